@@ -0,0 +1,64 @@
+"""
+Athlete lookup for the knapsack scorers, built once per chrono frame.
+
+The elo* scorers in knapsack-scrape.py, knapsack-chrono-scrape.py,
+podium_regress.py and points/ used to find each fantasy athlete with
+df.loc[df['name'].str.lower() == name]: a fresh lowercase of the whole name
+column and a full scan of the chrono history for every athlete, per race.
+An AthleteIndex lowercases the names once and groups row positions by name,
+so a lookup is a dict hit, and the latest row of every fantasy athlete comes
+out of one reindex:
+
+    - rows(name): the athlete's rows in frame order (what the .loc filter gave)
+    - latest_features(names, columns): the last row per name joined onto the
+      fantasy names in one pass; athletes with no rows get `fill`
+
+Usage:
+    from athlete_index import AthleteIndex
+
+    skier_index = AthleteIndex(df)
+    skier = skier_index.rows('johannes hoesflot klaebo')
+    latest = skier_index.latest_features(fantasy_names, ['elo', 'age', 'exp'])
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+class AthleteIndex:
+    """Row positions of a chrono frame grouped by lowercased name."""
+
+    def __init__(self, df: pd.DataFrame, key: str = 'name'):
+        self.df = df
+        names = df[key].str.lower().to_numpy()
+        self.positions = pd.Series(np.arange(len(df))).groupby(names, sort=False).indices
+        # .iloc[-1] of an athlete's rows is the last one in frame order
+        last = {name: positions[-1] for name, positions in self.positions.items()}
+        self.latest = df.iloc[list(last.values())].set_axis(list(last.keys()), axis=0)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.positions
+
+    def rows(self, name: str) -> pd.DataFrame:
+        """The athlete's rows (empty frame when unknown), like the old .loc name filter."""
+        return self.df.iloc[self.positions.get(name, [])]
+
+    def latest_features(self, names: Sequence[str], columns: List[str], fill=0) -> pd.DataFrame:
+        """
+        Last row per name for columns, one row per entry of names (in order).
+
+        As with the per-column try/except lookups this replaces, athletes with no
+        rows and columns missing from the frame get `fill`; a NaN in an existing
+        row stays NaN.
+        """
+        present = [col for col in columns if col in self.latest.columns]
+        latest = self.latest[present].reindex(list(names))
+        found = pd.Index(names).isin(self.latest.index)
+        for col in present:
+            # where upcasts (e.g. a string column filled with 0) where .loc assignment may not
+            latest[col] = latest[col].where(found, fill)
+        for col in columns:
+            if col not in present:
+                latest[col] = fill
+        return latest[columns].reset_index(drop=True)
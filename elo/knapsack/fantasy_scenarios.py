@@ -0,0 +1,184 @@
+"""
+Scenario-based fantasy team selection over simulated race outcomes.
+
+knapsack.py picks the team with the best point estimate (the `points` column
+from knapsack-scrape.py). A team built on estimates can still collapse when
+one favourite has a bad race. This module picks the team on simulated outcomes
+instead:
+
+    - each scenario samples every race's finishing order from the athletes'
+      Elo (Plackett-Luce: Elo on the log-strength scale plus Gumbel noise, so
+      any two athletes finish in Elo win-probability order), per gender, and
+      scores places with the World Cup points table
+    - candidate teams come from exact DP solves (fantasy_solver) on the mean
+      points of bootstrap samples of scenarios, run over a process pool
+    - every candidate is scored on every scenario with one matrix product
+      (teams x athletes) @ (athletes x scenarios)
+
+The chosen team maximizes expected points, or a quantile of its score (e.g.
+q=0.1 for a team that holds up in a bad weekend), and comes back with its
+score distribution.
+
+Usage:
+    from fantasy_scenarios import simulate_points, best_team
+
+    scenarios = simulate_points(df, n_scenarios=5000)     # athletes x scenarios
+    result = best_team(df, scenarios, quantile=0.1, workers=4)
+    print(result.summary())
+
+    python fantasy_scenarios.py excel365/fantasydf_falun.xlsx --scenarios 5000 --quantile 0.1
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fantasy_solver import BUDGET, GROUP_LIMITS, MAX_PICKS, group_codes, solve_dp
+
+# World Cup points by place (knapsack-scrape.py wc); places past 50 score 0
+WC_POINTS = np.array([100, 95, 90, 85, 80, 75, 72, 69, 66, 63, 60, 58, 56, 54, 52, 50, 48, 46, 44, 42,
+                      40, 38, 36, 34, 32, 30, 28, 26, 24, 22, 20, 19, 18, 17, 16, 15, 14, 13, 12, 11,
+                      10, 9, 8, 7, 6, 5, 4, 3, 2, 1], dtype=float)
+DEFAULT_ELO = 1300  # knapsack-scrape.py's Elo for athletes without history
+
+def elo_columns(data: pd.DataFrame) -> List[str]:
+    """Per-race Elo columns written by knapsack-scrape.elo (elo1, elo2, ...), else ['elo']."""
+    races = sorted((c for c in data.columns if re.fullmatch(r'elo\d+', str(c))),
+                   key=lambda c: int(c[3:]))
+    return races or ['elo']
+
+def simulate_points(data: pd.DataFrame, n_scenarios: int = 5000,
+                    points_table: np.ndarray = WC_POINTS, seed: Optional[int] = None,
+                    sex_col: str = 'sex') -> np.ndarray:
+    """
+    Fantasy points of every athlete in every scenario, shape (athletes, scenarios).
+
+    Each race column of elo_columns(data) is one race, run separately per sex.
+    """
+    rng = np.random.default_rng(seed)
+    scenarios = np.zeros((len(data), n_scenarios))
+    sexes = data[sex_col].to_numpy()
+    for col in elo_columns(data):
+        elo = data[col].fillna(DEFAULT_ELO).to_numpy(dtype=float)
+        for sex in pd.unique(sexes):
+            members = np.flatnonzero(sexes == sex)
+            strength = elo[members] * np.log(10) / 400
+            performance = strength[:, None] + rng.gumbel(size=(len(members), n_scenarios))
+            # Place 0 for the best performance in each scenario (column)
+            places = np.argsort(np.argsort(-performance, axis=0), axis=0)
+            scenarios[members] += np.where(places < len(points_table),
+                                           points_table[np.minimum(places, len(points_table) - 1)], 0.0)
+    return scenarios
+
+def _solve_candidate(args) -> Optional[np.ndarray]:
+    prices, points, groups, limits, budget, max_picks = args
+    return solve_dp(prices, points, groups, limits, budget, max_picks)
+
+@dataclass
+class ScenarioResult:
+    """The chosen team and how every candidate did across the scenarios."""
+    data: pd.DataFrame
+    team: np.ndarray          # boolean mask over data rows
+    scores: np.ndarray        # the team's points in every scenario
+    candidates: np.ndarray    # (teams, athletes) 0/1
+    candidate_scores: np.ndarray  # (teams, scenarios)
+    quantile: Optional[float]
+
+    def summary(self) -> str:
+        q = np.quantile(self.scores, [0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95])
+        target = 'mean' if self.quantile is None else f'q{self.quantile:g}'
+        lines = [f"Best of {len(self.candidates)} candidate teams by {target} "
+                 f"over {self.scores.size} scenarios",
+                 f"Expected {self.scores.mean():.1f} (sd {self.scores.std():.1f})",
+                 "Quantiles " + ", ".join(f"{p:g}: {v:.1f}" for p, v
+                                          in zip([0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95], q))]
+        return "\n".join(lines)
+
+def candidate_teams(data: pd.DataFrame, scenarios: np.ndarray, n_candidates: int = 200,
+                    sample_size: int = 50, group_limits: Optional[Dict[str, int]] = None,
+                    budget: int = BUDGET, max_picks: int = MAX_PICKS, workers: Optional[int] = None,
+                    seed: Optional[int] = None, price_col: str = 'price',
+                    sex_col: str = 'sex') -> np.ndarray:
+    """
+    Distinct optimal teams for the mean points of bootstrap samples of scenarios.
+
+    The first candidate uses every scenario (the expected-points team). Returns
+    a (teams, athletes) 0/1 matrix.
+    """
+    rng = np.random.default_rng(seed)
+    groups, limits = group_codes(data[sex_col], group_limits or GROUP_LIMITS)
+    prices = data[price_col].to_numpy(dtype=float)
+    n_scenarios = scenarios.shape[1]
+    targets = [scenarios.mean(axis=1)]
+    for _ in range(n_candidates - 1):
+        sample = rng.integers(0, n_scenarios, min(sample_size, n_scenarios))
+        targets.append(scenarios[:, sample].mean(axis=1))
+    jobs = [(prices, points, groups, limits, budget, max_picks) for points in targets]
+
+    if workers == 1:
+        teams = [_solve_candidate(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            teams = list(executor.map(_solve_candidate, jobs, chunksize=max(1, len(jobs) // 32)))
+    if any(team is None for team in teams):
+        raise ValueError("Prices do not fit the DP price grid; scenario mode needs solve_dp")
+    return np.unique(np.array(teams, dtype=np.int8), axis=0)
+
+def best_team(data: pd.DataFrame, scenarios: np.ndarray, quantile: Optional[float] = None,
+              **kwargs) -> ScenarioResult:
+    """
+    The candidate team with the best expected points (quantile=None) or the best
+    given quantile of points across scenarios. kwargs go to candidate_teams.
+    """
+    candidates = candidate_teams(data, scenarios, **kwargs)
+    candidate_scores = candidates.astype(float) @ scenarios
+    if quantile is None:
+        objective = candidate_scores.mean(axis=1)
+    else:
+        objective = np.quantile(candidate_scores, quantile, axis=1)
+    chosen = int(np.argmax(objective))
+    return ScenarioResult(data=data, team=candidates[chosen].astype(bool),
+                          scores=candidate_scores[chosen], candidates=candidates,
+                          candidate_scores=candidate_scores, quantile=quantile)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Pick a fantasy team over simulated race outcomes')
+    parser.add_argument('path', help='fantasydf .xlsx/.pkl from knapsack-scrape.py')
+    parser.add_argument('--scenarios', type=int, default=5000)
+    parser.add_argument('--candidates', type=int, default=200)
+    parser.add_argument('--quantile', type=float, default=None,
+                        help='Maximize this quantile of team points instead of the mean')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    path = os.path.expanduser(args.path)
+    data = pd.read_pickle(path) if path.endswith('.pkl') else pd.read_excel(path)
+    if 'id' in data.columns:
+        data = data.drop_duplicates(subset=['id'])
+    data = data.reset_index(drop=True)
+
+    start = time.perf_counter()
+    scenarios = simulate_points(data, args.scenarios, seed=args.seed)
+    print(f"Simulated {args.scenarios} scenarios of {len(elo_columns(data))} races "
+          f"in {time.perf_counter() - start:.1f}s")
+    result = best_team(data, scenarios, quantile=args.quantile, n_candidates=args.candidates,
+                       workers=args.workers, seed=args.seed)
+    print(result.summary())
+    print(f"Finished in {time.perf_counter() - start:.1f}s\n")
+
+    picks = data[result.team].copy()
+    picks['expected_points'] = scenarios[result.team].mean(axis=1)
+    print(picks.sort_values(by=['sex', 'price'], ascending=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
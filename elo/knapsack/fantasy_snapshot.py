@@ -0,0 +1,151 @@
+"""
+Local snapshot of the fantasyxc.se athlete API for the knapsack scripts.
+
+Every fantasy() / fantasy_relay() / ... function in the knapsack scripts
+fetched https://www.fantasyxc.se/api/athletes, parsed the JSON back out of an
+html5lib soup and json_normalize'd it, and the roster builders re-read
+fantasy_api.xlsx (written by api-scrape.py) with pd.read_excel, several times
+per script. Now there is one ingestion step:
+
+    - the API response is parsed as JSON directly and the columns the scripts
+      use are typed (ids, ranks, scores and prices numeric, flags boolean)
+    - the frame is written as a Feather snapshot (fantasy_api.feather) with a
+      JSON sidecar recording when it was fetched and a digest of its content
+    - a refresh whose content matches the snapshot only updates checked_at,
+      so the snapshot file, and everything memoized on its modification time,
+      stays put
+    - price_changes lists the athletes whose price or active flag moved, for
+      the refresh report (api-scrape.py); the scorers' own reuse is keyed on
+      their race roster, prices included (model_cache.cached_scores), so a
+      refresh that moves no price in that roster leaves its scores cached
+
+load_athletes() reads the snapshot (once per process, keyed by modification
+time) and only goes to the API when the snapshot is missing or older than
+max_age.
+
+Usage:
+    from fantasy_snapshot import load_athletes
+
+    API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)   # prices for the next race
+    everyone = load_athletes()                         # whatever snapshot exists
+
+    python api-scrape.py                               # refresh the snapshot
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+import requests
+
+API_URL = 'https://www.fantasyxc.se/api/athletes'
+SNAPSHOT_PATH = Path(os.path.expanduser(os.getenv('FANTASY_SNAPSHOT', '~/ski/elo/knapsack/fantasy_api.feather')))
+SNAPSHOT_MAX_AGE = 3600  # seconds; prices only move between race days
+
+NUMERIC_COLUMNS = ['athlete_id', 'rank', 'score', 'price']
+BOOL_COLUMNS = ['active', 'is_team']
+PRICE_COLUMNS = ['athlete_id', 'price', 'active']
+
+_snapshot_memo: Dict[Tuple[str, float], pd.DataFrame] = {}
+
+def _meta_path(path: Path) -> Path:
+    return path.with_suffix('.json')
+
+def fetch_athletes(url: str = API_URL, timeout: int = 30) -> pd.DataFrame:
+    """The API's athlete list as a typed frame."""
+    with requests.Session() as s:
+        r = s.get(url, timeout=timeout)
+        r.raise_for_status()
+    frame = pd.json_normalize(r.json())
+    for col in NUMERIC_COLUMNS:
+        if col in frame.columns:
+            frame[col] = pd.to_numeric(frame[col], errors='coerce')
+    for col in BOOL_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].fillna(False).astype(bool)
+    return frame
+
+def content_digest(frame: pd.DataFrame, columns: Optional[list] = None) -> str:
+    """Order-independent content hash of frame (or of some of its columns)."""
+    frame = frame[[col for col in columns if col in frame.columns]] if columns else frame
+    rows = pd.util.hash_pandas_object(frame.astype(str), index=False).sort_values()
+    return hashlib.sha256(rows.to_numpy().tobytes()).hexdigest()
+
+def read_meta(path: Path = SNAPSHOT_PATH) -> dict:
+    try:
+        with open(_meta_path(path), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def read_snapshot(path: Path = SNAPSHOT_PATH) -> Optional[pd.DataFrame]:
+    """The snapshot frame (a copy, safe to mutate), or None when there is none."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    key = (str(path), path.stat().st_mtime)
+    if key not in _snapshot_memo:
+        _snapshot_memo[key] = pd.read_feather(path)
+    return _snapshot_memo[key].copy()
+
+def price_changes(previous: Optional[pd.DataFrame], current: pd.DataFrame) -> pd.DataFrame:
+    """Athletes that are new or whose price or active flag changed, with the old price."""
+    columns = [col for col in PRICE_COLUMNS if col in current.columns]
+    if previous is None:
+        return current[columns]
+    old = previous[[col for col in PRICE_COLUMNS if col in previous.columns]]
+    merged = current[columns].merge(old, on='athlete_id', how='left', suffixes=('', '_old'),
+                                    indicator=True)
+    changed = merged['_merge'] == 'left_only'
+    for col in columns:
+        if col != 'athlete_id' and f'{col}_old' in merged.columns:
+            changed |= merged[col].ne(merged[f'{col}_old'])
+    return merged.loc[changed].drop(columns='_merge')
+
+def refresh_snapshot(path: Path = SNAPSHOT_PATH, url: str = API_URL) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Fetch the API and update the snapshot. Returns (athletes, price changes).
+
+    An unchanged response only bumps checked_at in the sidecar, so the
+    snapshot file (and everything keyed on its modification time) stays put.
+    """
+    path = Path(path)
+    current = fetch_athletes(url)
+    previous = read_snapshot(path)
+    meta = read_meta(path)
+    now = datetime.now(timezone.utc).isoformat()
+    digest = content_digest(current)
+    changes = price_changes(previous, current)
+
+    if previous is None or meta.get('digest') != digest:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        current.reset_index(drop=True).to_feather(tmp)
+        os.replace(tmp, path)
+        meta = {'url': url, 'fetched_at': now, 'digest': digest, 'rows': len(current)}
+    meta['checked_at'] = now
+    meta['checked_ts'] = time.time()
+    with open(_meta_path(path), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=1)
+    return current, changes
+
+def load_athletes(max_age: Optional[float] = None, path: Path = SNAPSHOT_PATH) -> pd.DataFrame:
+    """
+    The fantasy athletes from the snapshot.
+
+    Refreshes from the API first when there is no snapshot, or when max_age
+    (seconds) is given and the snapshot was last checked longer ago than that.
+    """
+    path = Path(path)
+    frame = read_snapshot(path)
+    checked = read_meta(path).get('checked_ts', path.stat().st_mtime if path.exists() else 0)
+    if frame is None or (max_age is not None and time.time() - checked > max_age):
+        frame, changes = refresh_snapshot(path)
+        print(f"Fantasy snapshot refreshed: {len(frame)} athletes, {len(changes)} price changes")
+        frame = frame.copy()
+    return frame
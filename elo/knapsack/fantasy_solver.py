@@ -0,0 +1,219 @@
+"""
+Exact fantasy team solver: knapsack with pick-count limits per gender.
+
+A fantasy team is at most 16 athletes (8 men, 8 women) under a $100,000 budget,
+scored by the sum of their predicted points. knapsack.py used to build a fresh
+OR-Tools CBC model for every solve, adding one variable and one coefficient at
+a time with data[...].iloc[j]. This module solves the same problem exactly with
+a dynamic program over (price bucket, picks per group):
+
+    - prices are divided by their greatest common divisor with the budget, so a
+      $1,000 price grid over a $100,000 budget is 101 buckets
+    - best[c, m, f] is the best score costing exactly c buckets with m men and
+      f women; each athlete is one vectorized NumPy update of that table
+    - the picks are recovered by walking the per-athlete 'took it' tables back
+
+A typical race (a few hundred athletes, 101 x 9 x 9 states) solves in a few
+milliseconds, so it can run inside simulations. The CBC model is kept as
+solve_cbc for cross-checks and for price grids too fine for the table.
+
+Usage:
+    from fantasy_solver import pick_team
+
+    picks = pick_team(df)                              # boolean mask over df rows
+    picks = pick_team(df, group_limits={'mixed': 8, 'f': 16})
+    picks = pick_team(df, backend='cbc')               # OR-Tools CBC
+
+    python fantasy_solver.py excel365/fantasydf_*.xlsx  # DP vs CBC on recorded inputs
+"""
+
+import sys
+import time
+from functools import reduce
+from math import gcd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+BUDGET = 100000
+MAX_PICKS = 16
+GROUP_LIMITS = {'m': 8, 'f': 8}
+MAX_BUCKETS = 20000  # Larger price grids go to CBC
+
+def price_buckets(prices: np.ndarray, budget: int) -> Optional[Tuple[np.ndarray, int]]:
+    """Integer costs and capacity on the coarsest grid that keeps prices exact, or None."""
+    if not np.all(np.isfinite(prices)) or not np.all(prices == np.round(prices)):
+        return None
+    int_prices = np.round(prices).astype(np.int64)
+    step = reduce(gcd, (int(p) for p in np.unique(int_prices) if p > 0), int(budget))
+    if step <= 0:
+        return None
+    capacity = int(budget) // step
+    if capacity > MAX_BUCKETS:
+        return None
+    return int_prices // step, capacity
+
+def undominated(costs: np.ndarray, points: np.ndarray, groups: np.ndarray,
+                limits: Sequence[int]) -> np.ndarray:
+    """
+    Mask of athletes that can be in some optimal team.
+
+    An athlete with at least `limit` group-mates who cost no more and score no
+    less (ties broken by order) can always be swapped for one of them, so only
+    the rest need to enter the DP. With 8 picks per gender this leaves a small
+    fraction of a World Cup field.
+    """
+    keep = np.zeros(len(costs), dtype=bool)
+    for g, limit in enumerate(limits):
+        members = np.flatnonzero(groups == g)
+        c, v = costs[members], points[members]
+        order = np.arange(len(members))
+        dominates = ((c[:, None] <= c[None, :]) & (v[:, None] >= v[None, :])
+                     & ((c[:, None] < c[None, :]) | (v[:, None] > v[None, :])
+                        | (order[:, None] < order[None, :])))
+        keep[members] = dominates.sum(axis=0) < limit
+    return keep
+
+def solve_dp(prices: np.ndarray, points: np.ndarray, groups: np.ndarray,
+             limits: Sequence[int], budget: int = BUDGET,
+             max_picks: int = MAX_PICKS) -> Optional[np.ndarray]:
+    """
+    Exact best selection by dynamic programming.
+
+    groups[i] is athlete i's index into limits (the most picks allowed from that
+    group). Returns a boolean selection mask, or None when the prices do not fit
+    an integer bucket grid (use solve_cbc then).
+    """
+    buckets = price_buckets(np.asarray(prices, dtype=float), budget)
+    if buckets is None:
+        return None
+    costs, capacity = buckets
+    points = np.nan_to_num(np.asarray(points, dtype=float))
+    groups = np.asarray(groups)
+    limits = [min(int(limit), max_picks) for limit in limits]
+
+    # Athletes who cannot improve a team never need a state update
+    candidates = np.flatnonzero((points > 0) & (costs <= capacity))
+    candidates = candidates[undominated(costs[candidates], points[candidates],
+                                        groups[candidates], limits)]
+    shape = (capacity + 1,) + tuple(limit + 1 for limit in limits)
+    best = np.full(shape, -np.inf)
+    best[(0,) * len(shape)] = 0.0
+    took = np.zeros((len(candidates),) + shape, dtype=bool)
+
+    def window(cost: int, group: int, taken: bool) -> tuple:
+        # States before (taken=False) / after (taken=True) adding one athlete
+        price_slice = slice(cost, capacity + 1) if taken else slice(0, capacity + 1 - cost)
+        return (price_slice,) + tuple(
+            (slice(1, limit + 1) if taken else slice(0, limit)) if g == group else slice(None)
+            for g, limit in enumerate(limits))
+
+    for k, i in enumerate(candidates):
+        group = int(groups[i])
+        if limits[group] == 0:
+            continue
+        before, after = window(int(costs[i]), group, False), window(int(costs[i]), group, True)
+        candidate = best[before] + points[i]
+        current = best[after]
+        np.greater(candidate, current, out=took[k][after])
+        np.maximum(current, candidate, out=current)
+
+    # Best reachable state within the total pick limit
+    counts = np.indices(shape[1:]).sum(axis=0)
+    final = np.where(counts <= max_picks, best, -np.inf)
+    state = list(np.unravel_index(np.argmax(final), shape))
+
+    selected = np.zeros(len(points), dtype=bool)
+    for k in range(len(candidates) - 1, -1, -1):
+        if took[k][tuple(state)]:
+            i = candidates[k]
+            selected[i] = True
+            state[0] -= int(costs[i])
+            state[1 + int(groups[i])] -= 1
+    return selected
+
+def solve_cbc(prices: np.ndarray, points: np.ndarray, groups: np.ndarray,
+              limits: Sequence[int], budget: int = BUDGET,
+              max_picks: int = MAX_PICKS) -> Optional[np.ndarray]:
+    """The same problem as an OR-Tools CBC MIP. Returns None if CBC finds no optimum."""
+    from ortools.linear_solver import pywraplp
+
+    prices = np.asarray(prices, dtype=float)
+    points = np.nan_to_num(np.asarray(points, dtype=float))
+    groups = np.asarray(groups)
+    solver = pywraplp.Solver('fantasy_knapsack', pywraplp.Solver.CBC_MIXED_INTEGER_PROGRAMMING)
+    x = [solver.BoolVar(f'x[{i}]') for i in range(len(points))]
+
+    solver.Add(solver.Sum([float(p) * var for p, var in zip(prices, x)]) <= float(budget))
+    solver.Add(solver.Sum(x) <= max_picks)
+    for g, limit in enumerate(limits):
+        solver.Add(solver.Sum([x[i] for i in np.flatnonzero(groups == g)]) <= int(limit))
+    solver.Maximize(solver.Sum([float(v) * var for v, var in zip(points, x)]))
+
+    if solver.Solve() != pywraplp.Solver.OPTIMAL:
+        return None
+    return np.array([var.solution_value() > 0.5 for var in x])
+
+def group_codes(sexes: pd.Series, group_limits: Dict[str, int]) -> Tuple[np.ndarray, List[int]]:
+    """Group index per athlete and the per-group limits, in group_limits order."""
+    names = list(group_limits)
+    codes = pd.Categorical(sexes, categories=names).codes
+    if (codes < 0).any():
+        unknown = sorted(set(sexes[codes < 0].astype(str)))
+        raise ValueError(f"Unexpected sex values {unknown}; expected one of {names}")
+    return np.asarray(codes), [group_limits[name] for name in names]
+
+def pick_team(data: pd.DataFrame, group_limits: Optional[Dict[str, int]] = None,
+              budget: int = BUDGET, max_picks: int = MAX_PICKS,
+              backend: str = 'dp', points_col: str = 'points',
+              price_col: str = 'price', sex_col: str = 'sex') -> Optional[np.ndarray]:
+    """Boolean mask of the best team in data; backend is 'dp' (falls back to CBC) or 'cbc'."""
+    groups, limits = group_codes(data[sex_col], group_limits or GROUP_LIMITS)
+    args = (data[price_col].to_numpy(dtype=float), data[points_col].to_numpy(dtype=float),
+            groups, limits, budget, max_picks)
+    if backend == 'dp':
+        selected = solve_dp(*args)
+        if selected is not None:
+            return selected
+        print("Prices do not fit the DP price grid; solving with CBC")
+    elif backend != 'cbc':
+        raise ValueError(f"Unknown backend: {backend}")
+    return solve_cbc(*args)
+
+def cross_check(data: pd.DataFrame, group_limits: Optional[Dict[str, int]] = None,
+                **kwargs) -> bool:
+    """Solve with both backends and compare team scores; prints timings."""
+    points = data[kwargs.get('points_col', 'points')].fillna(0).to_numpy(dtype=float)
+    results = {}
+    for backend in ('dp', 'cbc'):
+        started = time.perf_counter()
+        selected = pick_team(data, group_limits, backend=backend, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        score = float(points[selected].sum()) if selected is not None else float('nan')
+        results[backend] = score
+        print(f"  {backend}: score {score:.2f} in {elapsed:.1f}ms")
+    return bool(np.isclose(results['dp'], results['cbc']))
+
+def main(paths: List[str]) -> int:
+    failures = skipped = 0
+    for path in paths:
+        try:
+            data = pd.read_excel(path)
+        except Exception as e:
+            print(f"{path}: skipped ({e})")
+            skipped += 1
+            continue
+        if 'id' in data.columns:
+            data = data.drop_duplicates(subset=['id'])
+        data = data.reset_index(drop=True)
+        group_limits = {'mixed': 8, 'f': 16} if (data['sex'] == 'mixed').any() else GROUP_LIMITS
+        print(f"{path}: {len(data)} athletes")
+        if not cross_check(data, group_limits):
+            print("  MISMATCH")
+            failures += 1
+    print(f"{len(paths) - failures - skipped}/{len(paths) - skipped} inputs match")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
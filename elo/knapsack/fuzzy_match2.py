@@ -5,7 +5,12 @@ import pandas as pd
 from fuzzywuzzy import fuzz
 from fuzzywuzzy import process
 import Levenshtein as lev
-df0 = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
+import sys
+import os
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import normalize_names
+from fantasy_snapshot import load_athletes
+df0 = load_athletes()
 
 df0 = df0[df0['is_team']!=True]
 
@@ -56,12 +61,7 @@ for a in range(len(url)):
 	                text.append(tweet_text)
 df['text'] = text
 df['text'] = df['text'].str.lower()
-df['text'] = df['text'].str.replace('ø', 'oe')
-df['text'] = df['text'].str.replace('ä', 'ae')
-df['text'] = df['text'].str.replace('æ', 'ae')
-df['text']= df['text'].str.replace('ö', 'oe')
-df['text']= df['text'].str.replace('ü', 'ue')
-df['text']= df['text'].str.replace('å', 'aa')
+df['text'] = normalize_names(df['text'], aliases=None)
 df = df.reset_index()
 
 
@@ -26,6 +26,14 @@ import math
 import time
 import json
 from pandas.io.json import json_normalize
+from athlete_index import AthleteIndex
+from lineups import best_lineups, lineup_startlist
+from model_cache import cached_fit, cached_scores, fit_all, fit_groups
+from fantasy_snapshot import SNAPSHOT_MAX_AGE, load_athletes
+import sys
+import os
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import name_keys, normalize_names
 pd.options.mode.chained_assignment = None
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning) 
@@ -138,14 +146,7 @@ def fantasy_team_sprint(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -250,6 +251,13 @@ def elo_team_sprint(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_c
 	ladiesrelaypkls = ["~/ski/elo/python/ski/relay/radar/varladies_sprint_k.pkl"]
 
 
+	#Fit every race type's regression at once; cached fits skip training
+	men_frames = [pd.read_pickle(pkl) for pkl in menpkls]
+	ladies_frames = [pd.read_pickle(pkl) for pkl in ladiespkls]
+	men_intslopes, ladies_intslopes = fit_groups(
+		[regress_relay_job(men_frames[a], men_vars[a]) for a in range(len(menpkls))],
+		[regress_relay_job(ladies_frames[a], ladies_vars[a]) for a in range(len(ladiespkls))])
+
 	for a in range(len(menpkls)):
 		skier_elo = []
 		skier_distance_elo = []
@@ -266,14 +274,8 @@ def elo_team_sprint(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_c
 		skier_exp = []
 		skier_age = []
 		skier_home = []
-		df = pd.read_pickle(menpkls[a])
-		df = df.loc[df['level']=="all"]
-		menintslope = regress_relay(df, men_vars[a])
-		
-		
-		ladiespkl = pd.read_pickle(ladiespkls[a])
-		ladiespkl = ladiespkl.loc[ladiespkl['level']=="all"]
-		ladiesintslope = regress_relay(ladiespkl, ladies_vars[a])
+		menintslope = men_intslopes[a]
+		ladiesintslope = ladies_intslopes[a]
 
 		df = men_chrono
 		df = df.loc[df['level']=="all"]
@@ -304,41 +306,7 @@ def elo_team_sprint(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_c
 		team_homes = []
 	
 		
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name']= df['name'].str.replace('Ø', 'Oe')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		
-
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Eric Silfver', 'erik silfver')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
-		df['name'] = df['name'].str.replace('Emmi Laemsae', 'emmi lamsa')
-		df['name'] = df['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-		df['name'] = df['name'].str.replace('Finn O\'Connell', 'finn o connell')
-		df['name'] = df['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
+		df['name'] = normalize_names(df['name'])
 
 		teamsdf = fantasydf.iloc[::3, :]
 		print(teamsdf)
@@ -346,7 +314,7 @@ def elo_team_sprint(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_c
 
 		#print(fantasydf)
 		fantasy_names = fantasydf['name']
-		fantasy_names = fantasy_names.str.lower()
+		fantasy_names = name_keys(fantasy_names)
 		fantasy_names  = fantasy_names.tolist()
 
 
@@ -372,9 +340,10 @@ def elo_team_sprint(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_c
 
 
 
+		skier_index = AthleteIndex(df)
 		for b in range(len(fantasy_names)):
 
-			skier = df.loc[df['name'].str.lower() == fantasy_names[b]]
+			skier = skier_index.rows(fantasy_names[b])
 			if(len(skier['name'])==0):
 				print("Name not registered", fantasy_names[b])
 			#print(skier)
@@ -707,14 +676,7 @@ def fantasy_mixed_ts(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -799,6 +761,10 @@ def elo_mixed_ts(fantasydf, mixedpkls, mixed_vars, mixed_chrono):
 	ladiesrelaypkls = ["~/ski/elo/python/ski/relay/radar/varladies_sprint_k.pkl"]
 
 
+	#Fit every race type's regression at once; cached fits skip training
+	mixed_intslopes = fit_all(
+		[regress_relay_job(pd.read_pickle(mixedpkls[a]), mixed_vars[a]) for a in range(len(mixedpkls))])
+
 	for a in range(len(mixedpkls)):
 		skier_elo = []
 		skier_distance_elo = []
@@ -815,9 +781,7 @@ def elo_mixed_ts(fantasydf, mixedpkls, mixed_vars, mixed_chrono):
 		skier_exp = []
 		skier_age = []
 		skier_home = []
-		df = pd.read_pickle(mixedpkls[a])
-		df = df.loc[df['level']=="all"]
-		mixedintslope = regress_relay(df, mixed_vars[a])
+		mixedintslope = mixed_intslopes[a]
 		
 		
 		
@@ -847,36 +811,7 @@ def elo_mixed_ts(fantasydf, mixedpkls, mixed_vars, mixed_chrono):
 		team_homes = []
 	
 		
-		df = df.str.replace('ø', 'oe')
-		df = df.str.replace('ä', 'ae')
-		df = df.str.replace('æ', 'ae')
-		df= df.str.replace('ö', 'oe')
-		df= df.str.replace('ü', 'ue')
-		df= df.str.replace('å', 'aa')
-		df= df.str.replace('Ã¸', 'oe')
-		df= df.str.replace('Ã¤', 'ae')
-		df= df.str.replace('Ã¼', 'ue')
-		df = df.str.replace('Ã¶', 'oe')
-		df = df.str.replace('Ã', 'oe')
-		df = df.str.replace('Ã¦', 'ae')
-		df= df.str.replace('Ã¥', 'aa')
-		df = df.str.replace('Aleksandr Terentev', 'alexander terentev')
-		df = df.str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df = df.str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df = df.str.replace('Aleksandr Terentev', 'alexander terentev')
-		df = df.str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df = df.str.replace('Philip Bellingham', 'phillip bellingham')
-		df = df.str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df = df.str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df = df.str.replace('Jessica Diggins', 'jessie diggins')
-		df = df.str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df = df.str.replace('Katri Lylynperae', 'katri lylynpera')
-		df = df.str.replace('Julia Belger', 'julia preussger')
-		df = df.str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df = df.str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df = df.str.replace('Ailja Iksanova', 'alija iksanova')
-		df = df.str.replace('Eric Silfver', 'erik silfver')
-		df = df.str.replace('Joni Maeki', 'joni maki')
+		df = normalize_names(df)
 
 		teamsdf = fantasydf.iloc[::3, :]
 		print(teamsdf)
@@ -886,7 +821,7 @@ def elo_mixed_ts(fantasydf, mixedpkls, mixed_vars, mixed_chrono):
 
 		fantasy_names = fantasydf
 		print(fantasy_names)
-		fantasy_names = fantasy_names.str.lower()
+		fantasy_names = name_keys(fantasy_names)
 		fantasy_names  = fantasy_names.tolist()
 		count = 0
 		team_elo = 0
@@ -1299,45 +1234,7 @@ def country_to_team(team_list):
 
 def df_to_name(name_list):
 	print(name_list)
-	name_list['name'] = name_list['name'].str.replace('ø', 'oe')
-	name_list['name'] = name_list['name'].str.replace('ä', 'ae')
-	name_list['name'] = name_list['name'].str.replace('æ', 'ae')
-	name_list['name']= name_list['name'].str.replace('ö', 'oe')
-	name_list['name']= name_list['name'].str.replace('ü', 'ue')
-	name_list['name']= name_list['name'].str.replace('å', 'aa')
-	name_list['name']= name_list['name'].str.replace('Ã¸', 'oe')
-	name_list['name']= name_list['name'].str.replace('Ã¤', 'ae')
-	name_list['name']= name_list['name'].str.replace('Ã¼', 'ue')
-	name_list['name']= name_list['name'].str.replace('Ã¥', 'aa')
-	name_list['name']= name_list['name'].str.replace('Ã¦', 'ae')
-	name_list['name']= name_list['name'].str.replace('Ø', 'Oe')
-	name_list['name'] = name_list['name'].str.replace('Ã¶', 'oe')
-	name_list['name'] = name_list['name'].str.replace('Ã', 'oe')
-	
-	
-	
-
-	name_list['name'] = name_list['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-	name_list['name'] = name_list['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-	name_list['name'] = name_list['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-	name_list['name'] = name_list['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-	name_list['name'] = name_list['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-	name_list['name'] = name_list['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-	name_list['name'] = name_list['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-	name_list['name'] = name_list['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-	name_list['name'] = name_list['name'].str.replace('Jessica Diggins', 'jessie diggins')
-	name_list['name'] = name_list['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-	name_list['name'] = name_list['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-	name_list['name'] = name_list['name'].str.replace('Julia Belger', 'julia preussger')
-	name_list['name'] = name_list['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-	name_list['name'] = name_list['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-	name_list['name'] = name_list['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-	name_list['name'] = name_list['name'].str.replace('Eric Silfver', 'erik silfver')
-	name_list['name'] = name_list['name'].str.replace('Joni Maeki', 'joni maki')
-	name_list['name'] = name_list['name'].str.replace('Emmi Laemsae', 'emmi lamsa')
-	name_list['name'] = name_list['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-	name_list['name'] = name_list['name'].str.replace('Finn O\'Connell', 'finn o connell')
-	name_list['name'] = name_list['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
+	name_list['name'] = normalize_names(name_list['name'])
 	name_list['name'] = name_list['name'].str.lower()
 	return name_list
 
@@ -1345,63 +1242,31 @@ def df_to_name(name_list):
 
 
 
-def invent_relay():
-	
-	all_men = pd.read_pickle("~/ski/elo/python/ski/age/relay/excel365/varmen_distance_k.pkl")
-	#print(all_men['date'])
-	all_men = all_men.loc[all_men['date']==20230500]
-	
-	all_men = all_men.sort_values(by=['pelo'], ascending=False)
-	all_men = df_to_name(all_men)
-	#print(all_men)
-
-	
-
-	everyteam = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
-	everyteam= everyteam.loc[everyteam['is_team']==True]
-	everyteam= everyteam.loc[everyteam['country']!="RUS"]
-	everyteam = everyteam.loc[everyteam['gender']=='m']
-	
-	country_codes = everyteam['country'].unique()
-	df_countries = country_code_to_country(country_codes)
-	men_teammates = []
-	team_list = []
-	for a in range(len(df_countries)):
-		try:
-			nat = all_men.loc[all_men['nation']==df_countries[a]]
-			top4 = nat['name']
-			top4 = top4[0:4]
-			if(len(top4)<4):
-				continue
-			print(top4)
-			men_teammates.append(top4)
-			team_list.append(df_countries[a])
-		except:
-			print(df_countries[a])
-			continue
-	team_list = country_to_team(team_list)
-	print(team_list)
-	men_teams = []
-	for a in range(len(team_list)):
-		print(team_list[a])
-		men_teams.append('m'+team_list[a])
-
-	#men_teammates = df_to_name(men_teammates)
-
-
-	men_ids = []
+def fantasy_team_names(sex):
+	#Fantasy team name per nation (e.g. Norway -> NORWAY I) for the nations with a team
+	everyteam = load_athletes()
+	everyteam = everyteam.loc[everyteam['is_team']==True]
+	everyteam = everyteam.loc[everyteam['country']!="RUS"]
+	everyteam = everyteam.loc[everyteam['gender']==sex]
+	teams = {}
+	for country in country_code_to_country(everyteam['country'].unique()):
+		team = country_to_team([country])
+		if(len(team)==1):
+			teams[country] = team[0]
+	return teams
 
-	everyman = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
-	everyman = everyman.loc[everyman['is_team']==False]
-	everyman = everyman.loc[everyman['country']!='RUS']
-	everyman = everyman.loc[everyman['gender']=='m']
+def fantasy_ids(sex):
+	#Fantasy athlete id per normalized, lowercased "first last" name
+	everyone = load_athletes()
+	everyone = everyone.loc[everyone['is_team']==False]
+	everyone = everyone.loc[everyone['country']!='RUS']
+	everyone = everyone.loc[everyone['gender']==sex]
 
-	
-	everyman_name = []
-	for a in range(len(everyman['name'])):
+	everyone_name = []
+	for a in range(len(everyone['name'])):
 		first_name = []
 		last_name = []
-		test_name = everyman['name'].iloc[a]
+		test_name = everyone['name'].iloc[a]
 		test_name = test_name.split(" ")
 		for word in test_name:
 			if word.isupper():
@@ -1411,38 +1276,48 @@ def invent_relay():
 		first_name = ' '.join(first_name)
 		last_name = ' '.join(last_name)
 		test_name = first_name + " " + last_name
-		test_name = test_name.lower()
-		everyman_name.append(test_name)
-	everyman['name'] = everyman_name
-	men_teammates = [item for sublist in men_teammates for item in sublist]
-	print(men_teammates)
-
-	for a in range(len(men_teammates)):
-		#print(men_teammates[a])
-		skier = everyman.loc[everyman['name']==men_teammates[a]]
-		#print(skier)
-		skier_id = skier['athlete_id']
-		#print(skier_id)
-		try:
-			skier_id = skier_id.iloc[0]
-		except:
-			print(men_teammates[a])
-			skier_id = 3040101
-		men_ids.append(skier_id)
-	#ids2 = men_teams+men_ids
-	print(len(men_teams))
-	print(len(men_ids))
-	ids = []
-	for a in range(len(men_teams)):
-		ids.append(men_teams[a])
-		index = a*4
-		ids.append(men_ids[index])
-		ids.append(men_ids[index+1])
-		ids.append(men_ids[index+2])
-		ids.append(men_ids[index+3])
+		everyone_name.append(test_name)
+	everyone['name'] = normalize_names(pd.Series(everyone_name, index=everyone.index)).str.lower()
+	return dict(zip(everyone['name'], everyone['athlete_id']))
+
+def relay_candidates(pkl, sex, date=20230500):
+	#Latest ratings of every athlete with a fantasy id, from a relay chrono pickle
+	athletes = pd.read_pickle(pkl)
+	athletes = athletes.loc[athletes['date']==date]
+	athletes = df_to_name(athletes)
+	athletes = athletes.drop_duplicates(subset=['name'], keep='last')
+	athletes['sex'] = sex
+	athletes['athlete_id'] = athletes['name'].map(fantasy_ids(sex))
+	for name in athletes.loc[athletes['athlete_id'].isna(), 'name']:
+		print("No fantasy id", name)
+	athletes = athletes.loc[athletes['athlete_id'].notna()]
+	return athletes.astype({'athlete_id': int})
+
+def invent_relay(event='relay', sex='m'):
+	#Best lineup per nation from the leg ratings, as a fis_relay/fis_team_sprint startlist
+	pkl = "~/ski/elo/python/ski/age/relay/excel365/var"+("men" if sex=='m' else "ladies")+"_distance_k.pkl"
+	athletes = relay_candidates(pkl, sex)
+	teams = fantasy_team_names(sex)
+	athletes = athletes.loc[athletes['nation'].isin(list(teams))]
+	lineups = best_lineups(athletes, event, rating='pelo')
+	print(lineups)
+	ids = lineup_startlist(lineups, teams, prefix=sex)
 	print(ids)
 	return ids
 
+def invent_mixed_relay(event='mixed_relay'):
+	#Best mixed lineup per nation, as a fis_mixed_relay/fis_mixed_ts startlist
+	athletes = pd.concat([
+		relay_candidates("~/ski/elo/python/ski/age/relay/excel365/varmen_distance_k.pkl", 'm'),
+		relay_candidates("~/ski/elo/python/ski/age/relay/excel365/varladies_distance_k.pkl", 'f')],
+		ignore_index=True)
+	teams = fantasy_team_names('mixed')
+	athletes = athletes.loc[athletes['nation'].isin(list(teams))]
+	lineups = best_lineups(athletes, event, rating='pelo')
+	print(lineups)
+	ids = lineup_startlist(lineups, teams)
+	print(ids)
+	return ids
 
 def fis_relay():
 	'''men_ids = [3420909, 3420605, 3420586, 3422819, 34819883, 3482119, 3482280, 3482277, 3180535, 3180861,
@@ -1527,14 +1402,7 @@ def fantasy_relay(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 	API_df['name'] = API_df['name'].str.replace("CZECH REPUBLIC", "CZECHIA")
 
 	##Change to locate for increased speed
@@ -1638,6 +1506,13 @@ def elo_relay(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono,
 	ladiesrelaypkls = ["~/ski/elo/python/ski/relay/radar/varladies_sprint_k.pkl"]
 
 
+	#Fit every race type's regression at once; cached fits skip training
+	men_frames = [pd.read_pickle(pkl) for pkl in menpkls]
+	ladies_frames = [pd.read_pickle(pkl) for pkl in ladiespkls]
+	men_intslopes, ladies_intslopes = fit_groups(
+		[regress_relay_job(men_frames[a], men_vars[a]) for a in range(len(menpkls))],
+		[regress_relay_job(ladies_frames[a], ladies_vars[a]) for a in range(len(ladiespkls))])
+
 	for a in range(len(menpkls)):
 		skier_elo = []
 		skier_distance_elo = []
@@ -1654,14 +1529,8 @@ def elo_relay(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono,
 		skier_exp = []
 		skier_age = []
 		skier_home = []
-		df = pd.read_pickle(menpkls[a])
-		df = df.loc[df['level']=="all"]
-		menintslope = regress_relay(df, men_vars[a])
-		
-		
-		ladiespkl = pd.read_pickle(ladiespkls[a])
-		ladiespkl = ladiespkl.loc[ladiespkl['level']=="all"]
-		ladiesintslope = regress_relay(ladiespkl, ladies_vars[a])
+		menintslope = men_intslopes[a]
+		ladiesintslope = ladies_intslopes[a]
 
 		df = men_chrono
 		df = df.loc[df['level']=="all"]
@@ -1692,45 +1561,7 @@ def elo_relay(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono,
 		team_homes = []
 	
 		
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name']= df['name'].str.replace('Ã¥', 'aa')
-		df['name']= df['name'].str.replace('Ã¦', 'ae')
-		df['name']= df['name'].str.replace('Ø', 'Oe')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		
-		
-		
-
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Eric Silfver', 'erik silfver')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
-		df['name'] = df['name'].str.replace('Emmi Laemsae', 'emmi lamsa')
-		df['name'] = df['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-		df['name'] = df['name'].str.replace('Finn O\'Connell', 'finn o connell')
-		df['name'] = df['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
+		df['name'] = normalize_names(df['name'])
 
 		teamsdf = fantasydf.iloc[::5, :]
 		print(teamsdf)
@@ -1740,7 +1571,7 @@ def elo_relay(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono,
 
 		fantasy_names = fantasydf
 		print(fantasy_names)
-		fantasy_names = fantasy_names['name'].str.lower()
+		fantasy_names = name_keys(fantasy_names['name'])
 		fantasy_names  = fantasy_names.tolist()
 		count = 0
 		team_elo = 0
@@ -1764,9 +1595,10 @@ def elo_relay(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono,
 
 
 
+		skier_index = AthleteIndex(df)
 		for b in range(len(fantasy_names)):
 
-			skier = df.loc[df['name'].str.lower() == fantasy_names[b]]
+			skier = skier_index.rows(fantasy_names[b])
 			
 			if(len(skier['name'])==0):
 				print("Name not registered", fantasy_names[b])
@@ -2087,14 +1919,7 @@ def fantasy_mixed_relay(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -2178,6 +2003,10 @@ def elo_mixed_relay(fantasydf, mixedpkls,  mixed_vars,  mixed_chrono):
 	ladiesrelaypkls = ["~/ski/elo/python/ski/relay/radar/varladies_sprint_k.pkl"]
 
 
+	#Fit every race type's regression at once; cached fits skip training
+	mixed_intslopes = fit_all(
+		[regress_relay_job(pd.read_pickle(mixedpkls[a]), mixed_vars[a]) for a in range(len(mixedpkls))])
+
 	for a in range(len(mixedpkls)):
 		skier_elo = []
 		skier_distance_elo = []
@@ -2194,9 +2023,7 @@ def elo_mixed_relay(fantasydf, mixedpkls,  mixed_vars,  mixed_chrono):
 		skier_exp = []
 		skier_age = []
 		skier_home = []
-		df = pd.read_pickle(mixedpkls[a])
-		df = df.loc[df['level']=="all"]
-		mixedintslope = regress_relay(df, mixed_vars[a])
+		mixedintslope = mixed_intslopes[a]
 
 		df = mixed_chrono
 		df = df.loc[df['level']=="all"]
@@ -2224,45 +2051,7 @@ def elo_mixed_relay(fantasydf, mixedpkls,  mixed_vars,  mixed_chrono):
 		team_homes = []
 	
 		
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name']= df['name'].str.replace('Ã¥', 'aa')
-		df['name']= df['name'].str.replace('Ã¦', 'ae')
-		df['name']= df['name'].str.replace('Ø', 'Oe')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		
-		
-		
-
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Eric Silfver', 'erik silfver')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
-		df['name'] = df['name'].str.replace('Emmi Laemsae', 'emmi lamsa')
-		df['name'] = df['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-		df['name'] = df['name'].str.replace('Finn O\'Connell', 'finn o connell')
-		df['name'] = df['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
+		df['name'] = normalize_names(df['name'])
 
 		teamsdf = fantasydf.iloc[::5, :]
 		print(teamsdf)
@@ -2272,7 +2061,7 @@ def elo_mixed_relay(fantasydf, mixedpkls,  mixed_vars,  mixed_chrono):
 
 		fantasy_names = fantasydf
 		print(fantasy_names)
-		fantasy_names = fantasy_names['name'].str.lower()
+		fantasy_names = name_keys(fantasy_names['name'])
 		fantasy_names  = fantasy_names.tolist()
 		count = 0
 		team_elo = 0
@@ -2296,9 +2085,10 @@ def elo_mixed_relay(fantasydf, mixedpkls,  mixed_vars,  mixed_chrono):
 
 
 
+		skier_index = AthleteIndex(df)
 		for b in range(len(fantasy_names)):
 
-			skier = df.loc[df['name'].str.lower() == fantasy_names[b]]
+			skier = skier_index.rows(fantasy_names[b])
 			if(len(skier['name'])==0):
 				print("Name not registered", fantasy_names[b])
 			#print(skier)
@@ -2518,7 +2308,7 @@ def fis():
 	3430249, 3490145, 3500664, 3501223, 3501741, 3501010, 3501255, 3510479, 3510342, 3510351,
 	3510361, 3510023, 3530882, 3530532]'''
 
-	everyone = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
+	everyone = load_athletes()
 	print(everyone)
 	everyone = everyone.loc[everyone['active']==True]
 	everyone = everyone.loc[everyone['is_team']==False]
@@ -2585,14 +2375,7 @@ def fantasy(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -2670,35 +2453,26 @@ def elo(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladie
 	#"~/ski/elo/python/ski/ladies/varladies_10_classic.pkl",
 	#"~/ski/elo/python/ski/ladies/varladies_sprint_classic.pkl"]
 
-	for a in range(len(menpkls)):
-		skier_elo = []
-		skier_distance_elo = []
-		skier_distance_classic_elo = []
-		skier_distance_freestyle_elo = []
+	#Fit every race type's regression at once; cached fits skip training
+	men_frames = [pd.read_pickle(pkl) for pkl in menpkls]
+	ladies_frames = [pd.read_pickle(pkl) for pkl in ladiespkls]
+	men_intslopes, ladies_intslopes = fit_groups(
+		[regress_job(men_frames[a], men_vars[a]) for a in range(len(menpkls))],
+		[regress_job(ladies_frames[a], ladies_vars[a]) for a in range(len(ladiespkls))])
 
-		skier_sprint_elo = []
-		skier_sprint_classic_elo = []
-		skier_sprint_freestyle_elo = []
-		skier_classic_elo = []
-		skier_freestyle_elo = []
-
-		skier_avg_points = []
-		skier_exp = []
-		skier_age = []
-		skier_home = []
-
-		df = pd.read_pickle(menpkls[a])
+	for a in range(len(menpkls)):
+		df = men_frames[a]
 		#df = men_chrono
 
 		#It's all unless it's the first race of the years
 		df = df.loc[df['level']=="all"]
 
-		menintslope = regress(df, men_vars[a])
+		menintslope = men_intslopes[a]
 		
-		ladiespkl = pd.read_pickle(ladiespkls[a])
+		ladiespkl = ladies_frames[a]
 		#ladiespkl = ladies_chrono
 		ladiespkl = ladiespkl.loc[ladiespkl['level']=="all"]
-		ladiesintslope = regress(ladiespkl, ladies_vars[a])
+		ladiesintslope = ladies_intslopes[a]
 
 		df_pkl = df
 		df = men_chrono
@@ -2711,197 +2485,43 @@ def elo(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladie
 		df = df.append(ladiespkl, ignore_index = True)
 		df_pkl = df_pkl.append(ladies_short_pkl, ignore_index=True)
 		
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name']= df['name'].str.replace('Ø', 'Oe')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		
-
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Eric Silfver', 'erik silfver')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
-		df['name'] = df['name'].str.replace('Emmi Laemsae', 'emmi lamsa')
-		df['name'] = df['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-		df['name'] = df['name'].str.replace('Finn O\'Connell', 'finn o connell')
-		df['name'] = df['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
-		
-
-		df_pkl['name'] = df_pkl['name'].str.replace('ø', 'oe')
-		df_pkl['name'] = df_pkl['name'].str.replace('ä', 'ae')
-		df_pkl['name'] = df_pkl['name'].str.replace('æ', 'ae')
-		df_pkl['name']= df_pkl['name'].str.replace('ö', 'oe')
-		df_pkl['name']= df_pkl['name'].str.replace('ü', 'ue')
-		df_pkl['name']= df_pkl['name'].str.replace('å', 'aa')
-		df_pkl['name']= df_pkl['name'].str.replace('Ã¸', 'oe')
-		df_pkl['name']= df_pkl['name'].str.replace('Ã¤', 'ae')
-		df_pkl['name']= df_pkl['name'].str.replace('Ã¼', 'ue')
-		df_pkl['name']= df_pkl['name'].str.replace('Ø', 'Oe')
-		df_pkl['name'] = df_pkl['name'].str.replace('Ã¶', 'oe')
-		df_pkl['name'] = df_pkl['name'].str.replace('Ã', 'oe')
-		df_pkl['name'] = df_pkl['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df_pkl['name'] = df_pkl['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df_pkl['name'] = df_pkl['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df_pkl['name'] = df_pkl['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df_pkl['name'] = df_pkl['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df_pkl['name'] = df_pkl['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df_pkl['name'] = df_pkl['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df_pkl['name'] = df_pkl['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df_pkl['name'] = df_pkl['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df_pkl['name'] = df_pkl['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df_pkl['name'] = df_pkl['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df_pkl['name'] = df_pkl['name'].str.replace('Julia Belger', 'julia preussger')
-		df_pkl['name'] = df_pkl['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df_pkl['name'] = df_pkl['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df_pkl['name'] = df_pkl['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df_pkl['name'] = df_pkl['name'].str.replace('Eric Silfver', 'erik silfver')
-		df_pkl['name'] = df_pkl['name'].str.replace('Joni Maeki', 'joni maki')
-		df_pkl['name'] = df_pkl['name'].str.replace('Emmi Laemsae', 'emmi lamsa')
-		df_pkl['name'] = df_pkl['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-		df_pkl['name'] = df_pkl['name'].str.replace('Finn O\'Connell', 'finn o connell')
-		df_pkl['name'] = df_pkl['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
+		df['name'] = normalize_names(df['name'])
+		
+
+		df_pkl['name'] = normalize_names(df_pkl['name'])
 		#df = df.str.replace('H', 'ailja iksanova')
 
 
 
 		fantasy_names = fantasydf['name']
-		fantasy_names = fantasy_names.str.lower()
+		fantasy_names = name_keys(fantasy_names)
 		fantasy_names  = fantasy_names.tolist()
 		
 		
 		#print(df.loc[df.str.lower()=='kristine stavaas skistad'])
 
 
-		for b in range(len(fantasy_names)):
-			skier = df.loc[df['name'].str.lower() == fantasy_names[b]]
-			skier_pkl = df_pkl.loc[df_pkl['name'].str.lower() == fantasy_names[b]]
-			
-			if(len(skier['name'])==0):
-				print(a, fantasy_names[b])
-			
-			try:
-				#Make tries and excepts for each of these
-				elo = skier['elo'].iloc[-1]
-				skier_elo.append(elo)
-			except:
-				skier_elo.append(0)
-			try:
-				distance_elo = skier['distance_elo'].iloc[-1]
-				skier_distance_elo.append(distance_elo)
-			except:
-				skier_distance_elo.append(0)
-			try:
-				distance_classic_elo = skier['distance_classic_elo'].iloc[-1]
-				skier_distance_classic_elo.append(distance_classic_elo)
-			except:
-				skier_distance_classic_elo.append(0)
-			try:
-				distance_freestyle_elo = skier['distance_freestyle_elo'].iloc[-1]
-				skier_distance_freestyle_elo.append(distance_freestyle_elo)
-			except:
-				skier_distance_freestyle_elo.append(0)
-			try:
-				sprint_elo = skier['sprint_elo'].iloc[-1]
-				skier_sprint_elo.append(sprint_elo)
-			except:
-				skier_sprint_elo.append(0)
-			try:
-				sprint_classic_elo = skier['sprint_classic_elo'].iloc[-1]
-				skier_sprint_classic_elo.append(sprint_classic_elo)
-			except:
-				skier_sprint_classic_elo.append(0)
-			try:
-				sprint_freestyle_elo = skier['sprint_freestyle_elo'].iloc[-1]
-				skier_sprint_freestyle_elo.append(sprint_freestyle_elo)
-			except:
-				skier_sprint_freestyle_elo.append(0)
-			try:
-				classic_elo = skier['classic_elo'].iloc[-1]
-				skier_classic_elo.append(classic_elo)
-			except:
-				skier_classic_elo.append(0)
-			try:
-				freestyle_elo = skier['freestyle_elo'].iloc[-1]
-				skier_freestyle_elo.append(freestyle_elo)
-			except:
-				skier_freestyle_elo.append(0)
-			try:
-				#NEED TO CHANGE AVERAGE POINTS AS IT LOOKS AT ALL
-
-				#Individual
-				avg_points = skier_pkl['avg_points'].iloc[-1]*.896294-0.0042397*skier_pkl['avg_points'].iloc[-1]**2+1.5865602
-
-				#Stage
-				#avg_points = skier_pkl['avg_points'].iloc[-1]*1.0801595-0.0100871*skier_pkl['avg_points'].iloc[-1]**2+0.1584908
-				
-				#Tour de Ski
-				#avg_points = skier['avg_points'].iloc[-1]*0.29674200-0.00046598*skier['avg_points'].iloc[-1]**2+1.76564661
-				skier_avg_points.append(avg_points)
-			except Exception:
-				#print(fantasy_names[b])
-				#traceback.print_exc()
-				skier_avg_points.append(0)
-			try:
-				exp = skier['exp'].iloc[-1]
-				skier_exp.append(exp)
-			except:
-				skier_exp.append(0)
-			try:
-				age = skier['age'].iloc[-1]
-				skier_age.append(age)
-			except:
-				skier_age.append(0)
-			try:
-				if(skier['nation'].iloc[-1]=="Sweden"):
-					#home = "TRUE"
-					home = 1
-				else:
-					home= "FALSE"
-					home = 0
-				skier_home.append(home)
-			except:
-				skier_home.append(0)
-				
-
-			
-		fantasydf['elo'] = skier_elo
-
-		fantasydf['distance_elo'] = skier_distance_elo
-		fantasydf['distance_classic_elo'] = skier_distance_classic_elo
-		fantasydf['distance_freestyle_elo'] = skier_distance_freestyle_elo
-
-		fantasydf['sprint_elo'] = skier_sprint_elo
-		fantasydf['sprint_classic_elo'] = skier_sprint_classic_elo
-		fantasydf['sprint_freestyle_elo'] = skier_sprint_freestyle_elo
-
-		fantasydf['classic_elo'] = skier_classic_elo
-		fantasydf['freestyle_elo'] = skier_freestyle_elo
-
-		fantasydf['avg_points'] = skier_avg_points
-		fantasydf['exp'] = skier_exp
-		fantasydf['age'] = skier_age
-		fantasydf['home'] = skier_home
+		# Latest chrono row of every fantasy athlete in one join (0 when not registered)
+		skier_index = AthleteIndex(df)
+		elo_columns = ['elo', 'distance_elo', 'distance_classic_elo', 'distance_freestyle_elo',
+			'sprint_elo', 'sprint_classic_elo', 'sprint_freestyle_elo', 'classic_elo', 'freestyle_elo']
+		latest = skier_index.latest_features(fantasy_names, elo_columns + ['exp', 'age', 'nation'])
+		for name in fantasy_names:
+			if name not in skier_index:
+				print(a, name)
+		for col in elo_columns:
+			fantasydf[col] = latest[col].to_numpy()
+		#NEED TO CHANGE AVERAGE POINTS AS IT LOOKS AT ALL
+		#Stage: avg_points*1.0801595-0.0100871*avg_points**2+0.1584908
+		#Tour de Ski: avg_points*0.29674200-0.00046598*avg_points**2+1.76564661
+		pkl_index = AthleteIndex(df_pkl)
+		avg_points = pkl_index.latest_features(fantasy_names, ['avg_points'])['avg_points']
+		registered = np.array([name in pkl_index for name in fantasy_names]) & ('avg_points' in df_pkl.columns)
+		#Individual
+		fantasydf['avg_points'] = np.where(registered, avg_points*.896294-0.0042397*avg_points**2+1.5865602, 0)
+		fantasydf['exp'] = latest['exp'].to_numpy()
+		fantasydf['age'] = latest['age'].to_numpy()
+		fantasydf['home'] = (latest['nation']=="Sweden").astype(int).to_numpy()
 
 		mendf = fantasydf.loc[fantasydf['sex']=='m']
 
@@ -3051,7 +2671,8 @@ def pkl_setup(pkl):
 
 
 
-def regress_relay(df, vars_list):#, pkl):
+#Builds the training frame for regress_relay; only runs when the fit is not cached
+def regress_relay_frame(df, vars_list):#, pkl):
 	
 
 	stage = [50, 46, 43, 40, 37, 34, 32, 30, 28, 26, 24, 22, 20, 18, 16, 15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
@@ -3094,21 +2715,20 @@ def regress_relay(df, vars_list):#, pkl):
 		#df['pavg_points'] = df['pavg_points'].apply(lambda x: 0.1584908+0.29674200*x-0.00046598*x**2)
 	
 	
-	y = df['points']
-	x = df[vars_list]
-	lm = LinearRegression()
-	
-	lm = LinearRegression().fit(x,y)
-	coefs = [lm.intercept_]
-	for a in range(len(vars_list)):
-		coefs.append(lm.coef_[a])
-	#print(coefs)
+	return df
+
+def regress_relay_job(df, vars_list):
+	return {'frame': df, 'features': vars_list, 'target': 'points', 'model': 'linear', 'prepare': regress_relay_frame}
+
+def regress_relay(df, vars_list):
+	coefs = cached_fit(**regress_relay_job(df, vars_list))
 	print(coefs)
 	return coefs
 
 #The point of regress is to take the pkl from pkl_setup, add a regression to it to get expected points for the current race
 #So it should return an intercept and a coefficient
-def regress(df, vars_list):#, pkl):
+#Builds the training frame for regress; only runs when the fit is not cached
+def regress_frame(df, vars_list):#, pkl):
 	
 	print(vars_list)
 
@@ -3164,14 +2784,13 @@ def regress(df, vars_list):#, pkl):
 		#df['pavg_points'] = df['pavg_points'].apply(lambda x: 0.1584908+1.0801595*x-0.0100871*x**2)
 	
 	
-	y = df['points']
-	x = df[vars_list]
-	lm = LinearRegression()
-	
-	lm = LinearRegression().fit(x,y)
-	coefs = [lm.intercept_]
-	for a in range(len(vars_list)):
-		coefs.append(lm.coef_[a])
+	return df
+
+def regress_job(df, vars_list):
+	return {'frame': df, 'features': vars_list, 'target': 'points', 'model': 'linear', 'prepare': regress_frame}
+
+def regress(df, vars_list):
+	coefs = cached_fit(**regress_job(df, vars_list))
 	print("these are the coefficients")
 	print(coefs)
 	return coefs
@@ -3409,6 +3028,10 @@ startlist = fis()
 #startlist = fis_relay()
 #startlist = fis_mixed_relay()
 #startlist = fis_team_sprint()
+#Before the startlists are out: best lineups from the leg ratings
+#startlist = invent_relay()
+#startlist = invent_relay('team_sprint', 'f')
+#startlist = invent_mixed_relay()
 
 fantasydf = (fantasy(startlist))
 #fantasydf = fantasy_relay(startlist)
@@ -3421,7 +3044,7 @@ fantasydf = (fantasy(startlist))
 
 
 
-fantasydf = elo(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladies_chrono)
+fantasydf = cached_scores(elo, fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladies_chrono)
 #fantasydf = pursuit(fantasydf)
 #fantasydf = elo_relay(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladies_chrono)
 #fantasydf = elo_mixed_relay(fantasydf, mixedpkls,  mixed_vars,  mixed_chrono)
@@ -19,6 +19,14 @@ from sklearn.linear_model import LinearRegression
 import time
 import json
 from pandas.io.json import json_normalize
+from athlete_index import AthleteIndex
+from lineups import best_lineups, lineup_startlist
+from model_cache import cached_fit, cached_scores, fit_groups
+from fantasy_snapshot import SNAPSHOT_MAX_AGE, load_athletes
+import sys
+import os
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import name_keys, normalize_names
 pd.options.mode.chained_assignment = None
 
 
@@ -283,14 +291,7 @@ def fantasy_team_sprint(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -406,35 +407,7 @@ def elo_team_sprint(fantasydf, menpkls, ladiespkls):
 		team_elos = []
 	
 		
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		df['name'] = df['name'].str.replace('Ã¦', 'ae')
-		df['name']= df['name'].str.replace('Ã¥', 'aa')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
+		df['name'] = normalize_names(df['name'])
 
 	teamsdf = fantasydf.iloc[::3, :]
 	print(teamsdf)
@@ -443,31 +416,15 @@ def elo_team_sprint(fantasydf, menpkls, ladiespkls):
 	#print(fantasydf)
 
 	fantasy_names = fantasydf['name']
-	fantasy_names = fantasy_names.str.lower()
+	fantasy_names = name_keys(fantasy_names)
 	fantasy_names  = fantasy_names.tolist()
-	count = 0
-	team_elo = 0
-	for b in range(len(fantasy_names)):
-
-		skier = df.loc[df['name'].str.lower() == fantasy_names[b]]
-		if(len(skier['name'])==0):
-			print("Name not registered", fantasy_names[b])
-		#print(skier)
-		try:
-
-			elo = skier['elo'].iloc[-1]
-			print(fantasy_names[b], elo)
-			team_elo+=elo
-			#skier_elo.append(elo)
-		#elo = (skier.loc[skier['date']==20210500]['elo'])
-		except:
-			print(fantasy_names[b])
-			team_elo+=1300
-
-		if(b%2==1):
-			team_elos.append(team_elo)
-			team_elo = 0
-			#skier_elo.append(1300)
+	# Latest elo of every fantasy athlete in one join (1300 when not registered), summed per team
+	skier_index = AthleteIndex(df)
+	for name in fantasy_names:
+		if name not in skier_index:
+			print("Name not registered", name)
+	elos = skier_index.latest_features(fantasy_names, ['elo'], fill=1300)['elo'].to_numpy()
+	team_elos = elos[:len(elos)//2*2].reshape(-1, 2).sum(axis=1).tolist()
 	
 	teamsdf['elo'] = team_elos
 	fantasydf = teamsdf
@@ -591,14 +548,7 @@ def fantasy_mixed_ts(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -687,37 +637,7 @@ def elo_mixed_ts(fantasydf, menpkls, ladiespkls, relaypkls):
 		df = df.append(ladiespkl, ignore_index = True)
 
 
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		df['name'] = df['name'].str.replace('Ã¦', 'ae')
-		df['name']= df['name'].str.replace('Ã¥', 'aa')
-		
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
-		df['name'] = df['name'].str.replace('Paal Golberg', 'pal golberg')
+		df['name'] = normalize_names(df['name'])
 
 		teamsdf = fantasydf.iloc[::3, :]
 
@@ -727,30 +647,15 @@ def elo_mixed_ts(fantasydf, menpkls, ladiespkls, relaypkls):
 		
 
 		fantasy_names = fantasydf['name']
-		fantasy_names = fantasy_names.str.lower()
+		fantasy_names = name_keys(fantasy_names)
 		fantasy_names  = fantasy_names.tolist()
-		count = 0
-		team_elo = 0
-		for b in range(len(fantasy_names)):
-
-			skier = df.loc[df['name'].str.lower() == fantasy_names[b]]
-			if(len(skier['name'])==0):
-				print(fantasy_names[b])
-			#print(skier)
-			try:
-				elo = skier['elo'].iloc[-1]
-				team_elo+=elo
-				#print(team_elo)
-				#skier_elo.append(elo)
-			#elo = (skier.loc[skier['date']==20210500]['elo'])
-			except:
-				print("Name not registered", fantasy_names[b])
-				team_elo+=1300
-
-			if(b%2==1):
-				team_elos.append(team_elo)
-				team_elo = 0
-				#skier_elo.append(1300)
+		# Latest elo of every fantasy athlete in one join (1300 when not registered), summed per team
+		skier_index = AthleteIndex(df)
+		for name in fantasy_names:
+			if name not in skier_index:
+				print("Name not registered", name)
+		elos = skier_index.latest_features(fantasy_names, ['elo'], fill=1300)['elo'].to_numpy()
+		team_elos = elos[:len(elos)//2*2].reshape(-1, 2).sum(axis=1).tolist()
 		
 		teamsdf['team_elo'] = team_elos
 		fantasydf = teamsdf
@@ -949,104 +854,35 @@ def country_to_team(team_list):
 
 def df_to_name(name_list):
 	print(name_list)
-	name_list['name'] = name_list['name'].str.replace('ø', 'oe')
-	name_list['name'] = name_list['name'].str.replace('ä', 'ae')
-	name_list['name'] = name_list['name'].str.replace('æ', 'ae')
-	name_list['name']= name_list['name'].str.replace('ö', 'oe')
-	name_list['name']= name_list['name'].str.replace('ü', 'ue')
-	name_list['name']= name_list['name'].str.replace('å', 'aa')
-	name_list['name']= name_list['name'].str.replace('Ã¸', 'oe')
-	name_list['name']= name_list['name'].str.replace('Ã¤', 'ae')
-	name_list['name']= name_list['name'].str.replace('Ã¼', 'ue')
-	name_list['name']= name_list['name'].str.replace('Ã¥', 'aa')
-	name_list['name']= name_list['name'].str.replace('Ã¦', 'ae')
-	name_list['name']= name_list['name'].str.replace('Ø', 'Oe')
-	name_list['name'] = name_list['name'].str.replace('Ã¶', 'oe')
-	name_list['name'] = name_list['name'].str.replace('Ã', 'oe')
-	
-	
-	
-
-	name_list['name'] = name_list['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-	name_list['name'] = name_list['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-	name_list['name'] = name_list['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-	name_list['name'] = name_list['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-	name_list['name'] = name_list['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-	name_list['name'] = name_list['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-	name_list['name'] = name_list['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-	name_list['name'] = name_list['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-	name_list['name'] = name_list['name'].str.replace('Jessica Diggins', 'jessie diggins')
-	name_list['name'] = name_list['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-	name_list['name'] = name_list['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-	name_list['name'] = name_list['name'].str.replace('Julia Belger', 'julia preussger')
-	name_list['name'] = name_list['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-	name_list['name'] = name_list['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-	name_list['name'] = name_list['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-	name_list['name'] = name_list['name'].str.replace('Eric Silfver', 'erik silfver')
-	name_list['name'] = name_list['name'].str.replace('Joni Maeki', 'joni maki')
-	name_list['name'] = name_list['name'].str.replace('Emmi Laemsae', 'emmi lamsa')
-	name_list['name'] = name_list['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-	name_list['name'] = name_list['name'].str.replace('Finn O\'Connell', 'finn o connell')
-	name_list['name'] = name_list['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
+	name_list['name'] = normalize_names(name_list['name'])
 	name_list['name'] = name_list['name'].str.lower()
 	return name_list
 
-def invent_relay():
-	
-	all_men = pd.read_pickle("~/ski/elo/python/ski/age/relay/excel365/varmen_distance_k.pkl")
-	#print(all_men['date'])
-	all_men = all_men.loc[all_men['date']==20230500]
-	
-	all_men = all_men.sort_values(by=['pelo'], ascending=False)
-	all_men = df_to_name(all_men)
-	#print(all_men)
-
-	
-
-	everyteam = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
-	everyteam= everyteam.loc[everyteam['is_team']==True]
-	everyteam= everyteam.loc[everyteam['country']!="RUS"]
-	everyteam = everyteam.loc[everyteam['gender']=='m']
-	
-	country_codes = everyteam['country'].unique()
-	df_countries = country_code_to_country(country_codes)
-	men_teammates = []
-	team_list = []
-	for a in range(len(df_countries)):
-		try:
-			nat = all_men.loc[all_men['nation']==df_countries[a]]
-			top4 = nat['name']
-			top4 = top4[0:4]
-			if(len(top4)<4):
-				continue
-			men_teammates.append(top4)
-			team_list.append(df_countries[a])
-		except:
-			print(df_countries[a])
-			continue
-	team_list = country_to_team(team_list)
-	print(team_list)
-	men_teams = []
-	for a in range(len(team_list)):
-		print(team_list[a])
-		men_teams.append('m'+team_list[a])
-
-	#men_teammates = df_to_name(men_teammates)
-
-
-	men_ids = []
-
-	everyman = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
-	everyman = everyman.loc[everyman['is_team']==False]
-	everyman = everyman.loc[everyman['country']!='RUS']
-	everyman = everyman.loc[everyman['gender']=='m']
+def fantasy_team_names(sex):
+	#Fantasy team name per nation (e.g. Norway -> NORWAY I) for the nations with a team
+	everyteam = load_athletes()
+	everyteam = everyteam.loc[everyteam['is_team']==True]
+	everyteam = everyteam.loc[everyteam['country']!="RUS"]
+	everyteam = everyteam.loc[everyteam['gender']==sex]
+	teams = {}
+	for country in country_code_to_country(everyteam['country'].unique()):
+		team = country_to_team([country])
+		if(len(team)==1):
+			teams[country] = team[0]
+	return teams
+
+def fantasy_ids(sex):
+	#Fantasy athlete id per normalized, lowercased "first last" name
+	everyone = load_athletes()
+	everyone = everyone.loc[everyone['is_team']==False]
+	everyone = everyone.loc[everyone['country']!='RUS']
+	everyone = everyone.loc[everyone['gender']==sex]
 
-	
-	everyman_name = []
-	for a in range(len(everyman['name'])):
+	everyone_name = []
+	for a in range(len(everyone['name'])):
 		first_name = []
 		last_name = []
-		test_name = everyman['name'].iloc[a]
+		test_name = everyone['name'].iloc[a]
 		test_name = test_name.split(" ")
 		for word in test_name:
 			if word.isupper():
@@ -1056,35 +892,46 @@ def invent_relay():
 		first_name = ' '.join(first_name)
 		last_name = ' '.join(last_name)
 		test_name = first_name + " " + last_name
-		test_name = test_name.lower()
-		everyman_name.append(test_name)
-	everyman['name'] = everyman_name
-	men_teammates = [item for sublist in men_teammates for item in sublist]
-	print(men_teammates)
-
-	for a in range(len(men_teammates)):
-		#print(men_teammates[a])
-		skier = everyman.loc[everyman['name']==men_teammates[a]]
-		#print(skier)
-		skier_id = skier['athlete_id']
-		#print(skier_id)
-		try:
-			skier_id = skier_id.iloc[0]
-		except:
-			print(men_teammates[a])
-			skier_id = 3040101
-		men_ids.append(skier_id)
-	#ids2 = men_teams+men_ids
-	print(len(men_teams))
-	print(len(men_ids))
-	ids = []
-	for a in range(len(men_teams)):
-		ids.append(men_teams[a])
-		index = a*4
-		ids.append(men_ids[index])
-		ids.append(men_ids[index+1])
-		ids.append(men_ids[index+2])
-		ids.append(men_ids[index+3])
+		everyone_name.append(test_name)
+	everyone['name'] = normalize_names(pd.Series(everyone_name, index=everyone.index)).str.lower()
+	return dict(zip(everyone['name'], everyone['athlete_id']))
+
+def relay_candidates(pkl, sex, date=20230500):
+	#Latest ratings of every athlete with a fantasy id, from a relay chrono pickle
+	athletes = pd.read_pickle(pkl)
+	athletes = athletes.loc[athletes['date']==date]
+	athletes = df_to_name(athletes)
+	athletes = athletes.drop_duplicates(subset=['name'], keep='last')
+	athletes['sex'] = sex
+	athletes['athlete_id'] = athletes['name'].map(fantasy_ids(sex))
+	for name in athletes.loc[athletes['athlete_id'].isna(), 'name']:
+		print("No fantasy id", name)
+	athletes = athletes.loc[athletes['athlete_id'].notna()]
+	return athletes.astype({'athlete_id': int})
+
+def invent_relay(event='relay', sex='m'):
+	#Best lineup per nation from the leg ratings, as a fis_relay/fis_team_sprint startlist
+	pkl = "~/ski/elo/python/ski/age/relay/excel365/var"+("men" if sex=='m' else "ladies")+"_distance_k.pkl"
+	athletes = relay_candidates(pkl, sex)
+	teams = fantasy_team_names(sex)
+	athletes = athletes.loc[athletes['nation'].isin(list(teams))]
+	lineups = best_lineups(athletes, event, rating='pelo')
+	print(lineups)
+	ids = lineup_startlist(lineups, teams, prefix=sex)
+	print(ids)
+	return ids
+
+def invent_mixed_relay(event='mixed_relay'):
+	#Best mixed lineup per nation, as a fis_mixed_relay/fis_mixed_ts startlist
+	athletes = pd.concat([
+		relay_candidates("~/ski/elo/python/ski/age/relay/excel365/varmen_distance_k.pkl", 'm'),
+		relay_candidates("~/ski/elo/python/ski/age/relay/excel365/varladies_distance_k.pkl", 'f')],
+		ignore_index=True)
+	teams = fantasy_team_names('mixed')
+	athletes = athletes.loc[athletes['nation'].isin(list(teams))]
+	lineups = best_lineups(athletes, event, rating='pelo')
+	print(lineups)
+	ids = lineup_startlist(lineups, teams)
 	print(ids)
 	return ids
 
@@ -1169,14 +1016,7 @@ def fantasy_relay(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 	API_df['name'] = API_df['name'].str.replace("CZECH REPUBLIC", "CZECHIA")
 
 	##Change to locate for increased speed
@@ -1289,38 +1129,7 @@ def elo_relay(fantasydf, menpkls, ladiespkls):
 		team_elos = []
 	
 		
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		df['name'] = df['name'].str.replace('Ã¦', 'ae')
-		df['name']= df['name'].str.replace('Ã¥', 'aa')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
-		df['name'] = df['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-		df['name'] = df['name'].str.replace('Finn O\'Connell', 'finn o connell')
-		df['name'] = df['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
+		df['name'] = normalize_names(df['name'])
 
 	teamsdf = fantasydf.iloc[::5, :]
 	fantasydf = fantasydf[fantasydf.index % 5 !=0]
@@ -1328,29 +1137,15 @@ def elo_relay(fantasydf, menpkls, ladiespkls):
 	#print(fantasydf)
 
 	fantasy_names = fantasydf['name']
-	fantasy_names = fantasy_names.str.lower()
+	fantasy_names = name_keys(fantasy_names)
 	fantasy_names  = fantasy_names.tolist()
-	count = 0
-	team_elo = 0
-	for b in range(len(fantasy_names)):
-
-		skier = df.loc[df['name'].str.lower() == fantasy_names[b]]
-		if(len(skier['name'])==0):
-			print(fantasy_names[b])
-		#print(skier)
-		try:
-			elo = skier['elo'].iloc[-1]
-			team_elo+=elo
-			#skier_elo.append(elo)
-		#elo = (skier.loc[skier['date']==20210500]['elo'])
-		except:
-			print(fantasy_names[b])
-			team_elo+=1300
-
-		if(b%4==3):
-			team_elos.append(team_elo)
-			team_elo = 0
-			#skier_elo.append(1300)
+	# Latest elo of every fantasy athlete in one join (1300 when not registered), summed per team
+	skier_index = AthleteIndex(df)
+	for name in fantasy_names:
+		if name not in skier_index:
+			print("Name not registered", name)
+	elos = skier_index.latest_features(fantasy_names, ['elo'], fill=1300)['elo'].to_numpy()
+	team_elos = elos[:len(elos)//4*4].reshape(-1, 4).sum(axis=1).tolist()
 	print(team_elos)
 	teamsdf['team_elo'] = team_elos
 	fantasydf = teamsdf
@@ -1460,14 +1255,7 @@ def fantasy_mixed_relay(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -1556,35 +1344,7 @@ def elo_mixed_relay(fantasydf, menpkls, ladiespkls, relaypkls):
 		df = df.append(ladiespkl, ignore_index = True)
 
 
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		
-		
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
+		df['name'] = normalize_names(df['name'])
 		
 
 		teamsdf = fantasydf.iloc[::5, :]
@@ -1596,30 +1356,15 @@ def elo_mixed_relay(fantasydf, menpkls, ladiespkls, relaypkls):
 		
 
 		fantasy_names = fantasydf['name']
-		fantasy_names = fantasy_names.str.lower()
+		fantasy_names = name_keys(fantasy_names)
 		fantasy_names  = fantasy_names.tolist()
-		count = 0
-		team_elo = 0
-		for b in range(len(fantasy_names)):
-
-			skier = df.loc[df['name'].str.lower() == fantasy_names[b]]
-			if(len(skier['name'])==0):
-				print(fantasy_names[b])
-			#print(skier)
-			try:
-				elo = skier['elo'].iloc[-1]
-				team_elo+=elo
-				#print(team_elo)
-				#skier_elo.append(elo)
-			#elo = (skier.loc[skier['date']==20210500]['elo'])
-			except:
-				print("Name not registered", fantasy_names[b])
-				team_elo+=1300
-
-			if(b%4==3):
-				team_elos.append(team_elo)
-				team_elo = 0
-				#skier_elo.append(1300)
+		# Latest elo of every fantasy athlete in one join (1300 when not registered), summed per team
+		skier_index = AthleteIndex(df)
+		for name in fantasy_names:
+			if name not in skier_index:
+				print("Name not registered", name)
+		elos = skier_index.latest_features(fantasy_names, ['elo'], fill=1300)['elo'].to_numpy()
+		team_elos = elos[:len(elos)//4*4].reshape(-1, 4).sum(axis=1).tolist()
 		
 		teamsdf['team_elo'] = team_elos
 		fantasydf = teamsdf
@@ -1663,7 +1408,7 @@ def fis():
 	3430249, 3490145, 3500664, 3501223, 3501741, 3501010, 3501255, 3510479, 3510342, 3510351,
 	3510361, 3510023, 3530882, 3530532]'''
 
-	everyone = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
+	everyone = load_athletes()
 	everyone = everyone.loc[everyone['is_team']==False]
 	everyone = everyone.loc[everyone['active']==True]
 	everyone = everyone.loc[everyone['country']!="RUS"]
@@ -1725,14 +1470,7 @@ def fantasy(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -1808,69 +1546,38 @@ def elo(fantasydf, menpkls, ladiespkls):
 	#"~/ski/elo/python/ski/ladies/varladies_10_classic.pkl",
 	#"~/ski/elo/python/ski/ladies/varladies_sprint_classic.pkl"]
 
+	#Fit every race type's regression at once; cached fits skip training
+	men_frames = [pd.read_pickle(pkl) for pkl in menpkls]
+	ladies_frames = [pd.read_pickle(pkl) for pkl in ladiespkls]
+	men_intslopes, ladies_intslopes = fit_groups([regress_job(frame) for frame in men_frames],
+		[regress_job(frame) for frame in ladies_frames])
+
 	for a in range(len(menpkls)):
-		skier_elo = []
-		df = pd.read_pickle(menpkls[a])
+		df = men_frames[a]
 
 		#It's all unless it's the first race of the years
 		df = df.loc[df['level']=="all"]
-		menintslope = regress(df)
+		menintslope = men_intslopes[a]
 		
-		ladiespkl = pd.read_pickle(ladiespkls[a])
+		ladiespkl = ladies_frames[a]
 		ladiespkl = ladiespkl.loc[ladiespkl['level']=="all"]
-		ladiesintslope = regress(ladiespkl)
+		ladiesintslope = ladies_intslopes[a]
 		df = df.append(ladiespkl, ignore_index = True)
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name']= df['name'].str.replace('Ø', 'Oe')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Eric Silfver', 'erik silfver')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
+		df['name'] = normalize_names(df['name'])
 		#df['name'] = df['name'].str.replace('H', 'ailja iksanova')
 
 
 
 		fantasy_names = fantasydf['name']
-		fantasy_names = fantasy_names.str.lower()
+		fantasy_names = name_keys(fantasy_names)
 		fantasy_names  = fantasy_names.tolist()
 		#print(fantasy_names)
-		for a in range(len(fantasy_names)):
-			skier = df.loc[df['name'].str.lower() == fantasy_names[a]]
-			if(len(skier['name'])==0):
-				print(fantasy_names[a])
-			#print(skier)
-			try:
-				elo = skier['elo'].iloc[-1]
-				skier_elo.append(elo)
-			#elo = (skier.loc[skier['date']==20210500]['elo'])
-			except:
-				print(fantasy_names[a])
-				skier_elo.append(1300)
-			
-		fantasydf['elo'] = skier_elo
+		# Latest elo of every fantasy athlete in one join (1300 when not registered)
+		skier_index = AthleteIndex(df)
+		for name in fantasy_names:
+			if name not in skier_index:
+				print("Name not registered", name)
+		fantasydf['elo'] = skier_index.latest_features(fantasy_names, ['elo'], fill=1300)['elo'].to_numpy()
 		mendf = fantasydf.loc[fantasydf['sex']=='m']
 		print(mendf['elo'])
 		max_elo = max(mendf['elo'])
@@ -1978,7 +1685,8 @@ def pkl_setup(pkl):
 
 
 
-def regress_relay(df):#, pkl):
+#Builds the pelopct/points frame for regress_relay; only runs when the fit is not cached
+def regress_relay_frame(df, vars_list):#, pkl):
 	
 
 	stage = [50, 46, 43, 40, 37, 34, 32, 30, 28, 26, 24, 22, 20, 18, 16, 15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
@@ -2041,18 +1749,20 @@ def regress_relay(df):#, pkl):
 	df2['points'] = df2['points'].apply(lambda x: x**(1/np.exp(1)))
 	#print("points", sum(df2['points']))
 	
-	x = df2['pelopct'].values.reshape((-1,1))
-	#print(x)
-	y = df2['points']
-	lm = LinearRegression()
-	#lm.fit(x,y)
-	lm = LinearRegression().fit(x,y)
-	print(lm.intercept_, lm.coef_[0])
-	return [lm.intercept_, lm.coef_[0]]
+	return df2
+
+def regress_relay_job(df):
+	return {'frame': df, 'features': ['pelopct'], 'target': 'points', 'model': 'linear', 'prepare': regress_relay_frame}
+
+def regress_relay(df):
+	intslope = cached_fit(**regress_relay_job(df))
+	print(intslope[0], intslope[1])
+	return intslope
 
 #The point of regress is to take the pkl from pkl_setup, add a regression to it to get expected points for the current race
 #So it should return an intercept and a coefficient
-def regress(df):#, pkl):
+#Builds the pelopct/points frame for regress; only runs when the fit is not cached
+def regress_frame(df, vars_list):#, pkl):
 	
 
 	stage = [50, 47, 44, 41, 38, 35, 32, 30, 28, 26, 24, 22, 20, 18, 16, 15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
@@ -2114,14 +1824,15 @@ def regress(df):#, pkl):
 	df2['points'] = df2['points'].apply(lambda x: x**(1/np.exp(1)))
 	#print("points", sum(df2['points']))
 	
-	x = df2['pelopct'].values.reshape((-1,1))
-	#print(x)
-	y = df2['points']
-	lm = LinearRegression()
-	#lm.fit(x,y)
-	lm = LinearRegression().fit(x,y)
-	print(lm.intercept_, lm.coef_[0])
-	return [lm.intercept_, lm.coef_[0]]
+	return df2
+
+def regress_job(df):
+	return {'frame': df, 'features': ['pelopct'], 'target': 'points', 'model': 'linear', 'prepare': regress_frame}
+
+def regress(df):
+	intslope = cached_fit(**regress_job(df))
+	print(intslope[0], intslope[1])
+	return intslope
 
 def mixed_combo(relaydf, tsdf):
 	
@@ -2170,6 +1881,10 @@ startlist = fis()
 #startlist = fis_relay()
 #startlist = fis_mixed_relay()
 #startlist = fis_team_sprint()
+#Before the startlists are out: best lineups from the leg ratings
+#startlist = invent_relay()
+#startlist = invent_relay('team_sprint', 'f')
+#startlist = invent_mixed_relay()
 
 fantasydf = (fantasy(startlist))
 #fantasydf = fantasy_relay(startlist)
@@ -2180,7 +1895,7 @@ fantasydf = (fantasy(startlist))
 #print(fantasydf)
 #print(fantasydf)
 
-fantasydf = elo(fantasydf, menpkls, ladiespkls)
+fantasydf = cached_scores(elo, fantasydf, menpkls, ladiespkls)
 #fantasydf = pursuit(fantasydf)
 #fantasydf = elo_relay(fantasydf, menpkls, ladiespkls)
 #fantasydf = elo_mixed_relay(fantasydf, menpkls, ladiespkls, relaypkls)
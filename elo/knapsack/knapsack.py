@@ -1,20 +1,12 @@
 from __future__ import print_function
-from bs4 import BeautifulSoup
-import requests
-import json
 import pandas as pd
-# pip install ortools
+import time
 
-from ortools.linear_solver import pywraplp
+from fantasy_solver import pick_team
+from fantasy_snapshot import SNAPSHOT_MAX_AGE, load_athletes
 
 ## Get -> prices/scores
-base_url = 'https://www.fantasyxc.se/api/athletes'
-with requests.Session() as s:
-    r = s.get(base_url)
-    soup = BeautifulSoup(r.content,'html5lib')
-
-API_json = json.loads(soup.get_text())
-API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 ## Filter ->
 df = API_df.filter(items=["gender","is_team", "name", "athlete_id", "active","rank","country","score","price"])
@@ -39,69 +31,27 @@ NEED TO ADD:
 
 ## Optimize ->
 
-def knapsack(data):
+def knapsack(data, backend='dp'):
   ## Dataframe Check:
   L = data.shape[0]
   if ((L-1)/2)*L != sum(data.index):
     print("ERROR: Remember to reset_index of dataframe ( df.reset_index(drop=True) )")
     return None
 
-  ## Initialize Solver:
-  solver = pywraplp.Solver('simple_mip_program',
-                            pywraplp.Solver.CBC_MIXED_INTEGER_PROGRAMMING)
-  ## Create Binary Varibles: 
-  x = {}
-  for j in range(data.shape[0]):
-      x[j] = solver.IntVar(0, 1, 'x[%s]' % data["name"].iloc[j])
-  
-  ## Cost Constraint (< $100,000):
-  constraint_expr = [data["price"].iloc[j] * x[j] for j in range(data.shape[0])]
-  solver.Add(sum(constraint_expr) <= 100000.0)
-  
-  ## Amount Constraint (16 selections):
-  constraint_expr = [x[j] for j in range(data.shape[0])]
-  #solver.Add(sum(constraint_expr) <= 8)
-  solver.Add(sum(constraint_expr) <= 16)
-
-  men, women = [], []
-  #mixed = []
-  for j in range(data.shape[0]):
-    '''if data["sex"].iloc[j] == "mixed":
-      mixed.append(x[j])'''
-     
-    if data["sex"].iloc[j] == "m":
-      men.append(x[j])
-    elif data["sex"].iloc[j] == "f":
-      women.append(x[j])
-    else:
-      print("ERROR: Gender is either m or f.")
-      return None
-
-  ## Composition Constraint (8 men & 8 women):
-  solver.Add(sum(men) <= 8)
-  solver.Add(sum(women) <= 8)
-  #solver.Add(sum(mixed) <= 8)
-  ## Objective:
-  objective = solver.Objective()
-  for j in range(L):
-    objective.SetCoefficient(x[j], float(data['points'].iloc[j]))
-  objective.SetMaximization()
-  
-  ## Solve:
-  status = solver.Solve()
-
-  if status == pywraplp.Solver.OPTIMAL:
-    print('Total Score =', int(solver.Objective().Value()))
-    Cost = []
-    data["Solution"] = 0.0
-    for j in range(L):
-      if x[j].solution_value() > 0:
-        Cost.append(data["price"].iloc[j])
-        data.loc[j, 'Solution'] = 1
-    print("Total Cost $",sum(Cost),'\n')
-    print('Problem solved in %f milliseconds' % solver.wall_time())
-    print('Problem solved in %d iterations' % solver.iterations())
-    print('Problem solved in %d branch-and-bound nodes' % solver.nodes(),'\n')
+  if not data["sex"].isin(['m', 'f']).all():
+    print("ERROR: Gender is either m or f.")
+    return None
+
+  ## Exact solve: $100,000 budget, 16 selections, 8 men & 8 women (CBC via backend='cbc'):
+  start = time.perf_counter()
+  selected = pick_team(data, group_limits={'m': 8, 'f': 8}, budget=100000, max_picks=16, backend=backend)
+  elapsed = (time.perf_counter() - start) * 1000
+
+  if selected is not None:
+    data["Solution"] = selected.astype(float)
+    print('Total Score =', int(data.loc[selected, 'points'].sum()))
+    print("Total Cost $",data.loc[selected, 'price'].sum(),'\n')
+    print('Problem solved in %f milliseconds' % elapsed,'\n')
     ## Print Picks:
     print(data[data.Solution > 0].sort_values(by=['sex', 'price'],ascending=False))
   else:
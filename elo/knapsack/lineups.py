@@ -0,0 +1,164 @@
+"""
+Relay and team sprint lineups for the fantasy team events.
+
+invent_relay in knapsack-scrape.py and knapsack-chrono-scrape.py guessed a
+relay team per nation by walking the nations and taking the top four men by
+pelo, whatever the legs were, and the team scorers then summed the members'
+ratings one athlete at a time. Here every nation's feasible lineups are built
+as index arrays and scored in one go:
+
+    - a format is a list of legs, each a sex (None: any) and the rating
+      column stem for that leg ('distance_classic' -> 'distance_classic_elo')
+    - a nation's candidates for a sex are, for each of that sex's legs, its
+      best len(legs) + top - 1 athletes on that leg's rating; any athlete
+      outside that set on every leg can be swapped for one of them without
+      losing rating, so the top lineups are among the candidates' lineups
+    - every ordered choice of distinct candidates for that sex's legs is one
+      row of an (assignments x legs) index array
+    - a lineup's score is the mean of its legs' ratings (the team Elo the
+      scorers use); the sexes of a mixed format are scored separately and
+      combined with an outer sum, so mixed relays do not enumerate the
+      product of both sides' assignments in Python
+
+best_lineups returns the top lineups per nation with the athlete ids per leg,
+in the order the startlist scrapers give them, so they go through
+fantasy_relay / elo_relay and into the solver as team items.
+
+Usage:
+    from lineups import best_lineups
+
+    lineups = best_lineups(athletes, 'relay', rating='pelo', top=1)
+    lineups = best_lineups(athletes, 'mixed_relay', rating='pelo', top=3)
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# (sex, rating column stem) per leg, in race order
+LEG_FORMATS: Dict[str, List[Tuple[Optional[str], str]]] = {
+    'relay': [(None, 'distance_classic'), (None, 'distance_classic'),
+              (None, 'distance_freestyle'), (None, 'distance_freestyle')],
+    'team_sprint': [(None, 'sprint'), (None, 'sprint')],
+    'mixed_relay': [('f', 'distance_classic'), ('m', 'distance_classic'),
+                    ('f', 'distance_freestyle'), ('m', 'distance_freestyle')],
+    'mixed_team_sprint': [('f', 'sprint'), ('m', 'sprint')],
+}
+
+@lru_cache(maxsize=None)
+def distinct_assignments(n: int, k: int) -> np.ndarray:
+    """Every ordered choice of k distinct candidates out of n, shape (n!/(n-k)!, k)."""
+    if k > n:
+        return np.empty((0, k), dtype=np.intp)
+    grid = np.indices((n,) * k).reshape(k, -1).T
+    ordered = np.sort(grid, axis=1)
+    return grid[(np.diff(ordered, axis=1) != 0).all(axis=1)]
+
+def leg_ratings(athletes: pd.DataFrame, legs: Sequence[Tuple[Optional[str], str]],
+                rating: str = 'elo') -> np.ndarray:
+    """(athletes, legs) ratings; a missing leg column or value falls back to `rating`."""
+    overall = athletes[rating].astype(float)
+    columns = []
+    for _, stem in legs:
+        col = f'{stem}_{rating}'
+        leg = athletes[col].astype(float).fillna(overall) if col in athletes.columns else overall
+        columns.append(leg.fillna(0).to_numpy())
+    return np.column_stack(columns)
+
+def _top(scores: np.ndarray, top: int) -> np.ndarray:
+    """Indices of the `top` best scores, best first."""
+    if len(scores) > top:
+        best = np.argpartition(-scores, top - 1)[:top]
+    else:
+        best = np.arange(len(scores))
+    return best[np.argsort(-scores[best], kind='stable')]
+
+def nation_lineups(ratings: np.ndarray, sexes: np.ndarray,
+                   legs: Sequence[Tuple[Optional[str], str]],
+                   top: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The `top` lineups of one nation: (athlete row per leg, shape (top, legs); scores).
+
+    ratings is leg_ratings for the nation's athletes and sexes their sex codes.
+    Fewer rows come back when the nation cannot fill every leg.
+    """
+    n_legs = len(legs)
+    # Partial lineups per sex: athlete rows for that sex's legs and their rating sums
+    parts = []
+    for sex in dict.fromkeys(sex for sex, _ in legs):
+        positions = np.array([i for i, (leg_sex, _) in enumerate(legs) if leg_sex == sex])
+        members = np.arange(len(ratings)) if sex is None else np.flatnonzero(sexes == sex)
+        if len(members) < len(positions):
+            return np.empty((0, n_legs), dtype=np.intp), np.empty(0)
+        # A top lineup only uses athletes among the best len(positions) + top - 1 on some leg
+        depth = len(positions) + top - 1
+        members = np.unique(np.concatenate([members[_top(ratings[members, position], depth)]
+                                            for position in positions]))
+        rows = members[distinct_assignments(len(members), len(positions))]
+        scores = ratings[rows, positions].sum(axis=1)
+        best = _top(scores, top)
+        parts.append((positions, rows[best], scores[best]))
+
+    # Outer sum of the sexes' partial scores; the top of a sum is within each part's top
+    lineups = np.zeros((1, n_legs), dtype=np.intp)
+    totals = np.zeros(1)
+    for positions, rows, scores in parts:
+        combined = (totals[:, None] + scores[None, :]).ravel()
+        left, right = np.divmod(np.arange(combined.size), len(scores))
+        lineups = lineups[left]
+        lineups[:, positions] = rows[right]
+        totals = combined
+        best = _top(totals, top)
+        lineups, totals = lineups[best], totals[best]
+    return lineups, totals / n_legs
+
+def best_lineups(athletes: pd.DataFrame, event: str = 'relay', rating: str = 'elo',
+                 top: int = 1,
+                 legs: Optional[Sequence[Tuple[Optional[str], str]]] = None,
+                 nation_col: str = 'nation', sex_col: str = 'sex', id_col: str = 'athlete_id',
+                 name_col: str = 'name') -> pd.DataFrame:
+    """
+    The `top` lineups of every nation for event (a LEG_FORMATS key, or custom legs).
+
+    One row per lineup: nation, rank within the nation, team rating (mean leg
+    rating), then leg1..legN athlete ids and leg1_name..legN_name. Nations that
+    cannot fill every leg are left out.
+    """
+    legs = list(legs or LEG_FORMATS[event])
+    athletes = athletes.reset_index(drop=True)
+    ratings = leg_ratings(athletes, legs, rating)
+    sexes = athletes[sex_col].to_numpy() if sex_col in athletes.columns else np.full(len(athletes), None)
+    ids = athletes[id_col].to_numpy()
+    names = athletes[name_col].to_numpy()
+
+    records = []
+    for nation, members in athletes.groupby(nation_col, sort=False).indices.items():
+        lineups, scores = nation_lineups(ratings[members], sexes[members], legs, top)
+        for rank, (lineup, score) in enumerate(zip(members[lineups], scores), start=1):
+            record = {nation_col: nation, 'rank': rank, 'team_rating': score}
+            record.update({f'leg{i + 1}': ids[row] for i, row in enumerate(lineup)})
+            record.update({f'leg{i + 1}_name': names[row] for i, row in enumerate(lineup)})
+            records.append(record)
+    lineups = pd.DataFrame.from_records(records)
+    if len(lineups):
+        lineups = lineups.sort_values(by=['rank', 'team_rating'], ascending=[True, False])
+    return lineups.reset_index(drop=True)
+
+def lineup_startlist(lineups: pd.DataFrame, teams: Dict[str, str], prefix: str = '',
+                     nation_col: str = 'nation') -> list:
+    """
+    Lineups as a scraped startlist: team name, then the leg athlete ids, per team.
+
+    teams maps nations to fantasy team names; nations without one are skipped.
+    """
+    leg_cols = [col for col in lineups.columns if col.startswith('leg') and col[3:].isdigit()]
+    startlist = []
+    for _, lineup in lineups.iterrows():
+        if lineup[nation_col] not in teams:
+            print("No fantasy team for", lineup[nation_col])
+            continue
+        startlist.append(prefix + teams[lineup[nation_col]])
+        startlist.extend(lineup[leg_cols].tolist())
+    return startlist
@@ -0,0 +1,240 @@
+"""
+Disk cache for the knapsack scorers' regression fits.
+
+regress / regress_relay in knapsack-scrape.py, knapsack-chrono-scrape.py and
+podium_regress.py rebuild a training frame from a chrono pickle and refit a
+LinearRegression (or LogisticRegression for podiums) for every race type and
+gender, every time a script runs, although the pickles only change when the
+Elo pipeline reruns. Here a fit is keyed by a hash of
+
+    - the training pickle's content (pandas row hashes, columns and dtypes)
+    - the feature list, target and model type
+    - the prepare function's code, constants and names, with the current
+      value of every module global it reads (helper functions by their own
+      code, recursively), so switching the points formula inside it or in a
+      module-level table or helper it calls is a new key
+    - CACHE_VERSION, bumped when the fitting itself changes
+
+and its coefficients ([intercept, coef per feature], as regress returns) are
+stored as JSON. Repeated runs within a weekend skip training entirely.
+cached_scores does the same for a whole scorer call (elo(fantasydf, ...)): the
+scored roster is pickled under a key of the roster's content, prices included,
+the scorer's code and its other arguments (frames by content, pickle paths by
+file size and modification time), so rerunning after a fantasy snapshot
+refresh that moved no price in this race's roster skips the scoring.
+fit_all runs the fits of several race types at once (threads: the knapsack
+scripts run top-level code, so they cannot be re-imported by worker
+processes), and the optional KFold score runs its folds on all cores.
+
+Usage:
+    from model_cache import cached_fit, cached_scores, fit_groups
+
+    coefs = cached_fit(df, ['elo', 'age'], 'points', prepare=regress_frame)
+    men_coefs, ladies_coefs = fit_groups(men_jobs, ladies_jobs)   # jobs: cached_fit kwargs
+    fantasydf = cached_scores(elo, fantasydf, menpkls, ladiespkls)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.model_selection import KFold, cross_val_score
+
+CACHE_DIR = Path(os.path.expanduser(os.getenv('MODEL_CACHE_DIR', '~/ski/elo/knapsack/model_cache')))
+
+# Part of every key; bump when fit_coefs or the stored entry changes
+CACHE_VERSION = '2'
+
+MODELS = {
+    'linear': LinearRegression,
+    'logistic': LogisticRegression,
+}
+
+def frame_digest(frame: pd.DataFrame) -> str:
+    """Content hash of a frame: row hashes plus column names and dtypes."""
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in frame.dtypes.items()]).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    except TypeError:
+        # Unhashable cells (lists, dicts): fall back to the pickled frame
+        digest.update(pickle.dumps(frame))
+    return digest.hexdigest()
+
+_PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes, tuple, list, dict)
+
+def _code_bytes(code) -> bytes:
+    # Nested code objects (the lambdas in regress) repr with their address
+    consts = [_code_bytes(c) if hasattr(c, 'co_code') else repr(c).encode() for c in code.co_consts]
+    return code.co_code + b'|'.join(consts) + b'|names:' + ','.join(code.co_names).encode()
+
+def _code_names(code) -> List[str]:
+    """Global/attribute names read by code and the code objects nested in it."""
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            names.extend(_code_names(const))
+    return list(dict.fromkeys(names))
+
+def _value_bytes(value, seen: set) -> bytes:
+    """Stable bytes for a global's current value."""
+    if hasattr(value, '__code__'):
+        return _func_bytes(value, seen)
+    if isinstance(value, np.ndarray):
+        return str(value.dtype).encode() + value.tobytes()
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(value, key=repr)).encode()
+    if isinstance(value, _PLAIN_TYPES):
+        return repr(value).encode()
+    # Modules, classes and other objects by qualified name
+    name = getattr(value, '__qualname__', getattr(value, '__name__', type(value).__qualname__))
+    return f"{getattr(value, '__module__', '')}.{name}".encode()
+
+def _func_bytes(func: Callable, seen: set) -> bytes:
+    """Code of func plus the values of the module globals it reads, helpers included."""
+    if func in seen:
+        return func.__qualname__.encode()
+    seen.add(func)
+    parts = [_code_bytes(func.__code__)]
+    scope = getattr(func, '__globals__', {})
+    for name in _code_names(func.__code__):
+        # Names that are not module globals are attributes or builtins
+        if name in scope:
+            parts.append(name.encode() + b'=' + _value_bytes(scope[name], seen))
+    for cell in getattr(func, '__closure__', None) or ():
+        try:
+            parts.append(_value_bytes(cell.cell_contents, seen))
+        except ValueError:
+            # A closure variable not assigned yet
+            parts.append(b'<empty>')
+    return b'|'.join(parts)
+
+def _code_digest(func: Optional[Callable]) -> str:
+    if func is None:
+        return ''
+    return hashlib.sha256(_func_bytes(func, set())).hexdigest()
+
+def model_key(frame: pd.DataFrame, features: Sequence[str], target: str, model: str,
+              prepare: Optional[Callable] = None) -> str:
+    """Cache key for fitting model on prepare(frame)[features] -> [target]."""
+    parts = [CACHE_VERSION, frame_digest(frame), json.dumps(list(features)), target, model,
+             _code_digest(prepare)]
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+def _arg_bytes(value) -> bytes:
+    """Stable bytes for a scorer argument; existing file paths by size and mtime."""
+    if isinstance(value, pd.DataFrame):
+        return frame_digest(value).encode()
+    if isinstance(value, (list, tuple)):
+        return b'[' + b','.join(_arg_bytes(v) for v in value) + b']'
+    if isinstance(value, str):
+        path = Path(os.path.expanduser(value))
+        if path.is_file():
+            stat = path.stat()
+            return f'{value}@{stat.st_size}:{stat.st_mtime_ns}'.encode()
+    return _value_bytes(value, set())
+
+def scores_key(score: Callable, roster: pd.DataFrame, args: Sequence) -> str:
+    """Cache key for score(roster, *args)."""
+    digest = hashlib.sha256(f'{CACHE_VERSION}|{_code_digest(score)}|'.encode())
+    digest.update(frame_digest(roster).encode())
+    for arg in args:
+        digest.update(b'|' + _arg_bytes(arg))
+    return digest.hexdigest()
+
+def fit_coefs(x: pd.DataFrame, y: pd.Series, model: str = 'linear') -> List[float]:
+    """[intercept, coef per feature] of a fresh fit."""
+    lm = MODELS[model]().fit(x, y)
+    intercept = np.ravel(lm.intercept_)[0]
+    return [float(intercept)] + [float(c) for c in np.ravel(lm.coef_)]
+
+def cv_score(x: pd.DataFrame, y: pd.Series, model: str = 'linear', folds: int = 5) -> float:
+    """Mean KFold score (R^2 or accuracy), folds run in parallel on all cores."""
+    cv = KFold(n_splits=folds, shuffle=True, random_state=0)
+    return float(np.mean(cross_val_score(MODELS[model](), x, y, cv=cv, n_jobs=-1)))
+
+def cached_fit(frame: pd.DataFrame, features: Sequence[str], target: str, model: str = 'linear',
+               prepare: Optional[Callable[[pd.DataFrame, List[str]], pd.DataFrame]] = None,
+               cv_folds: Optional[int] = None, cache_dir: Path = CACHE_DIR) -> List[float]:
+    """
+    Coefficients for model on the training frame, from the cache when possible.
+
+    prepare(frame, features) builds the training frame (the body of regress)
+    and only runs on a cache miss. With cv_folds the KFold score is computed
+    once and stored alongside the coefficients.
+    """
+    features = list(features)
+    key = model_key(frame, features, target, model, prepare)
+    path = Path(cache_dir) / f'{key}.json'
+    entry: Dict = {}
+    if path.exists():
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            entry = {}
+    if 'coefs' in entry and (cv_folds is None or entry.get('cv_folds') == cv_folds):
+        return entry['coefs']
+
+    train = prepare(frame, features) if prepare is not None else frame
+    x, y = train[features], train[target]
+    entry = {'features': features, 'target': target, 'model': model, 'rows': len(train),
+             'coefs': fit_coefs(x, y, model)}
+    if cv_folds:
+        entry['cv_folds'] = cv_folds
+        entry['cv_score'] = cv_score(x, y, model, cv_folds)
+        print(f"{model} {features}: {cv_folds}-fold score {entry['cv_score']:.4f}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, indent=1)
+    os.replace(tmp, path)
+    return entry['coefs']
+
+def fit_all(jobs: List[dict], workers: Optional[int] = None) -> List[List[float]]:
+    """cached_fit for every job (a dict of its keyword arguments), concurrently."""
+    if len(jobs) <= 1 or workers == 1:
+        return [cached_fit(**job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=workers or min(len(jobs), os.cpu_count() or 1)) as executor:
+        return list(executor.map(lambda job: cached_fit(**job), jobs))
+
+def fit_groups(*groups: List[dict], workers: Optional[int] = None) -> List[List[List[float]]]:
+    """fit_all over several job lists at once (e.g. men and ladies), split back per list."""
+    coefs = fit_all([job for group in groups for job in group], workers)
+    split, start = [], 0
+    for group in groups:
+        split.append(coefs[start:start + len(group)])
+        start += len(group)
+    return split
+
+def cached_scores(score: Callable[..., pd.DataFrame], roster: pd.DataFrame, *args,
+                  files: Sequence[str] = (), cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    """
+    score(roster, *args), reused while the roster, scorer and inputs are unchanged.
+
+    files lists paths the scorer reads that are not among its arguments.
+    """
+    key = scores_key(score, roster, list(args) + [list(files)])
+    path = Path(cache_dir) / f'scores-{key}.pkl'
+    if path.exists():
+        try:
+            scored = pd.read_pickle(path)
+            print(f"{score.__name__}: roster and inputs unchanged, reusing scores from {path.name}")
+            return scored
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    scored = score(roster, *args)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    scored.to_pickle(tmp)
+    os.replace(tmp, path)
+    return scored
@@ -28,6 +28,11 @@ import traceback
 from fuzzywuzzy import fuzz
 from fuzzywuzzy import process
 import Levenshtein as lev
+import sys
+import os
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import normalize_names
+from fantasy_snapshot import load_athletes
 
 
 
@@ -93,22 +98,12 @@ def name_match(men_chrono, ladies_chrono, fantasy_men, fantasy_ladies):
 	fantasy_men['name'] = fantasy_men['name'].str.lower()
 	fantasy_ladies['name'] = fantasy_ladies['name'].str.lower()
 	men_chrono['name'] = men_chrono['name'].str.lower()
-	men_chrono['name'] = men_chrono['name'].str.replace('ø', 'oe')
-	men_chrono['name'] = men_chrono['name'].str.replace('ä', 'ae')
-	men_chrono['name'] = men_chrono['name'].str.replace('æ', 'ae')
-	men_chrono['name']= men_chrono['name'].str.replace('ö', 'oe')
-	men_chrono['name']= men_chrono['name'].str.replace('ü', 'ue')
-	men_chrono['name']= men_chrono['name'].str.replace('å', 'aa')
+	men_chrono['name'] = normalize_names(men_chrono['name'], aliases=None)
 	
 
 	ladies_chrono['name'] = ladies_chrono['name'].str.lower()
 	ladies_chrono['name'] = ladies_chrono['name'].str.lower()
-	ladies_chrono['name'] = ladies_chrono['name'].str.replace('ø', 'oe')
-	ladies_chrono['name'] = ladies_chrono['name'].str.replace('ä', 'ae')
-	ladies_chrono['name'] = ladies_chrono['name'].str.replace('æ', 'ae')
-	ladies_chrono['name']= ladies_chrono['name'].str.replace('ö', 'oe')
-	ladies_chrono['name']= ladies_chrono['name'].str.replace('ü', 'ue')
-	ladies_chrono['name']= ladies_chrono['name'].str.replace('å', 'aa')
+	ladies_chrono['name'] = normalize_names(ladies_chrono['name'], aliases=None)
 	
 
 	#make name list for fantasy and chrono.  Go through fantasy_men and fuzzy match the highest level from chrono.  If not 100, print
@@ -185,7 +180,7 @@ men_chrono = men_chrono.loc[men_chrono['season']>=2010]
 ladies_chrono = ladies_chrono.loc[ladies_chrono['season']>=2010]
 print(ladies_chrono)
 
-fantasy = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
+fantasy = load_athletes()
 fantasy = fantasy.loc[fantasy['is_team']==False]
 fantasy_men = fantasy.loc[fantasy['gender']=='m']
 fantasy_ladies = fantasy.loc[fantasy['gender']=='f']
@@ -0,0 +1,111 @@
+"""
+Race-morning podium predictions for podium_regress.py.
+
+podium_regress.elo used to go race type by race type: rebuild the combined
+chrono frame, renormalize its names, look up every fantasy athlete, then
+apply the men's and the ladies' model one column product at a time, with
+the points average left at 0. podium_setup.py filled pavg_points one athlete
+at a time. The pipeline here does each stage once:
+
+    - features: the rolling points average (expanding mean of points per
+      athlete, what pavg_points is for their next race) as one grouped
+      window expression, then the latest Elo columns, avg_points, exp, age
+      and home flag of every startlisted athlete in one AthleteIndex join
+    - fit: the per-race-type podium models through model_cache.fit_groups,
+      started on a background thread while the features are built
+    - score: every race type's model applied to every athlete in one matrix
+      product (athletes x features) @ (features x race types)
+
+StageTimer records the wall-clock seconds of each stage; podium_regress
+prints them with the predictions.
+
+Usage:
+    from podium_pipeline import StageTimer, add_points_average, batched_logits
+
+    timer = StageTimer()
+    with timer('features'):
+        chrono = add_points_average(chrono)
+    logits = batched_logits(features, intslopes, vars_list)   # athletes x race types
+    print(timer.summary())
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from athlete_index import AthleteIndex
+
+class StageTimer:
+    """Wall-clock seconds per pipeline stage, in the order the stages first ran."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.start = time.perf_counter()
+
+    @contextmanager
+    def __call__(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - start
+
+    def summary(self) -> str:
+        lines = [f"{stage:>10}: {seconds:.2f}s" for stage, seconds in self.stages.items()]
+        lines.append(f"{'total':>10}: {time.perf_counter() - self.start:.2f}s")
+        return "\n".join(lines)
+
+def add_points_average(df: pd.DataFrame, key: str = 'name', points: str = 'points') -> pd.DataFrame:
+    """
+    avg_points: each athlete's mean points over their races so far, this one included.
+
+    Rows are taken in frame order (chrono frames are in date order), grouped
+    by lowercased key as AthleteIndex does. For the latest row this is the
+    average the athlete brings into their next race.
+    """
+    df = df.copy()
+    names = df[key].str.lower()
+    races = df.groupby(names, sort=False).cumcount() + 1
+    df['avg_points'] = df[points].fillna(0).groupby(names, sort=False).cumsum() / races
+    return df
+
+def startlist_features(df: pd.DataFrame, names: Sequence[str], columns: List[str],
+                       host_nation: Optional[str] = None) -> pd.DataFrame:
+    """
+    Latest columns plus avg_points, exp, age and the home flag per name, in order.
+
+    df needs avg_points (add_points_average). Athletes with no rows get 0, as
+    in the scorers' per-athlete lookups.
+    """
+    latest = AthleteIndex(df).latest_features(names, columns + ['avg_points', 'exp', 'age', 'nation'])
+    latest['home'] = (latest['nation'] == host_nation).astype(int)
+    return latest.drop(columns='nation')
+
+def batched_logits(features: pd.DataFrame, intslopes: Sequence[Sequence[float]],
+                   vars_list: Sequence[Sequence[str]]) -> np.ndarray:
+    """
+    Linear predictor of every model for every athlete, shape (athletes, models).
+
+    intslopes[r] is [intercept, coef per vars_list[r]] as regress returns it.
+    An athlete missing any of a model's features scores 0 for that model, as
+    the per-column fillna(0) did.
+    """
+    columns = list(dict.fromkeys(col for vars_ in vars_list for col in vars_))
+    weights = np.zeros((len(columns), len(intslopes)))
+    for r, (coefs, vars_) in enumerate(zip(intslopes, vars_list)):
+        for col, coef in zip(vars_, coefs[1:]):
+            weights[columns.index(col), r] += coef
+    intercepts = np.array([coefs[0] for coefs in intslopes], dtype=float)
+
+    x = features[columns].to_numpy(dtype=float)
+    missing = np.isnan(x)
+    logits = np.nan_to_num(x) @ weights + intercepts
+    logits[missing.astype(float) @ (weights != 0) > 0] = 0
+    return logits
+
+def podium_probability(logits: np.ndarray) -> np.ndarray:
+    """Logistic model output as a probability."""
+    return 1 / (1 + np.exp(-logits))
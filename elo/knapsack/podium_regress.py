@@ -13,13 +13,20 @@ from sklearn import linear_model
 from sklearn import preprocessing
 from sklearn.model_selection import KFold
 from sklearn.linear_model import LinearRegression
-from sklearn.linear_model import LogisticRegression
 #import statsmodels.api as sm
 #import matplotlib.pyplot as plt
 import math
 import time
 import json
 from pandas.io.json import json_normalize
+from model_cache import cached_fit, cached_scores, fit_groups
+from podium_pipeline import StageTimer, add_points_average, batched_logits, podium_probability, startlist_features
+from concurrent.futures import ThreadPoolExecutor
+from fantasy_snapshot import SNAPSHOT_MAX_AGE, load_athletes
+import sys
+import os
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import name_keys, normalize_names
 pd.options.mode.chained_assignment = None
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning) 
@@ -39,7 +46,7 @@ def fis():
 	3430249, 3490145, 3500664, 3501223, 3501741, 3501010, 3501255, 3510479, 3510342, 3510351,
 	3510361, 3510023, 3530882, 3530532]'''
 
-	everyone = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
+	everyone = load_athletes()
 	
 	everyone = everyone.loc[everyone['active']==True]
 	everyone = everyone.loc[everyone['is_team']==False]
@@ -106,14 +113,7 @@ def fantasy(startlist):
 	#sex = startlist['sex']
 	#startlist = startlist['id']
 
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -155,384 +155,65 @@ def fantasy(startlist):
 
 
 def elo(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladies_chrono):
-	stage = [50, 47, 44, 41, 38, 35, 32, 30, 28, 26, 24, 22, 20, 18, 16, 15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
-	wc = [100,95,90,85,80,75,72,69,66,63,60,58,56,54,52,50,48,46,44,42,40, 38, 36, 34, 32, 30, 28, 26, 24, 22, 20, 19, 18, 17, 16, 15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
-	tour = [300, 285, 270, 255, 240, 216, 207, 198, 189, 180, 174, 168, 162, 156, 150, 144, 138, 132, 126, 120, 114, 108, 102, 96, 90, 84, 78, 72, 66, 60, 57, 54, 51, 48, 45, 42, 39, 36, 33, 30, 27, 24, 21, 18, 15, 12, 9, 6, 3]
-	mendfs = []
-	ladiesdfs = []
+	timer = StageTimer()
 	fantasydf.loc[:,'points'] =0
-	
-	#"~/ski/elo/python/ski/ladies/varladies_10_classic.pkl",
-	#"~/ski/elo/python/ski/ladies/varladies_sprint_classic.pkl"]
-
-	for a in range(len(menpkls)):
-		skier_elo = []
-		skier_distance_elo = []
-		skier_distance_classic_elo = []
-		skier_distance_freestyle_elo = []
-
-		skier_sprint_elo = []
-		skier_sprint_classic_elo = []
-		skier_sprint_freestyle_elo = []
-		skier_classic_elo = []
-		skier_freestyle_elo = []
-
-		skier_avg_points = []
-		skier_exp = []
-		skier_age = []
-		skier_home = []
-
-		df = pd.read_pickle(menpkls[a])
-
-		#df = men_chrono
-
-		#It's all unless it's the first race of the years
-		df = df.loc[df['level']=="all"]
-
-		menintslope = regress(df, men_vars[a])
-		print("menintslop", menintslope)
-		ladiespkl = pd.read_pickle(ladiespkls[a])
-		#ladiespkl = ladies_chrono
-		ladiespkl = ladiespkl.loc[ladiespkl['level']=="all"]
-		ladiesintslope = regress(ladiespkl, ladies_vars[a])
-
-		df_pkl = df
-		df = men_chrono
-
-		#It's all unless it's the first race of the years
-		df = df.loc[df['level']=="all"]
-		ladies_short_pkl = ladiespkl
-		ladiespkl = ladies_chrono
-		ladiespkl = ladiespkl.loc[ladiespkl['level']=="all"]
-		df = df.append(ladiespkl, ignore_index = True)
-		df_pkl = df_pkl.append(ladies_short_pkl, ignore_index=True)
-		
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name']= df['name'].str.replace('Ã¸', 'oe')
-		df['name']= df['name'].str.replace('Ã¤', 'ae')
-		df['name']= df['name'].str.replace('Ã¼', 'ue')
-		df['name']= df['name'].str.replace('Ø', 'Oe')
-		df['name'] = df['name'].str.replace('Ã¶', 'oe')
-		df['name'] = df['name'].str.replace('Ã', 'oe')
-		
-
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Eric Silfver', 'erik silfver')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
-		df['name'] = df['name'].str.replace('Emmi Laemsae', 'emmi lamsa')
-		df['name'] = df['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-		df['name'] = df['name'].str.replace('Finn O\'Connell', 'finn o connell')
-		df['name'] = df['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
-		
-
-		df_pkl['name'] = df_pkl['name'].str.replace('ø', 'oe')
-		df_pkl['name'] = df_pkl['name'].str.replace('ä', 'ae')
-		df_pkl['name'] = df_pkl['name'].str.replace('æ', 'ae')
-		df_pkl['name']= df_pkl['name'].str.replace('ö', 'oe')
-		df_pkl['name']= df_pkl['name'].str.replace('ü', 'ue')
-		df_pkl['name']= df_pkl['name'].str.replace('å', 'aa')
-		df_pkl['name']= df_pkl['name'].str.replace('Ã¸', 'oe')
-		df_pkl['name']= df_pkl['name'].str.replace('Ã¤', 'ae')
-		df_pkl['name']= df_pkl['name'].str.replace('Ã¼', 'ue')
-		df_pkl['name']= df_pkl['name'].str.replace('Ø', 'Oe')
-		df_pkl['name'] = df_pkl['name'].str.replace('Ã¶', 'oe')
-		df_pkl['name'] = df_pkl['name'].str.replace('Ã', 'oe')
-		df_pkl['name'] = df_pkl['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df_pkl['name'] = df_pkl['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df_pkl['name'] = df_pkl['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df_pkl['name'] = df_pkl['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df_pkl['name'] = df_pkl['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df_pkl['name'] = df_pkl['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df_pkl['name'] = df_pkl['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df_pkl['name'] = df_pkl['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df_pkl['name'] = df_pkl['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df_pkl['name'] = df_pkl['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df_pkl['name'] = df_pkl['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df_pkl['name'] = df_pkl['name'].str.replace('Julia Belger', 'julia preussger')
-		df_pkl['name'] = df_pkl['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df_pkl['name'] = df_pkl['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df_pkl['name'] = df_pkl['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df_pkl['name'] = df_pkl['name'].str.replace('Eric Silfver', 'erik silfver')
-		df_pkl['name'] = df_pkl['name'].str.replace('Joni Maeki', 'joni maki')
-		df_pkl['name'] = df_pkl['name'].str.replace('Emmi Laemsae', 'emmi lamsa')
-		df_pkl['name'] = df_pkl['name'].str.replace('Anne Kylloenen', 'anne kyllonen')
-		df_pkl['name'] = df_pkl['name'].str.replace('Finn O\'Connell', 'finn o connell')
-		df_pkl['name'] = df_pkl['name'].str.replace('Viktoriya Olekh', 'viktoriia olekh')
-		#df = df.str.replace('H', 'ailja iksanova')
-
-
-
-		fantasy_names = fantasydf
-		fantasy_names = fantasy_names['name'].str.lower()
-		fantasy_names  = fantasy_names.tolist()
-		
-		
-		
-
-
-		for b in range(len(fantasy_names)):
-			skier = df.loc[df['name'].str.lower() == fantasy_names[b]]
-			skier_pkl = df_pkl.loc[df_pkl['name'].str.lower() == fantasy_names[b]]
-			
-			if(len(skier['name'])==0):
-				pass
-				#print(a, fantasy_names[b])
-			
-			try:
-				#Make tries and excepts for each of these
-				elo = skier['elo'].iloc[-1]
-				skier_elo.append(elo)
-			except:
-				skier_elo.append(0)
-			try:
-				distance_elo = skier['distance_elo'].iloc[-1]
-				skier_distance_elo.append(distance_elo)
-			except:
-				skier_distance_elo.append(0)
-			try:
-				distance_classic_elo = skier['distance_classic_elo'].iloc[-1]
-				skier_distance_classic_elo.append(distance_classic_elo)
-			except:
-				skier_distance_classic_elo.append(0)
-			try:
-				distance_freestyle_elo = skier['distance_freestyle_elo'].iloc[-1]
-				skier_distance_freestyle_elo.append(distance_freestyle_elo)
-			except:
-				skier_distance_freestyle_elo.append(0)
-			try:
-				sprint_elo = skier['sprint_elo'].iloc[-1]
-				skier_sprint_elo.append(sprint_elo)
-			except:
-				skier_sprint_elo.append(0)
-			try:
-				sprint_classic_elo = skier['sprint_classic_elo'].iloc[-1]
-				skier_sprint_classic_elo.append(sprint_classic_elo)
-			except:
-				skier_sprint_classic_elo.append(0)
-			try:
-				sprint_freestyle_elo = skier['sprint_freestyle_elo'].iloc[-1]
-				skier_sprint_freestyle_elo.append(sprint_freestyle_elo)
-			except:
-				skier_sprint_freestyle_elo.append(0)
-			try:
-				classic_elo = skier['classic_elo'].iloc[-1]
-				skier_classic_elo.append(classic_elo)
-			except:
-				skier_classic_elo.append(0)
-			try:
-				freestyle_elo = skier['freestyle_elo'].iloc[-1]
-				skier_freestyle_elo.append(freestyle_elo)
-			except:
-				skier_freestyle_elo.append(0)
-			try:
-				#NEED TO CHANGE AVERAGE POINTS AS IT LOOKS AT ALL
-
-				#Individual
-				#avg_points = skier_pkl['avg_points'].iloc[-1]*.896294-0.0042397*skier_pkl['avg_points'].iloc[-1]**2+1.5865602
-
-				#Stage
-				#avg_points = skier_pkl['avg_points'].iloc[-1]*1.0801595-0.0100871*skier_pkl['avg_points'].iloc[-1]**2+0.1584908
-				
-				#Tour de Ski
-				#avg_points = skier['avg_points'].iloc[-1]*0.29674200-0.00046598*skier['avg_points'].iloc[-1]**2+1.76564661
-				skier_avg_points.append(avg_points)
-			except Exception:
-				#print(fantasy_names[b])
-				#traceback.print_exc()
-				skier_avg_points.append(0)
-			try:
-				exp = skier['exp'].iloc[-1]
-				skier_exp.append(exp)
-			except:
-				skier_exp.append(0)
-			try:
-				age = skier['age'].iloc[-1]
-				skier_age.append(age)
-			except:
-				skier_age.append(0)
-			try:
-				if(skier['nation'].iloc[-1]=="Slovenia"):
-					#home = "TRUE"
-					home = 1
-				else:
-					home= "FALSE"
-					home = 0
-				skier_home.append(home)
-			except:
-				skier_home.append(0)
-				
-
-			
-		fantasydf['elo'] = skier_elo
-
-		fantasydf['distance_elo'] = skier_distance_elo
-		fantasydf['distance_classic_elo'] = skier_distance_classic_elo
-		fantasydf['distance_freestyle_elo'] = skier_distance_freestyle_elo
-
-		fantasydf['sprint_elo'] = skier_sprint_elo
-		fantasydf['sprint_classic_elo'] = skier_sprint_classic_elo
-		fantasydf['sprint_freestyle_elo'] = skier_sprint_freestyle_elo
-
-		fantasydf['classic_elo'] = skier_classic_elo
-		fantasydf['freestyle_elo'] = skier_freestyle_elo
-
-		fantasydf['avg_points'] = skier_avg_points
-		fantasydf['exp'] = skier_exp
-		fantasydf['age'] = skier_age
-		fantasydf['home'] = skier_home
-		fantasydf['pred'] = 0
-
-		mendf = fantasydf.loc[fantasydf['sex']=='m']
-		
-		mendf = dezero(mendf)
-		
-
-		#Edit out these next three and the ladies three for pursuit.  One for actual
-		
-		mendf = mendf.sort_values(by='elo', ascending=False)
-		mendf = mendf.reset_index(drop=True)
-
-		#comment out next block for regression		
-		'''
-		mendf = mendf[:30]
-		men_wc_scores = mendf['points'].tolist()
-		men_wc_scores = men_wc_scores[:30]		
-		men_wc_scores = np.add(men_wc_scores, wc)		
-		men_wc_scores = pd.Series(men_wc_scores)
-		mendf.loc[:30, 'points'] = men_wc_scores
-		'''
-
-
-		#Comment out next block for non-regression
-		
-		mendf['pred'] = menintslope[0]
-		men_vars[a] = [m.replace('pelo', 'elo') for m in men_vars[a]]
-		men_vars[a] = [m.replace('pavg', 'avg') for m in men_vars[a]]
-		ladies_vars[a] = [l.replace('pelo', 'elo') for l in ladies_vars[a]]
-		ladies_vars[a] = [l.replace('pavg', 'avg') for l in ladies_vars[a]]
-
-		
-		for b in range(len(men_vars[a])):
-			print(menintslope[b])
-			mendf['pred'] = mendf['pred']+menintslope[b+1]*mendf[men_vars[a][b]]
-		
-
-		
-		mendf['pred'] = mendf['pred'].fillna(0)
-		
-		
-		#mendf['points'].loc[mendf['points']<0] = 0
-
-		#For normal WCP
-		#mendf['points'] = .030964*mendf['points']**2+.263557*mendf['points']+3.196429
-
-		#for TDS
-		#mendf['points'] = 0.093193*mendf['points']**2+0.787371*mendf['points']+9.215816 
-
-		#For Stages
-		#mendf['points'] = 0.045676*mendf['points']**2+0.178935*mendf['points']+2.531034
-
-		
-		mendfs.append(mendf)
-		
-		ladiesdf = fantasydf.loc[fantasydf['sex']=='f']
-
-		ladiesdf = dezero(ladiesdf)
-		
-
-		ladiesdf = ladiesdf.sort_values(by='elo', ascending=False)
-		ladiesdf = ladiesdf.reset_index(drop=True)
-
-		ladiesdf['pred'] = ladiesintslope[0]
-		for b in range(len(ladies_vars[a])):
-			ladiesdf['pred'] = ladiesdf['pred']+ladiesintslope[b+1]*ladiesdf[ladies_vars[a][b]]
-		#Next block is for regression
-		
-		
-		ladiesdf['pred'] = ladiesdf['pred'].fillna(0)
-		#ladiesdf['pred'].loc[ladiesdf['points']<0] = 0
 
-		#Individual
-		#ladiesdf['points'] = .263557*ladiesdf['points']+.030964*ladiesdf['points']**2+3.196429
-		
-		#TDS
-		#ladiesdf['points'] = 0.787371 *ladiesdf['points']+0.093193*ladiesdf['points']**2+9.215816
-
-		#Stages
-		#ladiesdf['points'] = 0.045676*ladiesdf['points']**2+0.178935*ladiesdf['points']+2.531034
-
-		#Next block is ladies non-regression
-		'''
-		ladies_wc_scores = ladiesdf['points'].tolist()
-		ladies_wc_scores = ladies_wc_scores[:30]
-		ladies_wc_scores = np.add(ladies_wc_scores, wc)
-		ladies_wc_scores = pd.Series(ladies_wc_scores)
-		ladiesdf.loc[:30, 'points'] = ladies_wc_scores
-		'''
-		ladiesdfs.append(ladiesdf)
-
-	mendf = fantasydf.loc[fantasydf['sex']=='m']
-	mendf = mendf.sort_values(by='id')
-	mendf = mendf.reset_index(drop=True)
-	print(mendf)
-	ladiesdf = fantasydf.loc[fantasydf['sex']=='f']
-	ladiesdf = ladiesdf.sort_values(by='id')
-	ladiesdf = ladiesdf.reset_index(drop=True)
-	
-
-	for a in range(len(mendfs)):
-		mendfs[a] = mendfs[a].sort_values(by='id')
-		mendfs[a] = mendfs[a].reset_index(drop=True)
-		elo_name = "elo"+str(a+1)
-		race_name = "race"+str(a+1)
-		mendf[elo_name] = mendfs[a]['elo']
-		mendf[race_name] = mendfs[a]['pred']
-		mendf['pred'] = mendf['pred'] + mendf[race_name]
-		ladiesdfs[a] = ladiesdfs[a].sort_values(by='id')
-		ladiesdfs[a] = ladiesdfs[a].reset_index(drop=True)
-		ladiesdf[elo_name] = ladiesdfs[a]['elo']
-		ladiesdf[race_name] = ladiesdfs[a]['pred']
-		ladiesdf['pred'] = ladiesdf['pred'] + ladiesdf[race_name]
-
-
-
-
-
-
-
-	
-	#ladiesdf = ladiesdf[:30]
-	#ladiesdf[:30, 'points'] += wc
-	mendf=mendf.sort_values(by='pred', ascending=False)
-	ladiesdf =ladiesdf.sort_values(by='pred', ascending=False)
-	#mendf = mendf[mendf['points']>0]
-	#ladiesdf = ladiesdf[ladiesdf['points']>0]
-	mendf['place'] = np.arange(1, len(mendf)+1, 1)
-	ladiesdf['place'] = np.arange(1,len(ladiesdf)+1,1)
-	print(list(ladiesdf).sort())
-	fantasydf = mendf
-	fantasydf = fantasydf.append(ladiesdf)
-
-	fantasydf = fantasydf[['name', 'id', 'price', 'sex','pred', 'race1',  'place']]
+	#Fit every race type's regression on a background thread while the features are built; cached fits skip training
+	def fit():
+		with timer('fit'):
+			men_frames = [pd.read_pickle(pkl) for pkl in menpkls]
+			ladies_frames = [pd.read_pickle(pkl) for pkl in ladiespkls]
+			return fit_groups(
+				[regress_job(men_frames[a], men_vars[a]) for a in range(len(menpkls))],
+				[regress_job(ladies_frames[a], ladies_vars[a]) for a in range(len(ladiespkls))])
+	with ThreadPoolExecutor(max_workers=1) as executor:
+		fits = executor.submit(fit)
+
+		with timer('features'):
+			#It's all unless it's the first race of the years
+			df = men_chrono.loc[men_chrono['level']=="all"]
+			ladiespkl = ladies_chrono.loc[ladies_chrono['level']=="all"]
+			df = pd.concat([df, ladiespkl], ignore_index=True)
+			df['name'] = normalize_names(df['name'])
+			df = add_points_average(df)
+
+			fantasy_names = name_keys(fantasydf['name']).tolist()
+
+			# Latest chrono row of every fantasy athlete in one join (0 when not registered)
+			elo_columns = ['elo', 'distance_elo', 'distance_classic_elo', 'distance_freestyle_elo',
+				'sprint_elo', 'sprint_classic_elo', 'sprint_freestyle_elo', 'classic_elo', 'freestyle_elo']
+			latest = startlist_features(df, fantasy_names, elo_columns, HOST_NATION)
+			for col in latest.columns:
+				fantasydf[col] = latest[col].to_numpy()
+			fantasydf['pred'] = 0
+
+		men_intslopes, ladies_intslopes = fits.result()
+
+	with timer('score'):
+		#The models were fit on pre-race columns; the startlist has the current ones
+		men_vars = [[m.replace('pelo', 'elo').replace('pavg', 'avg') for m in v] for v in men_vars]
+		ladies_vars = [[l.replace('pelo', 'elo').replace('pavg', 'avg') for l in v] for v in ladies_vars]
+
+		sexdfs = []
+		for sex, intslopes, vars_list in [('m', men_intslopes, men_vars), ('f', ladies_intslopes, ladies_vars)]:
+			print(sex, "intslopes", intslopes)
+			sexdf = fantasydf.loc[fantasydf['sex']==sex]
+			scored = dezero(sexdf.copy())
+			#Every race type's model on every athlete in one product
+			logits = batched_logits(scored, intslopes, vars_list)
+			for a in range(len(intslopes)):
+				sexdf["elo"+str(a+1)] = scored['elo']
+				sexdf["race"+str(a+1)] = logits[:, a]
+				sexdf["prob"+str(a+1)] = podium_probability(logits[:, a])
+			sexdf['pred'] = sexdf['pred'] + logits.sum(axis=1)
+			sexdf = sexdf.sort_values(by='pred', ascending=False)
+			sexdf['place'] = np.arange(1, len(sexdf)+1, 1)
+			sexdfs.append(sexdf)
+
+		fantasydf = pd.concat(sexdfs)
+		fantasydf = fantasydf[['name', 'id', 'price', 'sex','pred', 'race1', 'prob1', 'place']]
+
+	print(timer.summary())
 	return fantasydf
 
 
@@ -541,7 +222,8 @@ def elo(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladie
 
 
 
-def regress(df, vars_list):#, pkl):
+#Builds the training frame for regress; only runs when the fit is not cached
+def regress_frame(df, vars_list):#, pkl):
 	
 	
 
@@ -591,20 +273,13 @@ def regress(df, vars_list):#, pkl):
 		#df['pavg_points'] = df['pavg_points'].apply(lambda x: 0.1584908+0.29674200*x-0.00046598*x**2)
 	
 	
-	y = df['podium']
-	x = df[vars_list]
+	return df
 
-	lm = LogisticRegression()
-	lm = LogisticRegression().fit(x,y)
+def regress_job(df, vars_list):
+	return {'frame': df, 'features': vars_list, 'target': 'podium', 'model': 'logistic', 'prepare': regress_frame}
 
-	
-	coefs = list(lm.intercept_)
-	
-	
-	for a in range(len(vars_list)):
-		coefs.append(lm.coef_[0][a])
-	
-	return coefs
+def regress(df, vars_list):
+	return cached_fit(**regress_job(df, vars_list))
 
 
 def dezero(df):
@@ -724,6 +399,9 @@ ladies_distance = [['age', 'distance_pelo', 'distance_classic_pelo', 'sprint_pel
 
 ladies_vars = ladies_R2
 
+#Home flag for the startlisted athletes
+HOST_NATION = "Slovenia"
+
 
 
 
@@ -749,7 +427,7 @@ fantasydf = (fantasy(startlist))
 
 
 
-fantasydf = elo(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladies_chrono)
+fantasydf = cached_scores(elo, fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladies_chrono)
 #fantasydf = pursuit(fantasydf)
 #fantasydf = elo_relay(fantasydf, menpkls, ladiespkls, men_vars, ladies_vars, men_chrono, ladies_chrono)
 #fantasydf = elo_mixed_relay(fantasydf, menpkls, ladiespkls, relaypkls)
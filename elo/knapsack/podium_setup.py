@@ -26,6 +26,7 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 import time
 import traceback
+from fantasy_snapshot import load_athletes
 start_time = time.time()
 
 
@@ -50,7 +51,7 @@ ladies_pkl = pd.read_pickle("/Users/syverjohansen/ski/elo/python/ski/age/excel36
 
 #2. Scrape ids from Fis.
 def ids_scrape():
-	everyone = pd.read_excel("~/ski/elo/knapsack/fantasy_api.xlsx")
+	everyone = load_athletes()
 	print(everyone)
 	everyone = everyone.loc[everyone['active']==True]
 	everyone = everyone.loc[everyone['is_team']==False]
@@ -120,7 +121,7 @@ def get_startlist(namelist, ids, men_chrono, ladies_chrono, men_pkl, ladies_pkl)
 
 	startlist_pkl = namelist[namelist['fantasy_id'].isin(ids)]
 	startlist_men_pkl = startlist_pkl.loc[startlist_pkl['sex']=="M"]
-	startlist_men_pkl = men_pkl[men_chrono['id'].isin(startlist_men_pkl['chrono_id'])]
+	startlist_men_pkl = men_pkl[men_pkl['id'].isin(startlist_men_pkl['chrono_id'])]
 	
 	startlist_ladies_pkl = startlist_pkl.loc[startlist_pkl['sex']=="L"]
 	startlist_ladies_pkl = ladies_pkl[ladies_pkl['id'].isin(startlist_ladies_pkl['chrono_id'])]
@@ -132,20 +133,9 @@ def get_startlist(namelist, ids, men_chrono, ladies_chrono, men_pkl, ladies_pkl)
 	startlist_men_pkl = startlist_men_pkl.groupby(by=['id'], as_index=False).last()
 	startlist_ladies_pkl = startlist_ladies_pkl.groupby(by=['id'], as_index=False).last()
 
-	id_list = startlist_men['id'].tolist()
-	for a in range(len(id_list)):
-		athlete = startlist_men_pkl.loc[startlist_men_pkl['id']==id_list[a]]
-		try:
-			startlist_men['pavg_points'][a] = athlete['pavg_points'].iloc[0]
-		except:
-			startlist_men['pavg_points'][a] = 0
-	id_list = startlist_ladies['id'].tolist()
-	for a in range(len(id_list)):
-		athlete = startlist_ladies_pkl.loc[startlist_ladies_pkl['id']==id_list[a]]
-		try:
-			startlist_ladies['pavg_points'][a] = athlete['pavg_points'].iloc[0]
-		except:
-			startlist_ladies['pavg_points'][a] = 0
+	#Points average from the short pickles, joined on id (0 when missing)
+	startlist_men['pavg_points'] = startlist_men['id'].map(startlist_men_pkl.set_index('id')['pavg_points']).fillna(0)
+	startlist_ladies['pavg_points'] = startlist_ladies['id'].map(startlist_ladies_pkl.set_index('id')['pavg_points']).fillna(0)
 
 	#startlist_men = startlist_men.groupby('id')['date'].transform('max')
 	#startlist_ladies = startlist_ladies.groupby('id')['date'].transform('max')
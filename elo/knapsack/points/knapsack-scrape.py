@@ -19,6 +19,14 @@ from sklearn.linear_model import LinearRegression
 import time
 import json
 from pandas.io.json import json_normalize
+import sys
+import os
+sys.path.insert(0, os.path.expanduser('~/ski/elo/knapsack'))
+from athlete_index import AthleteIndex
+from fantasy_snapshot import SNAPSHOT_MAX_AGE, load_athletes
+from model_cache import cached_scores
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import name_keys, normalize_names
 pd.options.mode.chained_assignment = None
 
 
@@ -245,14 +253,7 @@ def fantasy_team_sprint(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -344,28 +345,7 @@ def elo_team_sprint(fantasydf):
 	df = pd.read_pickle("~/ski/elo/python/ski/excel365/varmen_sprint_freestyle.pkl")
 	ladiesdf = pd.read_pickle("~/ski/elo/python/ski/excel365/varladies_sprint_freestyle.pkl")
 	df = df.append(ladiesdf, ignore_index = True)
-	df['name'] = df['name'].str.replace('ø', 'oe')
-	df['name'] = df['name'].str.replace('ä', 'ae')
-	df['name'] = df['name'].str.replace('æ', 'ae')
-	df['name']= df['name'].str.replace('ö', 'oe')
-	df['name']= df['name'].str.replace('ü', 'ue')
-	df['name']= df['name'].str.replace('å', 'aa')
-	df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-	df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-	df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-	df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-	df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-	df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-	df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-	df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-	df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-	df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-	df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-	df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-	df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-	df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-	df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-	df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
+	df['name'] = normalize_names(df['name'])
 
 	print(fantasydf)
 	teamsdf = fantasydf.iloc[::3, :]
@@ -374,13 +354,14 @@ def elo_team_sprint(fantasydf):
 	#print(fantasydf)
 
 	fantasy_names = fantasydf['name']
-	fantasy_names = fantasy_names.str.lower()
+	fantasy_names = name_keys(fantasy_names)
 	fantasy_names  = fantasy_names.tolist()
 	count = 0
 	team_elo = 0
+	skier_index = AthleteIndex(df)
 	for a in range(len(fantasy_names)):
 
-		skier = df.loc[df['name'].str.lower() == fantasy_names[a]]
+		skier = skier_index.rows(fantasy_names[a])
 		if(len(skier['name'])==0):
 			print(fantasy_names[a])
 		#print(skier)
@@ -478,14 +459,7 @@ def fantasy_relay(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -582,28 +556,7 @@ def elo_relay(fantasydf):
 	df = pd.read_pickle("~/ski/elo/python/ski/excel365/varmen_distance_k.pkl")
 	ladiesdf = pd.read_pickle("~/ski/elo/python/ski/excel365/varladies_distance_k.pkl")
 	df = df.append(ladiesdf, ignore_index = True)
-	df['name'] = df['name'].str.replace('ø', 'oe')
-	df['name'] = df['name'].str.replace('ä', 'ae')
-	df['name'] = df['name'].str.replace('æ', 'ae')
-	df['name']= df['name'].str.replace('ö', 'oe')
-	df['name']= df['name'].str.replace('ü', 'ue')
-	df['name']= df['name'].str.replace('å', 'aa')
-	df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-	df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-	df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-	df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-	df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-	df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-	df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-	df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-	df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-	df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-	df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-	df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-	df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-	df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-	df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-	df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
+	df['name'] = normalize_names(df['name'])
 
 	teamsdf = fantasydf.iloc[::5, :]
 	fantasydf = fantasydf[fantasydf.index % 5 !=0]
@@ -611,13 +564,14 @@ def elo_relay(fantasydf):
 	#print(fantasydf)
 
 	fantasy_names = fantasydf['name']
-	fantasy_names = fantasy_names.str.lower()
+	fantasy_names = name_keys(fantasy_names)
 	fantasy_names  = fantasy_names.tolist()
 	count = 0
 	team_elo = 0
+	skier_index = AthleteIndex(df)
 	for a in range(len(fantasy_names)):
 
-		skier = df.loc[df['name'].str.lower() == fantasy_names[a]]
+		skier = skier_index.rows(fantasy_names[a])
 		if(len(skier['name'])==0):
 			print(fantasy_names[a])
 		#print(skier)
@@ -721,14 +675,7 @@ def fantasy(startlist):
 	#startlist = startlist['id']
 	#print(sex)
 	#print(startlist)
-	fantasy = 'https://www.fantasyxc.se/api/athletes'
-	#soup = BeautifulSoup(urlopen(fantasy), 'html5lib')
-	#print(soup)
-	with requests.Session() as s:
-		r=s.get(fantasy)
-		soup = BeautifulSoup(r.content, 'html5lib')
-	API_json = json.loads(soup.get_text())
-	API_df = pd.DataFrame.from_dict(pd.json_normalize(API_json), orient='columns')
+	API_df = load_athletes(max_age=SNAPSHOT_MAX_AGE)
 
 	##Change to locate for increased speed
 	for a in range(len(startlist)):
@@ -823,40 +770,18 @@ def elo(fantasydf, menpkls, ladiespkls):
 		ladiespkl = points(ladiespkl)
 		ladiesintslope = regress(ladiespkl)
 		df = df.append(ladiespkl, ignore_index = True)
-		df['name'] = df['name'].str.replace('ø', 'oe')
-		df['name'] = df['name'].str.replace('Ø', 'oe')
-		df['name'] = df['name'].str.replace('ä', 'ae')
-		df['name'] = df['name'].str.replace('æ', 'ae')
-		df['name']= df['name'].str.replace('ö', 'oe')
-		df['name']= df['name'].str.replace('ü', 'ue')
-		df['name']= df['name'].str.replace('å', 'aa')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Irineu Esteve Altimiras', 'ireneu esteve altimiras')
-		df['name'] = df['name'].str.replace('Thomas Hjalmar Westgaard', 'thomas maloney westgaard')
-		df['name'] = df['name'].str.replace('Aleksandr Terentev', 'alexander terentev')
-		df['name'] = df['name'].str.replace('Lauri Lepistoe', 'lauri lepisto')
-		df['name'] = df['name'].str.replace('Philip Bellingham', 'phillip bellingham')
-		df['name'] = df['name'].str.replace('Snorri Einarsson', 'snorri eythor einarsson')
-		df['name'] = df['name'].str.replace('Krista Paermaekoski', 'krista parmakoski')
-		df['name'] = df['name'].str.replace('Jessica Diggins', 'jessie diggins')
-		df['name'] = df['name'].str.replace('Patricijia Eiduka', 'patricija eiduka')
-		df['name'] = df['name'].str.replace('Katri Lylynperae', 'katri lylynpera')
-		df['name'] = df['name'].str.replace('Julia Belger', 'julia preussger')
-		df['name'] = df['name'].str.replace('Perttu Hyvaerinen', 'perttu hyvarinen')
-		df['name'] = df['name'].str.replace('Kathrine Stewart-Jones', 'katherine stewart-jones')
-		df['name'] = df['name'].str.replace('Ailja Iksanova', 'alija iksanova')
-		df['name'] = df['name'].str.replace('Eric Silfver', 'erik silfver')
-		df['name'] = df['name'].str.replace('Joni Maeki', 'joni maki')
+		df['name'] = normalize_names(df['name'])
 		#df['name'] = df['name'].str.replace('H', 'ailja iksanova')
 
 
 
 		fantasy_names = fantasydf['name']
-		fantasy_names = fantasy_names.str.lower()
+		fantasy_names = name_keys(fantasy_names)
 		fantasy_names  = fantasy_names.tolist()
 		#print(fantasy_names)
+		skier_index = AthleteIndex(df)
 		for a in range(len(fantasy_names)):
-			skier = df.loc[df['name'].str.lower() == fantasy_names[a]]
+			skier = skier_index.rows(fantasy_names[a])
 			if(len(skier['name'])==0):
 				print(fantasy_names[a])
 			#print(skier)
@@ -1134,7 +1059,7 @@ fantasydf = (fantasy(startlist))
 #print(fantasydf)
 #print(fantasydf)
 
-fantasydf = elo(fantasydf, menpkls, ladiespkls)
+fantasydf = cached_scores(elo, fantasydf, menpkls, ladiespkls)
 #fantasydf = pursuit(fantasydf)
 #fantasydf = elo_relay(fantasydf)
 print(fantasydf)
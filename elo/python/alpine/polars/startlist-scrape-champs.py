@@ -20,7 +20,15 @@ warnings.filterwarnings('ignore')
 from startlist_common import *
 
 # Import Championships config functions
-from config import get_champs_athletes
+from champs_roster import ChampsRoster, get_champs_roster
+
+def get_roster(gender: str) -> Optional[ChampsRoster]:
+    """Championship roster for a gender, matched against the latest ELO scores once per run"""
+    from config import CHAMPS_ATHLETES_MEN, CHAMPS_ATHLETES_LADIES
+
+    athletes = CHAMPS_ATHLETES_MEN if gender == 'men' else CHAMPS_ATHLETES_LADIES
+    elo_path = f"~/ski/elo/python/alpine/polars/excel365/{gender}_chrono_pred.csv"
+    return get_champs_roster(elo_path, athletes, get_latest_elo_scores, threshold=80)
 
 def process_championships() -> None:
     """Main function to process Championships races"""
@@ -79,13 +87,10 @@ def create_simple_championships_startlist(gender: str, races_df: pd.DataFrame) -
     
     print(f"Creating simple startlist for {gender}")
     
-    # Get ELO data path
-    elo_path = f"~/ski/elo/python/alpine/polars/excel365/{gender}_chrono_pred.csv"
-    
     try:
         print("Loading ELO scores...")
-        elo_scores = get_latest_elo_scores(elo_path)
-        if elo_scores is None or elo_scores.empty:
+        roster = get_roster(gender)
+        if roster is None:
             print(f"No ELO scores found for {gender}")
             return
         
@@ -94,18 +99,13 @@ def create_simple_championships_startlist(gender: str, races_df: pd.DataFrame) -
         processed_athletes = set()
         
         # Get all nations with Championships athletes
-        from config import CHAMPS_ATHLETES_MEN, CHAMPS_ATHLETES_LADIES
-        
-        if gender == 'men':
-            all_nations = set(CHAMPS_ATHLETES_MEN.keys())
-        else:
-            all_nations = set(CHAMPS_ATHLETES_LADIES.keys())
+        all_nations = roster.nations(min_athletes=0)
         
         print(f"Found {len(all_nations)} nations with {gender} athletes configured")
         
         # Process each nation's athletes
-        for nation in sorted(all_nations):
-            athletes = get_champs_athletes(nation, gender)
+        for nation in all_nations:
+            athletes = roster.athletes(nation)
             
             print(f"\nProcessing {nation}: {len(athletes)} athletes")
             
@@ -116,26 +116,15 @@ def create_simple_championships_startlist(gender: str, races_df: pd.DataFrame) -
                 
                 print(f"Processing athlete: {athlete_name}")
                 
-                # Match with ELO scores
-                elo_match = None
-                if athlete_name in elo_scores['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    # Try fuzzy matching
-                    elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
-                
-                # Get ELO data
+                # Get ELO data (matched once for the whole roster)
+                elo_match = roster.match(athlete_name)
                 if elo_match:
-                    elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
+                    elo_data = roster.record(athlete_name)
                     print(f"Found ELO match: {athlete_name} -> {elo_match}")
                 else:
                     # Use quartile imputation for missing athletes
                     print(f"No ELO match found for {athlete_name}, using quartile imputation")
-                    elo_columns = [col for col in elo_scores.columns if 'Elo' in col]
-                    elo_data = {}
-                    for col in elo_columns:
-                        q1_value = elo_scores[col].quantile(0.25)
-                        elo_data[col] = q1_value
+                    elo_data = dict(roster.quartiles())
                     elo_data['Skier'] = athlete_name
                 
                 # Build row data (simple version - no race probabilities)
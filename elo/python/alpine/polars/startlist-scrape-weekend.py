@@ -6,11 +6,11 @@ from typing import List, Dict, Tuple, Optional
 import warnings
 from datetime import datetime, timezone
 import traceback
-import subprocess
 warnings.filterwarnings('ignore')
 
 # Import common utility functions
 from startlist_common import *
+from startlist_consolidate import consolidate_race_startlists
 
 def process_weekend_races() -> None:
     """Main function to process weekend races"""
@@ -71,21 +71,13 @@ def process_weekend_races() -> None:
         print("\n=== All startlists have been scraped. Running weekly-picks-alpine.R ===")
         r_script_path = os.path.expanduser('~/blog/daehl-e/content/post/alpine/drafts/weekly-picks2.R')
         
-        try:
-            # Run the R script
-            result = subprocess.run(
-                ["Rscript", r_script_path],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            print("R script executed successfully")
-            print("Output:")
-            print(result.stdout)
-        except subprocess.CalledProcessError as e:
-            print(f"Error running R script: {e}")
-            print("Error output:")
-            print(e.stderr)
+        from r_scheduler import submit_r_script
+
+        # Queued on the open job queue (run with the day's other R jobs), else run now
+        job = submit_r_script(r_script_path)
+        if job is not None and not job.succeeded:
+            print(f"Error running R script: {job.message}")
+            print(f"Script log: {job.log_path}")
     else:
         print("\nNo races found for today. Not running the R script.")
 
@@ -113,6 +105,10 @@ def process_individual_races(valid_races: pd.DataFrame) -> None:
         
         print(f"Found {len(men_races)} men's races and {len(ladies_races)} ladies' races to process")
         
+        # Fetch every startlist page for both genders concurrently; each race is
+        # processed as soon as its own page has arrived
+        prefetch_startlists(men_races, ladies_races)
+        
         # Process men's races
         if not men_races.empty:
             try:
@@ -151,14 +147,15 @@ def create_season_startlist(elo_path: str, race_info: pd.Series, gender: str,
         chrono_path = f"~/ski/elo/python/alpine/polars/excel365/{gender}_chrono_pred.csv"
         try:
             # First try to read chronological data
-            chrono_df = pd.read_csv(chrono_path)
+            chrono = get_chrono(chrono_path)  # parsed once per run, shared with get_latest_elo_scores
+            chrono_df = chrono.frame
             
             # Get current season
-            current_season = chrono_df['Season'].max()
+            current_season = chrono.current_season
             print(f"Most recent season in data: {current_season}")
             
             # Filter to current season
-            current_season_df = chrono_df[chrono_df['Season'] == current_season]
+            current_season_df = chrono.current_season_frame
             
             # Get unique skiers from current season
             current_skiers_df = current_season_df[['Skier', 'ID', 'Nation']].drop_duplicates()
@@ -223,9 +220,6 @@ def create_season_startlist(elo_path: str, race_info: pd.Series, gender: str,
                 if col in elo_data:
                     row_data[col] = elo_data.get(col)
             
-            # Add race-specific ELO based on discipline
-            row_data['Race_Elo'] = get_race_specific_elo(elo_data, discipline)
-            
             # Set race probability to 0 since not in startlist
             row_data[prob_column] = 0.0
             
@@ -233,6 +227,8 @@ def create_season_startlist(elo_path: str, race_info: pd.Series, gender: str,
         
         # Create DataFrame
         df = pd.DataFrame(data)
+        # Race-specific ELO for the whole startlist, unmatched athletes imputed at Q1
+        df = add_race_elo(df, get_elo_priority(discipline), elo_quartiles(elo_scores))
         
         # Add race info to all rows
         race_info_dict = {
@@ -347,9 +343,6 @@ def create_weekend_startlist(race_id: str, elo_path: str, race_info: pd.Series,
                 if col in elo_data:
                     row_data[col] = elo_data.get(col)
             
-            # Add race-specific ELO based on discipline
-            row_data['Race_Elo'] = get_race_specific_elo(elo_data, discipline)
-            
             # Set race probability
             if prob_column:
                 row_data[prob_column] = 1.0  # In startlist = 100% for this race
@@ -358,6 +351,8 @@ def create_weekend_startlist(race_id: str, elo_path: str, race_info: pd.Series,
         
         # Create DataFrame
         df = pd.DataFrame(data)
+        # Race-specific ELO for the whole startlist, unmatched athletes imputed at Q1
+        df = add_race_elo(df, get_elo_priority(discipline), elo_quartiles(elo_scores))
         
         # Add race info to all rows
         race_info_dict = {
@@ -383,38 +378,6 @@ def create_weekend_startlist(race_id: str, elo_path: str, race_info: pd.Series,
         traceback.print_exc()
         return None
 
-def merge_race_dataframes(df1: pd.DataFrame, df2: pd.DataFrame, prob_column: str) -> pd.DataFrame:
-    """Merge two race dataframes, preserving unique athletes and combining probability columns"""
-    # Create a copy of df1 to avoid modifying the original
-    result = df1.copy()
-    
-    # Create a set of existing skiers in df1
-    existing_skiers = set(df1['Skier'])
-    
-    # For skiers that exist in both dataframes, update the probability column
-    common_skiers = set(df2['Skier']) & existing_skiers
-    for skier in common_skiers:
-        # Find the row index in result for this skier
-        idx = result[result['Skier'] == skier].index[0]
-        
-        # Get probability from df2
-        prob_value = df2[df2['Skier'] == skier][prob_column].values[0]
-        
-        # Update the probability in result
-        result.loc[idx, prob_column] = prob_value
-    
-    # For skiers that only exist in df2, add them to result
-    new_skiers = set(df2['Skier']) - existing_skiers
-    new_rows = df2[df2['Skier'].isin(new_skiers)]
-    
-    # Append the new rows to result
-    result = pd.concat([result, new_rows], ignore_index=True)
-    
-    # Sort the result by ELO
-    result = result.sort_values('Race_Elo', ascending=False)
-    
-    return result
-
 def process_gender_races(races_df: pd.DataFrame, gender: str, host_nation: str) -> None:
     """Process races for a specific gender"""
     print(f"\nProcessing {gender} races...")
@@ -430,8 +393,8 @@ def process_gender_races(races_df: pd.DataFrame, gender: str, host_nation: str)
     # Get the ELO path
     elo_path = f"~/ski/elo/python/alpine/polars/excel365/{gender}_chrono_pred.csv"
     
-    # Initialize a consolidated dataframe
-    consolidated_df = None
+    # Collect each race's startlist; they are consolidated in one pass below
+    race_frames = []
     
     # Process each race
     for i, (_, race) in enumerate(races_df.iterrows()):
@@ -491,21 +454,10 @@ def process_gender_races(races_df: pd.DataFrame, gender: str, host_nation: str)
             print(f"Failed to create startlist for race {i+1}")
             continue
         
-        # If this is the first race, initialize the consolidated dataframe
-        if consolidated_df is None:
-            consolidated_df = race_df
-        else:
-            # Merge with existing data (ensuring we don't lose any athletes)
-            consolidated_df = merge_race_dataframes(consolidated_df, race_df, prob_column)
+        race_frames.append((prob_column, race_df))
     
     # If we successfully processed at least one race
-    if consolidated_df is not None:
-        # Ensure all race probability columns exist in the final dataframe
-        for i, col in enumerate(all_prob_columns):
-            if col not in consolidated_df.columns:
-                print(f"Adding missing column {col}")
-                consolidated_df[col] = 0.0
-        
+    if race_frames:
         # Create a comprehensive season startlist to ensure all skiers are included
         print("Creating comprehensive season startlist to ensure all skiers are included")
         all_season_skiers_df = create_season_startlist(
@@ -517,29 +469,18 @@ def process_gender_races(races_df: pd.DataFrame, gender: str, host_nation: str)
         )
         
         if all_season_skiers_df is not None:
-            # Get skiers already in the consolidated dataframe
-            existing_skiers = set(consolidated_df['Skier'])
-            
-            # Find skiers from the season who aren't in the consolidated dataframe
-            missing_skiers_df = all_season_skiers_df[~all_season_skiers_df['Skier'].isin(existing_skiers)]
-            print(f"Found {len(missing_skiers_df)} skiers from current season not already in the startlist")
-            
-            # Drop the temp_prob column
-            missing_skiers_df = missing_skiers_df.drop(columns=['temp_prob'])
-            
-            # Add all race probability columns with 0
-            for col in all_prob_columns:
-                missing_skiers_df[col] = 0.0
-            
-            # Combine with the consolidated dataframe
-            if len(missing_skiers_df) > 0:
-                consolidated_df = pd.concat([consolidated_df, missing_skiers_df], ignore_index=True)
-                print(f"Added {len(missing_skiers_df)} skiers from current season to the startlist")
-        
-        # Make sure In_Startlist is FALSE for skiers not on any startlist
-        # If a skier has 0 probability for all races, they weren't on any startlist
-        # Check row by row if all probability values are 0
-        consolidated_df.loc[consolidated_df[all_prob_columns].sum(axis=1) == 0, 'In_Startlist'] = False
+            all_season_skiers_df = all_season_skiers_df.drop(columns=['temp_prob'])
+        
+        # Consolidate all races in one pass: one probability column per race, missing
+        # races and season-only skiers zero-filled, In_Startlist set to False for skiers
+        # who are not on any startlist
+        consolidated_df = consolidate_race_startlists(
+            race_frames,
+            all_prob_columns,
+            sort_by='Race_Elo',
+            extra_athletes=all_season_skiers_df,
+            flag_column='In_Startlist'
+        )
         
         # Save the consolidated dataframe
         output_path = f"~/ski/elo/python/alpine/polars/excel365/startlist_weekend_{gender}.csv"
@@ -550,4 +491,8 @@ def process_gender_races(races_df: pd.DataFrame, gender: str, host_nation: str)
         print(f"No startlist data was generated for {gender}")
 
 if __name__ == "__main__":
-    process_weekend_races()
\ No newline at end of file
+    from r_scheduler import r_job_queue
+
+    # R jobs queued by this run and the relay scripts it starts run together at the end
+    with r_job_queue():
+        process_weekend_races()
\ No newline at end of file
@@ -8,7 +8,14 @@ from datetime import datetime, timezone
 import re
 import traceback
 import os
-import subprocess
+import sys
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
+from name_index import get_name_index, normalize_name as index_normalize_name
+from chrono_cache import get_chrono, load_chrono, per_chrono_file
+from race_elo import add_race_elo, elo_quartiles
 warnings.filterwarnings('ignore')
 
 def check_and_run_weekly_picks():
@@ -52,23 +59,14 @@ def check_and_run_weekly_picks():
             if not today_races.empty:
                 print("Races found for today! Running weekly-picks-alpine.R...")
                 
-                # Run the R script
-                try:
-                    result = subprocess.run(
-                        ["Rscript", r_script_path],
-                        check=True,
-                        capture_output=True,
-                        text=True
-                    )
-                    print("R script executed successfully")
-                    print("Output:")
-                    print(result.stdout)
-                    return True
-                except subprocess.CalledProcessError as e:
-                    print(f"Error running R script: {e}")
-                    print("Error output:")
-                    print(e.stderr)
+                # Queued on the open job queue (run with the day's other R jobs), else run now
+                from r_scheduler import submit_r_script
+                job = submit_r_script(r_script_path)
+                if job is not None and not job.succeeded:
+                    print(f"Error running R script: {job.message}")
+                    print(f"Script log: {job.log_path}")
                     return False
+                return True
             else:
                 print("No races found for today. Not running the R script.")
                 return False
@@ -81,6 +79,10 @@ def check_and_run_weekly_picks():
         traceback.print_exc()
         return False
 
+STARTLIST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
 def get_fis_race_data(race_id: str, sector_code: str = 'AL') -> Tuple[List[Dict], Dict]:
     """
     Extract race information from FIS website for alpine skiing
@@ -92,14 +94,12 @@ def get_fis_race_data(race_id: str, sector_code: str = 'AL') -> Tuple[List[Dict]
     Returns:
         Tuple containing (list of athletes, race metadata)
     """
-    url = f"https://www.fis-ski.com/DB/general/results.html?sectorcode={sector_code}&raceid={race_id}"
+    url = fis_race_url(race_id, sector_code)
     
     try:
         # Make request to the URL
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
+        headers = STARTLIST_HEADERS
+        response = scrape_transport.get(url, headers=headers)
         response.raise_for_status()
         
         # Parse the HTML content
@@ -164,6 +164,18 @@ def get_fis_race_data(race_id: str, sector_code: str = 'AL') -> Tuple[List[Dict]
         traceback.print_exc()
         return [], {}
 
+def fis_race_url(race_id: str, sector_code: str = 'AL') -> str:
+    """FIS results/startlist page for a race"""
+    return f"https://www.fis-ski.com/DB/general/results.html?sectorcode={sector_code}&raceid={race_id}"
+
+def prefetch_startlists(*race_frames: Optional[pd.DataFrame]) -> None:
+    """Start fetching the FIS race pages of all races concurrently"""
+    race_ids = [extract_race_id_from_url(url) for races in race_frames
+                if races is not None and 'Startlist' in races.columns
+                for url in races['Startlist'].dropna()]
+    scrape_transport.prefetch([fis_race_url(race_id) for race_id in race_ids if race_id],
+                              headers=STARTLIST_HEADERS)
+
 def extract_individual_results(soup: BeautifulSoup) -> List[Dict]:
     """Extract individual athlete results from FIS alpine skiing race page"""
     athletes = []
@@ -572,6 +584,7 @@ def extract_events_info_results(soup: BeautifulSoup) -> List[Dict]:
         traceback.print_exc()
         return []
 
+@per_chrono_file
 def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
     """Gets most recent ELO scores for each athlete with quartile imputation"""
     try:
@@ -580,7 +593,7 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
         
         # First try with more robust pandas approach
         try:
-            df = pd.read_csv(file_path, low_memory=False)
+            df = load_chrono(file_path).copy()
             print(f"Successfully read ELO file with pandas: {len(df)} rows")
         except Exception as pd_e:
             print(f"Error reading with pandas: {pd_e}")
@@ -708,59 +721,25 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
 
 def normalize_name(name: str) -> str:
     """Normalizes name for better fuzzy matching"""
-    normalized = name.lower()
-    char_map = {
-        'ø': 'oe', 'ö': 'oe', 'ó': 'o',
-        'ä': 'ae', 'á': 'a', 'å': 'aa',
-        'é': 'e', 'è': 'e',
-        'ü': 'ue',
-        'ý': 'y',
-        'æ': 'ae'
-    }
-    for char, replacement in char_map.items():
-        normalized = normalized.replace(char, replacement)
-    return normalized
+    return index_normalize_name(name)
 
 def fuzzy_match_name(name: str, name_list: List[str], threshold: int = 80) -> str:
-    """Finds best matching name using normalized comparison"""
-    from thefuzz import fuzz
-    
-    best_score = 0
-    best_match = ''
-    normalized_name = normalize_name(name)
-    
-    # Try matching full name
-    for candidate in name_list:
-        normalized_candidate = normalize_name(candidate)
-        score = fuzz.ratio(normalized_name, normalized_candidate)
-        
-        # Also try matching tokens in any order
-        token_score = fuzz.token_sort_ratio(normalized_name, normalized_candidate)
-        score = max(score, token_score)
-        
-        if score > best_score and score >= threshold:
-            best_score = score
-            best_match = candidate
-    
-    return best_match
+    """Finds best matching name using a NameIndex built once per candidate list"""
+    return get_name_index(name_list, threshold=threshold).match(name)
+
+# Elo columns in priority order for each discipline; Race_Elo is the first available
+ELO_PRIORITY = {
+    'Downhill': ['Downhill_Elo', 'Speed_Elo', 'Elo'],
+    'Super G': ['Super G_Elo', 'Speed_Elo', 'Elo'],  
+    'Giant Slalom': ['Giant Slalom_Elo', 'Tech_Elo', 'Elo'],
+    'Slalom': ['Slalom_Elo', 'Tech_Elo', 'Elo'],
+    'Combined': ['Combined_Elo', 'Elo'],
+    'Alpine Combined': ['Combined_Elo', 'Elo']
+}
 
 def get_race_specific_elo(elo_data: Dict, discipline: str) -> float:
-    """Get the most relevant ELO score based on discipline"""
-    # Define priority order for each discipline
-    priority_elo = {
-        'Downhill': ['Downhill_Elo', 'Speed_Elo', 'Elo'],
-        'Super G': ['Super G_Elo', 'Speed_Elo', 'Elo'],  
-        'Giant Slalom': ['Giant Slalom_Elo', 'Tech_Elo', 'Elo'],
-        'Slalom': ['Slalom_Elo', 'Tech_Elo', 'Elo'],
-        'Combined': ['Combined_Elo', 'Elo'],
-        'Alpine Combined': ['Combined_Elo', 'Elo']
-    }
-    
-    # Get the priority list for this discipline (default to just 'Elo' if discipline not found)
-    priority_cols = priority_elo.get(discipline, ['Elo'])
-    
-    # Try each column in priority order
-    for col in priority_cols:
+    """Get the most relevant ELO score from one athlete's ELO record based on discipline"""
+    for col in get_elo_priority(discipline):
         if col in elo_data and elo_data[col] is not None:
             try:
                 return float(elo_data[col])
@@ -769,6 +748,10 @@ def get_race_specific_elo(elo_data: Dict, discipline: str) -> float:
     
     return 0.0  # Default if no matching ELO found
 
+def get_elo_priority(discipline: str) -> List[str]:
+    """Determine which ELO columns to prioritize based on discipline"""
+    return ELO_PRIORITY.get(discipline, ['Elo'])
+
 def find_next_race_date(df: pd.DataFrame) -> str:
     """Find the next race date from today (inclusive) in the dataframe using UTC timezone"""
     
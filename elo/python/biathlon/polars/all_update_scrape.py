@@ -1,4 +1,5 @@
 import polars as pl
+import os
 import logging
 from datetime import datetime
 import sys
@@ -7,12 +8,17 @@ from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 import multiprocessing
 import concurrent.futures
-from typing import List, Any, Optional, Tuple
+from typing import List, Any
 
 # Import from all_scrape.py
 from all_scrape import (setup_cache_structure, fetch_season_links, get_race_data,
                    get_race_results, construct_historical_df)
 
+# Shared update helpers (race keys and experience as Polars frames)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from update_common import (race_keys_frame, max_experience_frame,
+                           is_known_race, apply_experience_offset)
+
 def setup_logging():
     """Set up logging configuration"""
     logging.basicConfig(
@@ -24,20 +30,18 @@ def get_existing_metadata(df: pl.DataFrame) -> Dict:
     """Extract metadata from existing DataFrame"""
     try:
         # Get unique races
-        races = set(df.select(["Date", "City", "Event"]).unique().rows())
+        races = race_keys_frame(df, ["Date", "City", "Event"])
 
         # Get max experience per ID
-        max_exp = (df.group_by('ID')
-                  .agg(pl.col('Exp').max().alias('max_exp')))
-        exp_dict = dict(zip(max_exp['ID'], max_exp['max_exp']))
+        experience = max_experience_frame(df)
 
         return {
             'races': races,
-            'experience': exp_dict
+            'experience': experience
         }
     except Exception as e:
         logging.error(f"Error extracting metadata: {e}")
-        return {'races': set(), 'experience': {}}
+        return {'races': None, 'experience': None}
 
 def load_and_process_data(sex: str) -> Tuple[Optional[pl.DataFrame], Dict]:
     """Load existing data and extract metadata"""
@@ -47,7 +51,7 @@ def load_and_process_data(sex: str) -> Tuple[Optional[pl.DataFrame], Dict]:
 
         if not path.exists():
             logging.warning(f"No existing data file found for {sex}")
-            return None, {'races': set(), 'experience': {}}
+            return None, {'races': None, 'experience': None}
 
         # Load data
         df = pl.read_csv(path)
@@ -58,7 +62,7 @@ def load_and_process_data(sex: str) -> Tuple[Optional[pl.DataFrame], Dict]:
 
     except Exception as e:
         logging.error(f"Error loading data: {e}")
-        return None, {'races': set(), 'experience': {}}
+        return None, {'races': None, 'experience': None}
 
 def process_race(link: List[Any], sex: str, metadata: Dict) -> Optional[Tuple]:
     """Process a single race with its results"""
@@ -69,7 +73,7 @@ def process_race(link: List[Any], sex: str, metadata: Dict) -> Optional[Tuple]:
 
         # Check if race exists
         race_key = (table_data[0], table_data[1], table_data[3])
-        if race_key in metadata['races']:
+        if is_known_race(race_key, metadata['races']):
             logging.info(f"Skipping existing race: {race_key}")
             return None
 
@@ -132,14 +136,9 @@ def process_new_season(sex: str, metadata: Dict) -> Optional[pl.DataFrame]:
     else:
         return ladies_df
 
-def update_experience(new_df: pl.DataFrame, exp_dict: Dict) -> pl.DataFrame:
+def update_experience(new_df: pl.DataFrame, experience: Optional[pl.DataFrame]) -> pl.DataFrame:
     """Update experience values for new data"""
-    return new_df.with_columns([
-        (pl.col('ID')
-         .map_elements(lambda x: exp_dict.get(x, 0), return_dtype=pl.Int32)
-         .add(pl.col('Exp'))
-         .alias('Exp'))
-    ])
+    return apply_experience_offset(new_df, experience)
 
 def merge_and_save(old_df: Optional[pl.DataFrame],
                   new_df: Optional[pl.DataFrame],
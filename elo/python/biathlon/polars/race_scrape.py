@@ -6,6 +6,12 @@ import re
 import time
 import pandas as pd
 from fuzzywuzzy import fuzz, process
+import sys
+import os
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
 
 def create_country_mapping():
     """Create mapping of country codes to full names"""
@@ -235,7 +241,7 @@ def scrape_biathlon():
         print(f"Scraping {gender} calendar...")
         
         try:
-            response = requests.get(url)
+            response = scrape_transport.get(url)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             
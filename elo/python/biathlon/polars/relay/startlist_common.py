@@ -8,6 +8,14 @@ from datetime import datetime, timezone
 import re
 import json
 import traceback
+import sys
+import os
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
+from name_index import get_name_index, normalize_name as index_normalize_name
+from chrono_cache import get_chrono, load_chrono, per_chrono_file
 warnings.filterwarnings('ignore')
 
 def check_and_run_weekly_picks():
@@ -18,7 +26,6 @@ def check_and_run_weekly_picks():
         bool: True if the R script was run successfully, False otherwise
     """
     import os
-    import subprocess
     from datetime import datetime, timezone
     
     # Get today's date in UTC
@@ -55,23 +62,14 @@ def check_and_run_weekly_picks():
             if not today_races.empty:
                 print("Races found for today! Running weekly-picks2.R...")
                 
-                # Run the R script
-                try:
-                    result = subprocess.run(
-                        ["Rscript", r_script_path],
-                        check=True,
-                        capture_output=True,
-                        text=True
-                    )
-                    print("R script executed successfully")
-                    print("Output:")
-                    print(result.stdout)
-                    return True
-                except subprocess.CalledProcessError as e:
-                    print(f"Error running R script: {e}")
-                    print("Error output:")
-                    print(e.stderr)
+                # Queued on the open job queue (run with the day's other R jobs), else run now
+                from r_scheduler import submit_r_script
+                job = submit_r_script(r_script_path)
+                if job is not None and not job.succeeded:
+                    print(f"Error running R script: {job.message}")
+                    print(f"Script log: {job.log_path}")
                     return False
+                return True
             else:
                 print("No races found for today. Not running the R script.")
                 return False
@@ -91,7 +89,7 @@ def get_biathlon_startlist(url: str) -> List[Dict]:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = scrape_transport.get(url, headers=headers)
         response.raise_for_status()
         
         # Parse the HTML content
@@ -153,7 +151,7 @@ def get_biathlon_relay_teams(url: str) -> List[Dict]:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = scrape_transport.get(url, headers=headers)
         response.raise_for_status()
         
         # Parse the HTML content
@@ -226,6 +224,7 @@ def get_biathlon_relay_teams(url: str) -> List[Dict]:
         traceback.print_exc()
         return []
 
+@per_chrono_file
 def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
     """Gets most recent ELO scores for each athlete with quartile imputation"""
     try:
@@ -234,7 +233,7 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
         
         # First try with more robust pandas approach
         try:
-            df = pd.read_csv(file_path, low_memory=False)
+            df = load_chrono(file_path).copy()
             print(f"Successfully read ELO file with pandas: {len(df)} rows")
         except Exception as pd_e:
             print(f"Error reading with pandas: {pd_e}")
@@ -362,41 +361,11 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
 
 def normalize_name(name: str) -> str:
     """Normalizes name for better fuzzy matching"""
-    normalized = name.lower()
-    char_map = {
-        'ø': 'oe', 'ö': 'oe', 'ó': 'o',
-        'ä': 'ae', 'á': 'a', 'å': 'aa',
-        'é': 'e', 'è': 'e',
-        'ü': 'ue',
-        'ý': 'y',
-        'æ': 'ae'
-    }
-    for char, replacement in char_map.items():
-        normalized = normalized.replace(char, replacement)
-    return normalized
+    return index_normalize_name(name)
 
 def fuzzy_match_name(name: str, name_list: List[str], threshold: int = 85) -> str:
-    """Finds best matching name using normalized comparison"""
-    from thefuzz import fuzz
-    
-    best_score = 0
-    best_match = ''
-    normalized_name = normalize_name(name)
-    
-    # Try matching full name
-    for candidate in name_list:
-        normalized_candidate = normalize_name(candidate)
-        score = fuzz.ratio(normalized_name, normalized_candidate)
-        
-        # Also try matching tokens in any order
-        token_score = fuzz.token_sort_ratio(normalized_name, normalized_candidate)
-        score = max(score, token_score)
-        
-        if score > best_score and score >= threshold:
-            best_score = score
-            best_match = candidate
-    
-    return best_match
+    """Finds best matching name using a NameIndex built once per candidate list"""
+    return get_name_index(name_list, threshold=threshold).match(name)
 
 def get_race_specific_elo(elo_data: Dict, race_type: str) -> float:
     """Get the most relevant ELO score based on race type"""
@@ -13,6 +13,11 @@ import pandas as pd
 from time import time
 import logging
 from pathlib import Path
+import sys
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
 
 # Set up logging
 logging.basicConfig(
@@ -73,7 +78,7 @@ def scrape_standings(url, gender):
     logger.info(f"Starting to scrape {gender}'s World Cup standings from {url}")
     
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
+        response = scrape_transport.get(url, headers=HEADERS, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to fetch {gender}'s standings: {e}")
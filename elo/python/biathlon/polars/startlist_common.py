@@ -8,6 +8,15 @@ from datetime import datetime, timezone
 import re
 import json
 import traceback
+import sys
+import os
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
+from name_index import get_name_index, normalize_name as index_normalize_name
+from chrono_cache import get_chrono, load_chrono, per_chrono_file
+from race_elo import add_race_elo, elo_quartiles
 warnings.filterwarnings('ignore')
 
 def check_and_run_weekly_picks():
@@ -18,7 +27,6 @@ def check_and_run_weekly_picks():
         bool: True if the R script was run successfully, False otherwise
     """
     import os
-    import subprocess
     from datetime import datetime, timezone
     
     # Get today's date in UTC
@@ -55,23 +63,14 @@ def check_and_run_weekly_picks():
             if not today_races.empty:
                 print("Races found for today! Running weekly-picks2.R...")
                 
-                # Run the R script
-                try:
-                    result = subprocess.run(
-                        ["Rscript", r_script_path],
-                        check=True,
-                        capture_output=True,
-                        text=True
-                    )
-                    print("R script executed successfully")
-                    print("Output:")
-                    print(result.stdout)
-                    return True
-                except subprocess.CalledProcessError as e:
-                    print(f"Error running R script: {e}")
-                    print("Error output:")
-                    print(e.stderr)
+                # Queued on the open job queue (run with the day's other R jobs), else run now
+                from r_scheduler import submit_r_script
+                job = submit_r_script(r_script_path)
+                if job is not None and not job.succeeded:
+                    print(f"Error running R script: {job.message}")
+                    print(f"Script log: {job.log_path}")
                     return False
+                return True
             else:
                 print("No races found for today. Not running the R script.")
                 return False
@@ -86,14 +85,16 @@ def check_and_run_weekly_picks():
 
 
 
+STARTLIST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
 def get_biathlon_startlist(url: str) -> List[Dict]:
     """Gets athlete data from Biathlon World website"""
     try:
         # Make request to the URL
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
+        headers = STARTLIST_HEADERS
+        response = scrape_transport.get(url, headers=headers)
         response.raise_for_status()
         
         # Parse the HTML content
@@ -148,6 +149,12 @@ def get_biathlon_startlist(url: str) -> List[Dict]:
         traceback.print_exc()
         return []
 
+def prefetch_startlists(*race_frames: Optional[pd.DataFrame]) -> None:
+    """Start fetching the startlist pages of all races concurrently"""
+    urls = [url for races in race_frames if races is not None and 'Startlist' in races.columns
+            for url in races['Startlist'].dropna()]
+    scrape_transport.prefetch(urls, headers=STARTLIST_HEADERS)
+
 def get_biathlon_relay_teams(url: str) -> List[Dict]:
     """Gets relay team data from Biathlon World website"""
     try:
@@ -155,7 +162,7 @@ def get_biathlon_relay_teams(url: str) -> List[Dict]:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = scrape_transport.get(url, headers=headers)
         response.raise_for_status()
         
         # Parse the HTML content
@@ -228,6 +235,7 @@ def get_biathlon_relay_teams(url: str) -> List[Dict]:
         traceback.print_exc()
         return []
 
+@per_chrono_file
 def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
     """Gets most recent ELO scores for each athlete with quartile imputation"""
     try:
@@ -236,7 +244,7 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
         
         # First try with more robust pandas approach
         try:
-            df = pd.read_csv(file_path, low_memory=False)
+            df = load_chrono(file_path).copy()
             print(f"Successfully read ELO file with pandas: {len(df)} rows")
         except Exception as pd_e:
             print(f"Error reading with pandas: {pd_e}")
@@ -364,57 +372,23 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
 
 def normalize_name(name: str) -> str:
     """Normalizes name for better fuzzy matching"""
-    normalized = name.lower()
-    char_map = {
-        'ø': 'oe', 'ö': 'oe', 'ó': 'o',
-        'ä': 'ae', 'á': 'a', 'å': 'aa',
-        'é': 'e', 'è': 'e',
-        'ü': 'ue',
-        'ý': 'y',
-        'æ': 'ae'
-    }
-    for char, replacement in char_map.items():
-        normalized = normalized.replace(char, replacement)
-    return normalized
+    return index_normalize_name(name)
 
 def fuzzy_match_name(name: str, name_list: List[str], threshold: int = 85) -> str:
-    """Finds best matching name using normalized comparison"""
-    from thefuzz import fuzz
-    
-    best_score = 0
-    best_match = ''
-    normalized_name = normalize_name(name)
-    
-    # Try matching full name
-    for candidate in name_list:
-        normalized_candidate = normalize_name(candidate)
-        score = fuzz.ratio(normalized_name, normalized_candidate)
-        
-        # Also try matching tokens in any order
-        token_score = fuzz.token_sort_ratio(normalized_name, normalized_candidate)
-        score = max(score, token_score)
-        
-        if score > best_score and score >= threshold:
-            best_score = score
-            best_match = candidate
-    
-    return best_match
+    """Finds best matching name using a NameIndex built once per candidate list"""
+    return get_name_index(name_list, threshold=threshold).match(name)
+
+# Elo columns in priority order for each race type; Race_Elo is the first available
+ELO_PRIORITY = {
+    'Individual': ['Individual_Elo', 'Elo'],
+    'Sprint': ['Sprint_Elo', 'Elo'],
+    'Pursuit': ['Pursuit_Elo', 'Sprint_Elo', 'Elo'],
+    'Mass Start': ['MassStart_Elo', 'Pursuit_Elo', 'Elo']
+}
 
 def get_race_specific_elo(elo_data: Dict, race_type: str) -> float:
-    """Get the most relevant ELO score based on race type"""
-    # Define priority order for each race type
-    priority_elo = {
-        'Individual': ['Individual_Elo', 'Elo'],
-        'Sprint': ['Sprint_Elo', 'Elo'],
-        'Pursuit': ['Pursuit_Elo', 'Sprint_Elo', 'Elo'],
-        'Mass Start': ['MassStart_Elo', 'Pursuit_Elo', 'Elo']
-    }
-    
-    # Get the priority list for this race type (default to just 'Elo' if race type not found)
-    priority_cols = priority_elo.get(race_type, ['Elo'])
-    
-    # Try each column in priority order
-    for col in priority_cols:
+    """Get the most relevant ELO score from one athlete's ELO record based on race type"""
+    for col in get_elo_priority(race_type):
         if col in elo_data and elo_data[col] is not None:
             try:
                 return float(elo_data[col])
@@ -455,11 +429,4 @@ def filter_races_by_date(df: pd.DataFrame, date: str) -> pd.DataFrame:
 
 def get_elo_priority(race_type: str) -> List[str]:
     """Determine which ELO columns to prioritize based on race type"""
-    priority_elo = {
-        'Individual': ['Individual_Elo', 'Elo'],
-        'Sprint': ['Sprint_Elo', 'Elo'],
-        'Pursuit': ['Pursuit_Elo', 'Sprint_Elo', 'Elo'],
-        'Mass Start': ['MassStart_Elo', 'Pursuit_Elo', 'Elo']
-    }
-    
-    return priority_elo.get(race_type, ['Elo'])
\ No newline at end of file
+    return ELO_PRIORITY.get(race_type, ['Elo'])
\ No newline at end of file
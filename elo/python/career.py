@@ -0,0 +1,119 @@
+"""
+Career aggregates per athlete, built once per chrono refresh for the sporcle leaderboards.
+
+The sporcle/<sport>/ scripts each reloaded a chrono and looped over athletes:
+alltime_100.get_active filtered the whole chrono for every id to find a
+career span and days-on-top.on_top filtered the reigns sheet for every id.
+Here one group-by over the chrono gives a table indexed by id with
+
+    - name, nation (latest), first_season, last_season
+    - starts, wins, podiums (race rows; the season-end '0500' rows are not races)
+    - peak_<col> and current_<col> (last row, whatever its season) for every
+      rating column; a season's leaderboard wants that season's rows instead
+    - days_on_top, reigns, reign_dates and first_reign from reigns.py, when the
+      chrono has race and date columns to compute reigns from
+
+load_career keeps the table next to the chrono as <chrono>_career.pkl and
+rebuilds it only when the chrono is newer, so a leaderboard script is a
+select on a small table.
+
+Usage:
+    from career import career_span, load_career
+
+    career = load_career('~/ski/elo/python/ski/age/excel365/varmen_all_k.pkl')
+    df['career'] = career_span(career, 2023).reindex(df['id']).to_numpy()
+    top = career.sort_values(by='peak_elo', ascending=False).head(100)
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from reigns import king_queen_table, rating_columns, standardize_chrono
+
+CAREER_SUFFIX = '_career.pkl'
+
+_career_memo: Dict[Tuple[str, float, str], pd.DataFrame] = {}
+
+def race_rows(df: pd.DataFrame) -> pd.Series:
+    """True for race results; False for the season-end ('...0500') rating rows."""
+    return ~df['date'].astype(str).str.endswith('0500')
+
+def career_table(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                 reigns: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Career aggregates of every athlete in a chrono frame (rows in date order), indexed by id.
+
+    columns defaults to every rating column; reigns is a king_queen_table for
+    the days-at-#1 columns.
+    """
+    df = standardize_chrono(df)
+    columns = columns or rating_columns(df)
+    athletes = df.groupby('id', sort=False)
+    table = athletes.agg(name=('name', 'last'), nation=('nation', 'last'),
+                         first_season=('season', 'min'), last_season=('season', 'max'))
+
+    races = df.loc[race_rows(df)]
+    table['starts'] = races.groupby('id').size().reindex(table.index, fill_value=0)
+    if 'place' in races.columns:
+        table['wins'] = (races['place'] == 1).groupby(races['id']).sum().reindex(table.index, fill_value=0)
+        table['podiums'] = (races['place'] <= 3).groupby(races['id']).sum().reindex(table.index, fill_value=0)
+
+    for col in columns:
+        table[f'peak_{col}'] = athletes[col].max()
+        table[f'current_{col}'] = athletes[col].last()
+
+    table['days_on_top'] = 0
+    table['reigns'] = 0
+    table['reign_dates'] = ''
+    table['first_reign'] = pd.NaT
+    if reigns is not None and len(reigns):
+        held = reigns.groupby('id', sort=False)
+        table['days_on_top'] = held['days'].sum().dt.days.reindex(table.index, fill_value=0)
+        table['reigns'] = held.size().reindex(table.index, fill_value=0)
+        # ' (start - end) (start - end)', as days-on-top wrote it
+        dates = held['dates'].agg(lambda d: ''.join(' ' + x for x in d))
+        table['reign_dates'] = dates.reindex(table.index, fill_value='')
+        table['first_reign'] = pd.to_datetime(held['start_date'].min()).reindex(table.index)
+    return table
+
+def build_career(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                 reign_column: Optional[str] = 'elo') -> pd.DataFrame:
+    """career_table with reigns of reign_column, when the frame has races to compute them from."""
+    df = standardize_chrono(df)
+    reigns = None
+    if reign_column and {'race', 'date', reign_column}.issubset(df.columns):
+        reigns = king_queen_table(df.loc[race_rows(df)], reign_column)
+    return career_table(df, columns, reigns)
+
+def load_career(path: str, columns: Optional[List[str]] = None,
+                reign_column: Optional[str] = 'elo') -> pd.DataFrame:
+    """
+    The career table of a chrono pickle, from <chrono>_career.pkl when it is newer
+    than the chrono, else rebuilt and saved there.
+    """
+    path = os.path.expanduser(path)
+    mtime = os.path.getmtime(path)
+    key = (path, mtime, repr((columns, reign_column)))
+    if key in _career_memo:
+        return _career_memo[key]
+
+    cache = os.path.splitext(path)[0] + CAREER_SUFFIX
+    table = None
+    if os.path.exists(cache) and os.path.getmtime(cache) >= mtime:
+        table = pd.read_pickle(cache)
+        if table.attrs.get('build') != key[2]:
+            table = None
+    if table is None:
+        table = build_career(pd.read_pickle(path), columns, reign_column)
+        table.attrs['build'] = key[2]
+        table.to_pickle(cache)
+        print(f"Built career table for {path}: {len(table)} athletes")
+    _career_memo[key] = table
+    return table
+
+def career_span(table: pd.DataFrame, active_season: int) -> pd.Series:
+    """'(first-last)' per id, 'Present' for athletes with a season at or after active_season."""
+    end = table['last_season'].astype(str).where(table['last_season'] < active_season, 'Present')
+    return '(' + table['first_season'].astype(str) + '-' + end + ')'
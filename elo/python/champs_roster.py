@@ -0,0 +1,139 @@
+"""
+Championship roster resolved against the latest Elo scores once per run.
+
+startlist-scrape-champs.py builds every championship event (individual races,
+relays, team sprints, mixed relays) from the same CHAMPS_ATHLETES_* config. Each
+event used to re-match every configured name against the Elo table (an `in
+.values` scan plus fuzzy_match_name) and re-select that athlete's Elo row, once
+per event and again per team record. A ChampsRoster does that work once per
+gender:
+
+    - all configured names matched in one pass (exact, then one match_many)
+    - the matched athletes' Elo rows selected in one query, as records and as
+      a roster frame (Config_Name, Nation, Skier, ID and every Elo column)
+    - per-column first quartiles for the imputation of unmatched athletes
+
+Every event for that gender then reads from the roster.
+
+Usage:
+    from champs_roster import get_champs_roster
+
+    roster = get_champs_roster(elo_path, CHAMPS_ATHLETES_MEN, get_latest_elo_scores,
+                               manual_mappings=MANUAL_NAME_MAPPINGS, threshold=85)
+    for nation in roster.nations(min_athletes=4):
+        team = roster.top(nation, 4, ['Distance_Elo', 'Elo'])
+        records = [roster.record(name) for name in team]   # None when unmatched
+"""
+
+import os
+from typing import Callable, Dict, List, Optional, Union
+
+import pandas as pd
+
+from name_index import get_name_index
+from race_elo import elo_quartiles
+
+class ChampsRoster:
+    """Configured championship athletes of one gender with their latest Elo rows."""
+
+    def __init__(self, athletes_by_nation: Dict[str, List[str]], elo_scores: pd.DataFrame,
+                 manual_mappings: Optional[Dict[str, str]] = None, threshold: int = 85):
+        self.athletes_by_nation = athletes_by_nation
+        self.elo_scores = elo_scores
+
+        names = list(dict.fromkeys(name for athletes in athletes_by_nation.values() for name in athletes))
+        known = set(elo_scores['Skier'])
+        unresolved = [name for name in names if name not in known]
+        index = get_name_index(elo_scores['Skier'].tolist(), manual_mappings=manual_mappings,
+                               threshold=threshold)
+        self.matches: Dict[str, str] = {name: name for name in names if name in known}
+        self.matches.update(zip(unresolved, index.match_many(unresolved)))
+
+        # First Elo row per matched name, as .iloc[0] on a name filter would pick
+        matched = elo_scores[elo_scores['Skier'].isin(set(self.matches.values()))]
+        self.records: Dict[str, dict] = {record['Skier']: record for record
+                                         in matched.drop_duplicates('Skier').to_dict('records')}
+        self._quartiles: Optional[Dict[str, float]] = None
+        self._frame: Optional[pd.DataFrame] = None
+
+    def nations(self, min_athletes: int = 1) -> List[str]:
+        """Sorted nations with at least min_athletes configured."""
+        return sorted(nation for nation, athletes in self.athletes_by_nation.items()
+                      if len(athletes) >= min_athletes)
+
+    def athletes(self, nation: str) -> List[str]:
+        return self.athletes_by_nation.get(nation, [])
+
+    def match(self, name: str) -> str:
+        """Elo name for a configured athlete, or '' if unmatched."""
+        return self.matches.get(name, '')
+
+    def record(self, name: str) -> Optional[dict]:
+        """Latest Elo row (as a dict) for a configured athlete, or None if unmatched."""
+        return self.records.get(self.match(name))
+
+    def best_elo(self, name: str, elo_priority: List[str]) -> float:
+        """First non-null Elo in priority order, 0 when unmatched or all null."""
+        record = self.record(name)
+        if record is not None:
+            for col in elo_priority:
+                if col in record and not pd.isna(record[col]):
+                    return record[col]
+        return 0
+
+    def top(self, nation: str, count: int,
+            elo_priority: Union[List[str], Callable[[dict], float]]) -> List[str]:
+        """The nation's count best configured athletes (config order on ties).
+
+        elo_priority is a column priority list (ranked by best_elo) or a function of
+        the Elo record; unmatched athletes score 0 either way.
+        """
+        if callable(elo_priority):
+            def score(name):
+                record = self.record(name)
+                return elo_priority(record) if record is not None else 0
+        else:
+            def score(name):
+                return self.best_elo(name, elo_priority)
+        return sorted(self.athletes(nation), key=score, reverse=True)[:count]
+
+    def quartiles(self) -> Dict[str, float]:
+        """First quartile of every Elo column, used to impute unmatched athletes."""
+        if self._quartiles is None:
+            self._quartiles = elo_quartiles(self.elo_scores)
+        return self._quartiles
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """One row per (nation, configured athlete) joined with the matched Elo row."""
+        if self._frame is None:
+            roster = pd.DataFrame(
+                [(name, nation, self.match(name)) for nation, athletes in self.athletes_by_nation.items()
+                 for name in athletes],
+                columns=['Config_Name', 'Nation', 'Skier'])
+            elo = pd.DataFrame(list(self.records.values()), columns=self.elo_scores.columns)
+            self._frame = roster.merge(elo.drop(columns=['Nation'], errors='ignore'),
+                                       on='Skier', how='left')
+        return self._frame
+
+_roster_memo: Dict[tuple, ChampsRoster] = {}
+
+def get_champs_roster(elo_path: str, athletes_by_nation: Dict[str, List[str]],
+                      load_elo: Callable[[str], pd.DataFrame],
+                      manual_mappings: Optional[Dict[str, str]] = None,
+                      threshold: int = 85) -> Optional[ChampsRoster]:
+    """Return the roster for this Elo file and athlete config, building it once per run.
+
+    load_elo is the sport's get_latest_elo_scores. Returns None when it yields no scores.
+    """
+    key = (os.path.expanduser(elo_path), id(athletes_by_nation), id(manual_mappings), threshold)
+    roster = _roster_memo.get(key)
+    if roster is None:
+        elo_scores = load_elo(elo_path)
+        if elo_scores is None or elo_scores.empty:
+            return None
+        roster = ChampsRoster(athletes_by_nation, elo_scores, manual_mappings, threshold)
+        _roster_memo[key] = roster
+        print(f"Matched {sum(1 for m in roster.matches.values() if m)}/{len(roster.matches)} "
+              f"championship athletes against {os.path.basename(elo_path)}")
+    return roster
@@ -0,0 +1,276 @@
+"""
+Per-process cache of the chrono_pred CSVs read by the startlist scrapers.
+
+A startlist run used to parse the same {gender}_chrono_pred.csv several times per
+race: once in get_latest_elo_scores, again for the recent-competitor flags, again
+(with Polars, then pandas) in the fallback startlist and once more just to look at
+the column names. Each file is now parsed at most once per process and everything
+the scrapers derive from it is computed from that single load:
+
+    - the parsed frame itself (treat it as read-only, .copy() before mutating)
+    - the current season and its rows
+    - current-season competitors by (Distance, Technique), from one group-by
+    - memoized per-file results such as get_latest_elo_scores (scores + quartiles)
+
+Entries are keyed by absolute path and modification time, so a chrono file that is
+rewritten during a run is re-read.
+
+When the resident rating service is running (rating_service.py), get_chrono returns
+a RemoteChronoSnapshot and per_chrono_file results come from the service, so a
+startlist script never parses the chrono file itself unless the service goes away
+mid-run; the full frame (load_chrono / snapshot.frame) is unpickled from the
+service's copy instead of parsing the CSV.
+
+Usage:
+    from chrono_cache import get_chrono, load_chrono, per_chrono_file
+
+    chronos = load_chrono(elo_path)
+    snapshot = get_chrono(elo_path)
+    snapshot.current_season
+    snapshot.recent_competitors(distance, technique)
+
+    @per_chrono_file
+    def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
+        df = load_chrono(file_path).copy()
+        ...
+"""
+
+import functools
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+import rating_client
+
+def _cache_key(path: str) -> Tuple[str, float]:
+    full_path = os.path.abspath(os.path.expanduser(path))
+    return full_path, os.path.getmtime(full_path)
+
+def _read_chrono(path: str) -> pd.DataFrame:
+    """Parse a chrono CSV, falling back to Polars for files pandas cannot handle."""
+    try:
+        df = pd.read_csv(path, low_memory=False)
+        print(f"Loaded chrono file {path}: {len(df)} rows")
+        return df
+    except Exception as pd_e:
+        print(f"Error reading {path} with pandas: {pd_e}")
+
+    import polars as pl
+    df = pl.scan_csv(path,
+                     infer_schema_length=10000,
+                     ignore_errors=True,
+                     null_values=["", "NA", "NULL", "Sprint"],
+                    ).collect().to_pandas()
+    print(f"Loaded chrono file {path} with polars: {len(df)} rows")
+    return df
+
+class ChronoSnapshot:
+    """One parsed chrono file and the values derived from it."""
+
+    def __init__(self, path: str, frame: pd.DataFrame):
+        self.path = path
+        self.frame = frame
+        self._current_season = None
+        self._current_season_frame: Optional[pd.DataFrame] = None
+        self._competitors: Optional[Dict[tuple, set]] = None
+        self._derived: Dict[str, object] = {}
+
+    @property
+    def columns(self):
+        return self.frame.columns
+
+    @property
+    def current_season(self):
+        """Maximum Season in the file, or the current UTC year without a Season column."""
+        if self._current_season is None:
+            if 'Season' in self.frame.columns:
+                self._current_season = self.frame['Season'].max()
+            else:
+                self._current_season = datetime.now(timezone.utc).year
+        return self._current_season
+
+    @property
+    def current_season_frame(self) -> pd.DataFrame:
+        """Rows from the current season (the whole file without a Season column)."""
+        if self._current_season_frame is None:
+            if 'Season' in self.frame.columns:
+                self._current_season_frame = self.frame[self.frame['Season'] == self.current_season]
+            else:
+                self._current_season_frame = self.frame
+        return self._current_season_frame
+
+    def current_season_skiers(self) -> set:
+        """Names of everyone who raced in the current season."""
+        season = self.current_season_frame
+        if 'Skier' not in season.columns:
+            return set()
+        return set(season['Skier'].dropna().unique())
+
+    def recent_competitors(self, distance=None, technique=None) -> set:
+        """Current-season skiers who raced the same Distance/Technique."""
+        if self._competitors is None:
+            self._competitors = self._group_competitors()
+        key = tuple(value for col, value in (('Distance', str(distance)), ('Technique', technique))
+                    if col in self.current_season_frame.columns)
+        return self._competitors.get(key, set())
+
+    def _group_competitors(self) -> Dict[tuple, set]:
+        season = self.current_season_frame
+        if 'Skier' not in season.columns:
+            return {}
+        keys = [col for col in ('Distance', 'Technique') if col in season.columns]
+        if not keys:
+            return {(): set(season['Skier'].dropna().unique())}
+        grouped = season.assign(Distance=season['Distance'].astype(str)) if 'Distance' in keys else season
+        competitors = {}
+        for key, skiers in grouped.groupby(keys)['Skier']:
+            key = key if isinstance(key, tuple) else (key,)
+            competitors[key] = set(skiers.dropna().unique())
+        return competitors
+
+    def latest_records(self) -> pd.DataFrame:
+        """Most recent row for every Skier, indexed by Skier."""
+        def build():
+            ordered = self.frame.sort_values('Date', ascending=False, kind='stable') \
+                if 'Date' in self.frame.columns else self.frame.iloc[::-1]
+            return ordered.drop_duplicates('Skier').set_index('Skier', drop=False)
+        return self.derived('latest_records', build)
+
+    def ratings_as_of(self, date, skiers=None) -> pd.DataFrame:
+        """Most recent row for every Skier on or before date, indexed by Skier."""
+        frame = self.frame if skiers is None else self.frame[self.frame['Skier'].isin(skiers)]
+        dates = pd.to_datetime(frame['Date'], errors='coerce')
+        return (frame.assign(_date=dates)[dates <= pd.Timestamp(date)]
+                .sort_values('_date', ascending=False, kind='stable')
+                .drop_duplicates('Skier')
+                .drop(columns='_date')
+                .set_index('Skier', drop=False))
+
+    def derived(self, name: str, build: Callable[[], object]):
+        """Memoize a value computed from this file."""
+        if name not in self._derived:
+            self._derived[name] = build()
+        return self._derived[name]
+
+class RemoteChronoSnapshot:
+    """
+    ChronoSnapshot answered by the rating service.
+
+    Every value is fetched once and memoized; if the service stops answering (or a
+    call fails there) the snapshot parses the file locally and carries on.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._values: Dict[tuple, object] = {}
+
+    def _local(self) -> ChronoSnapshot:
+        return _local_snapshot(self.path)
+
+    def _ask(self, op: str, local: Callable[[ChronoSnapshot], object], **kwargs):
+        key = (op, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        if key not in self._values:
+            try:
+                self._values[key] = rating_client.call(op, path=self.path, **kwargs)
+            except rating_client.ServiceUnavailable:
+                return local(self._local())
+            except rating_client.ServiceError as e:
+                print(f"Rating service could not answer {op} for {self.path}: {e}; reading the file")
+                return local(self._local())
+        return self._values[key]
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self._ask('snapshot', lambda s: s.frame, attr='frame')
+
+    @property
+    def columns(self):
+        return self._ask('snapshot', lambda s: s.columns, attr='columns')
+
+    @property
+    def current_season(self):
+        return self._ask('snapshot', lambda s: s.current_season, attr='current_season')
+
+    @property
+    def current_season_frame(self) -> pd.DataFrame:
+        return self._ask('snapshot', lambda s: s.current_season_frame, attr='current_season_frame')
+
+    def current_season_skiers(self) -> set:
+        return self._ask('snapshot', lambda s: s.current_season_skiers(), attr='current_season_skiers')
+
+    def recent_competitors(self, distance=None, technique=None) -> set:
+        return self._ask('recent_competitors', lambda s: s.recent_competitors(distance, technique),
+                         distance=distance, technique=technique)
+
+    def latest_records(self) -> pd.DataFrame:
+        return self._ask('snapshot', lambda s: s.latest_records(), attr='latest_records')
+
+    def ratings_as_of(self, date, skiers=None) -> pd.DataFrame:
+        skiers = None if skiers is None else list(skiers)
+        return self._ask('ratings_as_of', lambda s: s.ratings_as_of(date, skiers), date=str(date), skiers=skiers)
+
+    def derived(self, name: str, build: Callable[[], object]):
+        return self._local().derived(name, build)
+
+_snapshots: Dict[str, Tuple[float, ChronoSnapshot]] = {}
+_remote_snapshots: Dict[str, Tuple[float, RemoteChronoSnapshot]] = {}
+
+def _local_snapshot(path: str) -> ChronoSnapshot:
+    full_path, mtime = _cache_key(path)
+    cached = _snapshots.get(full_path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, ChronoSnapshot(full_path, _read_chrono(full_path)))
+        _snapshots[full_path] = cached
+    return cached[1]
+
+def get_chrono(path: str):
+    """Return the snapshot for a chrono file, parsing it on first use (or asking the rating service)."""
+    if not rating_client.enabled():
+        return _local_snapshot(path)
+    full_path, mtime = _cache_key(path)
+    cached = _remote_snapshots.get(full_path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, RemoteChronoSnapshot(full_path))
+        _remote_snapshots[full_path] = cached
+    return cached[1]
+
+def load_chrono(path: str) -> pd.DataFrame:
+    """Parsed chrono frame shared by every caller in this process (read-only)."""
+    return get_chrono(path).frame
+
+def clear_chrono_cache() -> None:
+    """Drop every cached chrono file."""
+    _snapshots.clear()
+    _remote_snapshots.clear()
+
+def per_chrono_file(func: Callable[[str], pd.DataFrame]) -> Callable[[str], pd.DataFrame]:
+    """
+    Memoize a function of a chrono file path on the file's snapshot.
+
+    The wrapped function runs once per file; callers get a copy of its result so
+    they are free to modify it. With the rating service running it runs there
+    instead, once per file for every process that asks.
+    """
+    module_file = getattr(sys.modules.get(func.__module__), '__file__', None)
+
+    @functools.wraps(func)
+    def wrapper(file_path: str) -> pd.DataFrame:
+        if module_file and rating_client.enabled():
+            try:
+                return rating_client.call('per_file', module=os.path.abspath(module_file),
+                                          function=func.__name__,
+                                          path=os.path.abspath(os.path.expanduser(file_path)))
+            except rating_client.ServiceUnavailable:
+                pass
+            except rating_client.ServiceError as e:
+                print(f"Rating service could not run {func.__name__}: {e}; running in-process")
+        try:
+            snapshot = _local_snapshot(file_path)
+        except Exception:
+            return func(file_path)
+        result = snapshot.derived(f"{func.__module__}.{func.__qualname__}", lambda: func(file_path))
+        return result.copy() if isinstance(result, pd.DataFrame) else result
+    return wrapper
@@ -0,0 +1,96 @@
+"""
+Regression features of a ski chrono as one lazy window query.
+
+sporcle/ski/chrono_regress.py built its features in Python loops: pct went
+season by season, rescaling each of the 18 rating columns with a per-row
+lambda that recomputed the column's season maximum for every row, and grew
+the result with DataFrame.append; pts_avg then did the same per athlete. The
+knapsack and podium scripts read the pickles it writes. Here every feature is
+a window expression over season or id in one polars query:
+
+    - over season: every rating column as a percentage of its season maximum
+      (total_pelo and total_elo keep the raw pelo and elo) and placepct,
+      1 - place / season's last place
+    - per row: World Cup points for the place (0 outside the top 50) and the
+      home flag, nation == country
+    - over id, in chrono order: race_num, total_points, avg_points and
+      pavg_points, the average the athlete brought into the race (0 for a
+      first race)
+
+A race type is a filter applied before the windows, so its ratings are scaled
+within that race type's season, as when chrono_regress.py was run on a
+distance() / discipline() selection.
+
+Usage:
+    from chrono_features import chrono_regress, RACE_TYPES
+
+    regress = chrono_regress(pd.read_pickle('~/ski/elo/python/ski/age/excel365/ladies_chrono.pkl'))
+    sprint = chrono_regress(chrono, race_type='sprint_classic')
+
+    # Polars frames
+    lazy = regress_query(pl.from_pandas(chrono).lazy(), RACE_TYPES['distance'])
+"""
+
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+import polars as pl
+
+WC_POINTS = [100, 95, 90, 85, 80, 75, 72, 69, 66, 63, 60, 58, 56, 54, 52, 50, 48, 46, 44, 42,
+             40, 38, 36, 34, 32, 30, 28, 26, 24, 22, 20, 19, 18, 17, 16, 15, 14, 13, 12, 11,
+             10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+POINTS_BY_PLACE = {place: points for place, points in enumerate(WC_POINTS, start=1)}
+
+RATING_STEMS = ['', 'distance_', 'distance_classic_', 'distance_freestyle_', 'sprint_',
+                'sprint_classic_', 'sprint_freestyle_', 'classic_', 'freestyle_']
+RATING_COLUMNS = [stem + kind for kind in ['pelo', 'elo'] for stem in RATING_STEMS]
+
+_sprint = pl.col('distance') == 'Sprint'
+_freestyle = pl.col('discipline') == 'F'
+_classic = (~pl.col('discipline').is_in(['F', 'P'])
+            & ~pl.col('distance').is_in(['Stage', 'Etappeløp']))
+
+# Row filters of the chrono_regress_<race type> pickles, as distance() and discipline() select them
+RACE_TYPES: Dict[str, pl.Expr] = {
+    'distance': ~_sprint,
+    'distance_classic': ~_sprint & _classic,
+    'distance_freestyle': ~_sprint & _freestyle,
+    'sprint': _sprint,
+    'sprint_classic': _sprint & _classic,
+    'sprint_freestyle': _sprint & _freestyle,
+}
+
+def season_pct(col: str) -> pl.Expr:
+    """col as a percentage of its season maximum."""
+    return (100 * pl.col(col) / pl.col(col).max().over('season')).alias(col)
+
+def regress_query(frame: pl.LazyFrame, race_filter: Optional[pl.Expr] = None,
+                  level: Optional[str] = 'all') -> pl.LazyFrame:
+    """The chrono_regress features of a chrono frame, rows in chrono order."""
+    columns = frame.collect_schema().names()
+    if level is not None and 'level' in columns:
+        frame = frame.filter(pl.col('level') == level)
+    if race_filter is not None:
+        frame = frame.filter(race_filter)
+    ratings: List[str] = [col for col in RATING_COLUMNS if col in columns]
+    place = pl.col('place').cast(pl.Int64, strict=False)
+
+    return (frame
+            .with_columns(pl.col('pelo').alias('total_pelo'), pl.col('elo').alias('total_elo'))
+            .with_columns(
+                *[season_pct(col) for col in ratings],
+                (1 - pl.col('place') / pl.col('place').max().over('season')).alias('placepct'),
+                place.replace_strict(POINTS_BY_PLACE, default=0, return_dtype=pl.Int64).alias('points'),
+                (pl.col('nation') == pl.col('country')).alias('home'))
+            .with_columns(
+                pl.int_range(1, pl.len() + 1).over('id').alias('race_num'),
+                pl.col('points').cum_sum().over('id').alias('total_points'))
+            .with_columns((pl.col('total_points') / pl.col('race_num')).alias('avg_points'))
+            .with_columns(pl.col('avg_points').shift(1, fill_value=0).over('id').alias('pavg_points')))
+
+def chrono_regress(df: Union[pd.DataFrame, pl.DataFrame], race_type: Optional[str] = None,
+                   level: Optional[str] = 'all') -> pd.DataFrame:
+    """regress_query on a pandas (or polars) chrono, for one of RACE_TYPES or all races."""
+    frame = df if isinstance(df, pl.DataFrame) else pl.from_pandas(df)
+    race_filter = RACE_TYPES[race_type] if race_type else None
+    return regress_query(frame.lazy(), race_filter, level).collect().to_pandas()
@@ -0,0 +1,263 @@
+"""
+Pre-normalized name-match index for startlist <-> Elo <-> fantasy matching.
+
+fuzzy_match_name in every startlist_common.py used to normalize each candidate and
+compute two thefuzz ratios against the whole name list, once per startlist athlete
+and once more per name format in get_fantasy_price. A NameIndex does that work once
+per candidate list:
+
+    - candidates normalized once (same character map as normalize_name)
+    - exact hash on the raw and normalized names
+    - token-sorted key map ("klaebo johannes hoesflot" == "johannes hoesflot klaebo")
+    - vectorized top-1 fuzzy search (rapidfuzz cdist, max of ratio and token_sort_ratio)
+    - persistent cache of fuzzy decisions per candidate list: keyed by a digest of
+      the candidates and character map, each source name stores the position of its
+      best candidate and the score, so a repeat run over the same list skips cdist
+      and a changed list (a closer candidate added) is scored afresh
+
+Usage:
+    from name_index import get_name_index
+
+    index = get_name_index(elo_scores['Skier'].tolist(), manual_mappings=MANUAL_NAME_MAPPINGS)
+    match = index.match('KLAEBO Johannes Hoesflot')   # '' when nothing reaches the threshold
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+NAME_CHAR_MAP = {
+    'ø': 'oe', 'ö': 'oe', 'ó': 'o',
+    'ä': 'ae', 'á': 'a', 'å': 'aa',
+    'é': 'e', 'è': 'e',
+    'ü': 'ue',
+    'ý': 'y',
+    'æ': 'ae'
+}
+_NAME_TRANSLATION = str.maketrans(NAME_CHAR_MAP)
+
+CACHE_PATH = Path(os.path.expanduser(os.getenv('NAME_MATCH_CACHE', '~/.cache/ski-elo/name_match_cache.json')))
+
+# Candidate lists not matched against for this long are dropped from the cache file
+CACHE_MAX_AGE = 30 * 24 * 3600
+
+def normalize_name(name: str, translation: Optional[dict] = None) -> str:
+    """Lowercase and fold special characters in one pass."""
+    return name.lower().translate(translation or _NAME_TRANSLATION)
+
+def token_key(normalized: str) -> str:
+    """Order-independent key for a normalized name."""
+    return ' '.join(sorted(normalized.split()))
+
+class _DecisionCache:
+    """Persistent {candidate digest: {source name: [best position, score]}} cache."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.sections: Dict[str, dict] = {}
+        self.dirty = False
+        if path.exists():
+            try:
+                with open(path, encoding='utf-8') as f:
+                    sections = json.load(f)
+                # Older files keyed by source name alone are dropped
+                self.sections = {digest: section for digest, section in sections.items()
+                                 if isinstance(section, dict) and 'decisions' in section}
+            except (OSError, ValueError):
+                self.sections = {}
+
+    def _decisions(self, digest: str) -> Dict[str, list]:
+        section = self.sections.get(digest)
+        if section is None:
+            section = self.sections[digest] = {'used': 0, 'decisions': {}}
+        if time.time() - section['used'] > 3600:
+            section['used'] = time.time()
+            self.dirty = True
+        return section['decisions']
+
+    def lookup(self, digest: str, source: str) -> Optional[Tuple[int, float]]:
+        """(best position, score) of source against the candidate list with this digest."""
+        decision = self._decisions(digest).get(source)
+        return (decision[0], decision[1]) if decision else None
+
+    def store(self, digest: str, source: str, position: int, score: float) -> None:
+        self._decisions(digest)[source] = [int(position), float(score)]
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        cutoff = time.time() - CACHE_MAX_AGE
+        sections = {digest: section for digest, section in self.sections.items()
+                    if section['used'] >= cutoff}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(sections, f, ensure_ascii=False, indent=0, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Could not save name match cache {self.path}: {e}")
+
+_decision_cache: Optional[_DecisionCache] = None
+
+def _get_decision_cache() -> _DecisionCache:
+    global _decision_cache
+    if _decision_cache is None:
+        _decision_cache = _DecisionCache(CACHE_PATH)
+        atexit.register(_decision_cache.save)
+    return _decision_cache
+
+class NameIndex:
+    """Match source names against a fixed list of candidate names."""
+
+    def __init__(self, candidates: List[str], manual_mappings: Optional[Dict[str, str]] = None,
+                 threshold: int = 85, char_map: Optional[Dict[str, str]] = None,
+                 use_cache: bool = True):
+        self.candidates = [c for c in candidates if isinstance(c, str)]
+        self.manual_mappings = manual_mappings or {}
+        self.threshold = threshold
+        self.translation = str.maketrans(char_map) if char_map else _NAME_TRANSLATION
+        self.use_cache = use_cache
+        self._digest: Optional[str] = None
+
+        self.normalized = [normalize_name(c, self.translation) for c in self.candidates]
+        self.exact: Dict[str, str] = {}
+        self.by_normalized: Dict[str, str] = {}
+        self.by_token_key: Dict[str, str] = {}
+        for candidate, normalized in zip(self.candidates, self.normalized):
+            self.exact.setdefault(candidate, candidate)
+            self.by_normalized.setdefault(normalized, candidate)
+            self.by_token_key.setdefault(token_key(normalized), candidate)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.exact
+
+    @property
+    def digest(self) -> str:
+        """Digest of the candidates (in order) and the character map, the decision cache key."""
+        if self._digest is None:
+            digest = hashlib.sha256(repr(sorted(self.translation.items())).encode())
+            digest.update('\n'.join(self.candidates).encode())
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def _decide(self, position: int, score: float, threshold: float) -> str:
+        return self.candidates[position] if score >= threshold else ''
+
+    def fuzzy_scores(self, names: List[str]) -> np.ndarray:
+        """Scores (names x candidates): max of ratio and token_sort_ratio on normalized names."""
+        queries = [normalize_name(n, self.translation) for n in names]
+        ratio = process.cdist(queries, self.normalized, scorer=fuzz.ratio, workers=-1)
+        token_sort = process.cdist(queries, self.normalized, scorer=fuzz.token_sort_ratio, workers=-1)
+        return np.rint(np.maximum(ratio, token_sort))
+
+    def match(self, name: str, threshold: Optional[int] = None) -> str:
+        """Best matching candidate for name, or '' if nothing reaches the threshold."""
+        if not self.candidates or not isinstance(name, str):
+            return ''
+        threshold = self.threshold if threshold is None else threshold
+
+        mapped = self.manual_mappings.get(name)
+        if mapped in self.exact:
+            return mapped
+
+        normalized = normalize_name(name, self.translation)
+        if normalized in self.by_normalized:
+            return self.by_normalized[normalized]
+        key = token_key(normalized)
+        if key in self.by_token_key:
+            return self.by_token_key[key]
+
+        cache = _get_decision_cache() if self.use_cache else None
+        if cache is not None:
+            cached = cache.lookup(self.digest, name)
+            if cached is not None:
+                return self._decide(*cached, threshold)
+
+        scores = self.fuzzy_scores([name])[0]
+        best = int(np.argmax(scores))
+        if cache is not None:
+            cache.store(self.digest, name, best, scores[best])
+        return self._decide(best, scores[best], threshold)
+
+    def match_many(self, names: List[str], threshold: Optional[int] = None) -> List[str]:
+        """Match a whole startlist; unresolved names are scored in one cdist call."""
+        threshold = self.threshold if threshold is None else threshold
+        results = []
+        pending = []
+        for i, name in enumerate(names):
+            if not isinstance(name, str) or not self.candidates:
+                results.append('')
+                continue
+            mapped = self.manual_mappings.get(name)
+            normalized = normalize_name(name, self.translation)
+            match = (mapped if mapped in self.exact else None) \
+                or self.by_normalized.get(normalized) \
+                or self.by_token_key.get(token_key(normalized))
+            results.append(match or '')
+            if not match:
+                pending.append(i)
+
+        cache = _get_decision_cache() if self.use_cache else None
+        if cache is not None:
+            unresolved = []
+            for i in pending:
+                cached = cache.lookup(self.digest, names[i])
+                if cached is not None:
+                    results[i] = self._decide(*cached, threshold)
+                else:
+                    unresolved.append(i)
+            pending = unresolved
+
+        if pending:
+            scores = self.fuzzy_scores([names[i] for i in pending])
+            best = scores.argmax(axis=1)
+            for row, i in enumerate(pending):
+                score = scores[row, best[row]]
+                results[i] = self._decide(best[row], score, threshold)
+                if cache is not None:
+                    cache.store(self.digest, names[i], best[row], score)
+        return results
+
+_index_memo: Dict[tuple, NameIndex] = {}
+# (id(candidate list), options) -> (that list, its index), so fuzzy_match_name callers
+# passing the same list object skip building and hashing its tuple on every call
+_list_memo: Dict[tuple, Tuple[list, NameIndex]] = {}
+_list_keys: Dict[tuple, tuple] = {}
+
+def get_name_index(candidates: List[str], manual_mappings: Optional[Dict[str, str]] = None,
+                   threshold: int = 85, char_map: Optional[Dict[str, str]] = None) -> NameIndex:
+    """
+    Return a NameIndex for this candidate list, building it once per run.
+
+    The same list object is found by identity; the list must not be mutated after
+    it has been indexed. Other lists with the same contents share the index.
+    """
+    options = (threshold, tuple(sorted(char_map.items())) if char_map else None, id(manual_mappings))
+    list_key = (id(candidates),) + options
+    entry = _list_memo.get(list_key)
+    if entry is not None and entry[0] is candidates:
+        return entry[1]
+
+    key = (tuple(candidates),) + options
+    index = _index_memo.get(key)
+    if index is None:
+        index = NameIndex(candidates, manual_mappings, threshold, char_map)
+        _index_memo[key] = index
+    # One list per index: holding it keeps its id from being reused by another list
+    _list_memo.pop(_list_keys.get(key), None)
+    _list_memo[list_key] = (candidates, index)
+    _list_keys[key] = list_key
+    return index
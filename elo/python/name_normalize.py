@@ -0,0 +1,133 @@
+"""
+Name normalization shared by the knapsack, sporcle and startlist pipelines.
+
+The knapsack scorers (knapsack-scrape.py, knapsack-chrono-scrape.py,
+podium_regress.py, points/) and the sporcle tables normalized names with
+chains of 6 to 35 df['name'].str.replace calls, repeated for every frame in
+every loop iteration: special characters, UTF-8 names that had been read as
+Latin-1 ('Ã¸' for 'ø'), and hand-coded spelling fixes between the fantasy
+site and the chrono files. Each call was a full pass over the column. Here
+the same work is one pass per distinct name:
+
+    - mojibake repaired with one regex (every 'Ã'/'Â' + continuation byte, until stable)
+    - characters folded with one str.translate table: FANTASY_TRANSLATION
+      (ø -> oe, as the fantasy site spells names) or ASCII_TRANSLATION
+      (ø -> o, for the sporcle quizzes)
+    - known aliases remapped with one dict lookup on the folded name
+
+The alias registry is shared with the startlist scripts: STARTLIST_ALIASES is
+MANUAL_NAME_MAPPINGS in ski startlist_common (FIS name -> Elo name), and every
+'First LAST' entry of it also becomes a FANTASY_ALIASES entry, so the knapsack
+and startlist paths agree on who is who. The knapsack scorers look fantasy
+names up with name_keys, the same normalization lowercased, so an athlete is
+found whether the fantasy site spells them the Elo way or the FIS way.
+
+Usage:
+    from name_normalize import name_keys, normalize_names, ASCII_TRANSLATION
+
+    df['name'] = normalize_names(df['name'])                  # fold + fantasy aliases
+    fantasy_names = name_keys(fantasydf['name']).tolist()     # AthleteIndex lookup keys
+    df['name'] = normalize_names(df['name'], ASCII_TRANSLATION, aliases=None)
+"""
+
+import re
+from typing import Dict, Optional
+
+import pandas as pd
+
+FANTASY_CHAR_MAP = {
+    'ø': 'oe', 'Ø': 'Oe', 'ö': 'oe', 'Ö': 'Oe',
+    'ä': 'ae', 'Ä': 'Ae', 'æ': 'ae', 'Æ': 'Ae',
+    'å': 'aa', 'Å': 'Aa',
+    'ü': 'ue', 'Ü': 'Ue'
+}
+ASCII_CHAR_MAP = {
+    'ø': 'o', 'Ø': 'O', 'ö': 'o', 'Ö': 'O',
+    'ä': 'a', 'Ä': 'A', 'å': 'a', 'Å': 'A',
+    'æ': 'ae', 'Æ': 'Ae',
+    'ü': 'u', 'Ü': 'U'
+}
+FANTASY_TRANSLATION = str.maketrans(FANTASY_CHAR_MAP)
+ASCII_TRANSLATION = str.maketrans(ASCII_CHAR_MAP)
+
+# A two-byte UTF-8 character decoded as Latin-1
+_MOJIBAKE = re.compile('[ÂÃ][\u0080-¿]')
+
+# FIS startlist name -> Elo name; MANUAL_NAME_MAPPINGS in ski startlist_common
+STARTLIST_ALIASES = {
+    'Thomas MALONEY WESTGAARD': 'Thomas Hjalmar Westgård',
+    'John Steel HAGENBUCH': 'Johnny Hagenbuch',
+    'Imanol ROJO GARCIA': 'Imanol Rojo',
+    'JC SCHOONMAKER': 'James Clinton Schoonmaker',
+    'HAGENBUCH John Steel': 'Johnny Hagenbuch',
+    'MALONEY WESTGAARD Thomas': 'Thomas Hjalmar Westgård',
+    'Lars Michael Saab BJERTNAES': 'Lars Michael Bjertnæs',
+    'BJERTNAES Lars Michael Saab': 'Lars Michael Bjertnæs',
+    'Amund August KORSAETH': 'Amund Korsæth',
+    'KORSAETH Amund August': 'Amund Korsæth',
+    'Samantha SMITH': 'Sammy Smith',
+    'SMITH Samantha': 'Sammy Smith'
+}
+
+# Folded, lowercased name -> the spelling both knapsack frames are matched on
+_FANTASY_FIXES = {
+    'aleksandr terentev': 'alexander terentev',
+    'irineu esteve altimiras': 'ireneu esteve altimiras',
+    'thomas hjalmar westgaard': 'thomas maloney westgaard',
+    'lauri lepistoe': 'lauri lepisto',
+    'philip bellingham': 'phillip bellingham',
+    'snorri einarsson': 'snorri eythor einarsson',
+    'krista paermaekoski': 'krista parmakoski',
+    'jessica diggins': 'jessie diggins',
+    'patricijia eiduka': 'patricija eiduka',
+    'katri lylynperae': 'katri lylynpera',
+    'julia belger': 'julia preussger',
+    'perttu hyvaerinen': 'perttu hyvarinen',
+    'kathrine stewart-jones': 'katherine stewart-jones',
+    'ailja iksanova': 'alija iksanova',
+    'eric silfver': 'erik silfver',
+    'joni maeki': 'joni maki',
+    'emmi laemsae': 'emmi lamsa',
+    'anne kylloenen': 'anne kyllonen',
+    "finn o'connell": 'finn o connell',
+    'viktoriya olekh': 'viktoriia olekh',
+    'paal golberg': 'pal golberg'
+}
+
+def repair_mojibake(name: str) -> str:
+    """Re-decode UTF-8 characters read as Latin-1, also twice over ('Ã\x83Â¸' -> 'Ã¸' -> 'ø')."""
+    while 'Ã' in name or 'Â' in name:
+        repaired = _MOJIBAKE.sub(lambda m: m.group(0).encode('latin-1').decode('utf-8'), name)
+        if repaired == name:
+            break
+        name = repaired
+    return name
+
+def fold_name(name: str, translation: dict = FANTASY_TRANSLATION,
+              aliases: Optional[Dict[str, str]] = None) -> str:
+    """Repair, fold characters and apply aliases (keyed by lowercased folded name)."""
+    folded = repair_mojibake(name).translate(translation)
+    if aliases:
+        return aliases.get(folded.lower(), folded)
+    return folded
+
+def _fantasy_aliases() -> Dict[str, str]:
+    aliases = dict(_FANTASY_FIXES)
+    for fis_name, elo_name in STARTLIST_ALIASES.items():
+        # 'First LAST' keys only; 'LAST First' spells the same athlete
+        if fis_name.split()[-1].isupper():
+            aliases.setdefault(fold_name(elo_name).lower(), fis_name.lower())
+    return aliases
+
+FANTASY_ALIASES = _fantasy_aliases()
+
+def normalize_names(names: pd.Series, translation: dict = FANTASY_TRANSLATION,
+                    aliases: Optional[Dict[str, str]] = FANTASY_ALIASES) -> pd.Series:
+    """fold_name over a name column, once per distinct name; non-strings become NaN."""
+    mapping = {name: fold_name(name, translation, aliases)
+               for name in names.dropna().unique() if isinstance(name, str)}
+    return names.map(mapping)
+
+def name_keys(names: pd.Series) -> pd.Series:
+    """Lowercased normalize_names: fantasy names as AthleteIndex keys normalized chrono names."""
+    return normalize_names(names).str.lower()
@@ -7,6 +7,12 @@ import time
 import random
 import pandas as pd
 from fuzzywuzzy import fuzz, process
+import sys
+import os
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
 
 def create_country_mapping():
     """Create mapping of country codes to full names"""
@@ -279,9 +285,9 @@ def make_request_with_retry(url, headers, max_retries=3):
     for attempt in range(max_retries):
         try:
             # Add random delay between requests to avoid rate limiting
-            time.sleep(random.uniform(2, 5))
+            scrape_transport.sleep(random.uniform(2, 5))
             
-            response = requests.get(url, headers=headers, timeout=30)
+            response = scrape_transport.get(url, headers=headers, timeout=30)
             response.raise_for_status()
             return response
             
@@ -1,7 +1,6 @@
 import logging
 import ssl
 import re
-from urllib.request import urlopen
 from urllib.error import URLError
 from http.client import HTTPConnection, HTTPSConnection
 from bs4 import BeautifulSoup
@@ -20,6 +19,11 @@ from typing import List, Dict, Any, Optional, Tuple, Set
 import asyncio
 import aiohttp
 import multiprocessing
+import os
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
 
 def check_environment():
     """Check and log system environment information"""
@@ -69,7 +73,7 @@ class RateLimit:
         now = time.time()
         elapsed = now - self.last_call
         if elapsed < self.delay:
-            time.sleep(self.delay - elapsed)
+            scrape_transport.sleep(self.delay - elapsed)
         self.last_call = time.time()
 
 # Initialize rate limiter
@@ -81,8 +85,7 @@ def fetch_with_retry(url, max_retries=3, timeout=10):
     
     for attempt in range(max_retries):
         try:
-            response = urlopen(url, timeout=timeout)
-            return response.read().decode('utf-8')
+            return scrape_transport.fetch_text(url, timeout=timeout)
         except (URLError, TimeoutError) as e:
             if attempt == max_retries - 1:
                 logging.error(f"Failed to fetch {url} after {max_retries} attempts: {e}")
@@ -502,7 +505,7 @@ async def fetch_athlete_info_batch(session: aiohttp.ClientSession, athlete_ids:
         ssl_context.verify_mode = ssl.CERT_NONE
         
         # Respect rate limiting
-        await asyncio.sleep(0.2)  # 5 requests per second rate limit
+        await scrape_transport.async_sleep(0.2)  # 5 requests per second rate limit
         
         # Build URL with gender parameter if needed
         url = f"https://firstskisport.com/nordic-combined/athlete.php?id={athlete_id}"
@@ -510,7 +513,7 @@ async def fetch_athlete_info_batch(session: aiohttp.ClientSession, athlete_ids:
             url += "&g=w"
             
         try:
-            async with session.get(url, ssl=ssl_context) as response:
+            async with scrape_transport.session_get(session, url, ssl=ssl_context) as response:
                 if response.status != 200:
                     return athlete_id, None
                     
@@ -806,58 +809,55 @@ def construct_historical_df(tables, results_data):
         except:
             logging.info("Some Place values are not numeric, keeping as string")
         
-        # Handle athletes with missing birthdays - estimate birthday based on first race
-        athletes_without_birthdays = df.filter(pl.col('Birthday').is_null()).select('ID').unique()
-        
-        if len(athletes_without_birthdays) > 0:
-            logging.info(f"Estimating birthdays for {len(athletes_without_birthdays)} athletes based on first race (assuming age 22 at debut)")
-            
-            # For each athlete without birthday, calculate estimated birthday
-            for athlete_row in athletes_without_birthdays.iter_rows():
-                athlete_id = athlete_row[0]
-                
-                # Find their earliest race date
-                athlete_races = df.filter(pl.col('ID') == athlete_id).sort('Date')
-                if len(athlete_races) > 0:
-                    first_race_date = athlete_races['Date'][0]
-                    
-                    # Calculate birthday assuming they were 22 years old at first race
-                    # Subtract 22 years from first race date
-                    try:
-                        estimated_birthday = datetime(first_race_date.year - 22, first_race_date.month, first_race_date.day)
-                    except ValueError:
-                        # Handle leap year issue - if Feb 29 doesn't exist in birth year, use Feb 28
-                        if first_race_date.month == 2 and first_race_date.day == 29:
-                            estimated_birthday = datetime(first_race_date.year - 22, 2, 28)
-                        else:
-                            raise  # Re-raise if it's a different date issue
-                    
-                    # Update all records for this athlete with the estimated birthday
-                    df = df.with_columns(
-                        pl.when(pl.col('ID') == athlete_id)
-                        .then(pl.lit(estimated_birthday))
-                        .otherwise(pl.col('Birthday'))
-                        .alias('Birthday')
-                    )
-                    
-                    logging.info(f"Set estimated birthday for athlete {athlete_id}: {estimated_birthday.strftime('%Y-%m-%d')} (22 years before first race on {first_race_date})")
-        
-        # Calculate age - now all athletes should have birthdays (actual or estimated)
-        df = df.with_columns(
-            ((pl.col('Date').cast(pl.Datetime) - pl.col('Birthday')).dt.total_days() / 365.25)
-            .cast(pl.Float64)
-            .alias('Age')
+        # Estimate missing birthdays as 22 years before each athlete's first race
+        # (Feb 29 debuts map to Feb 28) with one group-by and a join, then derive
+        # Age and Exp in the same lazy query
+        missing_count = df.filter(pl.col('Birthday').is_null()).select(pl.col('ID').n_unique()).item()
+        if missing_count > 0:
+            logging.info(f"Estimating birthdays for {missing_count} athletes based on first race (assuming age 22 at debut)")
+
+        first_date = pl.col('First_Date')
+        estimated_birthdays = (
+            df.lazy()
+            .filter(pl.col('Birthday').is_null())
+            .group_by('ID')
+            .agg(pl.col('Date').min().alias('First_Date'))
+            .select([
+                'ID',
+                pl.date(
+                    first_date.dt.year() - 22,
+                    first_date.dt.month(),
+                    pl.when((first_date.dt.month() == 2) & (first_date.dt.day() == 29))
+                    .then(pl.lit(28))
+                    .otherwise(first_date.dt.day())
+                ).cast(pl.Datetime).alias('Estimated_Birthday')
+            ])
         )
         
-        # Calculate experience (races participated in)
-        df = df.sort(['ID', 'Date'])
-        df = df.with_columns([
-            pl.col('ID')
-            .cum_count()
-            .over(['ID', 'Skier'])
-            .cast(pl.Int32)
-            .alias('Exp')
-        ])
+        df = (
+            df.lazy()
+            .join(estimated_birthdays, on='ID', how='left')
+            .with_columns(
+                pl.coalesce(['Estimated_Birthday', 'Birthday']).alias('Birthday')
+            )
+            .drop('Estimated_Birthday')
+            # Calculate age - now all athletes should have birthdays (actual or estimated)
+            .with_columns(
+                ((pl.col('Date').cast(pl.Datetime) - pl.col('Birthday')).dt.total_days() / 365.25)
+                .cast(pl.Float64)
+                .alias('Age')
+            )
+            # Calculate experience (races participated in)
+            .sort(['ID', 'Date'])
+            .with_columns(
+                pl.col('ID')
+                .cum_count()
+                .over(['ID', 'Skier'])
+                .cast(pl.Int32)
+                .alias('Exp')
+            )
+            .collect()
+        )
         
         # Split by sex
         men_df = df.filter(pl.col('Sex') == 'M')
@@ -1,4 +1,5 @@
 import polars as pl
+import os
 import logging
 from datetime import datetime
 import sys
@@ -12,6 +13,11 @@ import concurrent.futures
 from scrape import (setup_cache_structure, fetch_season_links, 
                    get_race_data, get_race_results, construct_historical_df, format_skier_name)
 
+# Shared update helpers (race keys and experience as Polars frames)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from update_common import (race_keys_frame, combine_race_keys, max_experience_frame,
+                           is_known_race, apply_experience_offset)
+
 def setup_logging():
     """Set up logging configuration"""
     logging.basicConfig(
@@ -23,28 +29,24 @@ def get_existing_metadata(men_df: pl.DataFrame, ladies_df: pl.DataFrame) -> Dict
     """Extract metadata from existing DataFrames"""
     try:
         # Get unique races from both men and ladies datasets
-        men_races = set(men_df.select(["Date", "City", "RaceType"]).unique().rows())
-        ladies_races = set(ladies_df.select(["Date", "City", "RaceType"]).unique().rows())
-        all_races = men_races.union(ladies_races)
+        men_races = race_keys_frame(men_df, ["Date", "City", "RaceType"])
+        ladies_races = race_keys_frame(ladies_df, ["Date", "City", "RaceType"])
+        all_races = combine_race_keys(men_races, ladies_races)
         
         # Get max experience per ID for men
-        men_max_exp = (men_df.group_by('ID')
-                     .agg(pl.col('Exp').max().alias('max_exp')))
-        men_exp_dict = dict(zip(men_max_exp['ID'], men_max_exp['max_exp']))
+        men_experience = max_experience_frame(men_df)
         
         # Get max experience per ID for ladies
-        ladies_max_exp = (ladies_df.group_by('ID')
-                        .agg(pl.col('Exp').max().alias('max_exp')))
-        ladies_exp_dict = dict(zip(ladies_max_exp['ID'], ladies_max_exp['max_exp']))
+        ladies_experience = max_experience_frame(ladies_df)
         
         return {
             'races': all_races,
-            'men_experience': men_exp_dict,
-            'ladies_experience': ladies_exp_dict
+            'men_experience': men_experience,
+            'ladies_experience': ladies_experience
         }
     except Exception as e:
         logging.error(f"Error extracting metadata: {e}")
-        return {'races': set(), 'men_experience': {}, 'ladies_experience': {}}
+        return {'races': None, 'men_experience': None, 'ladies_experience': None}
 
 def load_and_process_data() -> Tuple[Optional[pl.DataFrame], Optional[pl.DataFrame], Dict]:
     """Load existing data and extract metadata"""
@@ -104,13 +106,13 @@ def load_and_process_data() -> Tuple[Optional[pl.DataFrame], Optional[pl.DataFra
             empty_men = pl.DataFrame(schema=ladies_df.schema)
             metadata = get_existing_metadata(empty_men, ladies_df)
         else:
-            metadata = {'races': set(), 'men_experience': {}, 'ladies_experience': {}}
+            metadata = {'races': None, 'men_experience': None, 'ladies_experience': None}
         
         return men_df, ladies_df, metadata
         
     except Exception as e:
         logging.error(f"Error loading data: {e}")
-        return None, None, {'races': set(), 'men_experience': {}, 'ladies_experience': {}}
+        return None, None, {'races': None, 'men_experience': None, 'ladies_experience': None}
 
 def process_race(link: List[Any], metadata: Dict) -> Optional[Tuple]:
     """Process a single race with its results"""
@@ -126,7 +128,7 @@ def process_race(link: List[Any], metadata: Dict) -> Optional[Tuple]:
             
         # Check if race exists
         race_key = (table_data[0], table_data[1], table_data[6])  # Date, City, RaceType
-        if race_key in metadata['races']:
+        if is_known_race(race_key, metadata['races']):
             logging.info(f"Skipping existing race: {race_key}")
             return None
             
@@ -197,17 +199,12 @@ def process_new_season(metadata: Dict) -> Tuple[Optional[pl.DataFrame], Optional
     # Construct historical DataFrame from new results
     return construct_historical_df(all_tables, all_results)
 
-def update_experience(df: pl.DataFrame, exp_dict: Dict, sex: str) -> pl.DataFrame:
+def update_experience(df: pl.DataFrame, experience: Optional[pl.DataFrame], sex: str) -> pl.DataFrame:
     """Update experience values for new data based on sex"""
     if df is None or len(df) == 0:
         return df
         
-    return df.with_columns([
-        (pl.col('ID')
-         .map_elements(lambda x: exp_dict.get(x, 0))
-         .add(pl.col('Exp'))
-         .alias('Exp'))
-    ])
+    return apply_experience_offset(df, experience)
 
 def merge_and_save(old_df: Optional[pl.DataFrame], 
                   new_df: Optional[pl.DataFrame], 
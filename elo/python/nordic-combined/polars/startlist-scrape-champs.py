@@ -23,7 +23,19 @@ warnings.filterwarnings('ignore')
 from startlist_common import *
 
 # Import Championships config functions
-from config import get_champs_athletes
+from champs_roster import ChampsRoster, get_champs_roster
+
+def get_roster(gender: str) -> Optional[ChampsRoster]:
+    """Championship roster for a gender, matched against the latest ELO scores once per run"""
+    from config import CHAMPS_ATHLETES_MEN, CHAMPS_ATHLETES_LADIES
+
+    athletes = CHAMPS_ATHLETES_MEN if gender == 'men' else CHAMPS_ATHLETES_LADIES
+    elo_path = f"~/ski/elo/python/nordic-combined/polars/excel365/{gender}_chrono_pred.csv"
+    return get_champs_roster(elo_path, athletes, get_latest_elo_scores, threshold=80)
+
+def main_elo(elo_data: Dict) -> float:
+    """Team selection ELO: overall Elo, falling back to specific disciplines"""
+    return elo_data.get('Elo', 0) or elo_data.get('Individual_Elo', 0) or 0
 
 def process_championships() -> None:
     """Main function to process Championships races"""
@@ -151,13 +163,10 @@ def create_simple_championships_startlist(gender: str, races_df: pd.DataFrame) -
     
     print(f"Creating simple startlist for {gender}")
     
-    # Get ELO data path
-    elo_path = f"~/ski/elo/python/nordic-combined/polars/excel365/{gender}_chrono_pred.csv"
-    
     try:
         print("Loading ELO scores...")
-        elo_scores = get_latest_elo_scores(elo_path)
-        if elo_scores is None or elo_scores.empty:
+        roster = get_roster(gender)
+        if roster is None:
             print(f"No ELO scores found for {gender}")
             return
         
@@ -166,18 +175,13 @@ def create_simple_championships_startlist(gender: str, races_df: pd.DataFrame) -
         processed_athletes = set()
         
         # Get all nations with Championships athletes
-        from config import CHAMPS_ATHLETES_MEN, CHAMPS_ATHLETES_LADIES
-        
-        if gender == 'men':
-            all_nations = set(CHAMPS_ATHLETES_MEN.keys())
-        else:
-            all_nations = set(CHAMPS_ATHLETES_LADIES.keys())
+        all_nations = roster.nations(min_athletes=0)
         
         print(f"Found {len(all_nations)} nations with {gender} athletes configured")
         
         # Process each nation's athletes
-        for nation in sorted(all_nations):
-            athletes = get_champs_athletes(nation, gender)
+        for nation in all_nations:
+            athletes = roster.athletes(nation)
             
             print(f"\\nProcessing {nation}: {len(athletes)} athletes")
             
@@ -188,26 +192,17 @@ def create_simple_championships_startlist(gender: str, races_df: pd.DataFrame) -
                 
                 print(f"Processing athlete: {athlete_name}")
                 
-                # Match with ELO scores
-                elo_match = None
-                if athlete_name in elo_scores['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    # Try fuzzy matching
-                    elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
+                # Look up the roster's ELO match
+                elo_match = roster.match(athlete_name)
                 
                 # Get ELO data
                 if elo_match:
-                    elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
+                    elo_data = roster.record(athlete_name)
                     print(f"Found ELO match: {athlete_name} -> {elo_match}")
                 else:
                     # Use quartile imputation for missing athletes
                     print(f"No ELO match found for {athlete_name}, using quartile imputation")
-                    elo_columns = [col for col in elo_scores.columns if 'Elo' in col]
-                    elo_data = {}
-                    for col in elo_columns:
-                        q1_value = elo_scores[col].quantile(0.25)
-                        elo_data[col] = q1_value
+                    elo_data = dict(roster.quartiles())
                     elo_data['Skier'] = athlete_name
                 
                 # Build row data (simple version - no race probabilities)
@@ -242,26 +237,15 @@ def create_team_championships_startlist(gender: str, races_df: pd.DataFrame) ->
     
     print(f"Creating team startlist for {gender}")
     
-    # Use individual ELO data (like ski jumping does)
-    elo_path = f"~/ski/elo/python/nordic-combined/polars/excel365/{gender}_chrono_pred.csv"
-    
     try:
         print("Loading ELO scores...")
-        elo_scores = get_latest_elo_scores(elo_path)
-        if elo_scores is None or elo_scores.empty:
+        roster = get_roster(gender)
+        if roster is None:
             print(f"No ELO scores found for {gender}")
             return
         
         team_data = []
 
-        # Get qualifying nations from config
-        from config import CHAMPS_ATHLETES_MEN, CHAMPS_ATHLETES_LADIES
-
-        if gender == 'men':
-            all_nations = set(CHAMPS_ATHLETES_MEN.keys())
-        else:
-            all_nations = set(CHAMPS_ATHLETES_LADIES.keys())
-
         # Determine minimum athletes needed based on race type
         race_info = races_df.iloc[0]
         race_type = race_info['RaceType']
@@ -270,38 +254,13 @@ def create_team_championships_startlist(gender: str, races_df: pd.DataFrame) ->
         else:
             min_athletes = 4  # Regular Team needs 4 athletes (or 3 in some formats)
 
-        qualifying_nations = []
-        for nation in all_nations:
-            athletes = get_champs_athletes(nation, gender)
-            if len(athletes) >= min_athletes:
-                qualifying_nations.append(nation)
+        # Get qualifying nations from config
+        qualifying_nations = roster.nations(min_athletes=min_athletes)
 
         print(f"Found {len(qualifying_nations)} qualifying nations with {min_athletes}+ {gender} athletes for {race_type}")
         
-        for nation in sorted(qualifying_nations):
-            athletes = get_champs_athletes(nation, gender)
-            
-            # Sort athletes by highest ELO to select the best performers
-            athlete_elos = []
-            for athlete_name in athletes:
-                # Match with ELO scores
-                elo_match = None
-                if athlete_name in elo_scores['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
-                
-                if elo_match:
-                    elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
-                    # Use overall Elo as primary ranking, fallback to specific disciplines
-                    main_elo = elo_data.get('Elo', 0) or elo_data.get('Individual_Elo', 0) or 0
-                    athlete_elos.append((athlete_name, main_elo))
-                else:
-                    # No ELO match - assign low value
-                    athlete_elos.append((athlete_name, 0))
-            
-            # Sort by ELO (highest first) and select top athletes
-            athlete_elos.sort(key=lambda x: x[1], reverse=True)
+        for nation in qualifying_nations:
+            athletes = roster.athletes(nation)
             
             # Check race type to determine team size
             race_info = races_df.iloc[0]
@@ -310,17 +269,17 @@ def create_team_championships_startlist(gender: str, races_df: pd.DataFrame) ->
             if 'Sprint' in race_type:
                 # Team Sprint uses top 2 athletes by ELO
                 team_size = 2
-                team_athletes = [athlete for athlete, elo in athlete_elos[:team_size]]
+                team_athletes = roster.top(nation, team_size, main_elo)
                 print(f"Creating Team Sprint for {nation} with top {len(team_athletes)} athletes by ELO: {team_athletes}")
             else:
                 # Regular Team uses top 4 athletes by ELO (or fewer if less available)
                 team_size = min(4, len(athletes))
-                team_athletes = [athlete for athlete, elo in athlete_elos[:team_size]]
+                team_athletes = roster.top(nation, team_size, main_elo)
                 print(f"Creating Team for {nation} with top {len(team_athletes)} athletes by ELO: {team_athletes}")
             
             # Create team record
             team_record = create_team_record_from_config(
-                nation, team_athletes, elo_scores, race_info
+                nation, team_athletes, roster, race_info
             )
             team_data.append(team_record)
         
@@ -353,10 +312,10 @@ def create_mixed_team_championships_startlist(races_df: pd.DataFrame) -> None:
     
     try:
         # Load both men's and ladies' ELO data
-        men_elo = get_latest_elo_scores("~/ski/elo/python/nordic-combined/polars/excel365/men_chrono_pred.csv")
-        ladies_elo = get_latest_elo_scores("~/ski/elo/python/nordic-combined/polars/excel365/ladies_chrono_pred.csv")
+        men_roster = get_roster('men')
+        ladies_roster = get_roster('ladies')
         
-        if men_elo is None or ladies_elo is None or men_elo.empty or ladies_elo.empty:
+        if men_roster is None or ladies_roster is None:
             print("Could not load ELO data for mixed teams")
             return
         
@@ -380,59 +339,23 @@ def create_mixed_team_championships_startlist(races_df: pd.DataFrame) -> None:
         # Filter for nations with sufficient athletes
         final_nations = []
         for nation in qualifying_nations:
-            men_athletes = get_champs_athletes(nation, 'men')
-            ladies_athletes = get_champs_athletes(nation, 'ladies')
+            men_athletes = men_roster.athletes(nation)
+            ladies_athletes = ladies_roster.athletes(nation)
             if len(men_athletes) >= min_per_gender and len(ladies_athletes) >= min_per_gender:
                 final_nations.append(nation)
 
         print(f"Found {len(final_nations)} qualifying nations for {race_type}")
         
         for nation in sorted(final_nations):
-            # Get top 2 men by ELO
-            men_athletes_all = get_champs_athletes(nation, 'men')
-            men_elos = []
-            for athlete_name in men_athletes_all:
-                if athlete_name in men_elo['Skier'].values:
-                    elo_data = men_elo[men_elo['Skier'] == athlete_name].iloc[0].to_dict()
-                    main_elo = elo_data.get('Elo', 0) or elo_data.get('Individual_Elo', 0) or 0
-                    men_elos.append((athlete_name, main_elo))
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, men_elo['Skier'].tolist())
-                    if elo_match:
-                        elo_data = men_elo[men_elo['Skier'] == elo_match].iloc[0].to_dict()
-                        main_elo = elo_data.get('Elo', 0) or elo_data.get('Individual_Elo', 0) or 0
-                        men_elos.append((athlete_name, main_elo))
-                    else:
-                        men_elos.append((athlete_name, 0))
+            men_athletes = men_roster.top(nation, 2, main_elo)  # Top 2 men by ELO
             
-            men_elos.sort(key=lambda x: x[1], reverse=True)
-            men_athletes = [athlete for athlete, elo in men_elos[:2]]  # Top 2 men by ELO
-            
-            # Get top 2 ladies by ELO
-            ladies_athletes_all = get_champs_athletes(nation, 'ladies')
-            ladies_elos = []
-            for athlete_name in ladies_athletes_all:
-                if athlete_name in ladies_elo['Skier'].values:
-                    elo_data = ladies_elo[ladies_elo['Skier'] == athlete_name].iloc[0].to_dict()
-                    main_elo = elo_data.get('Elo', 0) or elo_data.get('Individual_Elo', 0) or 0
-                    ladies_elos.append((athlete_name, main_elo))
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, ladies_elo['Skier'].tolist())
-                    if elo_match:
-                        elo_data = ladies_elo[ladies_elo['Skier'] == elo_match].iloc[0].to_dict()
-                        main_elo = elo_data.get('Elo', 0) or elo_data.get('Individual_Elo', 0) or 0
-                        ladies_elos.append((athlete_name, main_elo))
-                    else:
-                        ladies_elos.append((athlete_name, 0))
-            
-            ladies_elos.sort(key=lambda x: x[1], reverse=True)
-            ladies_athletes = [athlete for athlete, elo in ladies_elos[:2]]  # Top 2 ladies by ELO
+            ladies_athletes = ladies_roster.top(nation, 2, main_elo)  # Top 2 ladies by ELO
             
             print(f"Creating mixed team for {nation}: Men (top 2 by ELO): {men_athletes}, Ladies (top 2 by ELO): {ladies_athletes}")
             
             # Create mixed team record
             team_record = create_mixed_team_record(
-                nation, men_athletes, ladies_athletes, men_elo, ladies_elo, races_df.iloc[0]
+                nation, men_athletes, ladies_athletes, men_roster, ladies_roster, races_df.iloc[0]
             )
             mixed_data.append(team_record)
         
@@ -452,7 +375,7 @@ def create_mixed_team_championships_startlist(races_df: pd.DataFrame) -> None:
         print(f"Error creating mixed team Championships startlist: {e}")
         traceback.print_exc()
 
-def create_team_record_from_config(nation: str, athletes: List[str], elo_scores: pd.DataFrame, race: pd.Series) -> Dict:
+def create_team_record_from_config(nation: str, athletes: List[str], roster: ChampsRoster, race: pd.Series) -> Dict:
     """Create team record using config athletes (adapted from ski jumping for Nordic Combined)"""
     
     # Define Elo columns for Nordic Combined
@@ -491,15 +414,11 @@ def create_team_record_from_config(nation: str, athletes: List[str], elo_scores:
         member_index = i + 1
         athlete_name = athletes[i]
         
-        # Match with ELO scores
-        elo_match = None
-        if athlete_name in elo_scores['Skier'].values:
-            elo_match = athlete_name
-        else:
-            elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
+        # Look up the roster's ELO match
+        elo_match = roster.match(athlete_name)
         
         if elo_match:
-            elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
+            elo_data = roster.record(athlete_name)
             valid_member_count += 1
             
             # Add to team totals
@@ -534,7 +453,7 @@ def create_team_record_from_config(nation: str, athletes: List[str], elo_scores:
     return team_record
 
 def create_mixed_team_record(nation: str, men_athletes: List[str], ladies_athletes: List[str], 
-                           men_elo: pd.DataFrame, ladies_elo: pd.DataFrame, race: pd.Series) -> Dict:
+                           men_roster: ChampsRoster, ladies_roster: ChampsRoster, race: pd.Series) -> Dict:
     """Create mixed team record (2 men + 2 ladies for Nordic Combined)"""
     
     elo_columns = [
@@ -568,17 +487,13 @@ def create_mixed_team_record(nation: str, men_athletes: List[str], ladies_athlet
     
     # Process men first, then ladies
     member_index = 1
-    for athletes, elo_data in [(men_athletes, men_elo), (ladies_athletes, ladies_elo)]:
+    for athletes, roster in [(men_athletes, men_roster), (ladies_athletes, ladies_roster)]:
         for athlete_name in athletes:
             # Match with appropriate ELO data
-            elo_match = None
-            if athlete_name in elo_data['Skier'].values:
-                elo_match = athlete_name
-            else:
-                elo_match = fuzzy_match_name(athlete_name, elo_data['Skier'].tolist())
+            elo_match = roster.match(athlete_name)
             
             if elo_match:
-                athlete_data = elo_data[elo_data['Skier'] == elo_match].iloc[0].to_dict()
+                athlete_data = roster.record(athlete_name)
                 valid_member_count += 1
                 
                 # Add to team totals
@@ -0,0 +1,364 @@
+"""
+Job scheduler for the R simulation scripts (and the scrapers that feed them).
+
+call_r_script and test_harness.py used to run every Rscript one after another
+with capture_output=True, holding each script's whole output in memory. A
+JobScheduler queues jobs with their dependencies instead:
+
+    - a job starts once every job it `needs` has succeeded and every `inputs`
+      file exists
+    - independent jobs run concurrently, up to a CPU budget
+    - stdout/stderr stream to one log file per job
+    - every job's status and wall time are reported at the end
+
+A day's R jobs share one scheduler. Scripts call submit_r_script: inside a
+job queue (R_JOB_QUEUE set) the job is appended to the queue file instead of
+run, and the scheduler that owns the queue picks it up while it runs, with
+the scraper job that queued it (R_JOB_PARENT) as a dependency. Scrapers of
+different sports and the relay scripts they start all queue into it, so the
+R jobs run concurrently instead of one Rscript after another.
+
+Environment (or ~/.env via pipeline_config):
+    R_JOB_CPUS     # CPU budget shared by running jobs (default: all cores)
+    R_JOB_LOG_DIR  # log directory (default ~/ski/elo/logs/r-jobs)
+    R_JOB_QUEUE    # queue file submit_r_script appends to (set by the queue owner)
+    R_JOB_PARENT   # job whose process is running (set by the scheduler)
+
+Usage:
+    from r_scheduler import JobScheduler, r_command
+
+    scheduler = JobScheduler()
+    scheduler.add('alpine-scrape', [sys.executable, scraper_path], cwd=scraper_dir)
+    scheduler.add('alpine-race-picks', r_command(r_script_path), needs=['alpine-scrape'],
+                  inputs=[startlist_path], timeout=600)
+    jobs = scheduler.run()
+    scheduler.report()
+
+    # From a scraper: queued when a job queue is open, else run now
+    job = submit_r_script('~/blog/.../race-picks-relay.R', ['men'])
+
+    # A standalone script owns a queue; its queued jobs run together on exit
+    with r_job_queue():
+        process_races()
+
+    # A day's scrapers (any sports) with every R job they queue, in one scheduler
+    python r_scheduler.py ski/polars/startlist-scrape-races.py alpine/polars/startlist-scrape-weekend.py
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pipeline_config  # noqa: F401 - loads ~/.env into the environment
+
+CPU_BUDGET = int(os.getenv('R_JOB_CPUS', '0') or 0) or (os.cpu_count() or 1)
+LOG_DIR = Path(os.path.expanduser(os.getenv('R_JOB_LOG_DIR', '~/ski/elo/logs/r-jobs')))
+POLL_INTERVAL = 0.2
+QUEUE_ENV = 'R_JOB_QUEUE'
+PARENT_ENV = 'R_JOB_PARENT'
+
+@dataclass
+class Job:
+    """One command in the schedule."""
+    name: str
+    command: List[str]
+    needs: List[str] = field(default_factory=list)
+    inputs: List[str] = field(default_factory=list)
+    cwd: Optional[str] = None
+    env: Optional[Dict[str, str]] = None
+    timeout: Optional[float] = None
+    cpus: int = 1
+
+    status: str = 'pending'  # pending, running, succeeded, failed, timeout, skipped
+    returncode: Optional[int] = None
+    message: str = ''
+    log_path: Optional[Path] = None
+    started: Optional[float] = None
+    duration: Optional[float] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == 'succeeded'
+
+    def read_log(self) -> str:
+        """Full log of a finished job."""
+        if self.log_path is None or not self.log_path.exists():
+            return ''
+        return self.log_path.read_text(errors='replace')
+
+def r_command(script_path: str, args: Sequence[str] = ()) -> List[str]:
+    """Rscript command line for a script."""
+    return ['Rscript', os.path.expanduser(str(script_path)), *[str(arg) for arg in args]]
+
+class JobScheduler:
+    """Runs queued jobs concurrently, respecting dependencies and a CPU budget."""
+
+    def __init__(self, cpu_budget: Optional[int] = None, log_dir: Optional[Path] = None,
+                 queue_path: Optional[Path] = None):
+        self.cpu_budget = max(1, cpu_budget or CPU_BUDGET)
+        self.log_dir = Path(log_dir) if log_dir else LOG_DIR
+        self.jobs: Dict[str, Job] = {}
+        self.queue_path = Path(queue_path) if queue_path else None
+        self._queue_offset = 0
+
+    def add(self, name: str, command: List[str], needs: Sequence[str] = (), inputs: Sequence[str] = (),
+            cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None,
+            timeout: Optional[float] = None, cpus: int = 1) -> Job:
+        """Queue a job; `needs` are names of jobs that must succeed first."""
+        if name in self.jobs:
+            raise ValueError(f"Duplicate job name: {name}")
+        job = Job(name=name, command=list(command), needs=list(needs),
+                  inputs=[os.path.expanduser(str(path)) for path in inputs],
+                  cwd=os.path.expanduser(cwd) if cwd else None, env=env, timeout=timeout,
+                  cpus=max(1, min(cpus, self.cpu_budget)))
+        self.jobs[name] = job
+        return job
+
+    def drain_queue(self) -> List[Job]:
+        """Add the jobs appended to the queue file since the last drain."""
+        if self.queue_path is None or not self.queue_path.exists():
+            return []
+        with open(self.queue_path, 'rb') as f:
+            f.seek(self._queue_offset)
+            lines = f.readlines()
+        # Leave a partly written last line for the next drain
+        if lines and not lines[-1].endswith(b'\n'):
+            lines.pop()
+        self._queue_offset += sum(len(line) for line in lines)
+        added = []
+        for line in lines:
+            spec = json.loads(line.decode('utf-8'))
+            name = spec.pop('name')
+            unique = name
+            count = 1
+            while unique in self.jobs:
+                count += 1
+                unique = f"{name}-{count}"
+            added.append(self.add(unique, **spec))
+            print(f"[{unique}] queued" + (f" after {', '.join(spec['needs'])}" if spec.get('needs') else ''))
+        return added
+
+    def _blocked_reason(self, job: Job) -> Optional[str]:
+        """Why a pending job can never start, or None if it may still run."""
+        for dep in job.needs:
+            if dep not in self.jobs:
+                return f"unknown dependency {dep}"
+            if self.jobs[dep].status in ('failed', 'timeout', 'skipped'):
+                return f"dependency {dep} {self.jobs[dep].status}"
+        return None
+
+    def _ready(self, job: Job) -> bool:
+        return all(self.jobs[dep].succeeded for dep in job.needs)
+
+    def _start(self, job: Job) -> subprocess.Popen:
+        missing = [path for path in job.inputs if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"missing inputs: {', '.join(missing)}")
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        job.log_path = self.log_dir / f"{job.name}-{stamp}.log"
+        log_file = open(job.log_path, 'w')
+        log_file.write(f"$ {' '.join(job.command)}\n")
+        log_file.flush()
+        env = {**os.environ, **(job.env or {}), PARENT_ENV: job.name}
+        if self.queue_path is not None:
+            env[QUEUE_ENV] = str(self.queue_path)
+        try:
+            process = subprocess.Popen(job.command, cwd=job.cwd, env=env,
+                                       stdout=log_file, stderr=subprocess.STDOUT, text=True)
+        finally:
+            log_file.close()
+        job.status = 'running'
+        job.started = time.monotonic()
+        print(f"[{job.name}] started ({job.cpus} cpu) -> {job.log_path}")
+        return process
+
+    def _finish(self, job: Job, status: str, returncode: Optional[int] = None, message: str = '') -> None:
+        job.status = status
+        job.returncode = returncode
+        job.message = message
+        if job.started is not None:
+            job.duration = time.monotonic() - job.started
+        timing = f" in {job.duration:.1f}s" if job.duration is not None else ''
+        print(f"[{job.name}] {status}{timing}" + (f": {message}" if message else ''))
+
+    def run(self) -> Dict[str, Job]:
+        """Run every queued job; returns the jobs by name once all have finished."""
+        running: Dict[str, subprocess.Popen] = {}
+        cpus_in_use = 0
+
+        while True:
+            self.drain_queue()
+
+            # Settle jobs that can never run
+            for job in self.jobs.values():
+                if job.status == 'pending':
+                    reason = self._blocked_reason(job)
+                    if reason:
+                        self._finish(job, 'skipped', message=reason)
+
+            # Start ready jobs while there is CPU budget (always allow one job)
+            for job in self.jobs.values():
+                if job.status != 'pending' or not self._ready(job):
+                    continue
+                if running and cpus_in_use + job.cpus > self.cpu_budget:
+                    continue
+                try:
+                    running[job.name] = self._start(job)
+                    cpus_in_use += job.cpus
+                except (OSError, FileNotFoundError) as e:
+                    self._finish(job, 'failed', message=str(e))
+
+            if not running:
+                if self.drain_queue():
+                    continue
+                pending = [job for job in self.jobs.values() if job.status == 'pending']
+                if any(self._blocked_reason(job) for job in pending):
+                    # A job just failed to start; settle its dependents on the next pass
+                    continue
+                for job in pending:
+                    self._finish(job, 'skipped', message="dependency cycle")
+                break
+
+            time.sleep(POLL_INTERVAL)
+            for name, process in list(running.items()):
+                job = self.jobs[name]
+                returncode = process.poll()
+                if returncode is None:
+                    if job.timeout and time.monotonic() - job.started > job.timeout:
+                        process.kill()
+                        process.wait()
+                        self._finish(job, 'timeout', message=f"timed out after {job.timeout:g}s")
+                    else:
+                        continue
+                elif returncode == 0:
+                    self._finish(job, 'succeeded', returncode)
+                else:
+                    self._finish(job, 'failed', returncode, f"return code {returncode}")
+                del running[name]
+                cpus_in_use -= job.cpus
+
+        return self.jobs
+
+    def report(self) -> None:
+        """Print status and duration of every job."""
+        if not self.jobs:
+            return
+        print(f"\n{'Job':<40} {'Status':<10} {'Seconds':>8}  Log")
+        for job in sorted(self.jobs.values(), key=lambda j: -(j.duration or 0)):
+            seconds = f"{job.duration:.1f}" if job.duration is not None else '-'
+            print(f"{job.name:<40} {job.status:<10} {seconds:>8}  {job.log_path or ''}")
+        total = sum(job.duration or 0 for job in self.jobs.values())
+        started = [job.started for job in self.jobs.values() if job.started is not None]
+        if started:
+            wall = max(job.started + (job.duration or 0) for job in self.jobs.values()
+                       if job.started is not None) - min(started)
+            print(f"Total job time {total:.1f}s, wall time {wall:.1f}s ({self.cpu_budget} cpu budget)")
+
+def r_job_name(script_path: str, args: Sequence[str] = ()) -> str:
+    """'cross-country-race-picks-relay-men' for .../cross-country/drafts/race-picks-relay.R men."""
+    path = Path(os.path.expanduser(str(script_path)))
+    sport = path.parent.parent.name if path.parent.name == 'drafts' else path.parent.name
+    return '-'.join([sport, path.stem, *[str(arg) for arg in args]])
+
+def run_r_script(script_path: str, args: Sequence[str] = (), name: Optional[str] = None,
+                 cwd: Optional[str] = None, timeout: Optional[float] = None) -> Job:
+    """Run a single R script through the scheduler (log file + timing) and return its job."""
+    name = name or r_job_name(script_path, args)
+    scheduler = JobScheduler()
+    job = scheduler.add(name, r_command(script_path, args), cwd=cwd, timeout=timeout)
+    scheduler.run()
+    return job
+
+def submit_r_script(script_path: str, args: Sequence[str] = (), name: Optional[str] = None,
+                    cwd: Optional[str] = None, inputs: Sequence[str] = (), needs: Sequence[str] = (),
+                    timeout: Optional[float] = None) -> Optional[Job]:
+    """
+    Queue an R script on the open job queue, or run it now when there is none.
+
+    Returns None when queued (the queue owner runs and reports it), else the finished job.
+    A queued job needs the job whose process queued it, so it starts once that scraper
+    has written all of its startlists.
+    """
+    queue_path = os.getenv(QUEUE_ENV)
+    if not queue_path:
+        return run_r_script(script_path, args, name=name, cwd=cwd, timeout=timeout)
+    parent = os.getenv(PARENT_ENV)
+    spec = {
+        'name': name or r_job_name(script_path, args),
+        'command': r_command(script_path, args),
+        'needs': list(needs) + ([parent] if parent else []),
+        'inputs': [os.path.expanduser(str(path)) for path in inputs],
+        'cwd': cwd,
+        'timeout': timeout,
+    }
+    with open(queue_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(spec) + '\n')
+    print(f"Queued R script {spec['name']} on {queue_path}")
+    return None
+
+def _new_queue_path() -> Path:
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    return LOG_DIR / f"queue-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl"
+
+@contextmanager
+def r_job_queue(cpu_budget: Optional[int] = None) -> Iterator[Optional[JobScheduler]]:
+    """
+    Open a job queue for the block: R scripts submitted inside it (by this process or
+    the scripts it starts) run together in one scheduler when the block ends.
+
+    Inside an already open queue this is a no-op; the outer owner runs the jobs.
+    """
+    if os.getenv(QUEUE_ENV):
+        yield None
+        return
+    queue_path = _new_queue_path()
+    queue_path.touch()
+    # Jobs queued here run after this block, not after a job of some outer scheduler
+    parent = os.environ.pop(PARENT_ENV, None)
+    os.environ[QUEUE_ENV] = str(queue_path)
+    scheduler = JobScheduler(cpu_budget=cpu_budget, queue_path=queue_path)
+    try:
+        yield scheduler
+    finally:
+        os.environ.pop(QUEUE_ENV, None)
+        if parent is not None:
+            os.environ[PARENT_ENV] = parent
+        scheduler.run()
+        scheduler.report()
+        queue_path.unlink(missing_ok=True)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run startlist scrapers concurrently with every R job they queue")
+    parser.add_argument('scrapers', nargs='+', help='Scraper scripts (paths relative to ~/ski/elo/python ok)')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='CPU budget for concurrent jobs (default: R_JOB_CPUS or all cores)')
+    parser.add_argument('--timeout', type=float, default=None, help='Timeout per scraper in seconds')
+    args = parser.parse_args()
+
+    queue_path = _new_queue_path()
+    queue_path.touch()
+    scheduler = JobScheduler(cpu_budget=args.jobs, queue_path=queue_path)
+    base = Path(os.path.expanduser('~/ski/elo/python'))
+    for scraper in args.scrapers:
+        path = Path(os.path.expanduser(scraper))
+        path = path if path.is_absolute() or path.exists() else base / path
+        path = path.resolve()
+        name = f"{path.parent.parent.name}-{path.stem}" if path.parent.name == 'polars' else path.stem
+        scheduler.add(name, [sys.executable, str(path)], cwd=str(path.parent), timeout=args.timeout)
+    jobs = scheduler.run()
+    scheduler.report()
+    queue_path.unlink(missing_ok=True)
+    return 0 if all(job.succeeded for job in jobs.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
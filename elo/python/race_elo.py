@@ -0,0 +1,62 @@
+"""
+Race-specific Elo for a whole startlist in one pass.
+
+Every startlist script picks a race's Elo as the first available column of a
+priority list (Sprint_C_Elo, Sprint_Elo, Classic_Elo, Elo for a classic sprint,
+and so on). That used to run per athlete: get_race_specific_elo walked the
+list over each athlete's Elo record while the rows were built, and athletes
+without an Elo match got 0.0, which sorted them below everyone with a rating.
+
+Each sport now keeps its priority lists as one table keyed by race type
+(ELO_PRIORITY in startlist_common), and Race_Elo is added to the finished
+startlist frame as a single coalesce over that race's columns. Athletes with
+none of them are imputed with the first quartile of the race's leading Elo
+column, as get_latest_elo_scores does for missing columns of matched athletes.
+
+Usage:
+    from race_elo import add_race_elo, elo_quartiles
+
+    df = pd.DataFrame(data)
+    df = add_race_elo(df, get_elo_priority(race_type), elo_quartiles(elo_scores))
+
+    # Polars frames
+    frame = frame.with_columns(race_elo_expr(priority, frame.columns, quartiles).alias('Race_Elo'))
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+import polars as pl
+
+def elo_quartiles(elo_scores: pd.DataFrame) -> Dict[str, float]:
+    """First quartile of every Elo column of the latest Elo scores."""
+    elo_columns = [col for col in elo_scores.columns if 'Elo' in col]
+    return elo_scores[elo_columns].astype(float).quantile(0.25).to_dict()
+
+def imputed_elo(priority: List[str], quartiles: Optional[Dict[str, float]] = None,
+                default: float = 0.0) -> float:
+    """Race_Elo for an athlete with none of the priority columns."""
+    for col in priority:
+        value = (quartiles or {}).get(col)
+        if value is not None and not pd.isna(value):
+            return float(value)
+    return default
+
+def race_elo_expr(priority: List[str], columns: Sequence[str],
+                  quartiles: Optional[Dict[str, float]] = None, default: float = 0.0) -> pl.Expr:
+    """Coalesce of the priority columns present in columns, imputed when all are null."""
+    available = [pl.col(col).cast(pl.Float64) for col in priority if col in columns]
+    return pl.coalesce([*available, pl.lit(imputed_elo(priority, quartiles, default))])
+
+def add_race_elo(df: pd.DataFrame, priority: List[str],
+                 quartiles: Optional[Dict[str, float]] = None,
+                 default: float = 0.0, column: str = 'Race_Elo') -> pd.DataFrame:
+    """Add column to a pandas startlist: first non-null priority column per row."""
+    available = [col for col in priority if col in df.columns]
+    fill_value = imputed_elo(priority, quartiles, default)
+    if available:
+        values = df[available].apply(pd.to_numeric, errors='coerce')
+        df[column] = values.bfill(axis=1).iloc[:, 0].fillna(fill_value)
+    else:
+        df[column] = fill_value
+    return df
@@ -0,0 +1,92 @@
+"""
+Client side of the resident rating service (see rating_service.py).
+
+Stdlib only, so chrono_cache can ask the service before paying for a CSV parse.
+When no service is listening every call raises ServiceUnavailable once and the
+process quietly stays in in-process mode from then on.
+
+Environment (or ~/.env via pipeline_config):
+    RATING_SERVICE         # 'off' to never contact the service (default: on)
+    RATING_SERVICE_SOCKET  # socket path (default ~/.cache/ski-elo/rating-service.sock)
+
+Usage:
+    import rating_client
+
+    if rating_client.enabled():
+        season = rating_client.call('snapshot', path=chrono_path, attr='current_season')
+"""
+
+import os
+import pickle
+import socket
+import struct
+from pathlib import Path
+from typing import Any
+
+import pipeline_config  # noqa: F401 - loads ~/.env into the environment
+
+SOCKET_PATH = Path(os.path.expanduser(
+    os.getenv('RATING_SERVICE_SOCKET', '~/.cache/ski-elo/rating-service.sock')))
+CONNECT_TIMEOUT = 0.5
+CALL_TIMEOUT = 300
+
+_HEADER = struct.Struct('!Q')
+
+class ServiceUnavailable(Exception):
+    """The rating service is not running, or died during a call."""
+
+class ServiceError(Exception):
+    """The rating service ran the call and it raised."""
+
+_disabled = os.getenv('RATING_SERVICE', 'on').lower() in ('off', 'false', '0')
+
+def enabled() -> bool:
+    """True while this process should try the service first."""
+    return not _disabled and SOCKET_PATH.exists()
+
+def enable() -> None:
+    """Try the service again (rating_service.py status/stop)."""
+    global _disabled
+    _disabled = False
+
+def disable() -> None:
+    """Stay in in-process mode for the rest of this process."""
+    global _disabled
+    _disabled = True
+
+def send_message(sock: socket.socket, message: Any) -> None:
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+def recv_message(sock: socket.socket) -> Any:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return pickle.loads(_recv_exact(sock, size))
+
+def call(op: str, **kwargs) -> Any:
+    """Run one operation on the service and return its result."""
+    if not enabled():
+        raise ServiceUnavailable("rating service disabled or not running")
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(SOCKET_PATH))
+            sock.settimeout(CALL_TIMEOUT)
+            send_message(sock, (op, kwargs))
+            ok, result = recv_message(sock)
+    except (OSError, ConnectionError, EOFError, pickle.UnpicklingError) as e:
+        print(f"Rating service unavailable ({e}); continuing in-process")
+        disable()
+        raise ServiceUnavailable(str(e)) from e
+    if not ok:
+        raise ServiceError(result)
+    return result
@@ -0,0 +1,263 @@
+"""
+Resident rating service for the startlist scrapers.
+
+Every startlist script is a cold process that parses the chrono_pred CSVs and
+rebuilds the latest Elo table before it can look at a single startlist. This
+service keeps that state in memory across runs and answers over a Unix socket:
+
+    - chrono snapshots (chrono_cache) per file, re-read when the file changes,
+      including the full frame, so a client never parses the CSV
+    - per-file startlist_common results such as get_latest_elo_scores
+    - point-in-time ratings (latest row per athlete on or before a date)
+    - name matching against the latest Elo names (name_index), so a client
+      never builds the index over the whole Elo name list
+    - nation quotas from each sport's config.py
+
+chrono_cache and startlist_common (match_elo_names, nation_quota_frame) ask the
+service first (rating_client) and fall back to in-process mode when it is not
+running or a call fails there. The clients still import pandas, polars and the
+scraping libraries at startup; what the service saves is the parsing and the
+derived tables.
+
+Only the startlist_common.py and config.py files of SPORT_DIRS are ever loaded,
+and only the functions in PER_FILE_FUNCTIONS can be called per file. Operations
+on different chrono files run concurrently; calls for the same file wait for each
+other. Results are pickled, so the socket is created in a directory only the
+current user can access.
+
+Usage:
+    python rating_service.py serve              # preload every sport, then serve
+    python rating_service.py serve --no-preload
+    python rating_service.py status
+    python rating_service.py stop
+"""
+
+import argparse
+import importlib.util
+import os
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import rating_client
+from rating_client import SOCKET_PATH, recv_message, send_message
+
+# The service answers from memory; it must never call itself
+rating_client.disable()
+
+from chrono_cache import get_chrono  # noqa: E402
+from name_index import get_name_index  # noqa: E402
+
+PYTHON_BASE = Path(os.path.dirname(os.path.abspath(__file__)))
+SPORT_DIRS = ['alpine', 'biathlon', 'nordic-combined', 'ski', 'skijump']
+GENDERS = ['men', 'ladies']
+
+# per_file functions a client may ask for (all @per_chrono_file in startlist_common)
+PER_FILE_FUNCTIONS = {'get_latest_elo_scores'}
+
+def _servable_modules() -> Dict[str, str]:
+    """Real path -> path of every startlist_common.py / config.py the service may load."""
+    paths = {}
+    for sport in SPORT_DIRS:
+        polars_dir = PYTHON_BASE / sport / 'polars'
+        for candidate in (polars_dir / 'startlist_common.py', polars_dir / 'relay' / 'startlist_common.py',
+                          polars_dir / 'config.py', polars_dir / 'relay' / 'config.py'):
+            if candidate.exists():
+                paths[os.path.realpath(candidate)] = str(candidate)
+    return paths
+
+_servable = _servable_modules()
+_modules: Dict[str, ModuleType] = {}
+_modules_lock = threading.Lock()
+_path_locks: Dict[str, threading.Lock] = {}
+_path_locks_lock = threading.Lock()
+_started = time.time()
+
+def _path_lock(path: str) -> threading.Lock:
+    """The lock serializing operations on one chrono file (or module)."""
+    path = os.path.realpath(os.path.expanduser(path))
+    with _path_locks_lock:
+        lock = _path_locks.get(path)
+        if lock is None:
+            lock = _path_locks[path] = threading.Lock()
+        return lock
+
+def _load_module(path: str) -> ModuleType:
+    """Import a sport's startlist_common.py / config.py by path under a name unique to that path."""
+    path = os.path.realpath(path)
+    if path not in _servable:
+        raise PermissionError(f"{path} is not a startlist_common.py or config.py of {', '.join(SPORT_DIRS)}")
+    with _modules_lock:
+        module = _modules.get(path)
+        if module is None:
+            relative = os.path.relpath(path, os.path.realpath(PYTHON_BASE))
+            name = '_served_' + ''.join(c if c.isalnum() else '_' for c in relative[:-3])
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+            _modules[path] = module
+        return module
+
+def _sport_config(module_path: str) -> ModuleType:
+    """config.py next to a startlist_common.py (or one directory up for relay/)."""
+    directory = Path(os.path.realpath(module_path)).parent
+    for candidate in (directory / 'config.py', directory.parent / 'config.py'):
+        if str(candidate) in _servable:
+            return _load_module(str(candidate))
+    raise FileNotFoundError(f"No config.py for {module_path}")
+
+def op_ping() -> dict:
+    return {'pid': os.getpid(), 'uptime': time.time() - _started, 'modules': sorted(_modules)}
+
+def op_snapshot(path: str, attr: str):
+    snapshot = get_chrono(path)
+    value = getattr(snapshot, attr)
+    return value() if callable(value) else value
+
+def op_recent_competitors(path: str, distance=None, technique=None) -> set:
+    return get_chrono(path).recent_competitors(distance, technique)
+
+def op_ratings_as_of(path: str, date: str, skiers: Optional[List[str]] = None):
+    return get_chrono(path).ratings_as_of(date, skiers)
+
+def op_per_file(module: str, function: str, path: str):
+    if function not in PER_FILE_FUNCTIONS:
+        raise PermissionError(f"{function} is not served per file")
+    return getattr(_load_module(module), function)(path)
+
+def op_match_names(module: str, path: str, names: List[str], threshold: int = 85) -> List[str]:
+    startlist_common = _load_module(module)
+    elo_scores = startlist_common.get_latest_elo_scores(path)
+    index = get_name_index(elo_scores['Skier'].tolist(),
+                           manual_mappings=getattr(startlist_common, 'MANUAL_NAME_MAPPINGS', None),
+                           threshold=threshold)
+    return index.match_many(names)
+
+def op_nation_quotas(module: str, gender: str, nations: List[str],
+                     host_nations: Optional[List[str]] = None) -> Dict[str, int]:
+    config = _sport_config(module)
+    host_nations = set(host_nations or [])
+    return {nation: config.get_nation_quota(nation, gender, is_host=nation in host_nations)
+            for nation in nations}
+
+OPERATIONS: Dict[str, Callable] = {
+    'ping': op_ping,
+    'snapshot': op_snapshot,
+    'recent_competitors': op_recent_competitors,
+    'ratings_as_of': op_ratings_as_of,
+    'per_file': op_per_file,
+    'match_names': op_match_names,
+    'nation_quotas': op_nation_quotas,
+}
+
+class RatingRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            op, kwargs = recv_message(self.request)
+        except Exception as e:
+            print(f"Bad request: {e}")
+            return
+        if op == 'shutdown':
+            send_message(self.request, (True, None))
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        started = time.perf_counter()
+        try:
+            # Calls for one chrono file wait for each other; other files run alongside
+            target = kwargs.get('path') or kwargs.get('module')
+            if target:
+                with _path_lock(target):
+                    result = (True, OPERATIONS[op](**kwargs))
+            else:
+                result = (True, OPERATIONS[op](**kwargs))
+        except Exception as e:
+            result = (False, f"{type(e).__name__}: {e}")
+        print(f"{op} {kwargs.get('attr') or kwargs.get('function') or ''} "
+              f"{os.path.basename(kwargs.get('path', ''))} {(time.perf_counter() - started) * 1000:.1f}ms")
+        try:
+            send_message(self.request, result)
+        except OSError as e:
+            print(f"Could not reply to {op}: {e}")
+
+class RatingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def preload() -> None:
+    """Parse every sport's chrono files and latest Elo scores up front."""
+    for sport in SPORT_DIRS:
+        polars_dir = PYTHON_BASE / sport / 'polars'
+        module = polars_dir / 'startlist_common.py'
+        if not module.exists():
+            continue
+        for gender in GENDERS:
+            chrono_path = polars_dir / 'excel365' / f'{gender}_chrono_pred.csv'
+            if not chrono_path.exists():
+                continue
+            try:
+                op_per_file(str(module), 'get_latest_elo_scores', str(chrono_path))
+                get_chrono(str(chrono_path)).latest_records()
+            except Exception as e:
+                print(f"Could not preload {chrono_path}: {e}")
+
+def serve(do_preload: bool = True) -> None:
+    if SOCKET_PATH.exists():
+        try:
+            rating_client.enable()
+            rating_client.call('ping')
+            print(f"Rating service already running on {SOCKET_PATH}")
+            return
+        except rating_client.ServiceUnavailable:
+            SOCKET_PATH.unlink()
+        finally:
+            rating_client.disable()
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    os.chmod(SOCKET_PATH.parent, 0o700)
+
+    if do_preload:
+        preload()
+
+    with RatingServer(str(SOCKET_PATH), RatingRequestHandler) as server:
+        os.chmod(SOCKET_PATH, 0o600)
+        print(f"Rating service listening on {SOCKET_PATH}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if SOCKET_PATH.exists():
+                SOCKET_PATH.unlink()
+            print("Rating service stopped")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Resident rating service for the startlist scrapers')
+    parser.add_argument('command', choices=['serve', 'status', 'stop'])
+    parser.add_argument('--no-preload', action='store_true', help='Load chrono files on first request only')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(do_preload=not args.no_preload)
+        return 0
+
+    rating_client.enable()
+    try:
+        if args.command == 'status':
+            status = rating_client.call('ping')
+            print(f"Running (pid {status['pid']}, up {status['uptime']:.0f}s)")
+            for module in status['modules']:
+                print(f"  {module}")
+        else:
+            rating_client.call('shutdown')
+            print("Stopping rating service")
+    except rating_client.ServiceUnavailable:
+        print("Rating service is not running")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
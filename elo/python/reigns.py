@@ -0,0 +1,186 @@
+"""
+"King/queen of Elo" reigns: who held the top rating after every race, for any sport.
+
+sporcle/*/king-queen.py (one copy per sport) walked each chrono pickle season
+by season and race by race, refiltering the season for the current holder's
+rows and the race for its maximum to decide whether the title changed hands,
+and only ever looked at the overall elo column. Here the whole chrono is one
+sorted pass per rating column:
+
+    - a season's ratings form a (races x athletes) matrix of each athlete's
+      latest rating as of each race, carried forward with ffill and seeded
+      with their pre-race rating from their first race of the season (the
+      rating the old loop used for a holder who had not raced yet)
+    - the leader after each race is the row-wise argmax of that matrix
+    - consecutive races with the same leader collapse into a reign with its
+      start and end dates, day count and number of races
+
+Any rating column works ('elo', 'sprint_classic_elo', 'Sprint_C_Elo', ...);
+its pre-race column is found by swapping elo for pelo. Both the sporcle
+chrono pickles (id, name, nation, date, race, season) and the polars chrono
+outputs (ID, Skier, Nation, Date, Race, Season) are accepted as they are.
+
+Usage:
+    from reigns import load_chrono_frame, king_queen_table, rating_columns
+
+    df = load_chrono_frame('~/ski/elo/python/ski/age/excel365/men_chrono.pkl')
+    table = king_queen_table(df, 'elo')
+
+    python reigns.py                          # every sport, gender and rating column
+    python reigns.py --sports ski alpine --columns elo
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Polars chrono column -> sporcle chrono column
+CHRONO_COLUMNS = {
+    'ID': 'id',
+    'Skier': 'name',
+    'Nation': 'nation',
+    'Date': 'date',
+    'Race': 'race',
+    'Season': 'season',
+}
+
+SPORCLE_SPORTS = ['ski', 'alpine', 'biathlon', 'nc', 'skijump']
+TITLES = {'men': 'king', 'ladies': 'queen'}
+CHRONO_PATH = '~/ski/elo/python/{sport}/age/excel365/{gender}_chrono.pkl'
+OUTPUT_PATH = '~/ski/elo/sporcle/{sport}/excel365/{title}-{col}_sporcle.xlsx'
+
+def load_chrono_frame(path: str) -> pd.DataFrame:
+    """A chrono pickle, CSV or Feather file with sporcle column names."""
+    path = os.path.expanduser(path)
+    if path.endswith('.csv'):
+        df = pd.read_csv(path, low_memory=False)
+    elif path.endswith('.feather'):
+        df = pd.read_feather(path)
+    else:
+        df = pd.read_pickle(path)
+    return standardize_chrono(df)
+
+def standardize_chrono(df: pd.DataFrame) -> pd.DataFrame:
+    renames = {src: dst for src, dst in CHRONO_COLUMNS.items()
+               if src in df.columns and dst not in df.columns}
+    return df.rename(columns=renames)
+
+def pre_race_column(col: str) -> str:
+    """'elo' -> 'pelo', 'Sprint_C_Elo' -> 'Sprint_C_Pelo'."""
+    if col.endswith('Elo'):
+        return col[:-3] + 'Pelo'
+    return col[:-3] + 'pelo'
+
+def rating_columns(df: pd.DataFrame) -> List[str]:
+    """Every post-race rating column of a chrono frame."""
+    return [col for col in df.columns
+            if isinstance(col, str) and col.lower().endswith('elo') and not col.lower().endswith('pelo')]
+
+def race_leaders(df: pd.DataFrame, col: str = 'elo') -> pd.DataFrame:
+    """
+    One row per race: the athlete with the top rating as of that race.
+
+    Columns season, date, race, id, rating; athletes count from the season's
+    first race, at their pre-race rating until they have raced.
+    """
+    pelo = pre_race_column(col)
+    df = df.loc[df[col].notna(), [c for c in ['season', 'date', 'race', 'id', col, pelo] if c in df.columns]]
+    df = df.assign(date=pd.to_datetime(df['date'].astype(str).str[:10]))
+    df = df.sort_values(['season', 'date', 'race'], kind='stable')
+
+    leaders = []
+    for season, seasondf in df.groupby('season', sort=False):
+        races = seasondf[['date', 'race']].drop_duplicates().reset_index(drop=True)
+        race_num = seasondf.groupby(['date', 'race'], sort=False).ngroup()
+        ratings = (seasondf.assign(race_num=race_num)
+                   .pivot_table(index='race_num', columns='id', values=col, aggfunc='last')
+                   .reindex(range(len(races)))
+                   .ffill())
+        if pelo in seasondf.columns:
+            seed = seasondf.groupby('id')[pelo].first().reindex(ratings.columns)
+            ratings = ratings.fillna(seed)
+        ratings = ratings.dropna(axis=0, how='all')
+        # Athletes with no rating yet (no pre-race column, or a missing one) cannot lead
+        values = ratings.to_numpy(dtype=float)
+        top = np.where(np.isnan(values), -np.inf, values).argmax(axis=1)
+        leaders.append(pd.DataFrame({
+            'season': season,
+            'date': races['date'].to_numpy()[ratings.index],
+            'race': races['race'].to_numpy()[ratings.index],
+            'id': ratings.columns.to_numpy()[top],
+            'rating': values[range(len(top)), top],
+        }))
+    if not leaders:
+        return pd.DataFrame(columns=['season', 'date', 'race', 'id', 'rating'])
+    return pd.concat(leaders, ignore_index=True)
+
+def reigns(leaders: pd.DataFrame, today: Optional[datetime.date] = None) -> pd.DataFrame:
+    """Collapse consecutive races with the same leader into reigns."""
+    today = today or datetime.date.today()
+    reign = leaders['id'].ne(leaders['id'].shift()).cumsum()
+    grouped = leaders.groupby(reign, sort=True)
+    table = grouped.agg(id=('id', 'first'), start_date=('date', 'first'),
+                        races=('race', 'size'), peak=('rating', 'max')).reset_index(drop=True)
+    table['start_date'] = table['start_date'].dt.date
+    table['end_date'] = table['start_date'].shift(-1)
+    table.loc[table.index[-1:], 'end_date'] = today
+    table['days'] = pd.to_datetime(table['end_date']) - pd.to_datetime(table['start_date'])
+    return table
+
+def king_queen_table(df: pd.DataFrame, col: str = 'elo',
+                     today: Optional[datetime.date] = None) -> pd.DataFrame:
+    """
+    The reigns table the sporcle quizzes use: start_date, end_date, name, id,
+    nation, dates ('(start - end)', 'Present' for the current reign), days, races.
+    """
+    df = standardize_chrono(df)
+    table = reigns(race_leaders(df, col), today)
+    people = df.drop_duplicates('id', keep='last').set_index('id')
+    table['name'] = table['id'].map(people['name'])
+    table['nation'] = table['id'].map(people['nation'])
+    end = table['end_date'].astype(str)
+    end.iloc[-1:] = 'Present'
+    table['dates'] = '(' + table['start_date'].astype(str) + ' - ' + end + ')'
+    return table[['start_date', 'end_date', 'name', 'id', 'nation', 'dates', 'days', 'races']]
+
+def run(sports: Sequence[str] = SPORCLE_SPORTS, columns: Optional[Sequence[str]] = None,
+        chrono_path: str = CHRONO_PATH, output_path: str = OUTPUT_PATH) -> Dict[tuple, pd.DataFrame]:
+    """Reign tables for every sport, gender and rating column, written as xlsx."""
+    tables = {}
+    for sport in sports:
+        for gender, title in TITLES.items():
+            path = os.path.expanduser(chrono_path.format(sport=sport, gender=gender))
+            if not os.path.exists(path):
+                print(f"No chrono for {sport} {gender}: {path}")
+                continue
+            df = load_chrono_frame(path)
+            for col in columns or rating_columns(df):
+                if col not in df.columns:
+                    continue
+                table = king_queen_table(df, col)
+                table.to_excel(os.path.expanduser(output_path.format(sport=sport, title=title, col=col)),
+                               index=False)
+                print(f"{sport} {title} {col}: {len(table)} reigns")
+                tables[(sport, gender, col)] = table
+    return tables
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='King/queen of Elo reign tables')
+    parser.add_argument('--sports', nargs='+', default=SPORCLE_SPORTS)
+    parser.add_argument('--columns', nargs='+', default=None,
+                        help='Rating columns (default: every rating column in each chrono)')
+    args = parser.parse_args()
+
+    start = time.time()
+    run(args.sports, args.columns)
+    print(time.time() - start)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
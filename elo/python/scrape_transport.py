@@ -0,0 +1,330 @@
+"""
+Record/replay transport for the Winter Sports scrapers.
+
+Every scraper fetches pages through one of three paths: urllib (`fetch_with_retry`),
+requests (`make_request_with_retry`, `get_fis_startlist`) or an aiohttp session.
+This module sits underneath all three so a scrape can be recorded once against the
+live sites and replayed offline for benchmarking and profiling.
+
+Modes are selected with environment variables (or ~/.env via pipeline_config):
+    SCRAPE_MODE=live       # default, talk to the real sites
+    SCRAPE_MODE=record     # talk to the real sites and save every response
+    SCRAPE_MODE=replay     # serve saved responses, never touch the network
+    SCRAPE_FIXTURES=...    # fixture archive directory (default ~/ski/elo/fixtures)
+    SCRAPE_REPLAY_LATENCY  # seconds of simulated latency per replayed response
+    SCRAPE_FIXTURE_SERVER  # e.g. http://127.0.0.1:8765, replay through a local
+                           # stand-in HTTP server instead of in-process
+    SCRAPE_PREFETCH_LIMIT / SCRAPE_PREFETCH_PER_HOST
+                           # connection limits for prefetch() (default 16 / 4)
+
+Usage:
+    from scrape_transport import fetch_text, get, session_get
+
+    html = fetch_text(url, timeout=10)                        # urllib replacement
+    response = get(url, headers=headers, timeout=30)          # requests.get replacement
+    async with session_get(session, url, ssl=ctx) as response:  # aiohttp replacement
+        html = await response.text()
+
+    scrape_transport.sleep(delay)  # rate-limit delays are skipped when replaying
+
+    # Start fetching a batch of pages concurrently; later get()/fetch_text() calls
+    # for those URLs wait for the prefetched page instead of going to the network
+    prefetch(startlist_urls, headers=headers)
+
+    # Serve a fixture archive on localhost for the SCRAPE_FIXTURE_SERVER mode
+    python scrape_transport.py serve --port 8765
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from urllib.error import URLError
+from urllib.parse import parse_qs, quote, urlparse
+from urllib.request import Request, urlopen
+
+import pipeline_config  # noqa: F401 - loads ~/.env into the environment
+
+MODE = os.getenv('SCRAPE_MODE', 'live').lower()
+FIXTURE_DIR = Path(os.path.expanduser(os.getenv('SCRAPE_FIXTURES', '~/ski/elo/fixtures')))
+REPLAY_LATENCY = float(os.getenv('SCRAPE_REPLAY_LATENCY', '0') or 0)
+FIXTURE_SERVER = os.getenv('SCRAPE_FIXTURE_SERVER', '').rstrip('/')
+PREFETCH_LIMIT = int(os.getenv('SCRAPE_PREFETCH_LIMIT', '16') or 16)
+PREFETCH_PER_HOST = int(os.getenv('SCRAPE_PREFETCH_PER_HOST', '4') or 4)
+PREFETCH_TIMEOUT = 60
+
+def fixture_key(url: str) -> str:
+    """Stable file name for a URL in the fixture archive."""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+def _fixture_path(url: str) -> Path:
+    return FIXTURE_DIR / f"{fixture_key(url)}.json"
+
+def record_fixture(url: str, status: int, body: str) -> None:
+    """Save one response to the fixture archive."""
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    payload = {'url': url, 'status': status, 'body': body, 'recorded': time.time()}
+    tmp_path = _fixture_path(url).with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, _fixture_path(url))
+
+def load_fixture(url: str):
+    """Return (status, body) for a recorded URL, or None if it was never recorded."""
+    path = _fixture_path(url)
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        payload = json.load(f)
+    return payload['status'], payload['body']
+
+def _replaying() -> bool:
+    return MODE == 'replay'
+
+def _server_url(url: str) -> str:
+    """Rewrite a live URL to its stand-in server URL."""
+    return f"{FIXTURE_SERVER}/fetch?url={quote(url, safe='')}"
+
+def _replay(url: str):
+    """Look up a fixture, applying the configured latency."""
+    if REPLAY_LATENCY:
+        time.sleep(REPLAY_LATENCY)
+    return load_fixture(url)
+
+def sleep(seconds: float) -> None:
+    """Politeness delay between live requests; skipped when replaying."""
+    if not _replaying():
+        time.sleep(seconds)
+
+async def async_sleep(seconds: float) -> None:
+    """Async politeness delay between live requests; skipped when replaying."""
+    if not _replaying():
+        await asyncio.sleep(seconds)
+
+class FixtureResponse:
+    """Minimal stand-in for requests.Response built from a fixture or a prefetched page."""
+
+    def __init__(self, url: str, status_code: int, text: str):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode('utf-8')
+        self.ok = status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.ok:
+            return
+        import requests
+        raise requests.exceptions.HTTPError(f"{self.status_code} replaying {self.url}", response=self)
+
+def fetch_text(url: str, headers: dict = None, timeout: int = 10) -> str:
+    """
+    urllib-style fetch returning the decoded body.
+
+    Raises URLError for failures (including missing fixtures in replay mode) so
+    existing retry loops keep working unchanged.
+    """
+    prefetched = _take_prefetched(url)
+    if prefetched is not None:
+        if prefetched[0] >= 400:
+            raise URLError(f"HTTP {prefetched[0]} prefetching {url}")
+        return prefetched[1]
+
+    if _replaying() and not FIXTURE_SERVER:
+        fixture = _replay(url)
+        if fixture is None or fixture[0] >= 400:
+            raise URLError(f"No fixture recorded for {url}")
+        return fixture[1]
+
+    target = _server_url(url) if _replaying() else url
+    response = urlopen(Request(target, headers=headers or {}), timeout=timeout)
+    body = response.read().decode('utf-8')
+    if MODE == 'record':
+        record_fixture(url, response.status, body)
+    return body
+
+def get(url: str, headers: dict = None, timeout=None, **kwargs):
+    """Drop-in replacement for requests.get."""
+    prefetched = _take_prefetched(url)
+    if prefetched is not None:
+        return FixtureResponse(url, prefetched[0], prefetched[1])
+
+    if _replaying() and not FIXTURE_SERVER:
+        fixture = _replay(url)
+        if fixture is None:
+            return FixtureResponse(url, 404, '')
+        return FixtureResponse(url, fixture[0], fixture[1])
+
+    import requests
+    target = _server_url(url) if _replaying() else url
+    response = requests.get(target, headers=headers, timeout=timeout, **kwargs)
+    if MODE == 'record':
+        record_fixture(url, response.status_code, response.text)
+    return response
+
+class _AsyncFixtureResponse:
+    """Minimal stand-in for an aiohttp response built from a fixture."""
+
+    def __init__(self, status: int, body: str):
+        self.status = status
+        self._body = body
+
+    async def text(self):
+        return self._body
+
+class _RecordingResponse:
+    """Wraps an aiohttp response and records its body once read."""
+
+    def __init__(self, url: str, response):
+        self._url = url
+        self._response = response
+        self.status = response.status
+
+    async def text(self):
+        body = await self._response.text()
+        record_fixture(self._url, self.status, body)
+        return body
+
+@asynccontextmanager
+async def session_get(session, url: str, **kwargs):
+    """Drop-in replacement for `async with session.get(url, ...)`."""
+    if _replaying() and not FIXTURE_SERVER:
+        if REPLAY_LATENCY:
+            await asyncio.sleep(REPLAY_LATENCY)
+        fixture = load_fixture(url)
+        status, body = fixture if fixture is not None else (404, '')
+        yield _AsyncFixtureResponse(status, body)
+        return
+
+    target = _server_url(url) if _replaying() else url
+    if _replaying():
+        # The stand-in server is plain HTTP, drop any TLS settings
+        kwargs.pop('ssl', None)
+    async with session.get(target, **kwargs) as response:
+        if MODE == 'record':
+            yield _RecordingResponse(url, response)
+        else:
+            yield response
+
+_prefetched: Dict[str, Future] = {}
+_prefetch_lock = threading.Lock()
+
+def prefetch(urls: Iterable[str], headers: dict = None, limit: Optional[int] = None,
+             limit_per_host: Optional[int] = None) -> None:
+    """
+    Fetch a batch of pages concurrently in the background.
+
+    Pages are fetched through one pooled aiohttp session with a total and a
+    per-host connection limit. The call returns immediately; get() and
+    fetch_text() for a prefetched URL block only until that page has arrived,
+    so callers can process pages in their own order as they come in. URLs that
+    fail to prefetch are fetched again the normal way.
+    """
+    pending = {}
+    with _prefetch_lock:
+        for url in urls:
+            if isinstance(url, str) and url and url not in _prefetched:
+                _prefetched[url] = pending[url] = Future()
+    if not pending:
+        return
+
+    print(f"Prefetching {len(pending)} pages concurrently")
+    limit = limit or PREFETCH_LIMIT
+    limit_per_host = limit_per_host or PREFETCH_PER_HOST
+    threading.Thread(
+        target=lambda: asyncio.run(_prefetch_all(pending, headers, limit, limit_per_host)),
+        name='scrape-prefetch',
+        daemon=True
+    ).start()
+
+async def _prefetch_one(session, url: str, future: Future) -> None:
+    try:
+        async with session_get(session, url) as response:
+            body = await response.text()
+        future.set_result((response.status, body))
+    except Exception as e:
+        future.set_exception(e)
+
+async def _prefetch_all(pending: Dict[str, Future], headers: Optional[dict],
+                        limit: int, limit_per_host: int) -> None:
+    if _replaying() and not FIXTURE_SERVER:
+        await asyncio.gather(*(_prefetch_one(None, url, future) for url, future in pending.items()))
+        return
+    try:
+        import aiohttp
+        connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host)
+        timeout = aiohttp.ClientTimeout(total=PREFETCH_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, headers=headers, timeout=timeout) as session:
+            await asyncio.gather(*(_prefetch_one(session, url, future) for url, future in pending.items()))
+    except Exception as e:
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(e)
+
+def _take_prefetched(url: str):
+    """(status, body) of a prefetched URL, waiting for it if needed; None if not prefetched."""
+    future = _prefetched.get(url)
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=PREFETCH_TIMEOUT)
+    except Exception as e:
+        print(f"Prefetch failed for {url} ({e}), fetching directly")
+        with _prefetch_lock:
+            _prefetched.pop(url, None)
+        return None
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Serves /fetch?url=<original url> from the fixture archive."""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        url = query.get('url', [''])[0]
+        fixture = _replay(url)
+        status, body = fixture if fixture is not None else (404, '')
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_fixtures(host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """Create the local stand-in HTTP server for the fixture archive."""
+    return ThreadingHTTPServer((host, port), _FixtureHandler)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Scraper fixture archive tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    serve_parser = subparsers.add_parser('serve', help='Serve fixtures on a local HTTP port')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    subparsers.add_parser('info', help='Show the fixture archive location and size')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        server = serve_fixtures(args.host, args.port)
+        print(f"Serving {FIXTURE_DIR} on http://{args.host}:{args.port} (latency {REPLAY_LATENCY}s)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+    else:
+        fixtures = list(FIXTURE_DIR.glob('*.json')) if FIXTURE_DIR.exists() else []
+        print(f"SCRAPE_MODE: {MODE}")
+        print(f"Fixture archive: {FIXTURE_DIR} ({len(fixtures)} responses)")
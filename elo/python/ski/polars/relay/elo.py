@@ -514,39 +514,43 @@ def elo(df, base_elo=1300, K=1, discount=.85):
     elo_df = elo_df.sort(['Date','Season', 'Race', 'Place'])
     return elo_df
 
-df = pl.DataFrame()
-
-json_str = sys.argv[1]
-data = json.loads(json_str)
-print(data)
-
-# File string creation code remains the same
-file_string = ""
-for key, value in data.items():
-    if key == "relay":
-        if value == 1:
-            file_string = file_string + "rel_"
-        else:
-            df = handle_value(key, 0, df)
-    elif value is not None and value != "null":  # Skip null values
-        file_string = file_string + value + "_"
-        df = handle_value(key, value, df)
-
-# Remove trailing underscore if it exists
-file_string = file_string[:-1] if file_string.endswith('_') else file_string
-
-# If file_string is empty, use just the sex value
-if not file_string:
-    file_string = data.get('sex', '')
-
-print(file_string)
-elo_df = elo(df)
-print(elo_df)
-
-# Base path for output files
-base_path = "~/ski/elo/python/ski/polars/relay/excel365"
-
-# Save CSV format
-elo_df.write_csv(f"{base_path}/{file_string}.csv")
-print(time.time() - start_time)
-
+def main():
+    """Run one ELO calculation from the JSON configuration in argv[1]"""
+    df = pl.DataFrame()
+
+    json_str = sys.argv[1]
+    data = json.loads(json_str)
+    print(data)
+
+    # File string creation code remains the same
+    file_string = ""
+    for key, value in data.items():
+        if key == "relay":
+            if value == 1:
+                file_string = file_string + "rel_"
+            else:
+                df = handle_value(key, 0, df)
+        elif value is not None and value != "null":  # Skip null values
+            file_string = file_string + value + "_"
+            df = handle_value(key, value, df)
+
+    # Remove trailing underscore if it exists
+    file_string = file_string[:-1] if file_string.endswith('_') else file_string
+
+    # If file_string is empty, use just the sex value
+    if not file_string:
+        file_string = data.get('sex', '')
+
+    print(file_string)
+    elo_df = elo(df)
+    print(elo_df)
+
+    # Base path for output files
+    base_path = "~/ski/elo/python/ski/polars/relay/excel365"
+
+    # Save CSV format
+    elo_df.write_csv(f"{base_path}/{file_string}.csv")
+    print(time.time() - start_time)
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ Run russia_scrape.py first for historical data (2022 through last season).
 """
 
 import polars as pl
+import sys
+import os
 import logging
 from datetime import datetime, timezone
 from typing import Dict, Tuple, Optional, List, Any
@@ -19,11 +21,17 @@ from russia_scrape import (
     process_single_race,
     load_fis_reference_data,
     build_id_mapping,
+    load_id_mapping,
     construct_dataframe,
     save_id_mapping,
     FIS_BAN_DATE,
 )
 
+# Shared update helpers (race keys and experience as Polars frames)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from update_common import (race_keys_frame, max_experience_frame,
+                           is_known_race, apply_experience_offset)
+
 
 def setup_logging():
     """Set up logging configuration"""
@@ -51,20 +59,18 @@ def get_existing_metadata(df: pl.DataFrame) -> Dict:
     """Extract metadata from existing DataFrame"""
     try:
         # Get unique races (Date, City, Event)
-        races = set(df.select(["Date", "City", "Event"]).unique().rows())
+        races = race_keys_frame(df, ["Date", "City", "Event"])
 
         # Get max experience per ID
-        max_exp = (df.group_by('ID')
-                   .agg(pl.col('Exp').max().alias('max_exp')))
-        exp_dict = dict(zip(max_exp['ID'], max_exp['max_exp']))
+        experience = max_experience_frame(df)
 
         return {
             'races': races,
-            'experience': exp_dict
+            'experience': experience
         }
     except Exception as e:
         logging.error(f"Error extracting metadata: {e}")
-        return {'races': set(), 'experience': {}}
+        return {'races': None, 'experience': None}
 
 
 def load_and_process_data(sex: str) -> Tuple[Optional[pl.DataFrame], Dict]:
@@ -75,7 +81,7 @@ def load_and_process_data(sex: str) -> Tuple[Optional[pl.DataFrame], Dict]:
 
         if not path.exists():
             logging.warning(f"No existing data file found for {sex}")
-            return None, {'races': set(), 'experience': {}}
+            return None, {'races': None, 'experience': None}
 
         df = pl.read_csv(path)
         metadata = get_existing_metadata(df)
@@ -85,7 +91,7 @@ def load_and_process_data(sex: str) -> Tuple[Optional[pl.DataFrame], Dict]:
 
     except Exception as e:
         logging.error(f"Error loading data: {e}")
-        return None, {'races': set(), 'experience': {}}
+        return None, {'races': None, 'experience': None}
 
 
 def process_race(race_info: Dict[str, Any], year: int, metadata: Dict) -> Optional[Dict]:
@@ -102,7 +108,7 @@ def process_race(race_info: Dict[str, Any], year: int, metadata: Dict) -> Option
 
         if race_date:
             race_key = (race_date, race_city, race_event)
-            if race_key in metadata['races']:
+            if is_known_race(race_key, metadata['races']):
                 logging.info(f"Skipping existing race: {race_key}")
                 return None
 
@@ -160,14 +166,25 @@ def process_new_season(sex: str, metadata: Dict) -> Tuple[List[Dict], List[Dict]
     return all_races, list(athlete_map.values())
 
 
-def update_experience(new_df: pl.DataFrame, exp_dict: Dict) -> pl.DataFrame:
+def relabel_rematched(old_df: pl.DataFrame, id_mapping: Dict[int, int],
+                      name_mapping: Dict[int, str]) -> pl.DataFrame:
+    """Move rows stored under an unmatched athlete's negative ID to the FIS ID matched this run."""
+    rematched = {-rid: fid for rid, fid in id_mapping.items() if fid > 0}
+    names = {-rid: name_mapping[rid] for rid in id_mapping if -rid in rematched}
+    moved = pl.col('ID').is_in(list(rematched))
+    count = old_df.filter(moved).select(pl.col('ID').n_unique()).item()
+    if count == 0:
+        return old_df
+    logging.info(f"Matched {count} previously unmatched athletes to FIS IDs")
+    return old_df.with_columns(
+        pl.when(moved).then(pl.col('ID').replace_strict(names, default=None))
+        .otherwise(pl.col('Skier')).alias('Skier'),
+        pl.col('ID').replace(rematched).alias('ID'))
+
+
+def update_experience(new_df: pl.DataFrame, experience: Optional[pl.DataFrame]) -> pl.DataFrame:
     """Update experience values for new data based on existing experience"""
-    return new_df.with_columns([
-        (pl.col('ID')
-         .map_elements(lambda x: exp_dict.get(x, 0), return_dtype=pl.Int32)
-         .add(pl.col('Exp'))
-         .alias('Exp'))
-    ])
+    return apply_experience_offset(new_df, experience)
 
 
 def merge_and_save(old_df: Optional[pl.DataFrame],
@@ -257,27 +274,23 @@ def main():
             logging.info(f"No new races to add for {sex}")
             continue
 
-        # Include existing unmatched athletes for consistent ID mapping
-        if old_df is not None:
-            existing_ids = {a['Russian_ID'] for a in unique_athletes}
-            for row in old_df.iter_rows(named=True):
-                if row['ID'] < 0:
-                    rid = -row['ID']
-                    if rid not in existing_ids:
-                        unique_athletes.append({
-                            'Russian_ID': rid,
-                            'Skier': row['Skier'],
-                            'Birth_Year': None
-                        })
+        # Reuse confirmed mappings so only athletes not matched before are matched;
+        # athletes left unmatched (negative IDs) are tried again every run
+        known_mapping = load_id_mapping(sex, str(base_path))
 
         # Build ID mapping
         fis_athletes = load_fis_reference_data(sex, str(base_path))
         id_mapping, name_mapping, birthday_mapping = build_id_mapping(
-            unique_athletes, fis_athletes, threshold=90
+            unique_athletes, fis_athletes, threshold=90, known_mapping=known_mapping
         )
 
-        # Save ID mapping
-        save_id_mapping(id_mapping, sex, str(base_path))
+        # Save ID mapping (previously confirmed plus newly matched athletes)
+        save_id_mapping({**known_mapping, **id_mapping}, sex, str(base_path))
+
+        # Athletes matched only now keep their earlier rows under the FIS ID
+        if old_df is not None:
+            old_df = relabel_rematched(old_df, id_mapping, name_mapping)
+            metadata['experience'] = max_experience_frame(old_df)
 
         # Construct DataFrame for new races
         new_df = construct_dataframe(new_races, id_mapping, name_mapping, birthday_mapping, sex)
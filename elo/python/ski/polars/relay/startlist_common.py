@@ -2,38 +2,32 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import polars as pl
-from thefuzz import fuzz
 from typing import Dict, List, Tuple, Optional
 import warnings
 from datetime import datetime, timezone
 import re
+import sys
+import os
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
+from name_index import get_name_index, normalize_name as index_normalize_name
+from chrono_cache import get_chrono, load_chrono, per_chrono_file
+from name_normalize import STARTLIST_ALIASES
 warnings.filterwarnings('ignore')
 
-MANUAL_NAME_MAPPINGS = {
-    'Thomas MALONEY WESTGAARD': 'Thomas Hjalmar Westgård',
-    'John Steel HAGENBUCH': 'Johnny Hagenbuch',
-    'Imanol ROJO GARCIA': 'Imanol Rojo',
-    'Samantha SMITH': 'Sammy Smith',
-    'SMITH Samantha': 'Samantha Smith',
-    'JC SCHOONMAKER': 'James Clinton Schoonmaker',
-    'HAGENBUCH John Steel': 'Johnny Hagenbuch',
-    'MALONEY WESTGAARD Thomas': 'Thomas Hjalmar Westgård',
-    'Lars Michael Saab BJERTNAES':'Lars Michael Bjertnæs',
-    'BJERTNAES Lars Michael Saab':  'Lars Michael Bjertnæs',
-    'Amund August KORSAETH': 'Amund Korsæth',
-    'KORSAETH Amund August': 'Amund Korsæth'
-}
+# FIS name -> Elo name, shared with the knapsack name normalization
+MANUAL_NAME_MAPPINGS = STARTLIST_ALIASES
+REVERSE_NAME_MAPPINGS = {v: k for k, v in MANUAL_NAME_MAPPINGS.items()}
 
 def get_fantasy_price(name: str, fantasy_prices: Dict[str, int]) -> int:
     """Gets fantasy price by trying multiple name formats"""
     print(f"\nTrying to find price for: {name}")
     
-    # First check if there's a reverse mapping
-    reverse_map = {v: k for k, v in MANUAL_NAME_MAPPINGS.items()}
-    
     # If this name has a FIS format, try that first
-    if name in reverse_map:
-        fis_name = reverse_map[name]
+    if name in REVERSE_NAME_MAPPINGS:
+        fis_name = REVERSE_NAME_MAPPINGS[name]
         if fis_name in fantasy_prices:
             print(f"Found FIS manual mapping match: {fis_name} -> {fantasy_prices[fis_name]}")
             return fantasy_prices[fis_name]
@@ -52,15 +46,18 @@ def get_fantasy_price(name: str, fantasy_prices: Dict[str, int]) -> int:
             print(f"Found FIS format match: {fis_format} -> {fantasy_prices[fis_format]}")
             return fantasy_prices[fis_format]
     
+    # Fuzzy fallbacks share one index over the fantasy names
+    price_index = get_name_index(list(fantasy_prices.keys()), manual_mappings=MANUAL_NAME_MAPPINGS)
+    
     # Try fuzzy matching with original name
-    best_match = fuzzy_match_name(name, list(fantasy_prices.keys()))
+    best_match = price_index.match(name)
     if best_match and best_match in fantasy_prices:
         print(f"Found fuzzy match for original name: {name} -> {best_match} -> {fantasy_prices[best_match]}")
         return fantasy_prices[best_match]
     
     # Try fuzzy matching with all FIS formats
     for fis_format in fis_formats:
-        best_match = fuzzy_match_name(fis_format, list(fantasy_prices.keys()))
+        best_match = price_index.match(fis_format)
         if best_match and best_match in fantasy_prices:
             print(f"Found fuzzy match for FIS format: {fis_format} -> {best_match} -> {fantasy_prices[best_match]}")
             return fantasy_prices[best_match]
@@ -75,7 +72,7 @@ def get_fis_startlist(url: str) -> List[Tuple[str, str]]:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers)
+        response = scrape_transport.get(url, headers=headers)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -177,7 +174,7 @@ def get_fis_startlist(url: str) -> List[Tuple[str, str]]:
 def get_fantasy_prices() -> Dict[str, int]:
     """Gets athlete prices from Fantasy XC API"""
     try:
-        response = requests.get('https://www.fantasyxc.se/api/athletes')
+        response = scrape_transport.get('https://www.fantasyxc.se/api/athletes')
         response.raise_for_status()
         
         athletes = response.json()
@@ -187,6 +184,7 @@ def get_fantasy_prices() -> Dict[str, int]:
         print(f"Error getting Fantasy XC prices: {e}")
         return {}
 
+@per_chrono_file
 def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
     """Gets most recent ELO scores for each athlete with quartile imputation"""
     try:
@@ -196,7 +194,7 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
         
         # First try with more robust pandas approach
         try:
-            df = pd.read_csv(file_path, low_memory=False)
+            df = load_chrono(file_path).copy()
             print(f"Successfully read ELO file with pandas: {len(df)} rows")
         except Exception as pd_e:
             print(f"Error reading with pandas: {pd_e}")
@@ -329,45 +327,11 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
 
 def normalize_name(name: str) -> str:
     """Normalizes name for better fuzzy matching"""
-    normalized = name.lower()
-    char_map = {
-        'ø': 'oe', 'ö': 'oe', 'ó': 'o',
-        'ä': 'ae', 'á': 'a', 'å': 'aa',
-        'é': 'e', 'è': 'e',
-        'ü': 'ue',
-        'ý': 'y',
-        'æ': 'ae'
-    }
-    for char, replacement in char_map.items():
-        normalized = normalized.replace(char, replacement)
-    return normalized
+    return index_normalize_name(name)
 
 def fuzzy_match_name(name: str, name_list: List[str], threshold: int = 85) -> str:
-    """Finds best matching name using normalized comparison"""
-    # First check manual mappings
-    if name in MANUAL_NAME_MAPPINGS:
-        mapped_name = MANUAL_NAME_MAPPINGS[name]
-        if mapped_name in name_list:
-            return mapped_name
-    
-    best_score = 0
-    best_match = ''
-    normalized_name = normalize_name(name)
-    
-    # Try matching full name
-    for candidate in name_list:
-        normalized_candidate = normalize_name(candidate)
-        score = fuzz.ratio(normalized_name, normalized_candidate)
-        
-        # Also try matching tokens in any order
-        token_score = fuzz.token_sort_ratio(normalized_name, normalized_candidate)
-        score = max(score, token_score)
-        
-        if score > best_score and score >= threshold:
-            best_score = score
-            best_match = candidate
-    
-    return best_match
+    """Finds best matching name using a NameIndex built once per candidate list"""
+    return get_name_index(name_list, manual_mappings=MANUAL_NAME_MAPPINGS, threshold=threshold).match(name)
 
 def convert_to_first_last(name: str) -> str:
     """Converts name from 'LAST First' to 'First Last' format"""
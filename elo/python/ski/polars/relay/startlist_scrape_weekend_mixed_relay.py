@@ -26,8 +26,7 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
         race_type: 'standard', 'team_sprint', 'relay', or 'mixed_relay'
         gender: 'men', 'ladies', or None for mixed events
     """
-    import subprocess
-    import os
+    from r_scheduler import submit_r_script
     
     # Set the base path to the R scripts
     r_script_base_path = "~/blog/daehl-e/content/post/cross-country/drafts"
@@ -66,27 +65,16 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
     # Full path to the R script
     r_script_path = os.path.expanduser(f"{r_script_base_path}/{r_script}")
     
-    # Command to execute the R script
-    command = ["Rscript", r_script_path]
-    
-    # Add gender parameter if specified
-    if gender:
-        command.append(gender)
-    
-    print(f"Calling R script: {' '.join(command)}")
-    
-    try:
-        # Call the R script
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-        print(f"R script output:\n{result.stdout}")
-        if result.stderr:
-            print(f"R script error:\n{result.stderr}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error calling R script: {e}")
-        print(f"Script output: {e.stdout}")
-        print(f"Script error: {e.stderr}")
-    except FileNotFoundError:
+    if not os.path.exists(r_script_path):
         print(f"R script not found: {r_script_path}")
+        return
+    
+    # Queued on the open job queue (run with the day's other R jobs), else run now;
+    # either way output streams to a log file and the run is timed
+    job = submit_r_script(r_script_path, [gender] if gender else [])
+    if job is not None and not job.succeeded:
+        print(f"Error calling R script: {job.message}")
+        print(f"Script log: {job.log_path}")
 
 def map_country_to_team_name(country: str) -> str:
     """
@@ -965,7 +953,7 @@ def generate_fallback_data(
     
     try:
         # Load the men's chronos data
-        men_chronos = pd.read_csv(men_chronos_path)
+        men_chronos = load_chrono(men_chronos_path).copy()
         
         # Find the maximum season in the data
         men_max_season = men_chronos['Season'].max()
@@ -1058,7 +1046,7 @@ def generate_fallback_data(
 
         
         # Load the women's chronos data
-        women_chronos = pd.read_csv(women_chronos_path)
+        women_chronos = load_chrono(women_chronos_path).copy()
         
         # Find the maximum season in the data
         women_max_season = women_chronos['Season'].max()
@@ -820,7 +820,7 @@ def generate_fallback_data(
     
     try:
         # Load the men's chronos data
-        men_chronos = pd.read_csv(men_chronos_path)
+        men_chronos = load_chrono(men_chronos_path).copy()
         
         # Find the maximum season in the data
         men_max_season = men_chronos['Season'].max()
@@ -870,7 +870,7 @@ def generate_fallback_data(
                     men_skier_elo_values[skier][elo_col] = float(row[elo_col])
         
         # Load the women's chronos data
-        women_chronos = pd.read_csv(women_chronos_path)
+        women_chronos = load_chrono(women_chronos_path).copy()
         
         # Find the maximum season in the data
         women_max_season = women_chronos['Season'].max()
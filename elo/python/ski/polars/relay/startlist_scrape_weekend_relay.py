@@ -31,8 +31,7 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
         race_type: 'standard', 'team_sprint', 'relay', or 'mixed_relay'
         gender: 'men', 'ladies', or None for mixed events
     """
-    import subprocess
-    import os
+    from r_scheduler import submit_r_script
     
     # Set the base path to the R scripts
     r_script_base_path = "~/blog/daehl-e/content/post/cross-country/drafts"
@@ -71,27 +70,16 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
     # Full path to the R script
     r_script_path = os.path.expanduser(f"{r_script_base_path}/{r_script}")
     
-    # Command to execute the R script
-    command = ["Rscript", r_script_path]
-    
-    # Add gender parameter if specified
-    if gender:
-        command.append(gender)
-    
-    print(f"Calling R script: {' '.join(command)}")
-    
-    try:
-        # Call the R script
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-        print(f"R script output:\n{result.stdout}")
-        if result.stderr:
-            print(f"R script error:\n{result.stderr}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error calling R script: {e}")
-        print(f"Script output: {e.stdout}")
-        print(f"Script error: {e.stderr}")
-    except FileNotFoundError:
+    if not os.path.exists(r_script_path):
         print(f"R script not found: {r_script_path}")
+        return
+    
+    # Queued on the open job queue (run with the day's other R jobs), else run now;
+    # either way output streams to a log file and the run is timed
+    job = submit_r_script(r_script_path, [gender] if gender else [])
+    if job is not None and not job.succeeded:
+        print(f"Error calling R script: {job.message}")
+        print(f"Script log: {job.log_path}")
 
 def process_weekend_relay_races(races_file: str = None) -> None:
     """
@@ -880,7 +868,7 @@ def generate_fallback_data(
     
     try:
         # Load the chronos data to get most recent Pelo values
-        chronos = pd.read_csv(chronos_path)
+        chronos = load_chrono(chronos_path).copy()
         
         # Find the maximum season in the data
         max_season = chronos['Season'].max()
@@ -9,7 +9,6 @@ import logging
 import ssl
 import re
 import unicodedata
-from urllib.request import urlopen, Request
 from urllib.error import URLError
 from http.client import RemoteDisconnected, IncompleteRead
 from bs4 import BeautifulSoup
@@ -19,9 +18,16 @@ from datetime import datetime, timezone
 import warnings
 import random
 from typing import List, Dict, Any, Optional, Tuple
-from thefuzz import fuzz
+from rapidfuzz import process as rf_process, fuzz as rf_fuzz, utils as rf_utils
+import numpy as np
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
+import sys
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
@@ -34,6 +40,7 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 start_time = time.time()
 BASE_URL = "https://flgr-results.ru"
 FIS_BAN_DATE = "2022-03-01"  # Russia banned from FIS starting this date
+BLOCK_PREFIX_LEN = 3  # Surname prefix length used to block fuzzy ID matching
 
 # ============================================================================
 # CYRILLIC TO LATIN TRANSLITERATION (BGN/PCGN Standard)
@@ -174,9 +181,7 @@ def fetch_with_retry(url: str, max_retries: int = 2, timeout: int = 10) -> Optio
     """Fetch URL with retry logic."""
     for attempt in range(max_retries):
         try:
-            req = Request(url, headers=HEADERS)
-            response = urlopen(req, timeout=timeout)
-            return response.read().decode('utf-8')
+            return scrape_transport.fetch_text(url, headers=HEADERS, timeout=timeout)
         except (URLError, TimeoutError, RemoteDisconnected, ConnectionResetError, IncompleteRead) as e:
             if attempt == max_retries - 1:
                 logging.error(f"Failed to fetch {url}: {e}")
@@ -587,9 +592,86 @@ def load_fis_reference_data(sex: str, base_path: str) -> List[Dict[str, Any]]:
         logging.error(f"Error loading FIS reference data: {e}")
         return []
 
+def _surname_block_key(name: str) -> str:
+    """Blocking key: first letters of the normalized surname.
+
+    y/j are folded into i so transliteration variants (Ustyugov/Ustiugov) share a block.
+    """
+    text = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii').lower()
+    parts = text.split()
+    if not parts:
+        return ''
+    surname = parts[-1].replace('y', 'i').replace('j', 'i')
+    return surname[:BLOCK_PREFIX_LEN]
+
+def _given_block_key(name: str) -> str:
+    """Secondary blocking key: first letter of the given name."""
+    text = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii').lower()
+    return text[:1]
+
+def _fis_birth_year(birthday: Any) -> Optional[int]:
+    if not birthday:
+        return None
+    try:
+        return int(birthday[:4]) if isinstance(birthday, str) else birthday.year
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+def _candidate_blocks(russian_athletes: List[Dict[str, Any]],
+                      fis_athletes: List[Dict[str, Any]],
+                      fis_birth_years: List[Optional[int]]) -> List[Tuple[List[int], List[int]]]:
+    """
+    Group athlete indices into (russian_idx, fis_idx) blocks worth scoring.
+
+    Two blockings are used: normalized surname prefix, and birth year plus given-name
+    initial (catches surname changes). A pair may appear in both; the caller dedupes.
+    """
+    blocks = []
+
+    fis_by_surname = defaultdict(list)
+    fis_by_year = defaultdict(list)
+    for j, fis in enumerate(fis_athletes):
+        fis_by_surname[_surname_block_key(fis['Skier'])].append(j)
+        if fis_birth_years[j]:
+            fis_by_year[(fis_birth_years[j], _given_block_key(fis['Skier']))].append(j)
+
+    rus_by_surname = defaultdict(list)
+    rus_by_year = defaultdict(list)
+    for i, athlete in enumerate(russian_athletes):
+        rus_by_surname[_surname_block_key(athlete['Skier'])].append(i)
+        if athlete['Birth_Year']:
+            rus_by_year[(athlete['Birth_Year'], _given_block_key(athlete['Skier']))].append(i)
+
+    for key, rus_idx in rus_by_surname.items():
+        if key in fis_by_surname:
+            blocks.append((rus_idx, fis_by_surname[key]))
+    for key, rus_idx in rus_by_year.items():
+        if key in fis_by_year:
+            blocks.append((rus_idx, fis_by_year[key]))
+    return blocks
+
+def load_id_mapping(sex: str, base_path: str) -> Dict[int, int]:
+    """Load previously confirmed Russian ID to FIS ID mappings (empty if none saved).
+
+    Only real matches (positive FIS IDs) are confirmed; entries for athletes left
+    unmatched are dropped so they are matched again.
+    """
+    sex_name = 'men' if sex == 'M' else 'ladies'
+    filepath = os.path.join(base_path, f"russia_{sex_name}_id_mapping.csv")
+    if not os.path.exists(filepath):
+        return {}
+    try:
+        df = pl.read_csv(filepath)
+        return {rid: fid for rid, fid in zip(df['Russian_ID'].to_list(), df['FIS_ID'].to_list())
+                if fid is not None and fid > 0}
+    except Exception as e:
+        logging.error(f"Error loading ID mapping {filepath}: {e}")
+        return {}
+
 def build_id_mapping(russian_athletes: List[Dict[str, Any]],
                      fis_athletes: List[Dict[str, Any]],
-                     threshold: int = 80) -> Tuple[Dict[int, int], Dict[int, str], Dict[int, Any]]:
+                     threshold: int = 80,
+                     known_mapping: Optional[Dict[int, int]] = None) -> Tuple[Dict[int, int], Dict[int, str], Dict[int, Any]]:
     """
     Build mapping from Russian IDs to FIS IDs using fuzzy matching.
     Returns: (id_mapping, name_mapping, birthday_mapping)
@@ -597,99 +679,91 @@ def build_id_mapping(russian_athletes: List[Dict[str, Any]],
     - name_mapping: Dict[russian_id, fis_name] (use FIS name when matched)
     - birthday_mapping: Dict[russian_id, fis_birthday] (use FIS birthday when matched)
 
-    Uses greedy matching - best matches first, ensuring 1:1 mapping.
+    Athletes in known_mapping (confirmed by an earlier run) are reused as-is and only
+    unseen athletes are matched; negative entries (unmatched earlier) are matched again.
+
+    Candidates are blocked by surname prefix and by birth year, each block is scored
+    in bulk with rapidfuzz cdist, and greedy matching (best matches first) keeps the
+    mapping 1:1.
     """
+    known_mapping = {rid: fid for rid, fid in (known_mapping or {}).items() if fid > 0}
     id_mapping = {}
     name_mapping = {}
     birthday_mapping = {}
 
-    if not fis_athletes:
-        for a in russian_athletes:
-            rid = a['Russian_ID']
-            id_mapping[rid] = -rid
-            name_mapping[rid] = a['Skier']
-            birthday_mapping[rid] = None
-        return id_mapping, name_mapping, birthday_mapping
-
-    # Pre-process FIS athletes
-    fis_processed = []
-    for fis in fis_athletes:
-        fis_year = None
-        if fis['Birthday']:
-            try:
-                bd = fis['Birthday']
-                fis_year = int(bd[:4]) if isinstance(bd, str) else bd.year
-            except:
-                pass
-        fis_processed.append({
-            'id': fis['ID'],
-            'name': fis['Skier'],
-            'name_lower': fis['Skier'].lower(),
-            'birth_year': fis_year,
-            'birthday': fis['Birthday'],
-            'matched': False
-        })
+    fis_by_id = {fis['ID']: fis for fis in fis_athletes}
+    matched_fis_ids = set()
 
-    # Calculate all match scores
-    match_candidates = []
+    # Reuse confirmed mappings from earlier runs
+    unseen_athletes = []
     for athlete in russian_athletes:
-        russian_id = athlete['Russian_ID']
-        name_lower = athlete['Skier'].lower()
-        birth_year = athlete['Birth_Year']
-
-        for fis in fis_processed:
-            score = fuzz.token_sort_ratio(name_lower, fis['name_lower'])
+        rid = athlete['Russian_ID']
+        if rid not in known_mapping:
+            unseen_athletes.append(athlete)
+            continue
+        fid = known_mapping[rid]
+        id_mapping[rid] = fid
+        if fid in fis_by_id:
+            name_mapping[rid] = fis_by_id[fid]['Skier']
+            birthday_mapping[rid] = fis_by_id[fid]['Birthday']
+            matched_fis_ids.add(fid)
+        else:
+            name_mapping[rid] = athlete['Skier']
+            birthday_mapping[rid] = None
+    matched_fis_ids.update(known_mapping.values())
+
+    if unseen_athletes and fis_athletes:
+        fis_birth_years = [_fis_birth_year(fis['Birthday']) for fis in fis_athletes]
+        fis_years = np.array([year or 0 for year in fis_birth_years])
+        fis_names = [fis['Skier'] for fis in fis_athletes]
+
+        # Score each block in bulk; keep the best score per (russian, fis) pair
+        pair_scores = {}
+        for rus_idx, fis_idx in _candidate_blocks(unseen_athletes, fis_athletes, fis_birth_years):
+            scores = rf_process.cdist(
+                [unseen_athletes[i]['Skier'] for i in rus_idx],
+                [fis_names[j] for j in fis_idx],
+                scorer=rf_fuzz.token_sort_ratio,
+                processor=rf_utils.default_process,
+                workers=-1,
+            )
+            scores = np.rint(scores).astype(int)
 
             # Boost score if birth years match
-            if birth_year and fis['birth_year'] and birth_year == fis['birth_year']:
-                score += 15
-
-            if score >= threshold:
-                match_candidates.append({
-                    'russian_id': russian_id,
-                    'russian_name': athlete['Skier'],
-                    'russian_birth_year': birth_year,
-                    'fis_idx': fis_processed.index(fis),
-                    'fis_id': fis['id'],
-                    'fis_name': fis['name'],
-                    'fis_birthday': fis['birthday'],
-                    'score': score
-                })
-
-    # Sort by score descending - best matches first
-    match_candidates.sort(key=lambda x: x['score'], reverse=True)
-
-    # Greedy matching - assign best matches first
-    matched_russian_ids = set()
-    matched_fis_ids = set()
+            rus_years = np.array([unseen_athletes[i]['Birth_Year'] or -1 for i in rus_idx])
+            scores += 15 * (rus_years[:, None] == fis_years[fis_idx][None, :])
 
-    for candidate in match_candidates:
-        rid = candidate['russian_id']
-        fid = candidate['fis_id']
+            for a, b in zip(*np.nonzero(scores >= threshold)):
+                pair = (rus_idx[a], fis_idx[b])
+                pair_scores[pair] = max(pair_scores.get(pair, 0), int(scores[a, b]))
 
-        # Skip if either already matched
-        if rid in matched_russian_ids or fid in matched_fis_ids:
-            continue
+        # Sort by score descending - best matches first (stable on athlete order)
+        match_candidates = sorted(pair_scores.items(), key=lambda item: (-item[1], item[0]))
 
-        # Make the match
-        id_mapping[rid] = fid
-        name_mapping[rid] = candidate['fis_name']  # Use FIS name
-        birthday_mapping[rid] = candidate['fis_birthday']  # Use FIS birthday
-        matched_russian_ids.add(rid)
-        matched_fis_ids.add(fid)
+        # Greedy matching - assign best matches first
+        for (i, j), _ in match_candidates:
+            rid = unseen_athletes[i]['Russian_ID']
+            fis = fis_athletes[j]
+            if rid in id_mapping or fis['ID'] in matched_fis_ids:
+                continue
+            id_mapping[rid] = fis['ID']
+            name_mapping[rid] = fis['Skier']  # Use FIS name
+            birthday_mapping[rid] = fis['Birthday']  # Use FIS birthday
+            matched_fis_ids.add(fis['ID'])
 
     # Assign negative IDs and original names to unmatched athletes
-    for athlete in russian_athletes:
+    for athlete in unseen_athletes:
         rid = athlete['Russian_ID']
         if rid not in id_mapping:
             id_mapping[rid] = -rid
             name_mapping[rid] = athlete['Skier']  # Use romanized name
             birthday_mapping[rid] = None
 
-    matched = len(matched_russian_ids)
+    matched = sum(1 for fid in id_mapping.values() if fid > 0)
     total = len(russian_athletes)
     match_pct = (100 * matched / total) if total > 0 else 0
-    logging.info(f"Matched {matched}/{total} athletes ({match_pct:.1f}%)")
+    logging.info(f"Matched {matched}/{total} athletes ({match_pct:.1f}%), "
+                 f"{len(russian_athletes) - len(unseen_athletes)} from saved mapping")
     return id_mapping, name_mapping, birthday_mapping
 
 # ============================================================================
@@ -888,8 +962,8 @@ def process_season(year: int, sex: str) -> List[Dict[str, Any]]:
     return all_races
 
 def save_id_mapping(mapping: Dict[int, int], sex: str, base_path: str):
-    """Save the Russian ID to FIS ID mapping to CSV."""
-    rows = [{'Russian_ID': k, 'FIS_ID': v} for k, v in mapping.items()]
+    """Save the confirmed (positive FIS ID) Russian ID to FIS ID mappings to CSV."""
+    rows = [{'Russian_ID': k, 'FIS_ID': v} for k, v in mapping.items() if v > 0]
     df = pl.DataFrame(rows)
 
     sex_name = 'men' if sex == 'M' else 'ladies'
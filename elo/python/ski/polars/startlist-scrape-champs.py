@@ -26,7 +26,15 @@ warnings.filterwarnings('ignore')
 from startlist_common import *
 
 # Import Championships config functions
-from config import get_champs_athletes_xc
+from champs_roster import ChampsRoster, get_champs_roster
+
+def get_roster(gender: str) -> Optional[ChampsRoster]:
+    """Championship roster for a gender, matched against the latest ELO scores once per run"""
+    from config import CHAMPS_ATHLETES_MEN_XC, CHAMPS_ATHLETES_LADIES_XC
+
+    athletes = CHAMPS_ATHLETES_MEN_XC if gender == 'men' else CHAMPS_ATHLETES_LADIES_XC
+    elo_path = f"~/ski/elo/python/ski/polars/excel365/{gender}_chrono_pred.csv"
+    return get_champs_roster(elo_path, athletes, get_latest_elo_scores, manual_mappings=MANUAL_NAME_MAPPINGS)
 
 def process_championships() -> None:
     """Main entry point - reads weekends.csv, filters Championship==1, routes by race type"""
@@ -184,13 +192,10 @@ def create_consolidated_individual_championships_startlist(gender: str, races_df
     
     print(f"Creating consolidated individual startlist for {gender}")
     
-    # Get ELO data path (use elevation file like weekend scraper)
-    elo_path = f"~/ski/elo/python/ski/polars/excel365/{gender}_chrono_pred.csv"
-    
     try:
         print("Loading ELO scores...")
-        elo_scores = get_latest_elo_scores(elo_path)
-        if elo_scores is None or elo_scores.empty:
+        roster = get_roster(gender)
+        if roster is None:
             print(f"No ELO scores found for {gender}")
             return
         
@@ -207,12 +212,7 @@ def create_consolidated_individual_championships_startlist(gender: str, races_df
         print(f"Processing {num_races} races with probability columns: {prob_columns}")
         
         # Get all nations with Championships athletes
-        from config import CHAMPS_ATHLETES_MEN_XC, CHAMPS_ATHLETES_LADIES_XC
-        
-        if gender == 'men':
-            all_nations = set(CHAMPS_ATHLETES_MEN_XC.keys())
-        else:
-            all_nations = set(CHAMPS_ATHLETES_LADIES_XC.keys())
+        all_nations = roster.nations(min_athletes=0)
         
         print(f"Found {len(all_nations)} nations with {gender} athletes configured")
         
@@ -221,32 +221,22 @@ def create_consolidated_individual_championships_startlist(gender: str, races_df
         processed_athletes = set()
         
         # Get all unique athletes across all races (championship pool)
-        for nation in sorted(all_nations):
-            nation_athletes = get_champs_athletes_xc(nation, gender)
+        for nation in all_nations:
+            nation_athletes = roster.athletes(nation)
             
             for athlete_name in nation_athletes:
                 if athlete_name in processed_athletes:
                     continue
                 
-                # Match with ELO scores
-                elo_match = None
-                if athlete_name in elo_scores['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
-                
-                # Get ELO data
+                # Get ELO data (matched once for the whole roster)
+                elo_match = roster.match(athlete_name)
                 if elo_match:
-                    elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
+                    elo_data = roster.record(athlete_name)
                     print(f"Found ELO match: {athlete_name} -> {elo_match}")
                 else:
                     # Use quartile imputation for missing athletes
                     print(f"No ELO match found for {athlete_name}, using quartile imputation")
-                    elo_columns = [col for col in elo_scores.columns if 'Elo' in col]
-                    elo_data = {}
-                    for col in elo_columns:
-                        q1_value = elo_scores[col].quantile(0.25)
-                        elo_data[col] = q1_value
+                    elo_data = dict(roster.quartiles())
                     elo_data['Skier'] = athlete_name
                     elo_data['Nation'] = nation
                 
@@ -304,73 +294,33 @@ def create_team_sprint_championships_startlist(gender: str, races_df: pd.DataFra
     
     print(f"Creating team sprint startlist for {gender}")
     
-    # Use individual ELO data for team sprint selection (pred file for predictions)
-    elo_path = f"~/ski/elo/python/ski/polars/excel365/{gender}_chrono_pred.csv"
-    
     try:
         print("Loading ELO scores...")
-        elo_scores = get_latest_elo_scores(elo_path)
-        if elo_scores is None or elo_scores.empty:
+        roster = get_roster(gender)
+        if roster is None:
             print(f"No ELO scores found for {gender}")
             return
         
         team_data = []
         
         # Get qualifying nations from config (2+ athletes for team sprint)
-        from config import CHAMPS_ATHLETES_MEN_XC, CHAMPS_ATHLETES_LADIES_XC
-        
-        if gender == 'men':
-            all_nations = set(CHAMPS_ATHLETES_MEN_XC.keys())
-        else:
-            all_nations = set(CHAMPS_ATHLETES_LADIES_XC.keys())
-        
-        qualifying_nations = []
-        for nation in all_nations:
-            athletes = get_champs_athletes_xc(nation, gender)
-            if len(athletes) >= 2:  # Team sprint requires 2 athletes minimum
-                qualifying_nations.append(nation)
+        qualifying_nations = roster.nations(min_athletes=2)
         
         print(f"Found {len(qualifying_nations)} qualifying nations with 2+ {gender} athletes")
         
         # Get race technique for ELO prioritization
         race_technique = races_df.iloc[0]['Technique'] if not races_df.empty else 'F'
+        elo_priority = get_race_specific_elo_priority('Ts', race_technique)
         
-        for nation in sorted(qualifying_nations):
-            athletes = get_champs_athletes_xc(nation, gender)
-            
-            # Sort athletes by sprint-relevant ELO 
-            athlete_elos = []
-            elo_priority = get_race_specific_elo_priority('Ts', race_technique)
-            
-            for athlete_name in athletes:
-                best_elo = 0
-                
-                # Match with ELO scores
-                elo_match = None
-                if athlete_name in elo_scores['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
-                
-                if elo_match:
-                    athlete_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0]
-                    # Use team sprint relevant ELO (prioritize sprint performance)
-                    for elo_col in elo_priority:
-                        if elo_col in athlete_data and not pd.isna(athlete_data[elo_col]):
-                            best_elo = athlete_data[elo_col]
-                            break
-                
-                athlete_elos.append((athlete_name, best_elo))
-            
-            # Sort by ELO (highest first) and select top 2 athletes
-            athlete_elos.sort(key=lambda x: x[1], reverse=True)
-            team_athletes = [athlete for athlete, elo in athlete_elos[:2]]
+        for nation in qualifying_nations:
+            # Select top 2 athletes by team sprint relevant ELO
+            team_athletes = roster.top(nation, 2, elo_priority)
             
             print(f"Creating team sprint for {nation} with top 2 athletes by sprint ELO: {team_athletes}")
             
             # Create team record
             team_record = create_team_record_from_config(
-                nation, team_athletes, elo_scores, races_df.iloc[0], 'team_sprint'
+                nation, team_athletes, roster, races_df.iloc[0], 'team_sprint'
             )
             team_data.append(team_record)
         
@@ -429,29 +379,15 @@ def create_relay_championships_startlist(gender: str, races_df: pd.DataFrame) ->
     # Create output directories
     os.makedirs("relay/excel365", exist_ok=True)
     
-    # Get ELO scores (use elevation file like weekend scraper)
-    elo_path = f"~/ski/elo/python/ski/polars/excel365/{gender}_chrono_pred.csv"
-    
     try:
         print("Loading ELO scores...")
-        elo_scores = get_latest_elo_scores(elo_path)
-        if elo_scores is None or elo_scores.empty:
+        roster = get_roster(gender)
+        if roster is None:
             print(f"No ELO scores found for {gender}")
             return
         
         # Get qualifying nations from config (4+ athletes for relay competitions)
-        from config import CHAMPS_ATHLETES_MEN_XC, CHAMPS_ATHLETES_LADIES_XC
-        
-        if gender == 'men':
-            all_nations = set(CHAMPS_ATHLETES_MEN_XC.keys())
-        else:
-            all_nations = set(CHAMPS_ATHLETES_LADIES_XC.keys())
-        
-        qualifying_nations = []
-        for nation in all_nations:
-            athletes = get_champs_athletes_xc(nation, gender)
-            if len(athletes) >= 4:  # Relay requires 4 athletes
-                qualifying_nations.append(nation)
+        qualifying_nations = roster.nations(min_athletes=4)
         
         print(f"Found {len(qualifying_nations)} qualifying nations with 4+ {gender} athletes")
         
@@ -467,42 +403,18 @@ def create_relay_championships_startlist(gender: str, races_df: pd.DataFrame) ->
         all_teams_data = []
         all_individuals_data = []
         
-        for nation in sorted(qualifying_nations):
-            athletes = get_champs_athletes_xc(nation, gender)
-            
-            # Sort athletes by relay-relevant ELO (similar pattern to existing scrapers)
-            elo_priority = get_race_specific_elo_priority('Rel', race['Technique'])
-            athlete_elos = []
-            
-            for athlete_name in athletes:
-                best_elo = 0
-                
-                # Match with ELO scores
-                elo_match = None
-                if athlete_name in elo_scores['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
-                
-                if elo_match:
-                    athlete_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0]
-                    # Use technique-specific ELO prioritization
-                    for elo_col in elo_priority:
-                        if elo_col in athlete_data and not pd.isna(athlete_data[elo_col]):
-                            best_elo = athlete_data[elo_col]
-                            break
-                
-                athlete_elos.append((athlete_name, best_elo))
-            
-            # Sort by ELO and select top 4 athletes
-            athlete_elos.sort(key=lambda x: x[1], reverse=True)
-            relay_athletes = [athlete for athlete, elo in athlete_elos[:4]]
+        # Sort athletes by relay-relevant ELO (technique-specific prioritization)
+        elo_priority = get_race_specific_elo_priority('Rel', race['Technique'])
+        
+        for nation in qualifying_nations:
+            # Select top 4 athletes by ELO
+            relay_athletes = roster.top(nation, 4, elo_priority)
             
             print(f"Creating relay team for {nation}: {relay_athletes}")
             
             # Create team data (matching weekend scraper structure)
             team_data, individual_data = create_championship_relay_team(
-                nation, relay_athletes, elo_scores, race, gender
+                nation, relay_athletes, roster, race, gender
             )
             
             all_teams_data.extend(team_data)
@@ -534,30 +446,18 @@ def create_mixed_relay_championships_startlist(races_df: pd.DataFrame) -> None:
     print("Creating mixed relay startlist")
     
     try:
-        # Load both men's and ladies' ELO data (pred file for predictions)
-        men_elo = get_latest_elo_scores("~/ski/elo/python/ski/polars/excel365/men_chrono_pred.csv")
-        ladies_elo = get_latest_elo_scores("~/ski/elo/python/ski/polars/excel365/ladies_chrono_pred.csv")
+        # Load both men's and ladies' rosters (pred file for predictions)
+        men_roster = get_roster('men')
+        ladies_roster = get_roster('ladies')
         
-        if men_elo is None or ladies_elo is None or men_elo.empty or ladies_elo.empty:
+        if men_roster is None or ladies_roster is None:
             print("Could not load ELO data for mixed relays")
             return
         
         mixed_data = []
         
-        # Get nations that have both men and ladies athletes
-        from config import CHAMPS_ATHLETES_MEN_XC, CHAMPS_ATHLETES_LADIES_XC
-        
-        men_nations = set(CHAMPS_ATHLETES_MEN_XC.keys())
-        ladies_nations = set(CHAMPS_ATHLETES_LADIES_XC.keys())
-        qualifying_nations = men_nations.intersection(ladies_nations)
-        
-        # Filter for nations with sufficient athletes (at least 2 men and 2 ladies)
-        final_nations = []
-        for nation in qualifying_nations:
-            men_athletes = get_champs_athletes_xc(nation, 'men')
-            ladies_athletes = get_champs_athletes_xc(nation, 'ladies')
-            if len(men_athletes) >= 2 and len(ladies_athletes) >= 2:
-                final_nations.append(nation)
+        # Nations with at least 2 men and 2 ladies
+        final_nations = sorted(set(men_roster.nations(min_athletes=2)) & set(ladies_roster.nations(min_athletes=2)))
         
         print(f"Found {len(final_nations)} qualifying nations for mixed relays")
         
@@ -565,58 +465,16 @@ def create_mixed_relay_championships_startlist(races_df: pd.DataFrame) -> None:
         race_technique = races_df.iloc[0]['Technique'] if not races_df.empty else 'F'
         elo_priority = get_race_specific_elo_priority('Mix', race_technique)
         
-        for nation in sorted(final_nations):
-            # Get top 2 men by ELO
-            men_athletes_all = get_champs_athletes_xc(nation, 'men')
-            men_elos = []
-            for athlete_name in men_athletes_all:
-                best_elo = 0
-                elo_match = None
-                if athlete_name in men_elo['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, men_elo['Skier'].tolist())
-                
-                if elo_match:
-                    athlete_data = men_elo[men_elo['Skier'] == elo_match].iloc[0]
-                    for elo_col in elo_priority:
-                        if elo_col in athlete_data and not pd.isna(athlete_data[elo_col]):
-                            best_elo = athlete_data[elo_col]
-                            break
-                
-                men_elos.append((athlete_name, best_elo))
-            
-            men_elos.sort(key=lambda x: x[1], reverse=True)
-            men_athletes = [athlete for athlete, elo in men_elos[:2]]  # Top 2 men by ELO
-            
-            # Get top 2 ladies by ELO
-            ladies_athletes_all = get_champs_athletes_xc(nation, 'ladies')
-            ladies_elos = []
-            for athlete_name in ladies_athletes_all:
-                best_elo = 0
-                elo_match = None
-                if athlete_name in ladies_elo['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, ladies_elo['Skier'].tolist())
-                
-                if elo_match:
-                    athlete_data = ladies_elo[ladies_elo['Skier'] == elo_match].iloc[0]
-                    for elo_col in elo_priority:
-                        if elo_col in athlete_data and not pd.isna(athlete_data[elo_col]):
-                            best_elo = athlete_data[elo_col]
-                            break
-                
-                ladies_elos.append((athlete_name, best_elo))
-            
-            ladies_elos.sort(key=lambda x: x[1], reverse=True)
-            ladies_athletes = [athlete for athlete, elo in ladies_elos[:2]]  # Top 2 ladies by ELO
+        for nation in final_nations:
+            # Top 2 men and top 2 ladies by ELO
+            men_athletes = men_roster.top(nation, 2, elo_priority)
+            ladies_athletes = ladies_roster.top(nation, 2, elo_priority)
             
             print(f"Creating mixed relay for {nation}: Men (top 2 by ELO): {men_athletes}, Ladies (top 2 by ELO): {ladies_athletes}")
             
             # Create mixed relay record
             relay_record = create_mixed_team_record(
-                nation, men_athletes, ladies_athletes, men_elo, ladies_elo, races_df.iloc[0]
+                nation, men_athletes, ladies_athletes, men_roster, ladies_roster, races_df.iloc[0]
             )
             mixed_data.append(relay_record)
         
@@ -660,7 +518,7 @@ def create_mixed_relay_championships_startlist(races_df: pd.DataFrame) -> None:
         print(f"Error creating mixed relay Championships startlist: {e}")
         traceback.print_exc()
 
-def create_team_record_from_config(nation: str, athletes: List[str], elo_scores: pd.DataFrame, 
+def create_team_record_from_config(nation: str, athletes: List[str], roster: ChampsRoster, 
                                   race: pd.Series, team_type: str) -> Dict:
     """Create team record using config athletes (adapted for cross-country 9-column system)"""
     
@@ -701,15 +559,10 @@ def create_team_record_from_config(nation: str, athletes: List[str], elo_scores:
         member_index = i + 1
         athlete_name = athletes[i]
         
-        # Match with ELO scores
-        elo_match = None
-        if athlete_name in elo_scores['Skier'].values:
-            elo_match = athlete_name
-        else:
-            elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
+        # Look up the roster's ELO match
+        elo_data = roster.record(athlete_name)
         
-        if elo_match:
-            elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
+        if elo_data is not None:
             valid_member_count += 1
             
             # Add to team totals
@@ -744,7 +597,7 @@ def create_team_record_from_config(nation: str, athletes: List[str], elo_scores:
     return team_record
 
 def create_mixed_team_record(nation: str, men_athletes: List[str], ladies_athletes: List[str], 
-                           men_elo: pd.DataFrame, ladies_elo: pd.DataFrame, race: pd.Series) -> Dict:
+                           men_roster: ChampsRoster, ladies_roster: ChampsRoster, race: pd.Series) -> Dict:
     """Create mixed relay record (2 men + 2 ladies for cross-country)"""
     
     elo_columns = [
@@ -779,17 +632,12 @@ def create_mixed_team_record(nation: str, men_athletes: List[str], ladies_athlet
     
     # Process men first, then ladies
     member_index = 1
-    for athletes, elo_data in [(men_athletes, men_elo), (ladies_athletes, ladies_elo)]:
+    for athletes, roster in [(men_athletes, men_roster), (ladies_athletes, ladies_roster)]:
         for athlete_name in athletes:
-            # Match with appropriate ELO data
-            elo_match = None
-            if athlete_name in elo_data['Skier'].values:
-                elo_match = athlete_name
-            else:
-                elo_match = fuzzy_match_name(athlete_name, elo_data['Skier'].tolist())
+            # Look up the matching roster's ELO data
+            athlete_data = roster.record(athlete_name)
             
-            if elo_match:
-                athlete_data = elo_data[elo_data['Skier'] == elo_match].iloc[0].to_dict()
+            if athlete_data is not None:
                 valid_member_count += 1
                 
                 # Add to team totals
@@ -822,7 +670,7 @@ def create_mixed_team_record(nation: str, men_athletes: List[str], ladies_athlet
     
     return team_record
 
-def create_championship_relay_team(nation: str, athletes: List[str], elo_scores: pd.DataFrame, 
+def create_championship_relay_team(nation: str, athletes: List[str], roster: ChampsRoster, 
                                   race: pd.Series, gender: str) -> Tuple[List[Dict], List[Dict]]:
     """Create team and individual data for championship relay (matching weekend scraper structure)"""
     
@@ -858,15 +706,11 @@ def create_championship_relay_team(nation: str, athletes: List[str], elo_scores:
     
     # Process each team member (up to 4 for relay)
     for position, athlete_name in enumerate(athletes[:4], 1):
-        # Match with ELO scores
-        elo_match = None
-        if athlete_name in elo_scores['Skier'].values:
-            elo_match = athlete_name
-        else:
-            elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
+        # Look up the roster's ELO match
+        elo_match = roster.match(athlete_name)
         
         if elo_match:
-            athlete_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
+            athlete_data = roster.record(athlete_name)
             valid_member_count += 1
             
             # Add to team totals
@@ -17,6 +17,7 @@ from pipeline_config import TEST_MODE, get_races_file
 
 # Import common utility functions
 from startlist_common import *
+from startlist_consolidate import consolidate_race_startlists
 
 # Add this function to each main script file to call the appropriate R script
 def call_r_script(script_type: str, race_type: str = None, gender: str = None) -> None:
@@ -28,8 +29,7 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
         race_type: 'standard', 'team_sprint', 'relay', or 'mixed_relay'
         gender: 'men', 'ladies', or None for mixed events
     """
-    import subprocess
-    import os
+    from r_scheduler import submit_r_script
     
     # Set the base path to the R scripts
     r_script_base_path = "~/blog/daehl-e/content/post/cross-country/drafts"
@@ -70,27 +70,16 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
     # Full path to the R script
     r_script_path = os.path.expanduser(f"{r_script_base_path}/{r_script}")
     
-    # Command to execute the R script
-    command = ["Rscript", r_script_path]
-    
-    # Add gender parameter if specified
-    if gender:
-        command.append(gender)
-    
-    print(f"Calling R script: {' '.join(command)}")
-    
-    try:
-        # Call the R script
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-        print(f"R script output:\n{result.stdout}")
-        if result.stderr:
-            print(f"R script error:\n{result.stderr}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error calling R script: {e}")
-        print(f"Script output: {e.stdout}")
-        print(f"Script error: {e.stderr}")
-    except FileNotFoundError:
+    if not os.path.exists(r_script_path):
         print(f"R script not found: {r_script_path}")
+        return
+    
+    # Queued on the open job queue (run with the day's other R jobs), else run now;
+    # either way output streams to a log file and the run is timed
+    job = submit_r_script(r_script_path, [gender] if gender else [])
+    if job is not None and not job.succeeded:
+        print(f"Error calling R script: {job.message}")
+        print(f"Script log: {job.log_path}")
 
 def is_relay_event(race: pd.Series) -> bool:
     """
@@ -296,8 +285,15 @@ def process_races() -> None:
     has_standard_races = False
     
     # Find next race dates for each gender separately
-    men_standard = process_gender_specific_races(races_df, 'men')
-    ladies_standard = process_gender_specific_races(races_df, 'ladies')
+    men_races = select_gender_races(races_df, 'men')
+    ladies_races = select_gender_races(races_df, 'ladies')
+    
+    # Fetch every startlist page for both genders concurrently; each race is
+    # processed as soon as its own page has arrived
+    prefetch_startlists(men_races, ladies_races)
+    
+    men_standard = process_gender_specific_races(men_races, 'men')
+    ladies_standard = process_gender_specific_races(ladies_races, 'ladies')
     
     # Disabled: predict_script.sh owns the cross-country race-day simulation invocation.
     if men_standard or ladies_standard:
@@ -306,12 +302,12 @@ def process_races() -> None:
         else:
             print("Standard race event detected - scraper-side R call skipped; predict_script.sh will run race-picks-simulation.R")
 
-def process_gender_specific_races(races_df: pd.DataFrame, target_gender: str) -> bool:
+def select_gender_races(races_df: pd.DataFrame, target_gender: str) -> Optional[pd.DataFrame]:
     """
-    Process races for a specific gender, finding the next available race for that gender
-    Returns True if standard races were processed, False otherwise
+    Find the next available individual races for a specific gender
+    Returns None if there are no standard races to process
     """
-    print(f"\n===== Processing {target_gender.upper()} races =====")
+    print(f"\n===== Selecting {target_gender.upper()} races =====")
     
     # Standardize gender values
     gender_map = {
@@ -323,7 +319,7 @@ def process_gender_specific_races(races_df: pd.DataFrame, target_gender: str) ->
     gender_races = races_df[races_df['Sex'].isin(gender_map[target_gender])]
     if gender_races.empty:
         print(f"No {target_gender} races found in the data")
-        return False
+        return None
     
     # Find next race date for this gender
     next_date = find_next_race_date(gender_races)
@@ -356,14 +352,14 @@ def process_gender_specific_races(races_df: pd.DataFrame, target_gender: str) ->
         
         if not found_race:
             print(f"No upcoming {target_gender} races found within the next {look_ahead_days} days")
-            return False
+            return None
     
     # Check if all next races are relay events
     if all(is_relay_event(race) for _, race in next_races.iterrows()):
         print(f"All next {target_gender} races are relay events.")
         if handle_relay_races(next_races):
             print(f"Relay races successfully handled by relay scripts.")
-            return False  # No standard races to process
+            return None  # No standard races to process
         else:
             print(f"Failed to handle relay races with relay scripts, continuing with standard processing...")
     
@@ -373,9 +369,19 @@ def process_gender_specific_races(races_df: pd.DataFrame, target_gender: str) ->
     
     if valid_races.empty:
         print(f"No valid individual {target_gender} races found for the next date")
+        return None
+    
+    return valid_races
+
+def process_gender_specific_races(valid_races: Optional[pd.DataFrame], target_gender: str) -> bool:
+    """
+    Process the selected races for a specific gender
+    Returns True if standard races were processed, False otherwise
+    """
+    if valid_races is None:
         return False
     
-    # Process the races for this gender
+    print(f"\n===== Processing {target_gender.upper()} races =====")
     try:
         process_gender_races(valid_races, target_gender)
         return True  # Successfully processed standard races
@@ -425,8 +431,8 @@ def process_gender_races(races_df: pd.DataFrame, gender: str) -> None:
     elo_path = f"~/ski/elo/python/ski/polars/excel365/{gender}_chrono_pred.csv"
     print(f"Using ELO path: {elo_path}")
     
-    # Initialize a consolidated dataframe
-    consolidated_df = None
+    # Collect each race's startlist; they are consolidated in one pass below
+    race_frames = []
     
     # Process each race
     for i, (_, race) in enumerate(races_df.iterrows()):
@@ -462,21 +468,10 @@ def process_gender_races(races_df: pd.DataFrame, gender: str) -> None:
             print(f"Failed to create startlist for race {i+1}")
             continue
         
-        # If this is the first race, initialize the consolidated dataframe
-        if consolidated_df is None:
-            consolidated_df = race_df
-        else:
-            # Merge with existing data (ensuring we don't lose any athletes)
-            consolidated_df = merge_race_dataframes(consolidated_df, race_df, prob_column)
+        race_frames.append((prob_column, race_df))
     
     # If we successfully processed at least one race
-    if consolidated_df is not None:
-        # Ensure all race probability columns exist in the final dataframe
-        for i, col in enumerate(all_prob_columns):
-            if col not in consolidated_df.columns:
-                print(f"Adding missing column {col}")
-                consolidated_df[col] = 0.0
-        
+    if race_frames:
         # Create a comprehensive fallback startlist to ensure all current season skiers are included
         print("Creating comprehensive fallback startlist to ensure all current season skiers are included")
         fallback_df = create_race_fallback_startlist(
@@ -488,29 +483,19 @@ def process_gender_races(races_df: pd.DataFrame, gender: str) -> None:
         )
         
         if fallback_df is not None:
-            # Get skiers already in the consolidated dataframe
-            existing_skiers = set(consolidated_df['Skier'])
-            
-            # Find skiers from fallback who aren't in the consolidated dataframe
-            missing_skiers_df = fallback_df[~fallback_df['Skier'].isin(existing_skiers)]
-            print(f"Found {len(missing_skiers_df)} skiers from current season not already in the startlist")
-            
-            # Drop the temp_prob column
-            missing_skiers_df = missing_skiers_df.drop(columns=['temp_prob'])
-            
-            # Add all race probability columns with 0
-            for col in all_prob_columns:
-                missing_skiers_df[col] = 0.0
-            
-            # Combine with the consolidated dataframe
-            if len(missing_skiers_df) > 0:
-                consolidated_df = pd.concat([consolidated_df, missing_skiers_df], ignore_index=True)
-                print(f"Added {len(missing_skiers_df)} skiers from current season to the startlist")
-        
-        # Make sure In_FIS_List is FALSE for skiers not on any startlist
-        # If a skier has 0 probability for all races, they weren't on any startlist
-        # Check row by row if all probability values are 0
-        consolidated_df.loc[consolidated_df[all_prob_columns].sum(axis=1) == 0, 'In_FIS_List'] = False
+            fallback_df = fallback_df.drop(columns=['temp_prob'])
+        
+        # Consolidate all races in one pass: one probability column per race, missing
+        # races and season-only skiers zero-filled, In_FIS_List set to False for skiers
+        # who are not on any startlist
+        consolidated_df = consolidate_race_startlists(
+            race_frames,
+            all_prob_columns,
+            sort_by=['Race_Elo', 'Price'],
+            ascending=[False, False],
+            extra_athletes=fallback_df,
+            flag_column='In_FIS_List'
+        )
         
         # Save the consolidated dataframe
         output_path = f"~/ski/elo/python/ski/polars/excel365/startlist_races_{gender}.csv"
@@ -601,13 +586,6 @@ def create_race_startlist(fis_url: str, elo_path: str, race_info: pd.Series, gen
                 skier_id = None
                 nation = fis_nation_code
             
-            # Determine which ELO columns to prioritize based on race type
-            try:
-                elo_priority = get_elo_priority(distance, technique)
-            except Exception as e:
-                print(f"Error determining ELO priority: {e}")
-                elo_priority = ['Elo']
-            
             # Build base row data
             row_data = {
                 'FIS_Name': fis_name,
@@ -623,8 +601,7 @@ def create_race_startlist(fis_url: str, elo_path: str, race_info: pd.Series, gen
                       'Sprint_Elo', 'Sprint_C_Elo', 'Sprint_F_Elo', 'Classic_Elo', 'Freestyle_Elo']:
                 row_data[col] = elo_data.get(col, None)
             
-            # Add race-specific ELO and race type
-            row_data['Race_Elo'] = get_race_specific_elo(elo_data, elo_priority)
+            # Add race type (Race_Elo is added for the whole startlist below)
             row_data['Race_Type'] = f"{distance}km {technique}"
             
             # Set race probability
@@ -645,10 +622,8 @@ def create_race_startlist(fis_url: str, elo_path: str, race_info: pd.Series, gen
         
         # Add chronos data for additional analysis and Last_5 features
         try:
-            chronos = pd.read_csv(elo_path)
-            
-            # Identify skiers who competed in previous races
-            recent_competitors = get_recent_competitors(chronos, race_info_dict)
+            # Identify skiers who competed in previous races (chrono file is parsed once per run)
+            recent_competitors = get_chrono(elo_path).recent_competitors(distance, technique)
             
             # Add recent competitor flag to dataframe
             for row in data:
@@ -666,6 +641,8 @@ def create_race_startlist(fis_url: str, elo_path: str, race_info: pd.Series, gen
         df = pd.DataFrame(data)
         for key, value in race_info_dict.items():
             df[key] = value
+        # Race-specific ELO for the whole startlist, unmatched athletes imputed at Q1
+        df = add_race_elo(df, get_elo_priority(distance, technique), elo_quartiles(elo_scores))
             
         # Sort by relevant ELO and price
         if 'Race_Elo' in df.columns and 'Price' in df.columns:
@@ -692,39 +669,6 @@ def create_race_fallback_startlist(elo_path: str, gender: str, race_info: pd.Ser
         
         print(f"Race details: {distance}km {technique} in {city}, {country}")
         
-        # Get the most recent ELO scores
-        elo_scores = get_latest_elo_scores(elo_path)
-        
-        # Get chronos data for finding current season skiers
-        try:
-            import polars as pl
-            chronos = pl.read_csv(
-                elo_path,
-                infer_schema_length=10000,
-                ignore_errors=True,
-                null_values=["", "NA", "NULL", "Sprint"]
-            ).to_pandas()
-        except Exception as csv_err:
-            print(f"Error with polars: {csv_err}")
-            # Fallback to pandas if polars fails
-            chronos = pd.read_csv(elo_path, low_memory=False)
-        
-        # Get all skiers from current season
-        current_season = get_current_season_from_chronos(chronos)
-        current_season_skiers = chronos[chronos['Season'] == current_season]['Skier'].unique()
-        print(f"Found {len(current_season_skiers)} skiers from the {current_season} season")
-        
-        # Create data for DataFrame
-        data = []
-        processed_names = set()
-        
-        # Define Elo columns
-        elo_columns = [
-            'Elo', 'Distance_Elo', 'Distance_C_Elo', 'Distance_F_Elo', 
-            'Sprint_Elo', 'Sprint_C_Elo', 'Sprint_F_Elo', 
-            'Classic_Elo', 'Freestyle_Elo'
-        ]
-        
         # Determine which ELO columns to prioritize based on race type
         try:
             elo_priority = get_elo_priority(distance, technique)
@@ -732,87 +676,33 @@ def create_race_fallback_startlist(elo_path: str, gender: str, race_info: pd.Ser
             print(f"Error determining ELO priority: {e}")
             elo_priority = ['Elo']
         
-        # Process each current season skier
-        for skier_name in current_season_skiers:
-            if skier_name in processed_names:
-                continue
-            
-            # Get the most recent record for this skier
-            recent_records = chronos[chronos['Skier'] == skier_name].sort_values('Date', ascending=False)
-            
-            if recent_records.empty:
-                continue
-                
-            # Get the most recent record
-            recent_record = recent_records.iloc[0]
-            nation = recent_record['Nation']
-            skier_id = recent_record['ID']
-            
-            # Match with ELO scores
-            elo_match = None
-            if 'Skier' in elo_scores.columns and skier_name in elo_scores['Skier'].values:
-                elo_match = skier_name
-            elif 'Skier' in elo_scores.columns:
-                # Try fuzzy matching if no exact match
-                elo_match = fuzzy_match_name(skier_name, elo_scores['Skier'].tolist())
-            
-            if elo_match and 'Skier' in elo_scores.columns:
-                elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
-            else:
-                # Use Elo values directly from chronos data as fallback
-                elo_data = {}
-                # Get Elo values directly from recent record
-                for elo_col in elo_columns:
-                    if elo_col in recent_record and not pd.isna(recent_record[elo_col]):
-                        elo_data[elo_col] = float(recent_record[elo_col])
-                    else:
-                        elo_data[elo_col] = None
-            
-            # Get fantasy price
-            price = get_fantasy_price(skier_name, fantasy_prices)
-            
-            # Build row data
-            row_data = {
-                'FIS_Name': skier_name,
-                'Skier': skier_name,
-                'ID': skier_id,
-                'Nation': nation,
-                'In_FIS_List': False,  # Not in FIS list since this is fallback
-                'Price': price
-            }
-            
-            # Add ELO columns
-            for col in elo_columns:
-                row_data[col] = elo_data.get(col, None)
-            
-            # Add race-specific ELO and race type
-            row_data['Race_Elo'] = get_race_specific_elo(elo_data, elo_priority)
-            row_data['Race_Type'] = f"{distance}km {technique}"
-            
-            # Set race probability for fallback - will be calculated later in R
-            if prob_column:
-                row_data[prob_column] = 0.0  # Default to 0 for fallback, R will calculate realistic probability
-            
-            # Add race info
-            row_data.update({
-                'City': city,
-                'Country': country,
-                'Distance': distance,
-                'Technique': technique,
-                'Race_Date': race_info['Date']
-            })
-            
-            # Mark as not a recent competitor for fallback (we don't have startlist info)
-            row_data['Recent_Competitor'] = False
-            
-            data.append(row_data)
-            processed_names.add(skier_name)
-        
-        
-        # Create DataFrame and sort by race-specific ELO and price
-        df = pd.DataFrame(data)
-        if 'Race_Elo' in df.columns and 'Price' in df.columns:
-            df = df.sort_values(['Race_Elo', 'Price'], ascending=[False, False])
+        # All current season skiers with Elo, Race_Elo and price in one Polars pipeline
+        season_df = season_fallback_frame(elo_path, fantasy_prices, elo_priority=elo_priority)
+        
+        columns = ['FIS_Name', 'Skier', 'ID', 'Nation', 'In_FIS_List', 'Price'] + ELO_COLUMNS + ['Race_Elo', 'Race_Type']
+        season_df = season_df.with_columns([
+            pl.col('Skier').alias('FIS_Name'),
+            pl.lit(False).alias('In_FIS_List'),  # Not in FIS list since this is fallback
+            pl.lit(f"{distance}km {technique}").alias('Race_Type'),
+        ])
+        if prob_column:
+            # Default to 0 for fallback, R will calculate realistic probability
+            season_df = season_df.with_columns(pl.lit(0.0).alias(prob_column))
+            columns.append(prob_column)
+        df = season_df.select(columns).to_pandas()
+        
+        # Add race info
+        df['City'] = city
+        df['Country'] = country
+        df['Distance'] = distance
+        df['Technique'] = technique
+        df['Race_Date'] = race_info['Date']
+        
+        # Mark as not a recent competitor for fallback (we don't have startlist info)
+        df['Recent_Competitor'] = False
+        
+        # Sort by race-specific ELO and price
+        df = df.sort_values(['Race_Elo', 'Price'], ascending=[False, False])
         
         print(f"Created fallback race startlist with {len(df)} athletes")
         return df
@@ -822,111 +712,9 @@ def create_race_fallback_startlist(elo_path: str, gender: str, race_info: pd.Ser
         traceback.print_exc()
         return None
 
-def get_elo_priority(distance: str, technique: str) -> List[str]:
-    """Determine which ELO columns to prioritize based on race type"""
-    # Handle sprint races (distance < 2)
-    try:
-        is_sprint = False
-        if isinstance(distance, str):
-            if distance.strip() == 'SP':
-                is_sprint = True
-            else:
-                # Remove km and try to convert to float
-                clean_distance = distance.replace('km', '').strip()
-                if clean_distance.replace('.', '', 1).isdigit():
-                    is_sprint = float(clean_distance) < 2
-    except Exception as e:
-        print(f"Error determining if race is sprint: {e}")
-        is_sprint = False
-    
-    if is_sprint:
-        if technique == 'C':
-            return ['Sprint_C_Elo', 'Sprint_Elo', 'Classic_Elo', 'Elo']
-        elif technique == 'F':
-            return ['Sprint_F_Elo', 'Sprint_Elo', 'Freestyle_Elo', 'Elo']
-        else:
-            return ['Sprint_Elo', 'Elo']
-    else:
-        if technique == 'C':
-            return ['Distance_C_Elo', 'Distance_Elo', 'Classic_Elo', 'Elo']
-        elif technique == 'F':
-            return ['Distance_F_Elo', 'Distance_Elo', 'Freestyle_Elo', 'Elo']
-        else:
-            return ['Distance_Elo', 'Elo']
-
-def get_race_specific_elo(elo_data: Dict, priority_columns: List[str]) -> float:
-    """Get the most relevant ELO score based on priority list"""
-    for col in priority_columns:
-        if col in elo_data and elo_data[col] is not None:
-            try:
-                return float(elo_data[col])
-            except (TypeError, ValueError):
-                continue
-    return 0.0  # Default if no matching ELO found
-
-def get_recent_competitors(chronos: pd.DataFrame, race_info: Dict) -> set:
-    """Get set of skiers who have competed in similar races recently"""
-    try:
-        # Filter to current season if Season column exists
-        if 'Season' in chronos.columns:
-            current_season = get_current_season_from_chronos(chronos)
-            current_season_data = chronos[chronos['Season'] == current_season]
-        else:
-            current_season_data = chronos
-        
-        # Find races similar to current one
-        similar_races = current_season_data
-        
-        # Filter by Distance if possible
-        if 'Distance' in current_season_data.columns:
-            similar_races = similar_races[similar_races['Distance'].astype(str) == str(race_info['Distance'])]
-        
-        # Filter by Technique if possible
-        if 'Technique' in current_season_data.columns:
-            similar_races = similar_races[similar_races['Technique'] == race_info['Technique']]
-        
-        # Get unique skiers
-        if 'Skier' in similar_races.columns:
-            return set(similar_races['Skier'].unique())
-        else:
-            return set()
-    except Exception as e:
-        print(f"Error getting recent competitors: {e}")
-        return set()
-
-
-def merge_race_dataframes(df1: pd.DataFrame, df2: pd.DataFrame, prob_column: str) -> pd.DataFrame:
-    """Merge two race dataframes, preserving unique athletes and combining probability columns"""
-    # Create a copy of df1 to avoid modifying the original
-    result = df1.copy()
-    
-    # Create a set of existing skiers in df1
-    existing_skiers = set(df1['Skier'])
-    
-    # For skiers that exist in both dataframes, update the probability column
-    common_skiers = set(df2['Skier']) & existing_skiers
-    for skier in common_skiers:
-        # Find the row index in result for this skier
-        idx = result[result['Skier'] == skier].index[0]
-        
-        # Get probability from df2
-        prob_value = df2[df2['Skier'] == skier][prob_column].values[0]
-        
-        # Update the probability in result
-        result.loc[idx, prob_column] = prob_value
-    
-    # For skiers that only exist in df2, add them to result
-    new_skiers = set(df2['Skier']) - existing_skiers
-    new_rows = df2[df2['Skier'].isin(new_skiers)]
-    
-    # Append the new rows to result
-    result = pd.concat([result, new_rows], ignore_index=True)
-    
-    # Sort the result by ELO and price
-    result = result.sort_values(['Race_Elo', 'Price'], ascending=[False, False])
-    
-    return result
-
-
 if __name__ == "__main__":
-    process_races()
+    from r_scheduler import r_job_queue
+
+    # R jobs queued by this run and the relay scripts it starts run together at the end
+    with r_job_queue():
+        process_races()
@@ -11,6 +11,7 @@ warnings.filterwarnings('ignore')
 
 # Import common utility functions
 from startlist_common import *
+from startlist_consolidate import consolidate_race_startlists
 
 # Import config for nation quotas
 from config import get_nation_quota, get_additional_skiers
@@ -25,8 +26,7 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
         race_type: 'standard', 'team_sprint', 'relay', or 'mixed_relay'
         gender: 'men', 'ladies', or None for mixed events
     """
-    import subprocess
-    import os
+    from r_scheduler import submit_r_script
     
     # Set the base path to the R scripts
     r_script_base_path = "~/blog/daehl-e/content/post/cross-country/drafts"
@@ -65,27 +65,16 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
     # Full path to the R script
     r_script_path = os.path.expanduser(f"{r_script_base_path}/{r_script}")
     
-    # Command to execute the R script
-    command = ["Rscript", r_script_path]
-    
-    # Add gender parameter if specified
-    if gender:
-        command.append(gender)
-    
-    print(f"Calling R script: {' '.join(command)}")
-    
-    try:
-        # Call the R script
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-        print(f"R script output:\n{result.stdout}")
-        if result.stderr:
-            print(f"R script error:\n{result.stderr}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error calling R script: {e}")
-        print(f"Script output: {e.stdout}")
-        print(f"Script error: {e.stderr}")
-    except FileNotFoundError:
+    if not os.path.exists(r_script_path):
         print(f"R script not found: {r_script_path}")
+        return
+    
+    # Queued on the open job queue (run with the day's other R jobs), else run now;
+    # either way output streams to a log file and the run is timed
+    job = submit_r_script(r_script_path, [gender] if gender else [])
+    if job is not None and not job.succeeded:
+        print(f"Error calling R script: {job.message}")
+        print(f"Script log: {job.log_path}")
 
 
 def process_tds_races() -> None:
@@ -121,6 +110,9 @@ def process_tds_races() -> None:
         print(f"      Date: {race.get('Race_Date', 'Unknown')}")
         print(f"      Startlist: {race.get('Startlist', 'No URL')}")
     
+    # Fetch every stage's startlist page for both genders concurrently
+    prefetch_startlists(tds_races)
+    
     # Get unique gender and date combinations to determine minimum race for each gender
     gender_mapping = {'M': 'men', 'L': 'ladies'}
     
@@ -185,8 +177,8 @@ def process_tds_gender_races(races_df: pd.DataFrame, gender: str, host_nation: s
     # Get the ELO path
     elo_path = f"~/ski/elo/python/ski/polars/excel365/{gender}_chrono_pred.csv"
     
-    # Initialize a consolidated dataframe
-    consolidated_df = None
+    # Collect each race's startlist; they are consolidated in one pass below
+    race_frames = []
     
     # Process each race
     for i, (_, race) in enumerate(races_df.iterrows()):
@@ -219,20 +211,16 @@ def process_tds_gender_races(races_df: pd.DataFrame, gender: str, host_nation: s
         race_prob_cols = [col for col in race_df.columns if 'Race' in col and 'Prob' in col]
         print(f"Probability columns returned by race {i+1}: {race_prob_cols}")
         
-        # Merge logic
-        if consolidated_df is None:
-            print(f"Initializing consolidated_df with race {i+1}")
-            consolidated_df = race_df.copy()
-            print(f"Initial consolidated_df has {len(consolidated_df)} rows, {len(consolidated_df.columns)} columns")
-        else:
-            # Debug merge operation
-            print(f"Merging race {i+1} data with consolidated_df...")
-            
-            # Perform the merge
-            print(f"Calling merge_race_dataframes with prob_column: '{prob_columns[i]}'")
-            consolidated_df = merge_race_dataframes(consolidated_df, race_df, prob_columns[i])
-            
-            print(f"After merge - total columns: {len(consolidated_df.columns)}")
+        race_frames.append((prob_columns[i], race_df))
+    
+    # Consolidate all races in one pass (one probability column per race)
+    consolidated_df = consolidate_race_startlists(
+        race_frames,
+        [prob_column for prob_column, _ in race_frames],
+        sort_by=['Price', 'Elo'],
+        ascending=[False, False],
+        fis_only=True
+    )
     
     # Save the result
     if consolidated_df is not None:
@@ -573,120 +561,28 @@ def create_fallback_startlist(elo_path: str, gender: str, host_nation: str,
     try:
         print(f"Creating fallback startlist with all skiers from the current season for {gender}")
         
-        # Get the most recent ELO scores
-        elo_scores = get_latest_elo_scores(elo_path)
-        
-        # Get chronos data for finding current season skiers
-        try:
-            chronos = pl.read_csv(
-                elo_path,
-                infer_schema_length=10000,
-                ignore_errors=True,
-                null_values=["", "NA", "NULL", "Sprint"]
-            ).to_pandas()
-        except Exception as csv_err:
-            print(f"Error with polars: {csv_err}")
-            # Fallback to pandas if polars fails
-            chronos = pd.read_csv(elo_path, low_memory=False)
-        
-        # Get all skiers from current season
-        current_season = get_current_season_from_chronos(chronos)
-        current_season_skiers = chronos[chronos['Season'] == current_season]['Skier'].unique()
-        print(f"Found {len(current_season_skiers)} skiers from the {current_season} season")
-        
         # Get list of nations in config
         ADDITIONAL_SKIERS = get_additional_skiers(gender)
         config_nations = list(ADDITIONAL_SKIERS.keys())
         
-        # Create data for DataFrame
-        data = []
-        processed_names = set()
-        
-        # Define Elo columns
-        elo_columns = [
-            'Elo', 'Distance_Elo', 'Distance_C_Elo', 'Distance_F_Elo', 
-            'Sprint_Elo', 'Sprint_C_Elo', 'Sprint_F_Elo', 
-            'Classic_Elo', 'Freestyle_Elo'
-        ]
-        
-        # Process each current season skier
-        for skier_name in current_season_skiers:
-            if skier_name in processed_names:
-                continue
-            
-            # Get the most recent record for this skier
-            recent_records = chronos[chronos['Skier'] == skier_name].sort_values('Date', ascending=False)
-            
-            if recent_records.empty:
-                continue
-                
-            # Get the most recent record
-            recent_record = recent_records.iloc[0]
-            nation = recent_record['Nation']
-            skier_id = recent_record['ID']
-            
-            # Match with ELO scores
-            elo_match = None
-            if skier_name in elo_scores['Skier'].values:
-                elo_match = skier_name
-            else:
-                # Try fuzzy matching if no exact match
-                elo_match = fuzzy_match_name(skier_name, elo_scores['Skier'].tolist())
-            
-            if elo_match:
-                elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
-            else:
-                # Use Elo values directly from chronos data as fallback
-                elo_data = {}
-                # Get Elo values directly
-                for elo_col in elo_columns:
-                    if elo_col in recent_record and not pd.isna(recent_record[elo_col]):
-                        elo_data[elo_col] = float(recent_record[elo_col])
-                    else:
-                        elo_data[elo_col] = None
-            
-            # Get fantasy price
-            price = get_fantasy_price(skier_name, fantasy_prices)
-            
-            # Calculate nation quota
-            base_quota = get_nation_quota(nation, gender)
-            is_host = (nation == host_nation)
-            total_quota = get_nation_quota(nation, gender, is_host=is_host)
-            
-            # Create skier data
-            skier_data = {
-                'FIS_Name': skier_name,
-                'Skier': skier_name,
-                'ID': skier_id,
-                'Nation': nation,
-                'In_FIS_List': False,  # Not in FIS list since this is fallback
-                'Config_Nation': nation in config_nations,
-                'In_Config': False,
-                'Price': price,
-                'Elo': elo_data.get('Elo', None),
-                'Distance_Elo': elo_data.get('Distance_Elo', None),
-                'Distance_C_Elo': elo_data.get('Distance_C_Elo', None),
-                'Distance_F_Elo': elo_data.get('Distance_F_Elo', None),
-                'Sprint_Elo': elo_data.get('Sprint_Elo', None),
-                'Sprint_C_Elo': elo_data.get('Sprint_C_Elo', None),
-                'Sprint_F_Elo': elo_data.get('Sprint_F_Elo', None),
-                'Classic_Elo': elo_data.get('Classic_Elo', None),
-                'Freestyle_Elo': elo_data.get('Freestyle_Elo', None),
-                'Base_Quota': base_quota,
-                'Is_Host_Nation': is_host,
-                'Quota': total_quota
-            }
-            
-            # Set race probability
-            if prob_column:
-                # Set all TdS race probabilities to 100%
-                skier_data[prob_column] = 1.0
-            
-            data.append(skier_data)
-            processed_names.add(skier_name)
-        
-        # Create DataFrame and sort by Elo
-        df = pd.DataFrame(data)
+        # All current season skiers with Elo, price and nation quotas in one Polars pipeline
+        season_df = season_fallback_frame(elo_path, fantasy_prices, gender=gender,
+                                          nation_quota=get_nation_quota, host_nation=host_nation)
+        season_df = season_df.with_columns([
+            pl.col('Skier').alias('FIS_Name'),
+            pl.lit(False).alias('In_FIS_List'),  # Not in FIS list since this is fallback
+            pl.col('Nation').is_in(config_nations).fill_null(False).alias('Config_Nation'),
+            pl.lit(False).alias('In_Config'),
+        ])
+        columns = ['FIS_Name', 'Skier', 'ID', 'Nation', 'In_FIS_List', 'Config_Nation', 'In_Config', 'Price'] + \
+            ELO_COLUMNS + ['Base_Quota', 'Is_Host_Nation', 'Quota', 'Nation_Rank', 'In_Quota']
+        if prob_column:
+            # Set all TdS race probabilities to 100%
+            season_df = season_df.with_columns(pl.lit(1.0).alias(prob_column))
+            columns.append(prob_column)
+        
+        # Create DataFrame and sort by price and Elo
+        df = season_df.select(columns).to_pandas()
         df = df.sort_values(['Price', 'Elo'], ascending=[False, False])
         
         print(f"Created fallback TdS startlist with {len(df)} athletes")
@@ -697,48 +593,9 @@ def create_fallback_startlist(elo_path: str, gender: str, host_nation: str,
         traceback.print_exc()
         return None
 
-
-def merge_race_dataframes(df1: pd.DataFrame, df2: pd.DataFrame, prob_column: str) -> pd.DataFrame:
-    """Merge two race dataframes, preserving unique athletes and combining probability columns"""
-    # Create a copy of df1 to avoid modifying the original
-    result = df1.copy()
-    
-    # Check if we should only include FIS athletes (if df1 has any FIS athletes)
-    fis_athletes_exist_in_result = (result['In_FIS_List'] == True).any()
-    
-    # Create a set of existing skiers in df1
-    existing_skiers = set(df1['Skier'])
-    
-    # For skiers that exist in both dataframes, update the probability column
-    common_skiers = set(df2['Skier']) & existing_skiers
-    for skier in common_skiers:
-        # Find the row index in result for this skier
-        idx = result[result['Skier'] == skier].index[0]
-        
-        # Get probability from df2
-        prob_value = df2[df2['Skier'] == skier][prob_column].values[0]
-        
-        # Update the probability in result
-        result.loc[idx, prob_column] = prob_value
-    
-    # For skiers that only exist in df2, add them to result
-    new_skiers = set(df2['Skier']) - existing_skiers
-    new_rows = df2[df2['Skier'].isin(new_skiers)]
-    
-    # Apply FIS filtering to new rows if we're in FIS-only mode
-    if fis_athletes_exist_in_result and not new_rows.empty:
-        print(f"Filtering {len(new_rows)} new skiers to only include FIS athletes")
-        new_rows = new_rows[new_rows['In_FIS_List'] == True]
-        print(f"After FIS filtering: {len(new_rows)} new skiers remaining")
-    
-    # Append the new rows to result
-    result = pd.concat([result, new_rows], ignore_index=True)
-    
-    # Sort the result by price and elo
-    result = result.sort_values(['Price', 'Elo'], ascending=[False, False])
-    
-    return result
-
-
 if __name__ == "__main__":
-    process_tds_races()
+    from r_scheduler import r_job_queue
+
+    # R jobs queued by this run and the relay scripts it starts run together at the end
+    with r_job_queue():
+        process_tds_races()
@@ -17,6 +17,7 @@ from pipeline_config import TEST_MODE, get_weekends_file
 
 # Import common utility functions
 from startlist_common import *
+from startlist_consolidate import consolidate_race_startlists
 
 # Import config for nation quotas
 from config import get_nation_quota, get_additional_skiers
@@ -32,8 +33,7 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
         race_type: 'standard', 'team_sprint', 'relay', or 'mixed_relay'
         gender: 'men', 'ladies', or None for mixed events
     """
-    import subprocess
-    import os
+    from r_scheduler import submit_r_script
     
     # Set the base path to the R scripts
     r_script_base_path = "~/blog/daehl-e/content/post/cross-country/drafts"
@@ -72,27 +72,16 @@ def call_r_script(script_type: str, race_type: str = None, gender: str = None) -
     # Full path to the R script
     r_script_path = os.path.expanduser(f"{r_script_base_path}/{r_script}")
     
-    # Command to execute the R script
-    command = ["Rscript", r_script_path]
-    
-    # Add gender parameter if specified
-    if gender:
-        command.append(gender)
-    
-    print(f"Calling R script: {' '.join(command)}")
-    
-    try:
-        # Call the R script
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-        print(f"R script output:\n{result.stdout}")
-        if result.stderr:
-            print(f"R script error:\n{result.stderr}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error calling R script: {e}")
-        print(f"Script output: {e.stdout}")
-        print(f"Script error: {e.stderr}")
-    except FileNotFoundError:
+    if not os.path.exists(r_script_path):
         print(f"R script not found: {r_script_path}")
+        return
+    
+    # Queued on the open job queue (run with the day's other R jobs), else run now;
+    # either way output streams to a log file and the run is timed
+    job = submit_r_script(r_script_path, [gender] if gender else [])
+    if job is not None and not job.succeeded:
+        print(f"Error calling R script: {job.message}")
+        print(f"Script log: {job.log_path}")
 
 def is_relay_event(race: pd.Series) -> bool:
     """
@@ -333,6 +322,10 @@ def process_weekend_races() -> None:
         
         print(f"Found {len(men_races)} men's races and {len(ladies_races)} ladies' races to process")
         
+        # Fetch every startlist page for both genders concurrently; each race is
+        # processed as soon as its own page has arrived
+        prefetch_startlists(men_races, ladies_races)
+        
         # Process men's races
         if not men_races.empty:
             try:
@@ -388,8 +381,8 @@ def process_gender_races(races_df: pd.DataFrame, gender: str, host_nation: str,
     # Check base ELO file for existing probability columns
     print(f"\n=== CHECKING BASE ELO FILE ===")
     try:
-        base_elo_df = pd.read_csv(elo_path)
-        base_prob_cols = [col for col in base_elo_df.columns if 'Race' in col and 'Prob' in col]
+        base_elo_columns = get_chrono(elo_path).columns
+        base_prob_cols = [col for col in base_elo_columns if 'Race' in col and 'Prob' in col]
         if base_prob_cols:
             print(f"⚠️  BASE FILE ALREADY HAS PROBABILITY COLUMNS: {base_prob_cols}")
             print("This could be the source of extra columns!")
@@ -398,8 +391,8 @@ def process_gender_races(races_df: pd.DataFrame, gender: str, host_nation: str,
     except Exception as e:
         print(f"Could not read base ELO file: {e}")
     
-    # Initialize a consolidated dataframe
-    consolidated_df = None
+    # Collect each race's startlist; they are consolidated in one pass below
+    race_frames = []
     
     # Process each race with detailed debugging
     for i, (_, race) in enumerate(races_df.iterrows()):
@@ -444,53 +437,15 @@ def process_gender_races(races_df: pd.DataFrame, gender: str, host_nation: str,
         else:
             print(f"✓ Race {i+1} returned correct single probability column")
         
-        # Merge logic with debugging
-        if consolidated_df is None:
-            print(f"Initializing consolidated_df with race {i+1}")
-            consolidated_df = race_df.copy()
-            init_prob_cols = [col for col in consolidated_df.columns if 'Race' in col and 'Prob' in col]
-            print(f"Initial consolidated_df probability columns: {init_prob_cols}")
-            print(f"Initial consolidated_df has {len(consolidated_df)} rows, {len(consolidated_df.columns)} columns")
-        else:
-            # Debug merge operation
-            print(f"Merging race {i+1} data with consolidated_df...")
-            
-            # Before merge state
-            before_prob_cols = [col for col in consolidated_df.columns if 'Race' in col and 'Prob' in col]
-            before_total_cols = len(consolidated_df.columns)
-            print(f"Before merge - probability columns: {before_prob_cols}")
-            print(f"Before merge - total columns: {before_total_cols}")
-            
-            # Perform the merge
-            print(f"Calling merge_race_dataframes with prob_column: '{prob_columns[i]}'")
-            consolidated_df = merge_race_dataframes(consolidated_df, race_df, prob_columns[i])
-            
-            # After merge state
-            after_prob_cols = [col for col in consolidated_df.columns if 'Race' in col and 'Prob' in col]
-            after_total_cols = len(consolidated_df.columns)
-            print(f"After merge - probability columns: {after_prob_cols}")
-            print(f"After merge - total columns: {after_total_cols}")
-            
-            # Validate merge results
-            expected_prob_cols = len(before_prob_cols) + 1
-            actual_prob_cols = len(after_prob_cols)
-            
-            if actual_prob_cols != expected_prob_cols:
-                print(f"⚠️  MERGE PROBLEM!")
-                print(f"Expected {expected_prob_cols} probability columns after merge, got {actual_prob_cols}")
-                
-                # Show what changed
-                new_cols = set(after_prob_cols) - set(before_prob_cols)
-                removed_cols = set(before_prob_cols) - set(after_prob_cols)
-                
-                if new_cols:
-                    print(f"Columns added during merge: {new_cols}")
-                if removed_cols:
-                    print(f"Columns removed during merge: {removed_cols}")
-                    
-                print("This suggests merge_race_dataframes is the source of extra columns!")
-            else:
-                print(f"✓ Merge correctly added 1 probability column")
+        race_frames.append((prob_columns[i], race_df))
+    
+    # Consolidate all races in one pass (one probability column per race)
+    consolidated_df = consolidate_race_startlists(
+        race_frames,
+        [prob_column for prob_column, _ in race_frames],
+        sort_by=['Price', 'Elo'],
+        ascending=[False, False]
+    )
     
     # Final validation and save
     if consolidated_df is not None:
@@ -757,23 +712,12 @@ def create_weekend_startlist(fis_url: str, elo_path: str, gender: str,
 
         # Add processing for additional skiers from chronos data
         try:
-            # Get chronos data for finding additional national skiers
-            # Use more robust options for reading the CSV
-            try:
-                chronos = pl.read_csv(
-                    elo_path,
-                    infer_schema_length=10000,  # Increase schema inference length
-                    ignore_errors=True,  # Ignore parsing errors
-                    null_values=["", "NA", "NULL", "Sprint"]  # Add "Sprint" to null values
-                ).to_pandas()
-            except Exception as csv_err:
-                print(f"Error with polars: {csv_err}")
-                # Fallback to pandas if polars fails
-                chronos = pd.read_csv(elo_path, low_memory=False)
+            # Get chronos data for finding additional national skiers (parsed once per run)
+            chrono = get_chrono(elo_path)
             
             # Get current season and all nations from that season
-            current_season = get_current_season_from_chronos(chronos)
-            all_current_nations = set(chronos[chronos['Season'] == current_season]['Nation'].unique())
+            current_season = chrono.current_season
+            all_current_nations = set(chrono.current_season_frame['Nation'].unique())
             
             # Find nations that aren't in config
             non_config_nations = {nation for nation in all_current_nations if nation not in config_nations}
@@ -788,8 +732,8 @@ def create_weekend_startlist(fis_url: str, elo_path: str, gender: str,
                 current_skiers = {row['Skier'] for row in data if row['Nation'] == nation}
                 
                 # Get all skiers from this nation who competed in current season
-                nation_skiers = chronos[(chronos['Nation'] == nation) & 
-                                      (chronos['Season'] == current_season)]['Skier'].unique()
+                season_df = chrono.current_season_frame
+                nation_skiers = season_df[season_df['Nation'] == nation]['Skier'].unique()
                 
                 print(f"Found {len(nation_skiers)} skiers from {nation} who competed in {current_season}")
                 
@@ -893,23 +837,6 @@ def create_fallback_startlist(elo_path: str, gender: str, host_nation: str,
         # Get the most recent ELO scores
         elo_scores = get_latest_elo_scores(elo_path)
 
-        # Get chronos data for finding current season skiers
-        try:
-            chronos = pl.read_csv(
-                elo_path,
-                infer_schema_length=10000,
-                ignore_errors=True,
-                null_values=["", "NA", "NULL", "Sprint"]
-            ).to_pandas()
-        except Exception as csv_err:
-            print(f"Error with polars: {csv_err}")
-            chronos = pd.read_csv(elo_path, low_memory=False)
-
-        # Get all skiers from current season
-        current_season = get_current_season_from_chronos(chronos)
-        current_season_skiers = set(chronos[chronos['Season'] == current_season]['Skier'].unique())
-        print(f"Found {len(current_season_skiers)} skiers from the {current_season} season")
-
         # Get config data
         ADDITIONAL_SKIERS = get_additional_skiers(gender)
         config_nations = list(ADDITIONAL_SKIERS.keys())
@@ -934,13 +861,6 @@ def create_fallback_startlist(elo_path: str, gender: str, host_nation: str,
         data = []
         processed_names = set()
 
-        # Define Elo columns
-        elo_columns = [
-            'Elo', 'Distance_Elo', 'Distance_C_Elo', 'Distance_F_Elo',
-            'Sprint_Elo', 'Sprint_C_Elo', 'Sprint_F_Elo',
-            'Classic_Elo', 'Freestyle_Elo'
-        ]
-
         def get_elo_data_for_skier(skier_name):
             """Helper to get ELO data for a skier"""
             if skier_name in elo_scores['Skier'].values:
@@ -1004,71 +924,29 @@ def create_fallback_startlist(elo_path: str, gender: str, host_nation: str,
             data.append(skier_data)
             processed_names.add(matched_name)
 
-        # STEP 2: Process remaining current season skiers
+        # STEP 2: Remaining current season skiers, with quotas, in one Polars pipeline
         print(f"Processing remaining current season skiers...")
-        for skier_name in current_season_skiers:
-            if skier_name in processed_names:
-                continue
-
-            recent_records = chronos[chronos['Skier'] == skier_name].sort_values('Date', ascending=False)
-            if recent_records.empty:
-                continue
-
-            recent_record = recent_records.iloc[0]
-            nation = recent_record['Nation']
-            skier_id = recent_record['ID']
-
-            elo_data, matched_name = get_elo_data_for_skier(skier_name)
-            if not elo_data:
-                elo_data = {}
-                for elo_col in elo_columns:
-                    if elo_col in recent_record and not pd.isna(recent_record[elo_col]):
-                        elo_data[elo_col] = float(recent_record[elo_col])
-
-            price = get_fantasy_price(skier_name, fantasy_prices)
-            base_quota = get_nation_quota(nation, gender)
-            is_host = (nation == host_nation)
-            total_quota = get_nation_quota(nation, gender, is_host=is_host)
-
-            is_config_nation = nation in config_nations
-
-            skier_data = {
-                'FIS_Name': skier_name,
-                'Skier': skier_name,
-                'ID': skier_id,
-                'Nation': nation,
-                'In_FIS_List': False,
-                'Config_Nation': is_config_nation,
-                'In_Config': False,
-                'Price': price,
-                'Elo': elo_data.get('Elo', None),
-                'Distance_Elo': elo_data.get('Distance_Elo', None),
-                'Distance_C_Elo': elo_data.get('Distance_C_Elo', None),
-                'Distance_F_Elo': elo_data.get('Distance_F_Elo', None),
-                'Sprint_Elo': elo_data.get('Sprint_Elo', None),
-                'Sprint_C_Elo': elo_data.get('Sprint_C_Elo', None),
-                'Sprint_F_Elo': elo_data.get('Sprint_F_Elo', None),
-                'Classic_Elo': elo_data.get('Classic_Elo', None),
-                'Freestyle_Elo': elo_data.get('Freestyle_Elo', None),
-                'Base_Quota': base_quota,
-                'Is_Host_Nation': is_host,
-                'Quota': total_quota
-            }
-
-            # Set probability based on config nation status
-            if prob_column:
-                if is_config_nation:
-                    # Config nation but not in config = not announced = 0.0
-                    skier_data[prob_column] = 0.0
-                else:
-                    # Non-config nation = R calculates from history
-                    skier_data[prob_column] = None
-
-            data.append(skier_data)
-            processed_names.add(skier_name)
-
-        # Create DataFrame and sort
-        df = pd.DataFrame(data)
+        season_df = season_fallback_frame(elo_path, fantasy_prices, gender=gender,
+                                          nation_quota=get_nation_quota, host_nation=host_nation)
+        season_df = season_df.filter(~pl.col('Skier').is_in(list(processed_names))).with_columns([
+            pl.col('Skier').alias('FIS_Name'),
+            pl.lit(False).alias('In_FIS_List'),
+            pl.col('Nation').is_in(config_nations).fill_null(False).alias('Config_Nation'),
+            pl.lit(False).alias('In_Config'),
+        ])
+        columns = ['FIS_Name', 'Skier', 'ID', 'Nation', 'In_FIS_List', 'Config_Nation', 'In_Config', 'Price'] + \
+            ELO_COLUMNS + ['Base_Quota', 'Is_Host_Nation', 'Quota']
+        if prob_column:
+            # Config nation but not in config = not announced = 0.0
+            # Non-config nation = R calculates from history
+            season_df = season_df.with_columns(
+                pl.when(pl.col('Config_Nation')).then(pl.lit(0.0)).otherwise(pl.lit(None, dtype=pl.Float64))
+                  .alias(prob_column))
+            columns.append(prob_column)
+
+        # Create DataFrame, rank within nation quotas (config athletes first) and sort
+        df = pd.concat([pd.DataFrame(data), season_df.select(columns).to_pandas()], ignore_index=True)
+        df = nation_quota_rank(pl.from_pandas(df).lazy(), 'Elo', first='In_Config').collect().to_pandas()
         df = df.sort_values(['Price', 'Elo'], ascending=[False, False])
 
         print(f"Created fallback startlist with {len(df)} athletes ({len(config_skier_lookup)} from config)")
@@ -1079,37 +957,9 @@ def create_fallback_startlist(elo_path: str, gender: str, host_nation: str,
         traceback.print_exc()
         return None
 
-def merge_race_dataframes(df1: pd.DataFrame, df2: pd.DataFrame, prob_column: str) -> pd.DataFrame:
-    """Merge two race dataframes, preserving unique athletes and combining probability columns"""
-    # Create a copy of df1 to avoid modifying the original
-    result = df1.copy()
-    
-    # Create a set of existing skiers in df1
-    existing_skiers = set(df1['Skier'])
-    
-    # For skiers that exist in both dataframes, update the probability column
-    common_skiers = set(df2['Skier']) & existing_skiers
-    for skier in common_skiers:
-        # Find the row index in result for this skier
-        idx = result[result['Skier'] == skier].index[0]
-        
-        # Get probability from df2
-        prob_value = df2[df2['Skier'] == skier][prob_column].values[0]
-        
-        # Update the probability in result
-        result.loc[idx, prob_column] = prob_value
-    
-    # For skiers that only exist in df2, add them to result
-    new_skiers = set(df2['Skier']) - existing_skiers
-    new_rows = df2[df2['Skier'].isin(new_skiers)]
-    
-    # Append the new rows to result
-    result = pd.concat([result, new_rows], ignore_index=True)
-    
-    # Sort the result by price and elo
-    result = result.sort_values(['Price', 'Elo'], ascending=[False, False])
-    
-    return result
-
 if __name__ == "__main__":
-    process_weekend_races()
+    from r_scheduler import r_job_queue
+
+    # R jobs queued by this run and the relay scripts it starts run together at the end
+    with r_job_queue():
+        process_weekend_races()
@@ -2,39 +2,34 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import polars as pl
-from thefuzz import fuzz
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import warnings
 from datetime import datetime, timezone
 import re
+import sys
+import os
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
+import rating_client
+from name_index import get_name_index, normalize_name as index_normalize_name
+from chrono_cache import get_chrono, load_chrono, per_chrono_file
+from name_normalize import STARTLIST_ALIASES
+from race_elo import add_race_elo, elo_quartiles, race_elo_expr
 warnings.filterwarnings('ignore')
 
-# Add manual name mappings
-MANUAL_NAME_MAPPINGS = {
-    'Thomas MALONEY WESTGAARD': 'Thomas Hjalmar Westgård',
-    'John Steel HAGENBUCH': 'Johnny Hagenbuch',
-    'Imanol ROJO GARCIA': 'Imanol Rojo',
-    'JC SCHOONMAKER': 'James Clinton Schoonmaker',
-    'HAGENBUCH John Steel': 'Johnny Hagenbuch',
-    'MALONEY WESTGAARD Thomas': 'Thomas Hjalmar Westgård',
-    'Lars Michael Saab BJERTNAES':'Lars Michael Bjertnæs',
-    'BJERTNAES Lars Michael Saab':  'Lars Michael Bjertnæs',
-    'Amund August KORSAETH': 'Amund Korsæth',
-    'KORSAETH Amund August': 'Amund Korsæth',
-    'Samantha SMITH': 'Sammy Smith',
-    'SMITH Samantha': 'Sammy Smith'
-}
+# FIS name -> Elo name, shared with the knapsack name normalization
+MANUAL_NAME_MAPPINGS = STARTLIST_ALIASES
+REVERSE_NAME_MAPPINGS = {v: k for k, v in MANUAL_NAME_MAPPINGS.items()}
 
 def get_fantasy_price(name: str, fantasy_prices: Dict[str, int]) -> int:
     """Gets fantasy price by trying multiple name formats"""
     print(f"\nTrying to find price for: {name}")
     
-    # First check if there's a reverse mapping
-    reverse_map = {v: k for k, v in MANUAL_NAME_MAPPINGS.items()}
-    
     # If this name has a FIS format, try that first
-    if name in reverse_map:
-        fis_name = reverse_map[name]
+    if name in REVERSE_NAME_MAPPINGS:
+        fis_name = REVERSE_NAME_MAPPINGS[name]
         if fis_name in fantasy_prices:
             print(f"Found FIS manual mapping match: {fis_name} -> {fantasy_prices[fis_name]}")
             return fantasy_prices[fis_name]
@@ -53,15 +48,18 @@ def get_fantasy_price(name: str, fantasy_prices: Dict[str, int]) -> int:
             print(f"Found FIS format match: {fis_format} -> {fantasy_prices[fis_format]}")
             return fantasy_prices[fis_format]
     
+    # Fuzzy fallbacks share one index over the fantasy names
+    price_index = get_name_index(list(fantasy_prices.keys()), manual_mappings=MANUAL_NAME_MAPPINGS)
+    
     # Try fuzzy matching with original name
-    best_match = fuzzy_match_name(name, list(fantasy_prices.keys()))
+    best_match = price_index.match(name)
     if best_match and best_match in fantasy_prices:
         print(f"Found fuzzy match for original name: {name} -> {best_match} -> {fantasy_prices[best_match]}")
         return fantasy_prices[best_match]
     
     # Try fuzzy matching with all FIS formats
     for fis_format in fis_formats:
-        best_match = fuzzy_match_name(fis_format, list(fantasy_prices.keys()))
+        best_match = price_index.match(fis_format)
         if best_match and best_match in fantasy_prices:
             print(f"Found fuzzy match for FIS format: {fis_format} -> {best_match} -> {fantasy_prices[best_match]}")
             return fantasy_prices[best_match]
@@ -70,13 +68,17 @@ def get_fantasy_price(name: str, fantasy_prices: Dict[str, int]) -> int:
     print("Available names in fantasy prices (first 5):", list(fantasy_prices.keys())[:5])
     return 0
 
+FANTASY_API_URL = 'https://www.fantasyxc.se/api/athletes'
+
+STARTLIST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
 def get_fis_startlist(url: str) -> List[Tuple[str, str]]:
     """Gets skier names and nations from FIS website"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
+        headers = STARTLIST_HEADERS
+        response = scrape_transport.get(url, headers=headers)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -175,10 +177,16 @@ def get_fis_startlist(url: str) -> List[Tuple[str, str]]:
         print(f"Error fetching data: {e}")
         return []
 
+def prefetch_startlists(*race_frames: Optional[pd.DataFrame]) -> None:
+    """Start fetching the FIS startlists of all races (and the fantasy prices) concurrently"""
+    urls = [url for races in race_frames if races is not None and 'Startlist' in races.columns
+            for url in races['Startlist'].dropna()]
+    scrape_transport.prefetch(urls + [FANTASY_API_URL], headers=STARTLIST_HEADERS)
+
 def get_fantasy_prices() -> Dict[str, int]:
     """Gets athlete prices from Fantasy XC API"""
     try:
-        response = requests.get('https://www.fantasyxc.se/api/athletes')
+        response = scrape_transport.get(FANTASY_API_URL)
         response.raise_for_status()
         
         athletes = response.json()
@@ -188,6 +196,7 @@ def get_fantasy_prices() -> Dict[str, int]:
         print(f"Error getting Fantasy XC prices: {e}")
         return {}
 
+@per_chrono_file
 def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
     """Gets most recent ELO scores for each athlete with quartile imputation"""
     try:
@@ -197,7 +206,7 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
         
         # First try with more robust pandas approach
         try:
-            df = pd.read_csv(file_path, low_memory=False)
+            df = load_chrono(file_path).copy()
             print(f"Successfully read ELO file with pandas: {len(df)} rows")
         except Exception as pd_e:
             print(f"Error reading with pandas: {pd_e}")
@@ -344,45 +353,11 @@ def get_latest_elo_scores(file_path: str) -> pd.DataFrame:
 
 def normalize_name(name: str) -> str:
     """Normalizes name for better fuzzy matching"""
-    normalized = name.lower()
-    char_map = {
-        'ø': 'oe', 'ö': 'oe', 'ó': 'o',
-        'ä': 'ae', 'á': 'a', 'å': 'aa',
-        'é': 'e', 'è': 'e',
-        'ü': 'ue',
-        'ý': 'y',
-        'æ': 'ae'
-    }
-    for char, replacement in char_map.items():
-        normalized = normalized.replace(char, replacement)
-    return normalized
+    return index_normalize_name(name)
 
 def fuzzy_match_name(name: str, name_list: List[str], threshold: int = 85) -> str:
-    """Finds best matching name using normalized comparison"""
-    # First check manual mappings
-    if name in MANUAL_NAME_MAPPINGS:
-        mapped_name = MANUAL_NAME_MAPPINGS[name]
-        if mapped_name in name_list:
-            return mapped_name
-    
-    best_score = 0
-    best_match = ''
-    normalized_name = normalize_name(name)
-    
-    # Try matching full name
-    for candidate in name_list:
-        normalized_candidate = normalize_name(candidate)
-        score = fuzz.ratio(normalized_name, normalized_candidate)
-        
-        # Also try matching tokens in any order
-        token_score = fuzz.token_sort_ratio(normalized_name, normalized_candidate)
-        score = max(score, token_score)
-        
-        if score > best_score and score >= threshold:
-            best_score = score
-            best_match = candidate
-    
-    return best_match
+    """Finds best matching name using a NameIndex built once per candidate list"""
+    return get_name_index(name_list, manual_mappings=MANUAL_NAME_MAPPINGS, threshold=threshold).match(name)
 
 def convert_to_first_last(name: str) -> str:
     """Converts name from 'LAST First' to 'First Last' format"""
@@ -500,6 +475,199 @@ def get_additional_national_skiers(chronos: pd.DataFrame, elo_scores: pd.DataFra
         
     return additional_data
 
+ELO_COLUMNS = [
+    'Elo', 'Distance_Elo', 'Distance_C_Elo', 'Distance_F_Elo',
+    'Sprint_Elo', 'Sprint_C_Elo', 'Sprint_F_Elo',
+    'Classic_Elo', 'Freestyle_Elo'
+]
+
+# Elo columns in priority order by (race kind, technique); Race_Elo is the first available
+ELO_PRIORITY = {
+    ('Sprint', 'C'): ['Sprint_C_Elo', 'Sprint_Elo', 'Classic_Elo', 'Elo'],
+    ('Sprint', 'F'): ['Sprint_F_Elo', 'Sprint_Elo', 'Freestyle_Elo', 'Elo'],
+    ('Sprint', ''): ['Sprint_Elo', 'Elo'],
+    ('Distance', 'C'): ['Distance_C_Elo', 'Distance_Elo', 'Classic_Elo', 'Elo'],
+    ('Distance', 'F'): ['Distance_F_Elo', 'Distance_Elo', 'Freestyle_Elo', 'Elo'],
+    ('Distance', ''): ['Distance_Elo', 'Elo'],
+}
+
+def is_sprint_distance(distance) -> bool:
+    """True for 'SP' and for distances under 2km"""
+    if not isinstance(distance, str):
+        return False
+    if distance.strip() == 'SP':
+        return True
+    # Remove km and try to convert to float
+    clean_distance = distance.replace('km', '').strip()
+    return clean_distance.replace('.', '', 1).isdigit() and float(clean_distance) < 2
+
+def get_elo_priority(distance: str, technique: str) -> List[str]:
+    """Determine which ELO columns to prioritize based on race type"""
+    kind = 'Sprint' if is_sprint_distance(distance) else 'Distance'
+    return ELO_PRIORITY[(kind, technique if technique in ('C', 'F') else '')]
+
+def fantasy_price_frame(names: List[str], fantasy_prices: Dict[str, int]) -> pl.DataFrame:
+    """Skier -> Price for a list of names; only names without a direct hit go through get_fantasy_price"""
+    prices = {}
+    for name in dict.fromkeys(names):
+        fis_name = REVERSE_NAME_MAPPINGS.get(name)
+        if fis_name in fantasy_prices:
+            prices[name] = fantasy_prices[fis_name]
+        elif name in fantasy_prices:
+            prices[name] = fantasy_prices[name]
+        elif not fantasy_prices:
+            prices[name] = 0
+        else:
+            prices[name] = get_fantasy_price(name, fantasy_prices)
+    return pl.DataFrame({'Skier': list(prices.keys()), 'Price': list(prices.values())},
+                        schema={'Skier': pl.Utf8, 'Price': pl.Int64})
+
+def match_elo_names(elo_path: str, elo_scores: pd.DataFrame, names: List[str]) -> List[str]:
+    """
+    Latest-Elo name for each name ('' when nothing matches), in one batched match.
+
+    With the rating service running the match runs there against its resident name
+    index; otherwise (or if the call fails) the index is built here from elo_scores.
+    """
+    if names and rating_client.enabled():
+        try:
+            return rating_client.call('match_names', module=os.path.abspath(__file__),
+                                      path=os.path.abspath(os.path.expanduser(elo_path)), names=names)
+        except rating_client.ServiceUnavailable:
+            pass
+        except rating_client.ServiceError as e:
+            print(f"Rating service could not match names: {e}; matching in-process")
+    index = get_name_index(elo_scores['Skier'].tolist(), manual_mappings=MANUAL_NAME_MAPPINGS)
+    return index.match_many(names)
+
+def _served_quotas(nations: List[str], gender: str, nation_quota: Callable[..., int],
+                   host_nation: Optional[str]) -> Optional[Tuple[Dict[str, int], Dict[str, int]]]:
+    """(base, total) quotas per nation from the rating service, or None to compute them here."""
+    # The service only knows this sport's config.get_nation_quota
+    quota_module = getattr(sys.modules.get(nation_quota.__module__), '__file__', None)
+    if not nations or not rating_client.enabled() or nation_quota.__name__ != 'get_nation_quota':
+        return None
+    if not quota_module or os.path.dirname(os.path.abspath(quota_module)) != os.path.dirname(os.path.abspath(__file__)):
+        return None
+    try:
+        base = rating_client.call('nation_quotas', module=os.path.abspath(__file__), gender=gender,
+                                  nations=nations)
+        total = dict(base)
+        if host_nation in base:
+            total.update(rating_client.call('nation_quotas', module=os.path.abspath(__file__), gender=gender,
+                                            nations=[host_nation], host_nations=[host_nation]))
+        return base, total
+    except rating_client.ServiceUnavailable:
+        return None
+    except rating_client.ServiceError as e:
+        print(f"Rating service could not look up nation quotas: {e}; using config")
+        return None
+
+def nation_quota_frame(nations: List[str], gender: str, nation_quota: Callable[..., int],
+                       host_nation: Optional[str] = None) -> pl.DataFrame:
+    """Base quota, host flag and total quota (host and World Cup leader bonuses) per nation"""
+    nations = [nation for nation in dict.fromkeys(nations) if nation is not None]
+    served = _served_quotas(nations, gender, nation_quota, host_nation)
+    if served is None:
+        base = {nation: nation_quota(nation, gender) for nation in nations}
+        total = {nation: nation_quota(nation, gender, is_host=nation == host_nation) for nation in nations}
+    else:
+        base, total = served
+    return pl.DataFrame({
+        'Nation': nations,
+        'Base_Quota': [base[nation] for nation in nations],
+        'Is_Host_Nation': [nation == host_nation for nation in nations],
+        'Quota': [total[nation] for nation in nations],
+    }, schema={'Nation': pl.Utf8, 'Base_Quota': pl.Int64, 'Is_Host_Nation': pl.Boolean, 'Quota': pl.Int64})
+
+def nation_quota_rank(frame: pl.LazyFrame, rank_by: str, first: Optional[str] = None) -> pl.LazyFrame:
+    """
+    Add Nation_Rank (1 = best rank_by in the nation, unrated skiers last) and In_Quota
+    (Nation_Rank <= Quota). Rows with the boolean column first set, such as announced
+    config athletes, take their nation's places before everyone else.
+    """
+    rating = pl.col(rank_by).cast(pl.Float64, strict=False).fill_nan(None).fill_null(float('-inf'))
+    if first is None:
+        rank = rating.rank('ordinal', descending=True).over('Nation')
+    else:
+        rank = (rating.rank('ordinal', descending=True).over(['Nation', first])
+                + pl.when(pl.col(first)).then(0).otherwise(pl.col(first).sum().over('Nation')))
+    return (frame
+            .with_columns(rank.cast(pl.Int64).alias('Nation_Rank'))
+            .with_columns((pl.col('Nation_Rank') <= pl.col('Quota')).fill_null(False).alias('In_Quota')))
+
+def season_fallback_frame(elo_path: str, fantasy_prices: Dict[str, int],
+                          elo_priority: Optional[List[str]] = None,
+                          gender: Optional[str] = None,
+                          nation_quota: Optional[Callable[..., int]] = None,
+                          host_nation: Optional[str] = None) -> pl.DataFrame:
+    """
+    Every current-season skier with latest Elo, price and (optionally) nation quota.
+
+    Elo columns come from the latest Elo scores (exact name, then one batched fuzzy
+    match), or from the skier's latest chrono record when there is no match.
+    Race_Elo is the first available column of elo_priority, imputed at the first
+    quartile of its leading column when none is.
+    With nation_quota, Base_Quota / Is_Host_Nation / Quota are joined per nation and
+    nation_quota_rank ranks skiers within their nation (by Race_Elo, else Elo), so
+    In_Quota marks who fits inside the quota.
+    """
+    chrono = get_chrono(elo_path)
+    elo_scores = get_latest_elo_scores(elo_path)
+    latest = chrono.latest_records()
+
+    # Current-season skiers in order of first appearance, with their latest record
+    season_order = pd.Index(chrono.current_season_frame['Skier'].dropna().unique())
+    season_order = season_order[season_order.isin(latest.index)]
+    record_columns = ['Skier', 'Nation', 'ID'] + [c for c in ELO_COLUMNS if c in latest.columns]
+    records = pl.from_pandas(latest.loc[season_order, record_columns].reset_index(drop=True))
+    print(f"Found {records.height} skiers from the {chrono.current_season} season")
+
+    # Elo name for every skier: exact hits first, the rest in one fuzzy pass
+    elo_scores = elo_scores.drop_duplicates('Skier')
+    elo_names = set(elo_scores['Skier'])
+    names = records['Skier'].to_list()
+    unresolved = [name for name in names if name not in elo_names]
+    fuzzy = dict(zip(unresolved, match_elo_names(elo_path, elo_scores, unresolved)))
+    matches = [name if name in elo_names else (fuzzy.get(name) or None) for name in names]
+
+    elo_columns = [c for c in ELO_COLUMNS if c in elo_scores.columns]
+    elo_frame = pl.from_pandas(elo_scores[['Skier'] + elo_columns]).rename(
+        {c: f'_elo_{c}' for c in ['Skier'] + elo_columns})
+
+    frame = (records.lazy()
+             .with_columns(pl.Series('_match', matches, dtype=pl.Utf8))
+             .join(elo_frame.lazy(), left_on='_match', right_on='_elo_Skier', how='left')
+             .with_columns([
+                 pl.when(pl.col('_match').is_not_null())
+                   .then(pl.col(f'_elo_{c}').cast(pl.Float64, strict=False) if c in elo_columns
+                         else pl.lit(None, dtype=pl.Float64))
+                   .otherwise(pl.col(c).cast(pl.Float64, strict=False) if c in records.columns
+                              else pl.lit(None, dtype=pl.Float64))
+                   .alias(c)
+                 for c in ELO_COLUMNS
+             ])
+             .drop(['_match'] + [f'_elo_{c}' for c in elo_columns])
+             .join(fantasy_price_frame(names, fantasy_prices).lazy(), on='Skier', how='left'))
+
+    if elo_priority:
+        race_elo = race_elo_expr(elo_priority, ELO_COLUMNS, elo_quartiles(elo_scores))
+        frame = frame.with_columns(race_elo.alias('Race_Elo'))
+
+    if nation_quota is not None:
+        default_quota = nation_quota(None, gender)
+        quotas = nation_quota_frame(records['Nation'].to_list(), gender, nation_quota, host_nation)
+        frame = (frame
+                 .join(quotas.lazy(), on='Nation', how='left')
+                 .with_columns([
+                     pl.col('Base_Quota').fill_null(default_quota),
+                     pl.col('Is_Host_Nation').fill_null(False),
+                     pl.col('Quota').fill_null(default_quota),
+                 ]))
+        frame = nation_quota_rank(frame, 'Race_Elo' if elo_priority else 'Elo')
+
+    return frame.collect()
+
 def parse_fis_race_id(url: str) -> Optional[int]:
     """Extract the race ID from a FIS URL"""
     if pd.isna(url) or not url:
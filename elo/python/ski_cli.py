@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the per-sport pipeline scripts.
+
+Importing this module costs only the standard library. Each subcommand finds
+the script it wraps and runs it as __main__ (from the script's own directory,
+as the shell drivers do), so pandas, polars, bs4 and friends are imported only
+by the commands that need them, and `ski --help` stays fast. The scripts still
+import their dependencies at the top, so a subcommand costs what running the
+script directly does; the shell drivers (elo_script.sh etc.) call the scripts.
+
+Usage:
+    python ski_cli.py scrape ski                       # scrape.py
+    python ski_cli.py scrape ski --all                 # all_scrape.py
+    python ski_cli.py update biathlon --relay          # relay/update_scrape.py
+    python ski_cli.py elo ski -- '{"sex": "M", ...}'   # elo.py '<json>'
+    python ski_cli.py chrono alpine
+    python ski_cli.py startlist ski races              # startlist-scrape-races.py
+    python ski_cli.py startlist ski weekend --relay team_sprint
+    python ski_cli.py champs skijump
+    python ski_cli.py sporcle nordic-combined king-queen
+    python ski_cli.py selfcheck --budget-ms 150        # import-time budget check
+
+Arguments after `--` are passed on to the script.
+"""
+
+import argparse
+import os
+import runpy
+import sys
+from pathlib import Path
+
+PYTHON_BASE = Path(os.path.dirname(os.path.abspath(__file__)))
+SPORCLE_BASE = PYTHON_BASE.parent / 'sporcle'
+
+# Sport name -> directory under elo/python and under elo/sporcle
+SPORTS = {
+    'alpine': ('alpine', 'alpine'),
+    'biathlon': ('biathlon', 'biathlon'),
+    'cross-country': ('ski', 'ski'),
+    'ski': ('ski', 'ski'),
+    'nordic-combined': ('nordic-combined', 'nc'),
+    'skijump': ('skijump', 'skijump'),
+}
+
+# Scripts run by the simple per-sport commands
+SCRIPTS = {
+    'scrape': 'scrape.py',
+    'update': 'update_scrape.py',
+    'elo': 'elo.py',
+    'chrono': 'chrono.py',
+}
+
+# Modules the CLI itself must never import
+HEAVY_MODULES = ['pandas', 'polars', 'numpy', 'bs4', 'aiohttp', 'selenium', 'sklearn',
+                 'thefuzz', 'rapidfuzz', 'requests', 'scipy', 'openpyxl']
+IMPORT_BUDGET_MS = float(os.getenv('SKI_CLI_IMPORT_BUDGET_MS', '150'))
+
+def sport_dir(sport: str, relay: bool = False) -> Path:
+    directory = PYTHON_BASE / SPORTS[sport][0] / 'polars'
+    return directory / 'relay' if relay else directory
+
+def run_script(path: Path, args: list) -> int:
+    """Run a pipeline script as __main__ in its own directory."""
+    if not path.exists():
+        print(f"Script not found: {path}", file=sys.stderr)
+        return 1
+    script_dir = str(path.parent)
+    os.chdir(script_dir)
+    sys.path.insert(0, script_dir)
+    sys.argv = [str(path), *args]
+    runpy.run_path(str(path), run_name='__main__')
+    return 0
+
+def script_args(args: argparse.Namespace) -> list:
+    return list(args.args) + list(args.passthrough)
+
+def cmd_simple(args: argparse.Namespace) -> int:
+    if args.all and args.relay:
+        print("--all and --relay cannot be combined", file=sys.stderr)
+        return 2
+    script = ('all_' if args.all else '') + SCRIPTS[args.command]
+    return run_script(sport_dir(args.sport, args.relay) / script, script_args(args))
+
+def cmd_startlist(args: argparse.Namespace) -> int:
+    if args.relay:
+        path = sport_dir(args.sport, relay=True) / f"startlist_scrape_{args.mode}_{args.relay}.py"
+    else:
+        path = sport_dir(args.sport) / f"startlist-scrape-{args.mode}.py"
+    return run_script(path, script_args(args))
+
+def cmd_champs(args: argparse.Namespace) -> int:
+    return run_script(sport_dir(args.sport) / 'startlist-scrape-champs.py', script_args(args))
+
+def cmd_sporcle(args: argparse.Namespace) -> int:
+    return run_script(SPORCLE_BASE / SPORTS[args.sport][1] / f"{args.script}.py", script_args(args))
+
+def measure_import_time() -> tuple:
+    """Total import time (ms) of `ski_cli.py --help` and the modules it imported."""
+    import subprocess
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', os.path.abspath(__file__), '--help'],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ski_cli.py --help failed:\n{result.stderr[-2000:]}")
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        name = name[1:]
+        modules.add(name.strip().split('.')[0])
+        if not name.startswith(' '):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+def cmd_selfcheck(args: argparse.Namespace) -> int:
+    total_ms, modules = measure_import_time()
+    heavy = sorted(set(HEAVY_MODULES) & modules)
+    print(f"Import time: {total_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        return 1
+    if total_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        return 1
+    print("OK")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='ski', description='Winter sports pipeline scripts',
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog=__doc__)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name, help_text, func):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('sport', choices=sorted(SPORTS))
+        sub.set_defaults(func=func)
+        return sub
+
+    def add_passthrough(sub):
+        sub.add_argument('args', nargs='*', help='arguments passed to the script (after --)')
+
+    for name, help_text in [('scrape', 'Scrape race results'),
+                            ('update', 'Scrape new race results into the existing data'),
+                            ('elo', 'Calculate ELO ratings'),
+                            ('chrono', 'Build the chrono files')]:
+        sub = add_command(name, help_text, cmd_simple)
+        sub.add_argument('--all', action='store_true', help=f'Run all_{SCRIPTS[name]}')
+        sub.add_argument('--relay', action='store_true', help='Run the relay/ version')
+        add_passthrough(sub)
+
+    sub = add_command('startlist', 'Scrape startlists and write prediction inputs', cmd_startlist)
+    sub.add_argument('mode', choices=['races', 'weekend', 'tds'])
+    sub.add_argument('--relay', metavar='TYPE', help='Relay variant, e.g. relay, team_sprint, mixed_relay')
+    add_passthrough(sub)
+
+    sub = add_command('champs', 'Build the championships startlist', cmd_champs)
+    add_passthrough(sub)
+
+    sub = add_command('sporcle', 'Run a sporcle quiz script', cmd_sporcle)
+    sub.add_argument('script', help='Script name without .py, e.g. king-queen, top10')
+    add_passthrough(sub)
+
+    sub = subparsers.add_parser('selfcheck', help='Check that startup imports stay within budget')
+    sub.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    sub.set_defaults(func=cmd_selfcheck)
+
+    return parser
+
+def main() -> int:
+    # Everything after the first `--` goes to the script untouched
+    argv = sys.argv[1:]
+    passthrough = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, passthrough = argv[:split], argv[split + 1:]
+    args = build_parser().parse_args(argv)
+    args.passthrough = passthrough
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,19 @@ from startlist_common import *
 
 # Import Championships config functions
 from config import get_champs_athletes
+from champs_roster import ChampsRoster, get_champs_roster
+
+def get_roster(gender: str) -> Optional[ChampsRoster]:
+    """Championship roster for a gender, matched against the latest ELO scores once per run"""
+    from config import CHAMPS_ATHLETES_MEN, CHAMPS_ATHLETES_LADIES
+
+    athletes = CHAMPS_ATHLETES_MEN if gender == 'men' else CHAMPS_ATHLETES_LADIES
+    elo_path = f"~/ski/elo/python/skijump/polars/excel365/{gender}_chrono_pred.csv"
+    return get_champs_roster(elo_path, athletes, get_latest_elo_scores, threshold=80)
+
+def main_elo(elo_data: Dict) -> float:
+    """Team selection ELO: overall Elo, falling back to specific hill types"""
+    return elo_data.get('Elo', 0) or elo_data.get('Normal_Elo', 0) or elo_data.get('Large_Elo', 0) or 0
 
 def process_championships() -> None:
     """Main function to process Championships races"""
@@ -111,13 +124,10 @@ def create_individual_championships_startlist(gender: str, races_df: pd.DataFram
     
     print(f"Creating individual startlist for {gender}")
     
-    # Get ELO data path (using individual elevation data)
-    elo_path = f"~/ski/elo/python/skijump/polars/excel365/{gender}_chrono_pred.csv"
-    
     try:
         print("Loading ELO scores...")
-        elo_scores = get_latest_elo_scores(elo_path)
-        if elo_scores is None or elo_scores.empty:
+        roster = get_roster(gender)
+        if roster is None:
             print(f"No ELO scores found for {gender}")
             return
         
@@ -126,18 +136,13 @@ def create_individual_championships_startlist(gender: str, races_df: pd.DataFram
         processed_athletes = set()
         
         # Get all nations with Championships athletes
-        from config import CHAMPS_ATHLETES_MEN, CHAMPS_ATHLETES_LADIES
-        
-        if gender == 'men':
-            all_nations = set(CHAMPS_ATHLETES_MEN.keys())
-        else:
-            all_nations = set(CHAMPS_ATHLETES_LADIES.keys())
+        all_nations = roster.nations(min_athletes=0)
         
         print(f"Found {len(all_nations)} nations with {gender} athletes configured")
         
         # Process each nation's athletes
-        for nation in sorted(all_nations):
-            athletes = get_champs_athletes(nation, gender)
+        for nation in all_nations:
+            athletes = roster.athletes(nation)
             
             if not athletes:  # Skip nations with no athletes
                 continue
@@ -151,26 +156,17 @@ def create_individual_championships_startlist(gender: str, races_df: pd.DataFram
                 
                 print(f"Processing athlete: {athlete_name}")
                 
-                # Match with ELO scores
-                elo_match = None
-                if athlete_name in elo_scores['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    # Try fuzzy matching
-                    elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
+                # Look up the roster's ELO match
+                elo_match = roster.match(athlete_name)
                 
                 # Get ELO data
                 if elo_match:
-                    elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
+                    elo_data = roster.record(athlete_name)
                     print(f"Found ELO match: {athlete_name} -> {elo_match}")
                 else:
                     # Use quartile imputation for missing athletes
                     print(f"No ELO match found for {athlete_name}, using quartile imputation")
-                    elo_columns = [col for col in elo_scores.columns if 'Elo' in col]
-                    elo_data = {}
-                    for col in elo_columns:
-                        q1_value = elo_scores[col].quantile(0.25)
-                        elo_data[col] = q1_value
+                    elo_data = dict(roster.quartiles())
                     elo_data['Skier'] = athlete_name
                 
                 # Build row data (simple version - no race probabilities)
@@ -228,65 +224,29 @@ def create_team_championships_startlist(gender: str, races_df: pd.DataFrame) ->
     
     print(f"Creating team startlist for {gender}")
     
-    # Use individual ELO data (like weekend scraper does)
-    elo_path = f"~/ski/elo/python/skijump/polars/excel365/{gender}_chrono_pred.csv"
-    
     try:
         print("Loading ELO scores...")
-        elo_scores = get_latest_elo_scores(elo_path)
-        if elo_scores is None or elo_scores.empty:
+        roster = get_roster(gender)
+        if roster is None:
             print(f"No ELO scores found for {gender}")
             return
         
         team_data = []
         
         # Get qualifying nations from config (2+ athletes for team competitions - Olympics uses 2-person teams)
-        from config import CHAMPS_ATHLETES_MEN, CHAMPS_ATHLETES_LADIES
-
-        if gender == 'men':
-            all_nations = set(CHAMPS_ATHLETES_MEN.keys())
-        else:
-            all_nations = set(CHAMPS_ATHLETES_LADIES.keys())
-
-        qualifying_nations = []
-        for nation in all_nations:
-            athletes = get_champs_athletes(nation, gender)
-            if len(athletes) >= 2:  # Minimum team size requirement (Olympics uses 2-person teams)
-                qualifying_nations.append(nation)
+        qualifying_nations = roster.nations(min_athletes=2)  # Minimum team size requirement (Olympics uses 2-person teams)
 
         print(f"Found {len(qualifying_nations)} qualifying nations with 2+ {gender} athletes")
         
-        for nation in sorted(qualifying_nations):
-            athletes = get_champs_athletes(nation, gender)
-            
-            # Sort athletes by highest ELO to select the best performers
-            athlete_elos = []
-            for athlete_name in athletes:
-                # Match with ELO scores
-                elo_match = None
-                if athlete_name in elo_scores['Skier'].values:
-                    elo_match = athlete_name
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
-                
-                if elo_match:
-                    elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
-                    # Use overall Elo as primary ranking, fallback to specific hill types
-                    main_elo = elo_data.get('Elo', 0) or elo_data.get('Normal_Elo', 0) or elo_data.get('Large_Elo', 0) or 0
-                    athlete_elos.append((athlete_name, main_elo))
-                else:
-                    # No ELO match - assign low value
-                    athlete_elos.append((athlete_name, 0))
-            
+        for nation in qualifying_nations:
             # Sort by ELO (highest first) and select top 2 athletes (Olympics uses 2-person teams)
-            athlete_elos.sort(key=lambda x: x[1], reverse=True)
-            team_athletes = [athlete for athlete, elo in athlete_elos[:2]]
+            team_athletes = roster.top(nation, 2, main_elo)
 
             print(f"Creating team for {nation} with top 2 athletes by ELO: {team_athletes}")
             
             # Create team record using highest ELO athletes
             team_record = create_team_record_from_config(
-                nation, team_athletes, elo_scores, races_df.iloc[0]
+                nation, team_athletes, roster, races_df.iloc[0]
             )
             team_data.append(team_record)
         
@@ -324,12 +284,12 @@ def create_mixed_team_championships_startlist(races_df: pd.DataFrame) -> None:
     # Load both gender ELO data
     try:
         print("Loading men's ELO scores...")
-        men_elo = get_latest_elo_scores("~/ski/elo/python/skijump/polars/excel365/men_chrono_pred.csv")
+        men_roster = get_roster('men')
         
         print("Loading ladies' ELO scores...")
-        ladies_elo = get_latest_elo_scores("~/ski/elo/python/skijump/polars/excel365/ladies_chrono_pred.csv")
+        ladies_roster = get_roster('ladies')
         
-        if men_elo is None or men_elo.empty or ladies_elo is None or ladies_elo.empty:
+        if men_roster is None or ladies_roster is None:
             print("Missing ELO data for mixed teams")
             return
         
@@ -341,8 +301,8 @@ def create_mixed_team_championships_startlist(races_df: pd.DataFrame) -> None:
         
         qualifying_nations = []
         for nation in all_nations:
-            men_athletes = get_champs_athletes(nation, 'men')
-            ladies_athletes = get_champs_athletes(nation, 'ladies')
+            men_athletes = men_roster.athletes(nation)
+            ladies_athletes = ladies_roster.athletes(nation)
             
             if len(men_athletes) >= 2 and len(ladies_athletes) >= 2:
                 qualifying_nations.append(nation)
@@ -350,45 +310,9 @@ def create_mixed_team_championships_startlist(races_df: pd.DataFrame) -> None:
         print(f"Found {len(qualifying_nations)} qualifying nations with 2+ men and 2+ ladies")
         
         for nation in sorted(qualifying_nations):
-            # Get top 2 men by ELO
-            men_athletes_all = get_champs_athletes(nation, 'men')
-            men_elos = []
-            for athlete_name in men_athletes_all:
-                if athlete_name in men_elo['Skier'].values:
-                    elo_data = men_elo[men_elo['Skier'] == athlete_name].iloc[0].to_dict()
-                    main_elo = elo_data.get('Elo', 0) or elo_data.get('Normal_Elo', 0) or elo_data.get('Large_Elo', 0) or 0
-                    men_elos.append((athlete_name, main_elo))
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, men_elo['Skier'].tolist())
-                    if elo_match:
-                        elo_data = men_elo[men_elo['Skier'] == elo_match].iloc[0].to_dict()
-                        main_elo = elo_data.get('Elo', 0) or elo_data.get('Normal_Elo', 0) or elo_data.get('Large_Elo', 0) or 0
-                        men_elos.append((athlete_name, main_elo))
-                    else:
-                        men_elos.append((athlete_name, 0))
+            men_athletes = men_roster.top(nation, 2, main_elo)  # Top 2 men by ELO
             
-            men_elos.sort(key=lambda x: x[1], reverse=True)
-            men_athletes = [athlete for athlete, elo in men_elos[:2]]  # Top 2 men by ELO
-            
-            # Get top 2 ladies by ELO
-            ladies_athletes_all = get_champs_athletes(nation, 'ladies')
-            ladies_elos = []
-            for athlete_name in ladies_athletes_all:
-                if athlete_name in ladies_elo['Skier'].values:
-                    elo_data = ladies_elo[ladies_elo['Skier'] == athlete_name].iloc[0].to_dict()
-                    main_elo = elo_data.get('Elo', 0) or elo_data.get('Normal_Elo', 0) or elo_data.get('Large_Elo', 0) or 0
-                    ladies_elos.append((athlete_name, main_elo))
-                else:
-                    elo_match = fuzzy_match_name(athlete_name, ladies_elo['Skier'].tolist())
-                    if elo_match:
-                        elo_data = ladies_elo[ladies_elo['Skier'] == elo_match].iloc[0].to_dict()
-                        main_elo = elo_data.get('Elo', 0) or elo_data.get('Normal_Elo', 0) or elo_data.get('Large_Elo', 0) or 0
-                        ladies_elos.append((athlete_name, main_elo))
-                    else:
-                        ladies_elos.append((athlete_name, 0))
-            
-            ladies_elos.sort(key=lambda x: x[1], reverse=True)
-            ladies_athletes = [athlete for athlete, elo in ladies_elos[:2]]  # Top 2 ladies by ELO
+            ladies_athletes = ladies_roster.top(nation, 2, main_elo)  # Top 2 ladies by ELO
             
             print(f"Creating mixed team for {nation}: Men (top 2 by ELO): {men_athletes}, Ladies (top 2 by ELO): {ladies_athletes}")
             
@@ -397,8 +321,8 @@ def create_mixed_team_championships_startlist(races_df: pd.DataFrame) -> None:
                 nation, 
                 men_athletes,      # Top 2 men by ELO
                 ladies_athletes,   # Top 2 ladies by ELO
-                men_elo, 
-                ladies_elo, 
+                men_roster, 
+                ladies_roster, 
                 races_df.iloc[0]
             )
             mixed_data.append(mixed_record)
@@ -419,7 +343,7 @@ def create_mixed_team_championships_startlist(races_df: pd.DataFrame) -> None:
         print(f"Error creating mixed team Championships startlist: {e}")
         traceback.print_exc()
 
-def create_team_record_from_config(nation: str, athletes: List[str], elo_scores: pd.DataFrame, race: pd.Series) -> Dict:
+def create_team_record_from_config(nation: str, athletes: List[str], roster: ChampsRoster, race: pd.Series) -> Dict:
     """Create team record using config athletes (based on fallback method structure)"""
     
     # Define Elo columns to work with for ski jumping
@@ -459,15 +383,11 @@ def create_team_record_from_config(nation: str, athletes: List[str], elo_scores:
         if i < len(athletes):
             athlete_name = athletes[i]
             
-            # Match with ELO scores
-            elo_match = None
-            if athlete_name in elo_scores['Skier'].values:
-                elo_match = athlete_name
-            else:
-                elo_match = fuzzy_match_name(athlete_name, elo_scores['Skier'].tolist())
+            # Look up the roster's ELO match
+            elo_match = roster.match(athlete_name)
             
             if elo_match:
-                elo_data = elo_scores[elo_scores['Skier'] == elo_match].iloc[0].to_dict()
+                elo_data = roster.record(athlete_name)
                 valid_member_count += 1
                 
                 # Add to team totals
@@ -506,7 +426,7 @@ def create_team_record_from_config(nation: str, athletes: List[str], elo_scores:
     return team_record
 
 def create_mixed_team_record(nation: str, men_athletes: List[str], ladies_athletes: List[str], 
-                           men_elo: pd.DataFrame, ladies_elo: pd.DataFrame, race: pd.Series) -> Dict:
+                           men_roster: ChampsRoster, ladies_roster: ChampsRoster, race: pd.Series) -> Dict:
     """Create mixed team record (2 men + 2 ladies)"""
     
     elo_columns = [
@@ -539,24 +459,20 @@ def create_mixed_team_record(nation: str, men_athletes: List[str], ladies_athlet
         team_record[f'Avg_{col}'] = 0
 
     valid_member_count = 0
-    all_elos = [men_elo, men_elo, ladies_elo, ladies_elo]  # Match genders
+    all_rosters = [men_roster, men_roster, ladies_roster, ladies_roster]  # Match genders
     
     for i in range(4):
         member_index = i + 1
         
         if i < len(all_athletes):
             athlete_name = all_athletes[i]
-            elo_data_source = all_elos[i]
+            roster = all_rosters[i]
             
             # Match with appropriate ELO scores
-            elo_match = None
-            if athlete_name in elo_data_source['Skier'].values:
-                elo_match = athlete_name
-            else:
-                elo_match = fuzzy_match_name(athlete_name, elo_data_source['Skier'].tolist())
+            elo_match = roster.match(athlete_name)
             
             if elo_match:
-                elo_data = elo_data_source[elo_data_source['Skier'] == elo_match].iloc[0].to_dict()
+                elo_data = roster.record(athlete_name)
                 valid_member_count += 1
                 
                 # Add to team totals
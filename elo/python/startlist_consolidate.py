@@ -0,0 +1,118 @@
+"""
+One-pass consolidation of per-race startlists into a weekend startlist.
+
+The startlist scrapers build one DataFrame per race, each with a single
+RaceN_Prob column. They used to fold them together with merge_race_dataframes,
+which looked up every common skier one at a time and re-sorted after every
+race. consolidate_race_startlists does the whole weekend at once:
+
+    - athlete attributes come from the first race each athlete appears in
+    - probabilities are pivoted from (athlete, race) into one column per race
+    - race columns with no startlist and season-only athletes are zero-filled
+    - the startlist flag (In_FIS_List / In_Startlist) is set to False for
+      athletes whose probabilities sum to zero
+
+A probability that a race startlist left empty on purpose (None, "let the R
+model decide") stays empty, as does the probability of an athlete who is not
+on that race's startlist.
+
+Usage:
+    from startlist_consolidate import consolidate_race_startlists
+
+    race_frames = [('Race1_Prob', race1_df), ('Race2_Prob', race2_df)]
+    consolidated_df = consolidate_race_startlists(
+        race_frames, ['Race1_Prob', 'Race2_Prob', 'Race3_Prob'],
+        sort_by='Race_Elo', extra_athletes=season_df, flag_column='In_Startlist')
+"""
+
+from typing import List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+def _keep_race_rows(race_frames: Sequence[Tuple[str, pd.DataFrame]], fis_only: bool) -> List[Tuple[str, pd.DataFrame]]:
+    """
+    Deduplicate each race by Skier and, in FIS-only mode, drop athletes who are not
+    on the FIS list and first appear after a race that had FIS athletes.
+    """
+    kept = []
+    seen = set()
+    fis_seen = False
+    for prob_column, frame in race_frames:
+        frame = frame.drop_duplicates('Skier')
+        has_flag = 'In_FIS_List' in frame.columns
+        if fis_only and fis_seen and has_flag:
+            frame = frame[frame['Skier'].isin(seen) | (frame['In_FIS_List'] == True)]
+        kept.append((prob_column, frame))
+        seen.update(frame['Skier'])
+        if fis_only and has_flag:
+            fis_seen = fis_seen or bool((frame['In_FIS_List'] == True).any())
+    return kept
+
+def consolidate_race_startlists(race_frames: Sequence[Tuple[str, Optional[pd.DataFrame]]],
+                                prob_columns: Sequence[str],
+                                sort_by: Union[str, List[str], None] = None,
+                                ascending: Union[bool, List[bool]] = False,
+                                extra_athletes: Optional[pd.DataFrame] = None,
+                                flag_column: Optional[str] = None,
+                                fis_only: bool = False) -> Optional[pd.DataFrame]:
+    """
+    Combine per-race startlists into one row per athlete.
+
+    Args:
+        race_frames: (probability column, race DataFrame) pairs in race order
+        prob_columns: every race probability column of the weekend
+        sort_by / ascending: sort order for the athletes on a race startlist
+        extra_athletes: athletes to append with zero probabilities when they are
+            not on any race startlist (e.g. the rest of the current season)
+        flag_column: startlist flag set to False when all probabilities are zero
+        fis_only: once a race has FIS-listed athletes, only add new athletes from
+            later races if they are FIS-listed too
+
+    Returns:
+        Consolidated DataFrame, or None when no race produced a startlist
+    """
+    race_frames = [(col, frame) for col, frame in race_frames if frame is not None and not frame.empty]
+    if not race_frames:
+        return None
+    race_frames = _keep_race_rows(race_frames, fis_only)
+
+    # Athlete attributes from the first race each athlete appears in
+    all_prob_columns = set(prob_columns) | {col for col, _ in race_frames}
+    attributes = pd.concat(
+        [frame.drop(columns=[c for c in frame.columns if c in all_prob_columns]) for _, frame in race_frames],
+        ignore_index=True
+    ).drop_duplicates('Skier', keep='first')
+
+    # (athlete, race) -> probability, one column per race
+    long_probs = pd.concat(
+        [frame[['Skier', col]].rename(columns={col: '_prob'}).assign(_race=col)
+         for col, frame in race_frames if col in frame.columns],
+        ignore_index=True
+    )
+    probs = long_probs.pivot(index='Skier', columns='_race', values='_prob')
+    result = attributes.merge(probs, left_on='Skier', right_index=True, how='left')
+
+    for col in prob_columns:
+        if col not in result.columns:
+            print(f"Adding missing column {col}")
+            result[col] = 0.0
+
+    sort_cols = [sort_by] if isinstance(sort_by, str) else list(sort_by or [])
+    if sort_cols and all(col in result.columns for col in sort_cols):
+        result = result.sort_values(sort_cols, ascending=ascending, kind='stable')
+
+    if extra_athletes is not None and not extra_athletes.empty:
+        missing = extra_athletes[~extra_athletes['Skier'].isin(result['Skier'])]
+        missing = missing.drop(columns=[c for c in missing.columns if c in all_prob_columns])
+        missing = missing.assign(**{col: 0.0 for col in prob_columns})
+        print(f"Found {len(missing)} skiers from current season not already in the startlist")
+        if len(missing) > 0:
+            result = pd.concat([result, missing], ignore_index=True)
+
+    result = result.reset_index(drop=True)
+
+    if flag_column and prob_columns:
+        prob_sum = result[list(prob_columns)].apply(pd.to_numeric, errors='coerce').sum(axis=1)
+        result.loc[prob_sum == 0, flag_column] = False
+
+    return result
@@ -11,6 +11,12 @@ Usage:
     python test_harness.py alpine biathlon    # Test multiple sports
     python test_harness.py --scrape-only      # Only run scraping phase
     python test_harness.py --simulate-only    # Only run simulation phase
+    python test_harness.py --jobs 4           # Run at most 4 jobs at once
+
+Scrapers and R simulations are queued on a JobScheduler: each sport's
+simulation waits for its own scraper, while different sports run concurrently.
+Job output is written to log files (see r_scheduler.py) and every job's
+duration is reported at the end.
 
 The harness tests:
 1. Startlist scraping (Python) - reads test_races.csv, scrapes startlists
@@ -20,12 +26,14 @@ The harness tests:
 
 import os
 import sys
-import subprocess
 import argparse
 from pathlib import Path
 from datetime import datetime
 import traceback
 
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from r_scheduler import Job, JobScheduler, r_command
+
 # Configuration
 SPORTS = {
     'alpine': {
@@ -113,81 +121,55 @@ def set_test_mode(enabled: bool) -> None:
 
     print_info(f"TEST_MODE set to {test_mode_value}")
 
-def run_scraper(sport: str, config: dict, verbose: bool = False) -> tuple[bool, str]:
-    """Run the startlist scraper for a sport"""
+def add_scraper_job(scheduler: JobScheduler, sport: str, config: dict) -> tuple[bool, str]:
+    """Queue the startlist scraper for a sport"""
     scraper_path = Path(config['scraper']).expanduser()
 
     if not scraper_path.exists():
         return False, f"Scraper not found: {scraper_path}"
 
-    print_info(f"Running scraper: {scraper_path.name}")
+    # Run from the scraper's directory for relative imports
+    scheduler.add(
+        f"{sport}-scrape",
+        [sys.executable, str(scraper_path)],
+        cwd=str(scraper_path.parent),
+        timeout=300,  # 5 minute timeout
+        env={'TEST_MODE': 'true'}
+    )
+    return True, f"Queued scraper: {scraper_path.name}"
 
-    try:
-        # Change to the scraper's directory for relative imports
-        scraper_dir = scraper_path.parent
-
-        result = subprocess.run(
-            [sys.executable, str(scraper_path)],
-            cwd=str(scraper_dir),
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minute timeout
-            env={**os.environ, 'TEST_MODE': 'true'}
-        )
-
-        if verbose:
-            if result.stdout:
-                print(f"STDOUT:\n{result.stdout}")
-            if result.stderr:
-                print(f"STDERR:\n{result.stderr}")
-
-        if result.returncode != 0:
-            return False, f"Scraper failed with return code {result.returncode}\n{result.stderr}"
-
-        return True, "Scraper completed successfully"
-
-    except subprocess.TimeoutExpired:
-        return False, "Scraper timed out after 5 minutes"
-    except Exception as e:
-        return False, f"Error running scraper: {e}"
-
-def run_r_simulation(sport: str, config: dict, verbose: bool = False) -> tuple[bool, str]:
-    """Run the R simulation script for a sport"""
+def add_simulation_job(scheduler: JobScheduler, sport: str, config: dict,
+                       after_scrape: bool) -> tuple[bool, str]:
+    """Queue the R simulation script for a sport, after its scraper when one is queued"""
     r_script_path = Path(config['r_script']).expanduser()
 
     if not r_script_path.exists():
         return False, f"R script not found: {r_script_path}"
 
-    print_info(f"Running R simulation: {r_script_path.name}")
-
-    try:
-        # Change to the R script's directory
-        r_script_dir = r_script_path.parent
-
-        result = subprocess.run(
-            ['Rscript', str(r_script_path)],
-            cwd=str(r_script_dir),
-            capture_output=True,
-            text=True,
-            timeout=600,  # 10 minute timeout for R simulations
-            env={**os.environ, 'TEST_MODE': 'true'}
-        )
-
-        if verbose:
-            if result.stdout:
-                print(f"STDOUT:\n{result.stdout}")
-            if result.stderr:
-                print(f"STDERR:\n{result.stderr}")
-
-        if result.returncode != 0:
-            return False, f"R script failed with return code {result.returncode}\n{result.stderr}"
-
-        return True, "R simulation completed successfully"
-
-    except subprocess.TimeoutExpired:
-        return False, "R simulation timed out after 10 minutes"
-    except Exception as e:
-        return False, f"Error running R script: {e}"
+    scheduler.add(
+        f"{sport}-simulate",
+        r_command(r_script_path),
+        needs=[f"{sport}-scrape"] if after_scrape else [],
+        cwd=str(r_script_path.parent),
+        timeout=600,  # 10 minute timeout for R simulations
+        env={'TEST_MODE': 'true'}
+    )
+    return True, f"Queued R simulation: {r_script_path.name}"
+
+def job_result(job: Job, label: str, verbose: bool = False) -> dict:
+    """Success flag and message for a finished scheduler job"""
+    if verbose:
+        print(f"\n{Colors.BOLD}{job.name} log ({job.log_path}):{Colors.ENDC}")
+        print(job.read_log())
+
+    if job.succeeded:
+        return {'success': True, 'message': f"{label} completed successfully in {job.duration:.1f}s"}
+    if job.status == 'timeout':
+        return {'success': False, 'message': f"{label} {job.message}"}
+    if job.status == 'skipped':
+        return {'success': False, 'message': f"{label} skipped: {job.message}"}
+    log_tail = '\n'.join(job.read_log().splitlines()[-20:])
+    return {'success': False, 'message': f"{label} failed: {job.message}\n{log_tail}"}
 
 def validate_outputs(sport: str, config: dict) -> tuple[bool, list]:
     """Validate that expected output files exist"""
@@ -211,9 +193,9 @@ def validate_outputs(sport: str, config: dict) -> tuple[bool, list]:
 
     return len(missing) == 0, found, missing
 
-def test_sport(sport: str, config: dict, scrape_only: bool = False,
-               simulate_only: bool = False, verbose: bool = False) -> dict:
-    """Test a single sport through the pipeline"""
+def queue_sport(scheduler: JobScheduler, sport: str, config: dict, scrape_only: bool = False,
+                simulate_only: bool = False) -> dict:
+    """Queue the scrape and simulation phases of a sport; sports run concurrently"""
     results = {
         'sport': sport,
         'scraper': {'success': None, 'message': ''},
@@ -221,34 +203,48 @@ def test_sport(sport: str, config: dict, scrape_only: bool = False,
         'validation': {'success': None, 'found': [], 'missing': []},
     }
 
+    scrape_queued = False
+    if not simulate_only:
+        scrape_queued, message = add_scraper_job(scheduler, sport, config)
+        if not scrape_queued:
+            results['scraper'] = {'success': False, 'message': message}
+            print_error(f"{sport}: {message}")
+
+    if not scrape_only:
+        queued, message = add_simulation_job(scheduler, sport, config, after_scrape=scrape_queued)
+        if not queued:
+            results['simulation'] = {'success': False, 'message': message}
+            print_error(f"{sport}: {message}")
+
+    return results
+
+def test_sport(results: dict, config: dict, jobs: dict, verbose: bool = False) -> dict:
+    """Report the finished jobs of a single sport and validate its outputs"""
+    sport = results['sport']
     print_header(f"Testing: {sport.upper()}")
 
     # Phase 1: Scraping
-    if not simulate_only:
+    scrape_job = jobs.get(f"{sport}-scrape")
+    if scrape_job is not None:
         print(f"\n{Colors.BOLD}Phase 1: Startlist Scraping{Colors.ENDC}")
-        success, message = run_scraper(sport, config, verbose)
-        results['scraper'] = {'success': success, 'message': message}
-
-        if success:
-            print_success(message)
+        results['scraper'] = job_result(scrape_job, "Scraper", verbose)
+        if results['scraper']['success']:
+            print_success(results['scraper']['message'])
         else:
-            print_error(message)
-            if not scrape_only:
-                print_warning("Continuing to simulation phase despite scraper error...")
-    else:
+            print_error(results['scraper']['message'])
+    elif results['scraper']['success'] is None:
         print_info("Skipping scraper phase (--simulate-only)")
 
     # Phase 2: R Simulation
-    if not scrape_only:
+    simulate_job = jobs.get(f"{sport}-simulate")
+    if simulate_job is not None:
         print(f"\n{Colors.BOLD}Phase 2: R Simulation{Colors.ENDC}")
-        success, message = run_r_simulation(sport, config, verbose)
-        results['simulation'] = {'success': success, 'message': message}
-
-        if success:
-            print_success(message)
+        results['simulation'] = job_result(simulate_job, "R simulation", verbose)
+        if results['simulation']['success']:
+            print_success(results['simulation']['message'])
         else:
-            print_error(message)
-    else:
+            print_error(results['simulation']['message'])
+    elif results['simulation']['success'] is None:
         print_info("Skipping simulation phase (--scrape-only)")
 
     # Phase 3: Output Validation
@@ -333,6 +329,12 @@ def main():
         action='store_true',
         help='Show detailed output from scrapers and R scripts'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='CPU budget for concurrent jobs (default: R_JOB_CPUS or all cores)'
+    )
     parser.add_argument(
         '--no-reset',
         action='store_true',
@@ -357,18 +359,23 @@ def main():
     set_test_mode(True)
 
     all_results = []
+    scheduler = JobScheduler(cpu_budget=args.jobs)
 
     try:
-        for sport in args.sports:
-            config = SPORTS[sport]
-            result = test_sport(
+        queued = [
+            queue_sport(
+                scheduler,
                 sport,
-                config,
+                SPORTS[sport],
                 scrape_only=args.scrape_only,
-                simulate_only=args.simulate_only,
-                verbose=args.verbose
+                simulate_only=args.simulate_only
             )
-            all_results.append(result)
+            for sport in args.sports
+        ]
+        jobs = scheduler.run()
+        for result in queued:
+            all_results.append(test_sport(result, SPORTS[result['sport']], jobs, verbose=args.verbose))
+        scheduler.report()
     finally:
         # Reset TEST_MODE unless --no-reset is specified
         if not args.no_reset:
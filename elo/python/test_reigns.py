@@ -0,0 +1,39 @@
+"""
+Checks for reigns.race_leaders.
+
+Usage:
+    python -m pytest test_reigns.py
+"""
+
+import datetime
+
+import pandas as pd
+
+from reigns import king_queen_table, race_leaders
+
+def late_starter_chrono() -> pd.DataFrame:
+    """Athlete 2 first races in race 2; there is no pre-race (pelo) column to seed them."""
+    return pd.DataFrame({
+        'season': [2020, 2020, 2020],
+        'date': ['2020-01-01', '2020-01-02', '2020-01-02'],
+        'race': [1, 2, 2],
+        'id': [1, 1, 2],
+        'name': ['A', 'A', 'B'],
+        'nation': ['NOR', 'NOR', 'SWE'],
+        'elo': [1300.0, 1310.0, 1400.0],
+    })
+
+def test_athlete_without_rating_does_not_lead():
+    leaders = race_leaders(late_starter_chrono(), 'elo')
+    assert leaders['id'].tolist() == [1, 2]
+    assert leaders['rating'].tolist() == [1300.0, 1400.0]
+
+def test_missing_pre_race_rating_does_not_lead():
+    df = late_starter_chrono().assign(pelo=[1300.0, 1300.0, float('nan')])
+    leaders = race_leaders(df, 'elo')
+    assert leaders['id'].tolist() == [1, 2]
+
+def test_late_starter_reign_starts_at_their_first_race():
+    table = king_queen_table(late_starter_chrono(), 'elo', today=datetime.date(2020, 1, 10))
+    assert table['id'].tolist() == [1, 2]
+    assert table['start_date'].astype(str).tolist() == ['2020-01-01', '2020-01-02']
@@ -0,0 +1,22 @@
+"""
+Checks for the ski_cli startup import budget.
+
+Usage:
+    python -m pytest test_ski_cli.py
+"""
+
+from ski_cli import HEAVY_MODULES, IMPORT_BUDGET_MS, build_parser, measure_import_time
+
+def test_help_stays_within_import_budget():
+    total_ms, _ = measure_import_time()
+    assert total_ms <= IMPORT_BUDGET_MS
+
+def test_help_imports_no_heavy_modules():
+    _, modules = measure_import_time()
+    assert 'argparse' in modules
+    assert not set(HEAVY_MODULES) & modules
+
+def test_startlist_relay_variant_is_parsed():
+    args = build_parser().parse_args(['startlist', 'ski', 'weekend', '--relay', 'team_sprint'])
+    assert args.mode == 'weekend'
+    assert args.relay == 'team_sprint'
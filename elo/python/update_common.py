@@ -0,0 +1,97 @@
+"""
+Shared helpers for the update scrapers (update_scrape.py, all_update_scrape.py,
+russia_update_scrape.py) of every sport.
+
+The update scrapes only need two facts from the existing history: which races are
+already known and each athlete's maximum Exp. Both are kept as small Polars frames
+(one row per race, one per athlete), so the experience carry-over is a join with no
+per-row Python callbacks and no Python dict of the full history. The known-race
+check runs once per scraped race from the scrapers' thread pools; it is a set
+lookup against the race keys, turned into a set once per race key frame.
+
+Usage:
+    from update_common import race_keys_frame, max_experience_frame, is_known_race, apply_experience_offset
+
+    races = race_keys_frame(df, ["Date", "City", "Event"])
+    experience = max_experience_frame(df)
+
+    if is_known_race((date, city, event), races):
+        ...
+    new_df = apply_experience_offset(new_df, experience)
+"""
+
+from typing import Dict, Optional, Sequence, Set, Tuple
+
+import polars as pl
+
+def _normalize_key_columns(columns: Sequence[str]) -> list:
+    """Cast key columns to strings, with dates as YYYYMMDD to match scraped race data."""
+    exprs = []
+    for col in columns:
+        expr = pl.col(col).cast(pl.Utf8)
+        if col == 'Date':
+            expr = expr.str.replace_all('-', '').str.slice(0, 8)
+        exprs.append(expr.alias(col))
+    return exprs
+
+def race_keys_frame(df: Optional[pl.DataFrame], columns: Sequence[str]) -> Optional[pl.DataFrame]:
+    """Unique race keys from an existing results frame."""
+    if df is None or len(df) == 0:
+        return None
+    return df.lazy().select(_normalize_key_columns(columns)).unique().collect()
+
+def combine_race_keys(*frames: Optional[pl.DataFrame]) -> Optional[pl.DataFrame]:
+    """Union of race key frames (e.g. men and ladies)."""
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        return None
+    return pl.concat(frames).unique()
+
+def max_experience_frame(df: Optional[pl.DataFrame]) -> Optional[pl.DataFrame]:
+    """Maximum Exp per athlete ID from an existing results frame."""
+    if df is None or len(df) == 0:
+        return None
+    return (df.lazy()
+            .group_by(pl.col('ID').cast(pl.Utf8))
+            .agg(pl.col('Exp').max().cast(pl.Int32).alias('max_exp'))
+            .collect())
+
+# id(race key frame) -> (the frame, kept alive so the id stays its own; its keys)
+_known_keys: Dict[int, Tuple[pl.DataFrame, Set[tuple]]] = {}
+
+def _normalize_key(race_key: tuple, columns: Sequence[str]) -> tuple:
+    """A scraped race key as _normalize_key_columns writes it: strings, Date as YYYYMMDD."""
+    key = []
+    for col, value in zip(columns, race_key):
+        if value is not None:
+            value = str(value)
+            if col == 'Date':
+                value = value.replace('-', '')[:8]
+        key.append(value)
+    return tuple(key)
+
+def known_race_keys(races: pl.DataFrame) -> Set[tuple]:
+    """The race keys of a race key frame as a set, built once per frame."""
+    entry = _known_keys.get(id(races))
+    if entry is None or entry[0] is not races:
+        entry = (races, set(races.iter_rows()))
+        _known_keys[id(races)] = entry
+    return entry[1]
+
+def is_known_race(race_key: tuple, races: Optional[pl.DataFrame]) -> bool:
+    """True if the race key already exists in the race key frame."""
+    if races is None or len(races) == 0:
+        return False
+    return _normalize_key(race_key, races.columns) in known_race_keys(races)
+
+def apply_experience_offset(new_df: Optional[pl.DataFrame],
+                            experience: Optional[pl.DataFrame]) -> Optional[pl.DataFrame]:
+    """Add each athlete's previous max Exp to the Exp of newly scraped rows."""
+    if new_df is None or len(new_df) == 0 or experience is None:
+        return new_df
+    return (new_df.lazy()
+            .with_columns(pl.col('ID').cast(pl.Utf8).alias('_exp_id'))
+            .join(experience.lazy().rename({'ID': '_exp_id'}), on='_exp_id', how='left')
+            .with_columns((pl.col('Exp') + pl.col('max_exp').fill_null(0)).alias('Exp'))
+            .drop(['_exp_id', 'max_exp'])
+            .collect())
@@ -1,6 +1,12 @@
 import pandas as pd
 import numpy as np
 import time
+import os
+import sys
+
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import ASCII_TRANSLATION, normalize_names
+from career import race_rows
 
 start_time = time.time()
 
@@ -14,41 +20,13 @@ start_time = time.time()
 
 
 def top10(df):
+	#Athletes rated in season 2024, by their 2024 season-end elo
 	df = pd.read_pickle(df)
-	df['date'] = df['date'].astype(str)
-	df = df[df['date'].str.endswith('0500')]
-	df = df.loc[df['season']>=1982]
-	df['name']= df['name'].str.replace('Ã¸', 'ø')
-	df['name']= df['name'].str.replace('Ã¤', 'ä')
-	df['name']= df['name'].str.replace('Ã¼', 'ü')
-	df['name'] = df['name'].str.replace('Ã¶', 'ö')
-	df['name'] = df['name'].str.replace('Ã', 'Ø')
-	df['name'] = df['name'].str.replace('Ã¦', 'æ')
-	df['name']= df['name'].str.replace('Ã¥', 'å')
-	df['name']= df['name'].str.replace('Ã', 'Å')
-	
-	df['name'] = df['name'].str.replace('ä', 'a')
-	df['name'] = df['name'].str.replace('Ä', 'A')
-	df['name'] = df['name'].str.replace('å', 'a')
-	df['name'] = df['name'].str.replace('Å', 'A')
-	df['name'] = df['name'].str.replace('Æ', 'Ae')
-	df['name'] = df['name'].str.replace('æ', 'ae')
-	df['name'] = df['name'].str.replace('ø', 'o')
-	df['name'] = df['name'].str.replace('Ø', 'O')
-	df['name'] = df['name'].str.replace('ö', 'o')
-	df['name'] = df['name'].str.replace('Ö', 'O')
-	df['name'] = df['name'].str.replace('ü', 'u')
-	df['name'] = df['name'].str.replace('Ü', 'U')
-
-	ret_df = pd.DataFrame()
-	for a in range(2024, 2025):
-		df_small = df.loc[df['season']==a]
-		df_small = df_small.sort_values(by='elo', ascending=False)
-		df_small = df_small.head(50)
-		rank = range(1,51)
-		df_small.insert(0, 'rank', rank)
-		df_small = df_small[["rank", "name", "nation"]]
-		ret_df = ret_df.append(df_small)
+	df = df.loc[~race_rows(df) & (df['season']==2024)]
+	ret_df = df.sort_values(by='elo', ascending=False).head(50)
+	ret_df.insert(0, 'rank', range(1, len(ret_df)+1))
+	ret_df['name'] = normalize_names(ret_df['name'], ASCII_TRANSLATION, aliases=None)
+	ret_df = ret_df[["rank", "name", "nation"]]
 		
 	print(ret_df)
 	return ret_df
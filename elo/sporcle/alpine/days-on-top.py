@@ -3,39 +3,31 @@ import numpy as np
 import time
 import datetime
 import operator
+import os
+import sys
+
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from career import load_career
 
 start_time = time.time()
 
 
 def on_top(df):
-	df = pd.read_excel(df)
-	ids = df['id'].unique()
-	total_days = []
-	names = []
-	nations = []
-	dates = []
-	for a in range(len(ids)):
-		skidf = df.loc[df['id']==ids[a]]
-		print(skidf)
-		total_days.append(sum(skidf['days']))
-		date = ''
-		for b in range(len(skidf['days'])):
-			date = date+' '+skidf['dates'].iloc[b]
-		dates.append(date)
-		names.append(skidf['name'].iloc[-1])
-		nations.append(skidf['nation'].iloc[-1])
+	#Days at #1 and the reign dates come from the career table of the chrono the reigns were built from
+	career = load_career(df)
+	career = career.loc[career['days_on_top']>0].sort_values(by='first_reign', kind='stable')
 	df = pd.DataFrame()
-	df['name'] = names
-	df['id'] = ids
-	df['nation'] = nations
-	df['dates'] = dates
-	df['days'] = total_days 
+	df['name'] = career['name'].to_numpy()
+	df['id'] = career.index.to_numpy()
+	df['nation'] = career['nation'].to_numpy()
+	df['dates'] = career['reign_dates'].to_numpy()
+	df['days'] = career['days_on_top'].to_numpy()
 	return df
 
 
 
-dfs = ['/Users/syverjohansen/ski/elo/sporcle/alpine/excel365/king-elo_sporcle.xlsx',
-'/Users/syverjohansen/ski/elo/sporcle/alpine/excel365/queen-elo_sporcle.xlsx']
+dfs = ['/Users/syverjohansen/ski/elo/python/alpine/age/excel365/men_chrono.pkl',
+'/Users/syverjohansen/ski/elo/python/alpine/age/excel365/ladies_chrono.pkl']
 
 for a in range(len(dfs)):
 	if(a==0):
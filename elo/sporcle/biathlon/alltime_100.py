@@ -1,6 +1,12 @@
 import pandas as pd
 import numpy as np
 import time
+import os
+import sys
+
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import ASCII_TRANSLATION, normalize_names
+from career import career_span, load_career
 
 start_time = time.time()
 
@@ -15,55 +21,18 @@ start_time = time.time()
 
 def get_active(df, sex):
 	df = pd.read_pickle(df)
+	#Career spans come from the career table, rebuilt only when the chrono changes
 	if(sex=="men"):
-		all_skiers = pd.read_pickle('/Users/syverjohansen/ski/elo/python/biathlon/excel365/varmen_all_k.pkl')
+		career = load_career('/Users/syverjohansen/ski/elo/python/biathlon/excel365/varmen_all_k.pkl')
 	else:
-		all_skiers = pd.read_pickle('/Users/syverjohansen/ski/elo/python/biathlon/excel365/varladies_all_k.pkl')
-	ids = list(df['id'].unique())
-	df['career'] = ''
-
-	for a in range(len(ids)):
-		small_df = all_skiers.loc[all_skiers['id']==ids[a]]
-		if(sex=="men"):
-			print(ids[a], small_df)
-		try:
-			start = str(small_df['season'].iloc[0])
-
-			end = str(small_df['season'].iloc[-1])
-		except:
-			start = "0"
-			end="0"
-		if(int(end)>=2023):
-			end="Present"
-		career = "("+start+"-"+end+")"
-		df.loc[df['id']==ids[a], 'career'] = career
+		career = load_career('/Users/syverjohansen/ski/elo/python/biathlon/excel365/varladies_all_k.pkl')
+	df['career'] = career_span(career, 2023).reindex(df['id']).fillna("(0-0)").to_numpy()
 	return df
 
 def top10(df):
 	#df = pd.read_pickle(df)
 	
-	df['name']= df['name'].str.replace('Ã¸', 'ø')
-	df['name']= df['name'].str.replace('Ã¤', 'ä')
-	df['name']= df['name'].str.replace('Ã¼', 'ü')
-	df['name'] = df['name'].str.replace('Ã¶', 'ö')
-	df['name'] = df['name'].str.replace('Ã', 'Ø')
-	df['name'] = df['name'].str.replace('Ã', 'Ø')
-	df['name'] = df['name'].str.replace('Ã¦', 'æ')
-	df['name']= df['name'].str.replace('Ã¥', 'å')
-	df['name']= df['name'].str.replace('Ã', 'Å')
-	
-	df['name'] = df['name'].str.replace('ä', 'a')
-	df['name'] = df['name'].str.replace('Ä', 'A')
-	df['name'] = df['name'].str.replace('å', 'a')
-	df['name'] = df['name'].str.replace('Å', 'A')
-	df['name'] = df['name'].str.replace('Æ', 'Ae')
-	df['name'] = df['name'].str.replace('æ', 'ae')
-	df['name'] = df['name'].str.replace('ø', 'o')
-	df['name'] = df['name'].str.replace('Ø', 'O')
-	df['name'] = df['name'].str.replace('ö', 'o')
-	df['name'] = df['name'].str.replace('Ö', 'O')
-	df['name'] = df['name'].str.replace('ü', 'u')
-	df['name'] = df['name'].str.replace('Ü', 'U')
+	df['name'] = normalize_names(df['name'], ASCII_TRANSLATION, aliases=None)
 
 	ret_df = pd.DataFrame()
 	
@@ -1,6 +1,11 @@
 import pandas as pd
 import numpy as np
 import time
+import os
+import sys
+
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import ASCII_TRANSLATION, normalize_names
 
 start_time = time.time()
 
@@ -19,19 +24,7 @@ def top10(df):
 	df = df[df['date'].str.endswith('0500')]
 	df = df.loc[df['season']>=1982]
 	
-	df['name'] = df['name'].str.replace('ä', 'a')
-	df['name'] = df['name'].str.replace('Ä', 'A')
-	df['name'] = df['name'].str.replace('å', 'a')
-	df['name'] = df['name'].str.replace('Å', 'A')
-	df['name'] = df['name'].str.replace('Æ', 'Ae')
-	df['name'] = df['name'].str.replace('æ', 'ae')
-	df['name'] = df['name'].str.replace('ø', 'o')
-	df['name'] = df['name'].str.replace('Ø', 'O')
-	df['name'] = df['name'].str.replace('ö', 'o')
-	df['name'] = df['name'].str.replace('Ö', 'O')
-	df['name'] = df['name'].str.replace('ü', 'u')
-	df['name'] = df['name'].str.replace('Ü', 'U')
-	df['name'] = df['name'].str.replace('Ã', 'Oe')
+	df['name'] = normalize_names(df['name'], ASCII_TRANSLATION, aliases=None)
 
 	ret_df = pd.DataFrame()
 	for a in range(1982, 2024):
@@ -3,6 +3,11 @@ import numpy as np
 import time
 import datetime
 import operator
+import os
+import sys
+
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+from name_normalize import ASCII_TRANSLATION, normalize_names
 
 start_time = time.time()
 
@@ -10,18 +15,7 @@ def winners(df):
 	df = pd.read_pickle(df)
 	df = df[['season', 'name', 'nation', 'place']]
 	df = df.loc[df['place']==1]
-	df['name'] = df['name'].str.replace('ä', 'a')
-	df['name'] = df['name'].str.replace('Ä', 'A')
-	df['name'] = df['name'].str.replace('å', 'a')
-	df['name'] = df['name'].str.replace('Å', 'A')
-	df['name'] = df['name'].str.replace('Æ', 'Ae')
-	df['name'] = df['name'].str.replace('æ', 'ae')
-	df['name'] = df['name'].str.replace('ø', 'o')
-	df['name'] = df['name'].str.replace('Ø', 'O')
-	df['name'] = df['name'].str.replace('ö', 'o')
-	df['name'] = df['name'].str.replace('Ö', 'O')
-	df['name'] = df['name'].str.replace('ü', 'u')
-	df['name'] = df['name'].str.replace('Ü', 'U')
+	df['name'] = normalize_names(df['name'], ASCII_TRANSLATION, aliases=None)
 	#df['season'] = df.loc[df['season']>=1982]
 	df2 = df.groupby(['season', 'name', 'nation'])['place'].count()
 	df2 = df2.reset_index()
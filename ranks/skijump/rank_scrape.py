@@ -12,6 +12,11 @@ from typing import List, Dict, Optional
 import os
 from pathlib import Path
 from datetime import datetime
+import sys
+
+# Shared record/replay transport (SCRAPE_MODE=live|record|replay)
+sys.path.insert(0, os.path.expanduser('~/ski/elo/python'))
+import scrape_transport
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -30,7 +35,7 @@ class RateLimit:
         now = time.time()
         elapsed = now - self.last_call
         if elapsed < self.delay:
-            await asyncio.sleep(self.delay - elapsed)
+            await scrape_transport.async_sleep(self.delay - elapsed)
         self.last_call = time.time()
 
 rate_limiter = RateLimit()
@@ -52,7 +57,7 @@ async def fetch_standings_page(session: aiohttp.ClientSession, year: int, gender
     for attempt in range(max_retries):
         try:
             await rate_limiter.wait()
-            async with session.get(url, ssl=ssl_context) as response:
+            async with scrape_transport.session_get(session, url, ssl=ssl_context) as response:
                 if response.status == 200:
                     return await response.text()
                 logging.warning(f"Failed to fetch {url}, status: {response.status}")